@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark: mmap vs chunked reverse line readers in macf.utils.streaming.
+
+Writes a synthetic event-log-shaped JSONL (or uses the file given), then
+times a full reverse scan and a short tail scan with both readers, for the
+decoded (``iter_lines_reverse``) and undecoded (``iter_line_bytes_reverse``)
+APIs. Each case reports the best of ``--repeat`` runs.
+
+Usage:
+  bench_streaming.py [--path FILE] [--mb 200] [--line-bytes 600] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from macf.utils.streaming import iter_line_bytes_reverse, iter_lines_reverse
+
+
+def write_fixture(path: str, megabytes: int, line_bytes: int) -> None:
+    """Write ~``megabytes`` MB of event-log-shaped lines of ~``line_bytes`` each."""
+    pad = "x" * max(0, line_bytes - 120)
+    with open(path, "w", encoding="utf-8") as f:
+        written, i = 0, 0
+        while written < megabytes * 1024 * 1024:
+            line = json.dumps({
+                "timestamp": 1778700000.0 + i,
+                "event": "tool_call_started",
+                "data": {"i": i, "pad": pad},
+            }) + "\n"
+            f.write(line)
+            written += len(line)
+            i += 1
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def full_scan(reader, path: str, use_mmap: bool) -> None:
+    for _line in reader(path, use_mmap=use_mmap):
+        pass
+
+
+def tail_scan(reader, path: str, use_mmap: bool, lines: int = 1000) -> None:
+    for n, _line in enumerate(reader(path, use_mmap=use_mmap)):
+        if n >= lines:
+            break
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", help="existing JSONL to scan (default: synthetic fixture)")
+    parser.add_argument("--mb", type=int, default=200, help="fixture size in MB (default: 200)")
+    parser.add_argument("--line-bytes", type=int, default=600, help="fixture line size (default: 600)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (default: 3)")
+    args = parser.parse_args()
+
+    tmpdir = None
+    path = args.path
+    if path is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="macf_bench_")
+        path = os.path.join(tmpdir.name, "events.jsonl")
+        write_fixture(path, args.mb, args.line_bytes)
+
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"File: {path} ({size_mb:.1f} MB), best of {args.repeat}")
+    print(f"  {'case':<28} {'chunked':>10} {'mmap':>10} {'speedup':>8}")
+    for label, reader, scan in (
+        ("full scan, str", iter_lines_reverse, full_scan),
+        ("full scan, bytes", iter_line_bytes_reverse, full_scan),
+        ("tail 1000 lines, str", iter_lines_reverse, tail_scan),
+    ):
+        chunked = best_of(args.repeat, lambda: scan(reader, path, False))
+        mapped = best_of(args.repeat, lambda: scan(reader, path, True))
+        print(f"  {label:<28} {chunked:>9.3f}s {mapped:>9.3f}s {chunked / mapped:>7.1f}x")
+
+    if tmpdir is not None:
+        tmpdir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
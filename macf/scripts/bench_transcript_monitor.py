@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark: inotify vs poll wake-up in the transcript monitor.
+
+Runs a TranscriptMonitor per backend on a synthetic transcript, then:
+
+* detection latency: appends a line every ``--gap`` seconds and measures
+  the time until the monitor's detector sees it (median, p95, max);
+* idle cost: leaves the transcript untouched for ``--idle`` seconds and
+  reports the CPU time the process used and how often the monitor woke.
+
+Usage:
+  bench_transcript_monitor.py [--appends 50] [--gap 0.05] [--idle 10] [--interval 1.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from macf.transcript_monitor.daemon import TranscriptMonitor
+
+
+def write_line(path: Path, n: int) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "assistant", "bench": n, "sent": time.perf_counter()}) + "\n")
+
+
+def run_backend(backend: str, args) -> dict:
+    tmpdir = tempfile.TemporaryDirectory(prefix="macf_bench_")
+    path = Path(tmpdir.name) / "session.jsonl"
+    write_line(path, -1)
+
+    latencies = []
+    seen = threading.Event()
+
+    def detector(entry):
+        if "bench" in entry:
+            latencies.append(time.perf_counter() - entry["sent"])
+            seen.set()
+        return None
+
+    monitor = TranscriptMonitor(path, poll_interval=args.interval, detectors=[detector], watch=backend)
+    monitor._fwd_checked_at = float("inf")  # no USER_REMOTE lookups in the loop
+    thread = threading.Thread(target=monitor.run, daemon=True)
+    thread.start()
+    while monitor._watcher is None and thread.is_alive():
+        time.sleep(0.01)
+    time.sleep(0.2)
+
+    for n in range(args.appends):
+        seen.clear()
+        write_line(path, n)
+        seen.wait(args.interval * 3)
+        time.sleep(args.gap)
+
+    time.sleep(0.5)
+    wakeups = monitor._watcher.wakeups
+    cpu = time.process_time()
+    time.sleep(args.idle)
+    idle_cpu = time.process_time() - cpu
+    idle_wakeups = monitor._watcher.wakeups - wakeups
+
+    started = time.perf_counter()
+    monitor.stop()
+    thread.join()
+    stop = time.perf_counter() - started
+    tmpdir.cleanup()
+
+    latencies.sort()
+    return {
+        "backend": monitor.backend,
+        "detected": len(latencies),
+        "median_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "idle_cpu_ms": idle_cpu * 1000,
+        "idle_wakeups": idle_wakeups,
+        "stop_ms": stop * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appends", type=int, default=50, help="lines appended per backend (default: 50)")
+    parser.add_argument("--gap", type=float, default=0.05, help="seconds between appends (default: 0.05)")
+    parser.add_argument("--idle", type=float, default=10.0, help="idle window in seconds (default: 10)")
+    parser.add_argument("--interval", type=float, default=1.0, help="poll interval (default: 1.0)")
+    args = parser.parse_args()
+    os.environ["MACF_TRANSCRIPT_FTS"] = "0"  # measure the wake-up path only
+
+    print(f"{args.appends} appends, {args.gap}s apart; {args.idle}s idle; poll interval {args.interval}s")
+    print(f"  {'backend':<8} {'median':>9} {'p95':>9} {'max':>9} {'idle CPU':>9} {'wakeups':>8} {'stop':>9}")
+    for backend in ("inotify", "poll"):
+        try:
+            r = run_backend(backend, args)
+        except OSError as e:
+            print(f"  {backend:<8} unavailable: {e}")
+            continue
+        print(f"  {r['backend']:<8} {r['median_ms']:>7.2f}ms {r['p95_ms']:>7.2f}ms {r['max_ms']:>7.2f}ms "
+              f"{r['idle_cpu_ms']:>7.2f}ms {r['idle_wakeups']:>8} {r['stop_ms']:>7.2f}ms"
+              + ("" if r["detected"] == args.appends else f"  ({r['detected']}/{args.appends} seen)"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,10 +3,20 @@ macf - Multi-Agent Coordination Framework tools
 
 CLI tools for MacEff multi-agent environment framework.
 Homophonous standin for legacy MACF, easier to type.
+
+``__version__`` is resolved on first access: ``importlib.metadata`` costs
+tens of ms to import, and every hook run imports this package.
 """
-from importlib.metadata import version, PackageNotFoundError
 
-try:
-    __version__ = version("macf")
-except PackageNotFoundError:
-    __version__ = "0.0.0-unknown"
\ No newline at end of file
+
+def __getattr__(name):
+    if name == "__version__":
+        from importlib.metadata import version, PackageNotFoundError
+
+        try:
+            value = version("macf")
+        except PackageNotFoundError:
+            value = "0.0.0-unknown"
+        globals()["__version__"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
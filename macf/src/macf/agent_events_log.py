@@ -12,19 +12,39 @@ Format: JSONL (one JSON object per line)
 Schema: {timestamp, event, breadcrumb, data, hook_input}
 """
 
+import copy
 import fcntl
+import heapq
 import json
+import os
+import re
+import select
 import sys
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, Generator, Iterable, Iterator, List, Optional
 
 from .utils import (
     find_agent_home,
     get_breadcrumb,
     parse_breadcrumb,
 )
-from .utils.streaming import iter_lines_forward, iter_lines_reverse
+from .utils.context import notify_events_appended
+from .observability.tracing import span
+from .event_index import get_event_index, is_indexable_key
+from .event_segments import (
+    iter_log_lines,
+    iter_raw_lines,
+    iter_raw_lines_reverse,
+    load_manifest,
+    logical_size,
+    prefix_stamp,
+    roll_segment,
+    segment_may_match,
+    spawn_compaction,
+    stamp_is_prefix,
+)
 
 
 # Global log path override for testing
@@ -156,13 +176,231 @@ def elide_large_values(payload, threshold=ELIDE_THRESHOLD_BYTES,
     return payload
 
 
+#: Records up to this size go out under a shared lock (which excludes a
+#: segment roll, not other appenders); larger records, and batches, take it
+#: exclusively. POSIX promises atomic writes up to PIPE_BUF for pipes and
+#: FIFOs only. For a regular O_APPEND file, whole small writes not
+#: interleaving is what Linux local filesystems do, not a guarantee, and
+#: NFS and other network filesystems do not provide it. So shared-lock
+#: appends are used only where ``events.shared_lock_appends`` allows them
+#: (see ``_shared_appends_allowed``).
+ATOMIC_APPEND_BYTES = select.PIPE_BUF
+
+#: Filesystem types (``/proc/self/mountinfo``) whose small O_APPEND writes
+#: are known not to interleave; ``auto`` locks exclusively on any other.
+_LOCAL_FILESYSTEMS = frozenset({
+    "btrfs", "ext2", "ext3", "ext4", "f2fs", "overlay", "ramfs", "tmpfs", "xfs", "zfs",
+})
+
+# One O_APPEND descriptor per process, reopened after a roll, a fork, or a
+# change of log path. ``max_bytes`` (the size-bound roll threshold) and
+# ``shared`` (whether small records may use the shared lock) are resolved
+# once per descriptor so the hot path never reads config.json.
+_appender: Dict[str, Any] = {"path": None, "fd": None, "pid": None, "max_bytes": 0, "shared": False}
+
+# Per-process appender counters (see ``get_append_stats``).
+_append_stats: Dict[str, Any] = {
+    "records": 0,
+    "writes": 0,
+    "bytes_written": 0,
+    "exclusive_writes": 0,
+    "lock_waits": 0,
+    "lock_wait_seconds": 0.0,
+    "reopens": 0,
+}
+
+
+def get_append_stats() -> Dict[str, Any]:
+    """
+    Counters for this process's appender.
+
+    Returns:
+        Dict with records, writes (one per append_event/append_events call),
+        bytes_written, exclusive_writes (writes that needed the exclusive
+        lock), lock_waits / lock_wait_seconds (how often and how long a
+        writer blocked on the lock) and reopens of the log descriptor.
+    """
+    return dict(_append_stats)
+
+
+def _close_append_fd() -> None:
+    fd = _appender["fd"]
+    _appender.update(path=None, fd=None, pid=None)
+    if fd is not None:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _filesystem_type(fd: int) -> Optional[str]:
+    """Filesystem type holding ``fd``, from ``/proc/self/mountinfo`` (Linux only)."""
+    dev = os.fstat(fd).st_dev
+    wanted = f"{os.major(dev)}:{os.minor(dev)}"
+    try:
+        with open("/proc/self/mountinfo", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                fields, sep, rest = line.partition(" - ")
+                parts = fields.split()
+                if sep and len(parts) > 2 and parts[2] == wanted:
+                    return (rest.split() or [None])[0]
+    except OSError:
+        pass
+    return None
+
+
+def _shared_appends_allowed(fd: int) -> bool:
+    """Whether small records may be appended to ``fd`` under the shared lock.
+
+    ``events.shared_lock_appends``: ``auto`` (default) allows it on the
+    local filesystems in ``_LOCAL_FILESYSTEMS`` and falls back to the
+    exclusive lock anywhere else, including when the type is unknown;
+    true/false force it either way.
+    """
+    from .config import coerce_bool, resolve_setting
+
+    mode, _ = resolve_setting(
+        "MACF_EVENTS_SHARED_LOCK_APPENDS", "events.shared_lock_appends", "auto",
+    )
+    if str(mode).strip().lower() != "auto":
+        return coerce_bool(mode)
+    return _filesystem_type(fd) in _LOCAL_FILESYSTEMS
+
+
+def _append_fd(log_path: Path) -> int:
+    """This process's O_APPEND descriptor for ``log_path`` (opened on demand)."""
+    if (_appender["fd"] is not None and _appender["path"] == log_path
+            and _appender["pid"] == os.getpid()):
+        return _appender["fd"]
+
+    _close_append_fd()
+    from .config import resolve_setting
+
+    # Created 0600 up front: the log holds prompts and commands.
+    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    max_mb, _ = resolve_setting("MACF_EVENTS_SEGMENT_MAX_MB", "events.segment_max_mb", 64, int)
+    _appender.update(
+        path=log_path, fd=fd, pid=os.getpid(),
+        max_bytes=max(0, max_mb) * 1024 * 1024, shared=_shared_appends_allowed(fd),
+    )
+    _append_stats["reopens"] += 1
+    return fd
+
+
+def _lock(fd: int, mode: int) -> None:
+    """flock ``fd``, counting the time spent blocked behind other holders."""
+    try:
+        fcntl.flock(fd, mode | fcntl.LOCK_NB)
+        return
+    except BlockingIOError:
+        pass
+    started = time.perf_counter()
+    fcntl.flock(fd, mode)
+    _append_stats["lock_waits"] += 1
+    _append_stats["lock_wait_seconds"] += time.perf_counter() - started
+
+
+def _was_rolled(fd: int, log_path: Path) -> bool:
+    """True if ``fd`` no longer refers to the hot file at ``log_path``.
+
+    A writer holding a descriptor from before another writer rolled the log
+    points at the now-cold segment (or at a deleted file). Checked under the
+    lock, so the answer cannot change before the write lands.
+    """
+    try:
+        st = os.fstat(fd)
+        return st.st_nlink == 0 or st.st_ino != os.stat(log_path).st_ino
+    except FileNotFoundError:
+        return True
+
+
+def _write_records(log_path: Path, payload: bytes, events: List[str]) -> None:
+    """Append ``payload`` (whole JSONL lines) with a single ``os.write``."""
+    while True:
+        fd = _append_fd(log_path)
+        exclusive = not _appender["shared"] or len(payload) > ATOMIC_APPEND_BYTES
+        _lock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            rolled = _was_rolled(fd, log_path)
+            if not rolled:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+                end = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        if not rolled:
+            break
+        _close_append_fd()  # another writer rolled the file we hold
+
+    _append_stats["writes"] += 1
+    _append_stats["records"] += len(events)
+    _append_stats["bytes_written"] += len(payload)
+    if exclusive:
+        _append_stats["exclusive_writes"] += 1
+
+    _maybe_roll_segment(fd, log_path, end, events)
+
+
+def _maybe_roll_segment(fd: int, log_path: Path, size: int, events: List[str]) -> None:
+    """Roll the hot file into a cold segment when it is due.
+
+    Due when the hot file passes ``events.segment_max_mb``, or on
+    ``compaction_detected`` when ``events.segment_per_cycle`` is on (one
+    segment per cycle). Rolling takes the lock exclusively, so it waits for
+    in-flight shared-lock writers and none can land a record mid-roll.
+    Compression runs in a detached child after the lock is released, so
+    other writers only ever wait for the link and manifest update.
+    """
+    from .config import coerce_bool, resolve_setting
+
+    max_bytes = _appender["max_bytes"]
+    due = max_bytes > 0 and size >= max_bytes
+    if not due and "compaction_detected" in events:
+        per_cycle, _ = resolve_setting(
+            "MACF_EVENTS_SEGMENT_PER_CYCLE", "events.segment_per_cycle", False, coerce_bool,
+        )
+        due = bool(per_cycle)
+    if not due:
+        return
+
+    compression, _ = resolve_setting(
+        "MACF_EVENTS_SEGMENT_COMPRESSION", "events.segment_compression", "gzip",
+    )
+    entry = None
+    _lock(fd, fcntl.LOCK_EX)
+    try:
+        # Another writer may have rolled between our write and this lock.
+        if not _was_rolled(fd, log_path):
+            entry = roll_segment(log_path, compression=compression)
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    _close_append_fd()
+    if entry and entry.get("pending_compression"):
+        spawn_compaction(log_path)
+
+
+def _event_record(event: str, data: dict, hook_input: Optional[dict], breadcrumb: str) -> bytes:
+    return (json.dumps({
+        "timestamp": time.time(),
+        "event": event,
+        "breadcrumb": breadcrumb,
+        "data": data,
+        "hook_input": hook_input if hook_input is not None else {}
+    }) + '\n').encode()
+
+
 def append_event(
     event: str,
     data: dict,
     hook_input: Optional[dict] = None
 ) -> bool:
     """
-    Append event to log atomically with file locking.
+    Append event to log atomically.
+
+    The record goes out in one ``os.write`` on a per-process O_APPEND
+    descriptor; see ``ATOMIC_APPEND_BYTES`` for when that needs the
+    exclusive lock.
 
     Args:
         event: Event type (lowercase_underscore format)
@@ -176,35 +414,48 @@ def append_event(
         >>> append_event("session_started", {"session_id": "abc123", "cycle": 170})
         True
     """
+    return append_events([(event, data, hook_input)])
+
+
+@span("event_append")
+def append_events(events: List[tuple]) -> bool:
+    """
+    Append several events as one group commit.
+
+    All records are serialised first and written with a single ``os.write``
+    under one lock acquisition, so a batch costs about the same as a single
+    append. The offset index is left for readers to catch up.
+
+    Args:
+        events: ``(event, data)`` or ``(event, data, hook_input)`` tuples,
+            in the order they should appear in the log
+
+    Returns:
+        True if successful, False on failure
+
+    Example:
+        >>> append_events([("scope_added", {"task_ids": [7]}),
+        ...                ("scope_timer_set", {"timer_end_epoch": 1.7e9})])
+        True
+    """
+    if not events:
+        return True
     try:
         log_path = get_log_path()
 
         # Generate breadcrumb for forensic querying (cached for performance)
         breadcrumb = _get_cached_breadcrumb()
 
-        # Build event record
-        event_record = {
-            "timestamp": time.time(),
-            "event": event,
-            "breadcrumb": breadcrumb,
-            "data": data,
-            "hook_input": hook_input if hook_input is not None else {}
-        }
+        payload = b"".join(
+            _event_record(entry[0], entry[1], entry[2] if len(entry) > 2 else None, breadcrumb)
+            for entry in events
+        )
+        _write_records(log_path, payload, [entry[0] for entry in events])
+        notify_events_appended(entry[0] for entry in events)
 
-        # Atomic append with file locking
-        with open(log_path, 'a') as f:
-            # Acquire exclusive lock
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-            try:
-                f.write(json.dumps(event_record) + '\n')
-                f.flush()
-            finally:
-                # Release lock
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-
-        # Set permissions on first write
-        if log_path.stat().st_size == len(json.dumps(event_record)) + 1:
-            log_path.chmod(0o600)
+        # The offset index is not touched here: syncing it takes its
+        # exclusive lock and rewrites its meta, which would serialise every
+        # writer again. Readers catch it up lazily (get_event_index).
 
         return True
 
@@ -213,10 +464,117 @@ def append_event(
         return False
 
 
+#: append_event writes {"timestamp": <float>, "event": "<type>", ...}, so both
+#: keys can be read off the head of a line without decoding the rest. Lines
+#: written any other way simply don't match and are decoded in full.
+_LEADING_KEYS = re.compile(r'^\{"timestamp": ([0-9.eE+-]+), "event": "([^"\\]*)"')
+
+
+def _peek_event(line: str) -> Optional[tuple]:
+    """(timestamp, event_type) from the head of a raw line, or None."""
+    match = _LEADING_KEYS.match(line)
+    if match is None:
+        return None
+    try:
+        return float(match.group(1)), match.group(2)
+    except ValueError:
+        return None
+
+
+class RawEvent:
+    """
+    One event log line, decoded only as far as the caller looks.
+
+    ``event`` and ``timestamp`` come straight off the head of the line;
+    ``data``, ``hook_input`` and the rest are decoded on first access. Reads
+    like the event dict it stands for (``get``, ``[]``), so whole-log scans
+    that only count types or compare timestamps never pay for ``json.loads``.
+    A line whose head parses is yielded without validating the remainder;
+    if the remainder turns out to be malformed, it decodes to just its head.
+    """
+
+    __slots__ = ("line", "_head", "_record")
+
+    def __init__(self, line: str, head: Optional[tuple] = None):
+        self.line = line
+        self._head = head
+        self._record: Optional[dict] = None
+
+    @property
+    def record(self) -> dict:
+        """The fully decoded event dict (decoded once, then cached)."""
+        if self._record is None:
+            try:
+                self._record = json.loads(self.line)
+            except json.JSONDecodeError:
+                if self._head is None:
+                    raise
+                self._record = {"timestamp": self._head[0], "event": self._head[1]}
+        return self._record
+
+    @property
+    def event(self) -> Optional[str]:
+        return self._head[1] if self._head is not None else self.record.get("event")
+
+    @property
+    def timestamp(self) -> Any:
+        return self._head[0] if self._head is not None else self.record.get("timestamp")
+
+    @property
+    def data(self) -> dict:
+        return self.record.get("data", {})
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._head is not None and key in ("event", "timestamp"):
+            return self.event if key == "event" else self.timestamp
+        return self.record.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if self._head is not None and key in ("event", "timestamp"):
+            return self.get(key)
+        return self.record[key]
+
+
+def _in_time_range(timestamp: Any, since: Optional[float], until: Optional[float]) -> bool:
+    """Same bounds as ``_matches_filter``: strictly after since, before until."""
+    if not isinstance(timestamp, (int, float)):
+        timestamp = None
+    if since is not None and (timestamp if timestamp is not None else 0) <= since:
+        return False
+    if until is not None and (timestamp if timestamp is not None else float('inf')) >= until:
+        return False
+    return True
+
+
+def _time_window_lines(
+    log_path: Path,
+    since: Optional[float],
+    until: Optional[float],
+    reverse: bool,
+    segment_filter: Optional[Callable[[dict], bool]],
+) -> Optional[Iterator[str]]:
+    """Lines of the index's time window for ``(since, until)``, or None without an index."""
+    index = get_event_index(log_path)
+    if index is None:
+        return None
+    start, end = index.time_window(since, until)
+    iter_raw = iter_raw_lines_reverse if reverse else iter_raw_lines
+    return (
+        line.decode("utf-8", errors="replace")
+        for _, line in iter_raw(log_path, start, end, segment_filter)
+    )
+
+
 def read_events(
     limit: Optional[int] = None,
-    reverse: bool = True
-) -> Generator[dict, None, None]:
+    reverse: bool = True,
+    segment_filter: Optional[Callable[[dict], bool]] = None,
+    event_types: Optional[Iterable[str]] = None,
+    session_prefix: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    raw: bool = False,
+) -> Generator[Any, None, None]:
     """
     Read events from log (generator for memory efficiency).
 
@@ -224,32 +582,68 @@ def read_events(
     (seek-from-end, fixed-chunk) and the forward path uses
     ``iter_lines_forward`` (line-by-line). Neither materializes the full
     file, so memory is O(chunk_size + max_line_size) regardless of log size.
+    Rolled segments (see ``macf.event_segments``) are spanned transparently.
 
     Callers that only need the most recent N events SHOULD pass an explicit
     ``limit`` so the generator stops early. ``limit=None`` still works but
     will scan the whole file if no early break.
 
+    The ``event_types``/``session_prefix``/``since``/``until`` filters are
+    pushed down to the raw lines: the type and timestamp are read off the
+    head of each line and the session prefix is matched as a substring, so
+    lines that cannot match are dropped before ``json.loads``. The manifest
+    also prunes cold segments outside the type set or time range, and
+    ``since``/``until`` are bisected on the index's sparse time checkpoints
+    (see ``EventIndex.time_window``) so only the matching byte window is read.
+
     Args:
         limit: Maximum events to yield (None = all)
         reverse: If True, read from end (most recent first)
+        segment_filter: Optional predicate over a cold segment's manifest
+            entry; segments it rejects are skipped unread (see
+            ``event_segments.segment_may_match``)
+        event_types: Only yield events of these types
+        session_prefix: Only yield events whose ``data.session_id`` starts
+            with this prefix
+        since: Only yield events strictly after this timestamp
+        until: Only yield events strictly before this timestamp
+        raw: Yield ``RawEvent`` records that decode lazily instead of dicts
 
     Yields:
-        Event dictionaries
+        Event dictionaries (``RawEvent`` records when ``raw`` is True)
 
     Example:
         >>> for event in read_events(limit=10, reverse=True):
         ...     print(event["event"], event["timestamp"])
+        >>> for event in read_events(event_types=["mode_change"], since=t0):
+        ...     print(event["data"]["mode"])
     """
+    wanted = frozenset(event_types) if event_types is not None else None
+    timed = since is not None or until is not None
+    screened = wanted is not None or timed
+    filtered = screened or bool(session_prefix)
+
+    if screened:
+        outer_filter = segment_filter
+
+        def segment_filter(entry: dict) -> bool:
+            if outer_filter is not None and not outer_filter(entry):
+                return False
+            return segment_may_match(
+                entry, event_types=None if wanted is None else list(wanted), since=since, until=until,
+            )
+
     try:
         log_path = get_log_path()
 
-        if not log_path.exists():
+        if not log_path.exists() and not load_manifest(log_path):
             return
 
-        if reverse:
-            line_iter = iter_lines_reverse(log_path)
-        else:
-            line_iter = iter_lines_forward(log_path)
+        line_iter = None
+        if timed:
+            line_iter = _time_window_lines(log_path, since, until, reverse, segment_filter)
+        if line_iter is None:
+            line_iter = iter_log_lines(log_path, reverse=reverse, segment_filter=segment_filter)
 
         count = 0
         for line in line_iter:
@@ -257,8 +651,38 @@ def read_events(
             if not line:
                 continue
 
+            head = _peek_event(line) if (raw or screened) else None
+            if head is not None:
+                if wanted is not None and head[1] not in wanted:
+                    continue
+                if timed and not _in_time_range(head[0], since, until):
+                    continue
+            if session_prefix and session_prefix not in line:
+                continue
+
             try:
-                event = json.loads(line)
+                if raw and head is not None and not session_prefix:
+                    event = RawEvent(line, head)
+                else:
+                    event = json.loads(line)
+                    if filtered:
+                        if not isinstance(event, dict):
+                            continue
+                        if head is None and not (
+                            (wanted is None or event.get("event") in wanted)
+                            and _in_time_range(event.get("timestamp"), since, until)
+                        ):
+                            continue
+                        if session_prefix:
+                            data = event.get("data")
+                            session_id = data.get("session_id") if isinstance(data, dict) else None
+                            if not (isinstance(session_id, str) and session_id.startswith(session_prefix)):
+                                continue
+                    if raw:
+                        raw_event = RawEvent(line, head)
+                        raw_event._record = event
+                        event = raw_event
+
                 yield event
 
                 count += 1
@@ -274,6 +698,172 @@ def read_events(
         return
 
 
+def iter_events_of_type(*event_types: str) -> Generator[dict, None, None]:
+    """
+    Yield events of the given type(s), most recent first.
+
+    Served from the per-type byte-offset index (see ``macf.event_index``):
+    each record costs one seek and one ``json.loads`` regardless of how many
+    events of other types lie between them. Several types are merged by file
+    position, so the stream is in true log order across types. Falls back to
+    a reverse scan when the index is disabled or cannot be maintained —
+    results are the same either way, only the cost differs.
+
+    Args:
+        *event_types: Event types to yield (e.g. "state_snapshot")
+
+    Yields:
+        Event dictionaries of any of ``event_types``, newest-first
+
+    Example:
+        >>> latest = next(iter_events_of_type("mode_change"), None)
+        >>> for event in iter_events_of_type("cycle_correction", "compaction_detected"):
+        ...     print(event["event"])
+    """
+    log_path = get_log_path()
+    if not event_types or not log_path.exists():
+        return
+
+    wanted = set(event_types)
+    index = None
+    if all(is_indexable_key(event_type) for event_type in wanted):
+        index = get_event_index(log_path)
+
+    if index is not None:
+        streams = [index.iter_offsets_reverse("event", event_type) for event_type in wanted]
+        for offset in heapq.merge(*streams, reverse=True):
+            event = index.read_at(offset)
+            if event is not None and event.get("event") in wanted:
+                yield event
+        return
+
+    for event in read_events(limit=None, reverse=True):
+        if event.get("event") in wanted:
+            yield event
+
+
+@dataclass(frozen=True)
+class ScanQuery:
+    """
+    One question answered by ``scan_many``: the newest events matching it.
+
+    Attributes:
+        event_types: Only events of these types can match (None = any type).
+            Lets the scan skip unrelated lines without parsing them.
+        where: Optional extra predicate over a parsed event
+        limit: Only look at the ``limit`` most recent events of any type,
+            like ``read_events(limit=...)`` (None = whole log)
+        max_matches: The query is answered once this many events matched
+    """
+    event_types: Optional[FrozenSet[str]] = None
+    where: Optional[Callable[[dict], bool]] = None
+    limit: Optional[int] = None
+    max_matches: int = 1
+
+    def accepts(self, event: dict) -> bool:
+        if self.event_types is not None and event.get("event") not in self.event_types:
+            return False
+        return self.where is None or bool(self.where(event))
+
+
+def _scan_tokens(pending: Dict[str, ScanQuery]) -> Optional[List[str]]:
+    """Quoted type names a line must contain to interest any pending query."""
+    if any(query.event_types is None for query in pending.values()):
+        return None
+    return [f'"{t}"' for query in pending.values() for t in query.event_types]
+
+
+def scan_many(queries: Dict[str, ScanQuery]) -> Dict[str, List[dict]]:
+    """
+    Answer several "newest matching events" questions in one reverse pass.
+
+    A hook that asks N independent questions of the log tail used to make N
+    reverse scans, re-reading and re-parsing the same lines each time. Here
+    every line is read once, screened against the quoted type names any
+    still-open query wants, and parsed at most once. Each query stops on its
+    own ``limit`` or ``max_matches``; the pass ends as soon as all have.
+
+    When no query has a ``limit`` and all name their event types, the pass
+    walks the type index instead (see ``iter_events_of_type``), so rare types
+    cost a few seeks rather than a scan back to the start of the log.
+
+    Args:
+        queries: Query name -> ScanQuery
+
+    Returns:
+        Query name -> matching events, most recent first (possibly empty)
+
+    Example:
+        >>> found = scan_many({
+        ...     "work_mode": ScanQuery(frozenset({"work_mode_change"}), limit=50),
+        ...     "quiet": ScanQuery(frozenset({"mode_change"}), limit=50),
+        ... })
+        >>> found["work_mode"]
+        [{'event': 'work_mode_change', ...}]
+    """
+    results: Dict[str, List[dict]] = {name: [] for name in queries}
+    pending = {name: query for name, query in queries.items() if query.max_matches > 0}
+    if not pending:
+        return results
+
+    def offer(event: dict) -> None:
+        for name, query in list(pending.items()):
+            if query.accepts(event):
+                results[name].append(event)
+                if len(results[name]) >= query.max_matches:
+                    del pending[name]
+
+    tokens = _scan_tokens(pending)
+    if tokens is not None and all(query.limit is None for query in pending.values()):
+        wanted = set().union(*(query.event_types for query in pending.values()))
+        for event in iter_events_of_type(*wanted):
+            offer(event)
+            if not pending:
+                break
+        return results
+
+    try:
+        log_path = get_log_path()
+        if not log_path.exists() and not load_manifest(log_path):
+            return results
+
+        seen = 0
+        for line in iter_log_lines(log_path, reverse=True):
+            line = line.strip()
+            if not line:
+                continue
+            seen += 1
+            expired = [name for name, query in pending.items()
+                       if query.limit is not None and seen > query.limit]
+            if expired:
+                for name in expired:
+                    del pending[name]
+                if not pending:
+                    break
+                tokens = _scan_tokens(pending)
+
+            if tokens is not None and not any(t in line for t in tokens):
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(event, dict):
+                continue
+
+            before = len(pending)
+            offer(event)
+            if not pending:
+                break
+            if len(pending) != before:
+                tokens = _scan_tokens(pending)
+
+    except (OSError, IOError) as e:
+        print(f"⚠️ MACF: event log read failed: {e}", file=sys.stderr)
+
+    return results
+
+
 def _matches_filter(event: dict, filters: dict) -> bool:
     """
     Check if event matches filter specification.
@@ -358,6 +948,16 @@ def _matches_filter(event: dict, filters: dict) -> bool:
     return True
 
 
+def _synced_mirror():
+    """The SQLite mirror when ``events.sqlite_mirror`` is on, else None.
+
+    Imported lazily: hooks never query, so they never pay for sqlite3.
+    """
+    from .event_mirror import get_event_mirror
+
+    return get_event_mirror(get_log_path())
+
+
 def query_events(filters: dict) -> List[dict]:
     """
     Query events with forensic filters.
@@ -378,9 +978,26 @@ def query_events(filters: dict) -> List[dict]:
         >>> # Find events between timestamps
         >>> events = query_events({'breadcrumb': {'t_min': 1000, 't_max': 2000}})
     """
+    mirror = _synced_mirror()
+    if mirror is not None:
+        try:
+            return mirror.query(filters)
+        finally:
+            mirror.close()
+
     results = []
 
-    for event in read_events(limit=None, reverse=False):
+    # Push the cheap filters down so non-matching lines are never decoded;
+    # _matches_filter still has the final say on every survivor.
+    pushed = read_events(
+        limit=None,
+        reverse=False,
+        event_types=[filters['event_type']] if 'event_type' in filters else None,
+        session_prefix=filters.get('session_id'),
+        since=filters.get('since'),
+        until=filters.get('until'),
+    )
+    for event in pushed:
         if _matches_filter(event, filters):
             results.append(event)
 
@@ -420,6 +1037,13 @@ def query_set_operations(queries: List[dict], operation: str) -> List[dict]:
     if not queries:
         return []
 
+    mirror = _synced_mirror()
+    if mirror is not None:
+        try:
+            return mirror.set_operation(queries, operation)
+        finally:
+            mirror.close()
+
     # Execute all queries
     query_results = [set(json.dumps(e, sort_keys=True) for e in query_events(q)) for q in queries]
 
@@ -444,11 +1068,205 @@ def query_set_operations(queries: List[dict], operation: str) -> List[dict]:
     return results
 
 
+# =============================================================================
+# Projections - incremental, checkpointed folds over the log
+# =============================================================================
+
+@dataclass(frozen=True)
+class Projection:
+    """A registered reducer whose folded state is persisted with its offset.
+
+    Attributes:
+        name: Registry key and checkpoint file name.
+        initial: Returns a fresh state (JSON-serialisable) for an empty log.
+        reduce: ``reduce(state, event) -> state``; may mutate ``state``.
+        event_types: Event types the reducer cares about. Lines that cannot be
+            one of them are skipped before ``json.loads``. None = every event.
+        version: Bump when ``reduce`` changes meaning; stale checkpoints with a
+            different version are discarded and refolded from offset 0.
+    """
+    name: str
+    initial: Callable[[], Any]
+    reduce: Callable[[Any, dict], Any]
+    event_types: Optional[FrozenSet[str]] = None
+    version: int = 1
+
+
+_PROJECTIONS: Dict[str, Projection] = {}
+
+
+def register_projection(
+    name: str,
+    initial: Callable[[], Any],
+    event_types: Optional[List[str]] = None,
+    version: int = 1,
+) -> Callable[[Callable[[Any, dict], Any]], Callable[[Any, dict], Any]]:
+    """
+    Register a reducer as a named projection (decorator).
+
+    Args:
+        name: Unique projection name
+        initial: Factory for the empty-log state
+        event_types: Event types the reducer consumes (None = all)
+        version: Reducer semantics version (bump to force a refold)
+
+    Example:
+        >>> @register_projection("mode_changes", initial=lambda: 0,
+        ...                      event_types=["mode_change"])
+        ... def _count_mode_changes(state, event):
+        ...     return state + 1
+        >>> fold_projection("mode_changes")
+        3
+    """
+    def decorator(reduce: Callable[[Any, dict], Any]) -> Callable[[Any, dict], Any]:
+        _PROJECTIONS[name] = Projection(
+            name=name,
+            initial=initial,
+            reduce=reduce,
+            event_types=frozenset(event_types) if event_types is not None else None,
+            version=version,
+        )
+        return reduce
+    return decorator
+
+
+def get_projection_dir(log_path: Path) -> Path:
+    """Checkpoint directory for ``log_path`` (``<log>.proj`` beside the log)."""
+    return log_path.parent / (log_path.name + ".proj")
+
+
+def _load_checkpoint(projection: Projection, log_path: Path) -> Optional[dict]:
+    """Persisted checkpoint for ``projection`` if it still describes this log."""
+    path = get_projection_dir(log_path) / f"{projection.name}.json"
+    try:
+        with open(path, "r") as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ MACF: projection checkpoint unreadable ({projection.name}): {e}", file=sys.stderr)
+        return None
+    if not isinstance(checkpoint, dict) or checkpoint.get("version") != projection.version:
+        return None
+    if not stamp_is_prefix(checkpoint.get("stamp"), log_path):
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(projection: Projection, log_path: Path, state: Any, covered: int) -> None:
+    proj_dir = get_projection_dir(log_path)
+    proj_dir.mkdir(mode=0o700, exist_ok=True)
+    path = proj_dir / f"{projection.name}.json"
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({
+            "version": projection.version,
+            "stamp": prefix_stamp(log_path, covered),
+            "state": state,
+        }, f)
+    os.replace(tmp, path)
+
+
+def _fold_from(projection: Projection, log_path: Path, state: Any, offset: int):
+    """Fold complete lines from logical ``offset`` on. Returns (state, new_offset)."""
+    tokens = None
+    if projection.event_types is not None:
+        tokens = [f'"{t}"'.encode() for t in projection.event_types]
+
+    position = offset
+    for line_offset, line in iter_raw_lines(log_path, offset):
+        position = line_offset + len(line)
+        # Cheap byte-level screen: a line that does not even contain the
+        # quoted type name cannot be one of the wanted events.
+        if tokens is not None and not any(t in line for t in tokens):
+            continue
+        try:
+            event = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if not isinstance(event, dict):
+            continue
+        if projection.event_types is not None and event.get("event") not in projection.event_types:
+            continue
+        state = projection.reduce(state, event)
+    return state, position
+
+
+def fold_projection(name: str) -> Any:
+    """
+    Current state of a registered projection.
+
+    Loads the persisted checkpoint, folds only the bytes appended since the
+    offset it covers, and persists the result. Cost is proportional to new
+    events, not to the log's lifetime. A checkpoint that no longer matches
+    the log (truncated, replaced, rewritten) is discarded and the projection
+    refolds from the start, so the answer always equals a full fold.
+
+    Args:
+        name: Registered projection name
+
+    Returns:
+        The folded state (a private copy; callers may mutate it)
+
+    Raises:
+        KeyError: If no projection is registered under ``name``
+    """
+    projection = _PROJECTIONS[name]
+    log_path = get_log_path()
+    if not log_path.exists():
+        return projection.initial()
+
+    lock_path = get_projection_dir(log_path) / f"{name}.lock"
+    try:
+        lock_path.parent.mkdir(mode=0o700, exist_ok=True)
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                checkpoint = _load_checkpoint(projection, log_path)
+                if checkpoint is not None:
+                    state, offset = checkpoint["state"], checkpoint["stamp"]["covered"]
+                else:
+                    state, offset = projection.initial(), 0
+                state, covered = _fold_from(projection, log_path, state, offset)
+                if covered != offset or checkpoint is None:
+                    _save_checkpoint(projection, log_path, state, covered)
+                return copy.deepcopy(state)
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+    except OSError as e:
+        # Checkpoint storage unavailable - fold the whole log in memory.
+        print(f"⚠️ MACF: projection checkpoint failed ({name}), full fold: {e}", file=sys.stderr)
+        state, _ = _fold_from(projection, log_path, projection.initial(), 0)
+        return state
+
+
+def _initial_slow_state() -> dict:
+    return {"session_id": None, "cycle": None, "latest_timestamp": 0.0}
+
+
+@register_projection("slow_fields", initial=_initial_slow_state)
+def _reduce_slow_fields(state: dict, event: dict) -> dict:
+    """Slow-field tracking behind ``reconstruct_state_at`` / ``get_current_state``."""
+    event_data = event.get('data', {})
+    if not isinstance(event_data, dict):
+        event_data = {}
+    if 'session_id' in event_data:
+        state['session_id'] = event_data['session_id']
+    if 'cycle' in event_data:
+        state['cycle'] = event_data['cycle']
+    event_time = event.get('timestamp', 0)
+    if isinstance(event_time, (int, float)) and event_time > state['latest_timestamp']:
+        state['latest_timestamp'] = event_time
+    return state
+
+
 def reconstruct_state_at(timestamp: float) -> dict:
     """
     Reconstruct agent state at specific timestamp.
 
     Uses slow-field tracking to build state from events up to timestamp.
+    Only the records around the timestamp are read: the index's sparse time
+    checkpoints locate it by bisection, tolerating out-of-order timestamps.
 
     Args:
         timestamp: Unix epoch timestamp
@@ -460,13 +1278,43 @@ def reconstruct_state_at(timestamp: float) -> dict:
         >>> state = reconstruct_state_at(1500.0)
         >>> print(state["session_id"], state["cycle"])
     """
+    # Nothing in the log is newer than the timestamp: the checkpointed
+    # projection IS the state at that time, no scan needed.
+    projected = fold_projection("slow_fields")
+    if timestamp >= projected.pop("latest_timestamp"):
+        return projected
+
     state = {
         "session_id": None,
         "cycle": None,
     }
-
-    # Scan events up to timestamp
-    for event in read_events(limit=None, reverse=False):
+    log_path = get_log_path()
+
+    # Bisect the index's time checkpoints for the first record that may be
+    # newer than the timestamp. Everything before that cutoff is at or before
+    # it, so the fields it last set are found by reading backwards from there.
+    index = get_event_index(log_path)
+    cutoff = index.time_window(since=timestamp)[0] if index is not None else 0
+    if cutoff:
+        missing = set(state)
+        for _, line in iter_raw_lines_reverse(log_path, 0, cutoff):
+            if not any(f'"{field}"'.encode() in line for field in missing):
+                continue
+            event_data = _decoded_data(line)
+            for field in [f for f in missing if f in event_data]:
+                state[field] = event_data[field]
+                missing.discard(field)
+            if not missing:
+                break
+
+    # Scan forward from the cutoff up to the first newer event
+    for _, line in iter_raw_lines(log_path, cutoff):
+        try:
+            event = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if not isinstance(event, dict):
+            continue
         event_time = event.get('timestamp', 0)
 
         if event_time > timestamp:
@@ -474,6 +1322,8 @@ def reconstruct_state_at(timestamp: float) -> dict:
 
         # Update state with slow-changing fields from data
         event_data = event.get('data', {})
+        if not isinstance(event_data, dict):
+            continue
 
         if 'session_id' in event_data:
             state['session_id'] = event_data['session_id']
@@ -484,6 +1334,16 @@ def reconstruct_state_at(timestamp: float) -> dict:
     return state
 
 
+def _decoded_data(line: bytes) -> dict:
+    """The ``data`` dict of one raw log line ({} when absent or undecodable)."""
+    try:
+        event = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    data = event.get('data') if isinstance(event, dict) else None
+    return data if isinstance(data, dict) else {}
+
+
 def get_current_state() -> dict:
     """
     Get latest reconstructed state.
@@ -498,7 +1358,37 @@ def get_current_state() -> dict:
     return reconstruct_state_at(time.time())
 
 
-def tally_all_events() -> dict:
+def _snapshot_baseline(baseline: Optional[dict], log_path: Path) -> Optional[dict]:
+    """The tally state a previous ``state_snapshot`` event covers, or None if unusable.
+
+    Snapshots written before incremental tallies carry no ``covered_offset``
+    and cannot be extended; neither can one whose offset lies past the end
+    of the log (it was truncated or replaced since).
+    """
+    if not baseline:
+        return None
+    data = baseline.get("data")
+    if not isinstance(data, dict):
+        return None
+    metadata = data.get("snapshot_metadata")
+    tallies = data.get("event_tallies")
+    durations = data.get("accumulated_durations")
+    if not (isinstance(metadata, dict) and isinstance(tallies, dict) and isinstance(durations, dict)):
+        return None
+    covered = metadata.get("covered_offset")
+    if not isinstance(covered, int) or isinstance(covered, bool) or covered < 0:
+        return None
+    if covered > logical_size(log_path):
+        return None
+    return {
+        "event_tallies": dict(tallies),
+        "accumulated_durations": dict(durations),
+        "metadata": metadata,
+        "covered": covered,
+    }
+
+
+def tally_all_events(baseline: Optional[dict] = None) -> dict:
     """
     Scan event log and count ALL event types for snapshot baseline.
 
@@ -506,6 +1396,15 @@ def tally_all_events() -> dict:
     *_ended events, and captures metadata about the scan. Designed for
     future extensibility - new event types automatically included.
 
+    With a ``baseline`` (a previous ``state_snapshot`` event) the tallies
+    start from that snapshot's and only records past the offset it covered
+    are read, so the cost is proportional to the events since the snapshot,
+    not to the log's lifetime. A baseline that cannot be extended (no
+    ``covered_offset``, or past the end of the log) falls back to a full scan.
+
+    Args:
+        baseline: Optional previous ``state_snapshot`` event to extend
+
     Returns:
         {
             "event_tallies": {"session_started": 50, "dev_drv_ended": 148, ...},
@@ -517,14 +1416,20 @@ def tally_all_events() -> dict:
                 "events_scanned": 6500,
                 "earliest_timestamp": 1760000000.0,
                 "latest_timestamp": 1764719000.0,
-                "unique_event_types": 15
+                "unique_event_types": 15,
+                "covered_offset": 4812345,
+                "incremental": False
             }
         }
 
     Example:
         >>> tallies = tally_all_events()
         >>> print(f"Total sessions: {tallies['event_tallies'].get('session_started', 0)}")
+        >>> tallies = tally_all_events(baseline=get_latest_state_snapshot())
     """
+    log_path = get_log_path()
+    base = _snapshot_baseline(baseline, log_path)
+
     event_tallies: Dict[str, int] = {}
     accumulated_durations = {
         "total_dev_drv_duration_seconds": 0.0,
@@ -533,28 +1438,43 @@ def tally_all_events() -> dict:
     events_scanned = 0
     earliest_timestamp = float('inf')
     latest_timestamp = 0.0
-
-    for event in read_events(limit=None, reverse=False):
+    covered = 0
+
+    if base is not None:
+        event_tallies.update(base["event_tallies"])
+        accumulated_durations.update(base["accumulated_durations"])
+        metadata = base["metadata"]
+        events_scanned = metadata.get("events_scanned", 0)
+        earliest_timestamp = metadata.get("earliest_timestamp") or float('inf')
+        latest_timestamp = metadata.get("latest_timestamp", 0.0)
+        covered = base["covered"]
+
+    # Raw records: only *_ended events need their data decoded.
+    for offset, event in _iter_raw_events(log_path, covered):
+        covered = offset
+        if event is None:
+            continue
         events_scanned += 1
 
         # Track timestamps
-        event_time = event.get('timestamp', 0)
+        event_time = event.timestamp or 0
         if event_time > 0:
-            earliest_timestamp = min(earliest_timestamp, event_time)
-            latest_timestamp = max(latest_timestamp, event_time)
+            if event_time < earliest_timestamp:
+                earliest_timestamp = event_time
+            if event_time > latest_timestamp:
+                latest_timestamp = event_time
 
         # Count by event type
-        event_type = event.get('event', 'unknown')
+        event_type = event.event or 'unknown'
         event_tallies[event_type] = event_tallies.get(event_type, 0) + 1
 
         # Sum durations from *_ended events
-        event_data = event.get('data', {})
         if event_type == 'dev_drv_ended':
-            duration = event_data.get('duration_seconds', 0)
+            duration = event.get('data', {}).get('duration_seconds', 0)
             if isinstance(duration, (int, float)):
                 accumulated_durations['total_dev_drv_duration_seconds'] += duration
         elif event_type == 'deleg_drv_ended':
-            duration = event_data.get('duration_seconds', 0)
+            duration = event.get('data', {}).get('duration_seconds', 0)
             if isinstance(duration, (int, float)):
                 accumulated_durations['total_deleg_drv_duration_seconds'] += duration
 
@@ -570,10 +1490,42 @@ def tally_all_events() -> dict:
             "earliest_timestamp": earliest_timestamp,
             "latest_timestamp": latest_timestamp,
             "unique_event_types": len(event_tallies),
+            "covered_offset": covered,
+            "incremental": base is not None,
         }
     }
 
 
+def _iter_raw_events(log_path: Path, start: int) -> Generator[tuple, None, None]:
+    """Yield ``(end_offset, RawEvent or None)`` for complete lines from ``start``.
+
+    ``end_offset`` is where the next line begins; blank and malformed lines
+    yield None so callers still see how far the log was read.
+    """
+    if not log_path.exists() and not load_manifest(log_path):
+        return
+    try:
+        for offset, raw_line in iter_raw_lines(log_path, start):
+            end = offset + len(raw_line)
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            head = _peek_event(line) if line else None
+            if head is not None:
+                yield end, RawEvent(line, head)
+                continue
+            try:
+                record = json.loads(line) if line else None
+            except json.JSONDecodeError:
+                record = None
+            if not isinstance(record, dict):
+                yield end, None
+                continue
+            event = RawEvent(line, None)
+            event._record = record
+            yield end, event
+    except OSError as e:
+        print(f"⚠️ MACF: event log read failed: {e}", file=sys.stderr)
+
+
 def emit_state_snapshot(
     session_id: str,
     snapshot_type: str,
@@ -587,9 +1539,14 @@ def emit_state_snapshot(
     events after snapshot = accurate total. Enables safe migration from mutable
     state files to event-first queries without losing historical data.
 
+    Tallies are built from the previous snapshot plus the records appended
+    after the offset it covered, so emitting one costs the same on a young
+    log and on one that has grown for years.
+
     Args:
         session_id: Current session identifier
         snapshot_type: "initialization" | "compaction_recovery" | "manual"
+            | "periodic" | "pre_compact"
         source: "state_files" | "event_log_scan" | "command_line"
         state_file_values: Optional dict with values from state files to merge
             {
@@ -613,8 +1570,9 @@ def emit_state_snapshot(
         ... )
         True
     """
-    # Tally all events in the log
-    tallies = tally_all_events()
+    # Tally the log: previous snapshot + events since the offset it covered
+    baseline = next(iter_events_of_type("state_snapshot"), None)
+    tallies = tally_all_events(baseline=baseline)
 
     # Merge state file values for historical data predating the log
     derived_values = {}
@@ -639,11 +1597,15 @@ def emit_state_snapshot(
             current_state['auto_mode_source'] = state_file_values['auto_mode_source']
 
         if 'compaction_count' in state_file_values:
-            # Override event tally with state file value if higher (historical data)
-            event_count = tallies['event_tallies'].get('compaction_detected', 0)
-            state_count = state_file_values['compaction_count']
-            if state_count > event_count:
-                tallies['event_tallies']['compaction_detected'] = state_count
+            # Kept apart from the event tallies, which later snapshots extend
+            # incrementally; readers take the higher of the two.
+            derived_values['compaction_count'] = state_file_values['compaction_count']
+
+    if 'compaction_count' not in derived_values and baseline is not None:
+        # The state-file count still stands until a state file says otherwise
+        carried = baseline.get("data", {}).get("derived_values", {}).get("compaction_count")
+        if carried is not None:
+            derived_values['compaction_count'] = carried
 
     # Build snapshot data
     snapshot_data = {
@@ -661,13 +1623,84 @@ def emit_state_snapshot(
     return append_event("state_snapshot", snapshot_data)
 
 
+#: Triggers accepted by ``maybe_emit_state_snapshot``.
+SNAPSHOT_TRIGGERS = ("events", "pre_compact")
+
+
+def maybe_emit_state_snapshot(session_id: str, trigger: str = "events") -> bool:
+    """
+    Emit a ``state_snapshot`` if the snapshot cadence policy calls for one.
+
+    Keeps a recent baseline under the snapshot-reading queries
+    (``get_dev_drv_stats_from_events``, ``get_compaction_count_from_events``)
+    so their incremental scans stay short. Snapshots are incremental (see
+    ``emit_state_snapshot``), so the policy only bounds how far behind the
+    latest one may fall. Cycle boundaries are already covered: SessionStart
+    emits a ``compaction_recovery`` snapshot on every compaction.
+
+    Policy (env > ``.maceff/config.json`` > default):
+        - ``events.snapshot_every`` / ``MACF_EVENTS_SNAPSHOT_EVERY``: emit once
+          this many events were logged since the latest snapshot (0 = never)
+        - ``events.snapshot_on_pre_compact`` /
+          ``MACF_EVENTS_SNAPSHOT_ON_PRE_COMPACT``: emit right before compaction
+
+    Args:
+        session_id: Current session identifier
+        trigger: "events" (cheap check, call as often as convenient) or
+            "pre_compact"
+
+    Returns:
+        True if a snapshot was emitted
+
+    Raises:
+        ValueError: If ``trigger`` is not one of ``SNAPSHOT_TRIGGERS``
+    """
+    from .config import coerce_bool, resolve_setting
+
+    if trigger not in SNAPSHOT_TRIGGERS:
+        raise ValueError(f"unknown snapshot trigger: {trigger!r}")
+
+    if trigger == "pre_compact":
+        enabled, _ = resolve_setting(
+            "MACF_EVENTS_SNAPSHOT_ON_PRE_COMPACT", "events.snapshot_on_pre_compact", True, coerce_bool,
+        )
+        if not enabled:
+            return False
+        return emit_state_snapshot(session_id, snapshot_type="pre_compact", source="events")
+
+    every, _ = resolve_setting("MACF_EVENTS_SNAPSHOT_EVERY", "events.snapshot_every", 5000, int)
+    if every <= 0:
+        return False
+    index = get_event_index(get_log_path())
+    if index is None:
+        return False
+    latest = next(iter_events_of_type("state_snapshot"), None)
+    scanned = 0
+    if latest is not None:
+        metadata = latest.get("data", {}).get("snapshot_metadata", {})
+        scanned = metadata.get("events_scanned", 0) if isinstance(metadata, dict) else 0
+    if index.records() - scanned < every:
+        return False
+    return emit_state_snapshot(session_id, snapshot_type="periodic", source="events")
+
 __all__ = [
     "append_event",
+    "append_events",
+    "get_append_stats",
     "read_events",
+    "RawEvent",
+    "iter_events_of_type",
+    "scan_many",
+    "ScanQuery",
+    "register_projection",
+    "fold_projection",
+    "Projection",
     "query_events",
     "query_set_operations",
     "reconstruct_state_at",
     "get_current_state",
     "tally_all_events",
     "emit_state_snapshot",
+    "maybe_emit_state_snapshot",
+    "SNAPSHOT_TRIGGERS",
 ]
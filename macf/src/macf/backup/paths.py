@@ -147,12 +147,15 @@ def _collect_recent_transcripts(
     transcripts_dir: Path,
     days: int
 ) -> List[BackupSource]:
-    """Collect only transcripts modified within N days."""
+    """Collect only transcripts modified within N days (raw or archived)."""
+    from ..utils.transcript_archive import ARCHIVE_SUFFIX
+
     sources = []
     cutoff = datetime.now() - timedelta(days=days)
     cutoff_ts = cutoff.timestamp()
 
-    for jsonl_file in transcripts_dir.glob("*.jsonl"):
+    jsonl_files = [*transcripts_dir.glob("*.jsonl"), *transcripts_dir.glob(f"*.jsonl{ARCHIVE_SUFFIX}")]
+    for jsonl_file in sorted(jsonl_files):
         if jsonl_file.stat().st_mtime >= cutoff_ts:
             sources.append(BackupSource(
                 source_path=jsonl_file,
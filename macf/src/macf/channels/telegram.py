@@ -19,17 +19,15 @@ to emit it via :func:`macf.observability.emit_warning`.
 import io
 import json
 import os
-import ssl
 import sys
 import threading
-import urllib.error
-import urllib.request
 import urllib.parse
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple
 
 from ..observability import Warning, emit_warning
+from ..observability.tracing import span
 
 
 class _UrlopenWallTimeout(TimeoutError):
@@ -46,9 +44,11 @@ class _UrlopenWallTimeout(TimeoutError):
 # Network exception family that maps to recoverable / user-actionable
 # warnings. Anything outside this family is a logic error and is allowed
 # to propagate so the caller's exception handler sees it as a real bug.
+# urllib.error.URLError and ssl.SSLError are both OSError subclasses, so
+# naming OSError covers them without importing ssl/urllib.request up front:
+# the Stop hook imports this module on every turn, configured or not, and
+# those two cost more than the rest of the hook's imports.
 NETWORK_EXCEPTIONS = (
-    urllib.error.URLError,
-    ssl.SSLError,
     OSError,
     TimeoutError,
 )
@@ -81,6 +81,8 @@ def _urlopen_with_walltime(req_or_url, data=None, *, timeout=5, wall_timeout=10)
         Anything ``urlopen`` would have raised, plus
         :class:`_UrlopenWallTimeout` if the wall-clock fallback fires.
     """
+    import urllib.request
+
     result = [None]
     exc: list = [None]
 
@@ -204,6 +206,9 @@ def _classify_network_exception(e: BaseException) -> Tuple[str, str, str]:
     Falls back to a generic ``"network_error"`` kind when the exception
     doesn't match a more specific case.
     """
+    import ssl
+    import urllib.error
+
     # HTTPError is the most informative — has .code with HTTP status.
     if isinstance(e, urllib.error.HTTPError):
         code = e.code
@@ -286,6 +291,7 @@ def _build_network_warning(e: BaseException, page: int, total: int) -> Warning:
     )
 
 
+@span("notification")
 def send_telegram_notification(text: str, prefix: str = "",
                                page_size: int = 4000,
                                parse_mode: Optional[str] = None) -> NotifyResult:
@@ -419,6 +425,8 @@ def send_telegram_document(content: str, filename: str,
     # Closing boundary
     body.write(f'--{boundary}--\r\n'.encode())
 
+    import urllib.request
+
     req = urllib.request.Request(
         url,
         data=body.getvalue(),
@@ -883,10 +883,17 @@ def cmd_hook_install(args: argparse.Namespace) -> int:
         import macf.hooks as hooks_package
         package_hooks_dir = Path(hooks_package.__file__).parent
 
-        # Create symlinks to handler modules
+        # Create symlinks to handler modules. With --server every script
+        # links to the stdlib-only launcher instead, which forwards the run
+        # to the warm hook server (macf.hooks.server) and falls back to the
+        # handler in-process when no server is up.
+        use_server = getattr(args, 'server', False)
         for script_name, handler_module in hooks_to_install:
             hook_script = hooks_dir / script_name
-            handler_path = package_hooks_dir / f"{handler_module}.py"
+            if use_server:
+                handler_path = package_hooks_dir / "client.py"
+            else:
+                handler_path = package_hooks_dir / f"{handler_module}.py"
 
             # Remove existing file/symlink if present
             if hook_script.exists() or hook_script.is_symlink():
@@ -901,6 +908,8 @@ def cmd_hook_install(args: argparse.Namespace) -> int:
             print(f"   Mode: {mode}")
             print(f"   Directory: {hooks_dir}")
             print(f"   Settings: {settings_file}")
+            if use_server:
+                print(f"   Runner: warm hook server (started by SessionStart)")
             print(f"\n   Hooks installed:")
             for script_name, _ in hooks_to_install:
                 print(f"   - {script_name}")
@@ -1194,6 +1203,133 @@ def cmd_hook_logs(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_hook_server(args: argparse.Namespace) -> int:
+    """Start, stop, or report the warm hook server for this project."""
+    from .hooks import server
+
+    action = args.server_cmd or "status"
+    if action == "start":
+        if getattr(args, "foreground", False):
+            return server.serve()
+        if server.ensure_server_running():
+            print(f"Hook server starting on {server.socket_path()}")
+        else:
+            print(f"Hook server already running on {server.socket_path()}")
+        return 0
+    if action == "stop":
+        if server.stop():
+            print("Hook server stopped")
+        else:
+            print("No hook server running")
+        return 0
+
+    info = server.status()
+    if getattr(args, "json_output", False):
+        print(json.dumps(info, indent=2))
+        return 0 if info else 1
+    if info is None:
+        print(f"No hook server running on {server.socket_path()}")
+        return 1
+    uptime = time.time() - info["started"]
+    print(f"Hook server running (pid {info['pid']})")
+    print(f"  Socket: {info['path']}")
+    print(f"  Uptime: {uptime:.0f}s")
+    print(f"  Hook runs served: {info['served']}")
+    print(f"  Handlers: {len(info['handlers'])}")
+    return 0
+
+
+def cmd_hook_bench(args: argparse.Namespace) -> int:
+    """Benchmark every hook against a production-scale fixture agent home."""
+    import shutil
+    import tempfile
+    from .hooks import bench
+
+    fast_path = None
+    if args.fast_path is not None:
+        from .hooks.fast_path import SUGGESTED_FAST_PATH_TOOLS
+        fast_path = [t.strip() for t in args.fast_path.split(",") if t.strip()] or list(SUGGESTED_FAST_PATH_TOOLS)
+
+    hooks = None
+    if args.hook:
+        hooks = [bench.resolve_hook(name) or bench.resolve_hook(f"handle_{name}") for name in args.hook]
+        unknown = [name for name, hook in zip(args.hook, hooks) if hook is None]
+        if unknown:
+            print(f"Unknown hook(s): {', '.join(unknown)}", file=sys.stderr)
+            return 2
+
+    root = Path(args.fixture_dir) if args.fixture_dir else Path(tempfile.mkdtemp(prefix="macf_bench_"))
+    try:
+        if not args.json_output:
+            print(f"Building fixture in {root} ({args.events} events, "
+                  f"{args.transcript_messages} transcript messages, {args.tasks} tasks)...")
+        fixture = bench.build_fixture(
+            root, events=args.events,
+            transcript_messages=args.transcript_messages, tasks=args.tasks,
+        )
+        payloads = bench.synthetic_payloads(fixture)
+        recorded = {}
+        if args.record_from_log:
+            recorded = bench.record_payloads(Path(args.record_from_log))
+        if args.payloads:
+            recorded.update(bench.load_payloads(Path(args.payloads)))
+        for hook, items in recorded.items():
+            payloads[hook] = [bench.retarget_payload(p, fixture) for p in items]
+
+        report = bench.bench(
+            fixture, payloads, hooks=hooks,
+            iterations=args.iterations, warmup=args.warmup, syscalls=not args.no_syscalls,
+            fast_path=fast_path,
+        )
+    finally:
+        if not args.fixture_dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    regressions = []
+    if args.baseline:
+        try:
+            baseline = json.loads(Path(args.baseline).read_text())
+        except (OSError, ValueError) as e:
+            print(f"Cannot read baseline {args.baseline}: {e}", file=sys.stderr)
+            return 2
+        regressions = bench.compare(report, baseline, tolerance=args.tolerance)
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.json_output:
+        print(json.dumps({**report, "regressions": regressions}, indent=2))
+    else:
+        print(bench.format_report(report, regressions))
+        if args.save_baseline:
+            print(f"Baseline saved to {args.save_baseline}")
+    failed = any(m["failures"] for m in report["hooks"].values())
+    return 1 if regressions or failed else 0
+
+
+def cmd_hook_profile(args: argparse.Namespace) -> int:
+    """Aggregate hook phase traces into per-phase latency tables."""
+    from .hooks import bench, profile
+
+    hooks = None
+    if args.hook:
+        hooks = [bench.resolve_hook(name) or bench.resolve_hook(f"handle_{name}") or name for name in args.hook]
+
+    files = profile.find_trace_files(Path(args.root), session=args.session, agent=args.agent)
+    records = profile.load_traces(files, hooks=hooks, since=profile.since_hours(args.since))
+
+    if args.folded:
+        print(profile.format_folded(profile.folded_stacks(records)))
+        return 0
+
+    summary = profile.aggregate(records)
+    if args.json_output:
+        print(json.dumps({"trace_files": len(files), "hooks": summary}, indent=2))
+    else:
+        print(profile.format_profile(summary, top=args.top, flame=not args.no_flame))
+    return 0
+
+
 def cmd_hook_status(args: argparse.Namespace) -> int:
     """Display current hook sidecar states."""
     from .hooks.sidecar import read_sidecar
@@ -3954,6 +4090,14 @@ def cmd_events_query(args: argparse.Namespace) -> int:
         if hasattr(args, 'before') and args.before:
             filters['until'] = float(args.before)
 
+        if getattr(args, 'since', None):
+            from .eventlog import parse_since
+            threshold = parse_since(args.since)
+            if threshold is None:
+                print(f"❌ Invalid --since window: {args.since} (use e.g. 30m, 1h, 7d)")
+                return 1
+            filters['since'] = max(filters.get('since', 0.0), threshold.timestamp())
+
         # Execute query
         results = query_events(filters)
 
@@ -4073,13 +4217,24 @@ def cmd_events_query_set(args: argparse.Namespace) -> int:
 
 def cmd_events_sessions_list(args: argparse.Namespace) -> int:
     """List all sessions from events log."""
-    from .agent_events_log import read_events
+    from .agent_events_log import get_log_path, read_events
+    from .event_mirror import get_event_mirror
 
     try:
         # Collect unique sessions
         sessions = {}
 
-        for event in read_events(limit=None, reverse=False):
+        mirror = get_event_mirror(get_log_path())
+        if mirror is not None:
+            try:
+                sessions = {row.pop('session_id'): row for row in mirror.sessions()}
+            finally:
+                mirror.close()
+            events = []
+        else:
+            events = read_events(limit=None, reverse=False)
+
+        for event in events:
             data = event.get('data', {})
             session_id = data.get('session_id')
 
@@ -4119,7 +4274,7 @@ def cmd_events_stats(args: argparse.Namespace) -> int:
         # Count events by type
         event_counts = {}
 
-        for event in read_events(limit=None, reverse=False):
+        for event in read_events(limit=None, reverse=False, raw=True):
             event_type = event.get('event', 'unknown')
             event_counts[event_type] = event_counts.get(event_type, 0) + 1
 
@@ -4151,17 +4306,17 @@ def cmd_events_gaps(args: argparse.Namespace) -> int:
         print(f"Time Gap Analysis (threshold: {threshold}s)")
         print("=" * 50)
 
-        events = list(read_events(limit=None, reverse=False))
-
-        if len(events) < 2:
-            print("Not enough events for gap analysis")
-            return 0
-
+        # Only timestamps and types are needed: stream raw records and
+        # never decode event payloads.
+        events_seen = 0
         gaps_found = 0
+        prev_event = None
 
-        for i in range(1, len(events)):
-            prev_event = events[i - 1]
-            curr_event = events[i]
+        for curr_event in read_events(limit=None, reverse=False, raw=True):
+            events_seen += 1
+            if prev_event is None:
+                prev_event = curr_event
+                continue
 
             prev_time = prev_event.get('timestamp', 0)
             curr_time = curr_event.get('timestamp', 0)
@@ -4180,6 +4335,12 @@ def cmd_events_gaps(args: argparse.Namespace) -> int:
                 print(f"  To:   {curr_dt.strftime('%Y-%m-%d %H:%M:%S')} ({curr_event.get('event')})")
                 print()
 
+            prev_event = curr_event
+
+        if events_seen < 2:
+            print("Not enough events for gap analysis")
+            return 0
+
         if gaps_found == 0:
             print("No significant gaps detected")
 
@@ -4190,6 +4351,115 @@ def cmd_events_gaps(args: argparse.Namespace) -> int:
         return 1
 
 
+def cmd_events_segments(args: argparse.Namespace) -> int:
+    """List rolled event log segments from the segment manifest."""
+    from .agent_events_log import get_log_path
+    from .event_segments import active_base, load_manifest
+
+    log_path = get_log_path()
+    segments = load_manifest(log_path)
+
+    if getattr(args, 'json_output', False):
+        print(json.dumps({"log": str(log_path), "segments": segments}, indent=2))
+        return 0
+
+    print(f"Event Log Segments: {len(segments)} cold")
+    print("=" * 50)
+    for entry in segments:
+        lo, hi = entry.get("min_timestamp"), entry.get("max_timestamp")
+        span = "empty"
+        if lo is not None and hi is not None:
+            span = (
+                f"{datetime.fromtimestamp(lo, tz=_pick_tz()).strftime('%Y-%m-%d %H:%M')} → "
+                f"{datetime.fromtimestamp(hi, tz=_pick_tz()).strftime('%Y-%m-%d %H:%M')}"
+            )
+        size_mb = (entry["last_offset"] - entry["first_offset"]) / (1024 * 1024)
+        print(f"#{entry['seq']:<4} {entry['file']:<20} {entry['records']:>8} events "
+              f"{size_mb:>8.1f} MB  {span}")
+
+    hot_bytes = log_path.stat().st_size if log_path.exists() else 0
+    print(f"hot  {log_path.name:<20} offset {active_base(log_path, segments)} "
+          f"+ {hot_bytes / (1024 * 1024):.1f} MB")
+    return 0
+
+
+def cmd_events_roll(args: argparse.Namespace) -> int:
+    """Roll the hot event log into a compressed segment now."""
+    import fcntl
+    from .agent_events_log import get_log_path
+    from .config import resolve_setting
+    from .event_segments import compact_segments, roll_segment
+
+    log_path = get_log_path()
+    if not log_path.exists():
+        print(f"❌ Event log not found: {log_path}")
+        return 1
+
+    compression = getattr(args, 'compression', None)
+    if not compression:
+        compression, _ = resolve_setting(
+            "MACF_EVENTS_SEGMENT_COMPRESSION", "events.segment_compression", "gzip",
+        )
+
+    # Same lock append_event takes, so no record lands in the file mid-roll
+    with open(log_path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            entry = roll_segment(log_path, compression=compression)
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    if entry is None:
+        print("Hot event log is empty — nothing to roll")
+        return 0
+    # Compress after releasing the lock, like the append path does
+    packed = {e['seq']: e for e in compact_segments(log_path)}
+    entry = packed.get(entry['seq'], entry)
+    print(f"✅ Rolled {entry['records']} events into segment #{entry['seq']} ({entry['file']})")
+    return 0
+
+
+def cmd_events_compact(args: argparse.Namespace) -> int:
+    """Compress rolled segments still waiting for compression."""
+    from .agent_events_log import get_log_path
+    from .event_segments import compact_segments
+
+    log_path = get_log_path()
+    packed = compact_segments(log_path)
+    if not packed:
+        print("No segments waiting for compression")
+        return 0
+    for entry in packed:
+        print(f"✅ Compressed segment #{entry['seq']} ({entry['file']})")
+    return 0
+
+
+def cmd_events_mirror(args: argparse.Namespace) -> int:
+    """Build or refresh the SQLite mirror of the event log."""
+    from .agent_events_log import get_log_path
+    from .event_mirror import EventMirror, mirror_enabled
+
+    log_path = get_log_path()
+    if not log_path.exists():
+        print(f"❌ Event log not found: {log_path}")
+        return 1
+
+    mirror = EventMirror(log_path)
+    try:
+        ok = mirror.rebuild() if getattr(args, 'rebuild', False) else mirror.sync()
+        if not ok:
+            print("❌ Event mirror could not be synced (see warning above)")
+            return 1
+        print(f"✅ Mirrored {mirror.count()} events into {mirror.db_path}")
+    finally:
+        mirror.close()
+
+    if not mirror_enabled():
+        print("   Queries use it once events.sqlite_mirror is on "
+              "(MACF_EVENTS_SQLITE_MIRROR=1 or .maceff/config.json)")
+    return 0
+
+
 def cmd_task_list(args: argparse.Namespace) -> int:
     """List tasks from current session with hierarchy and metadata."""
     from .task import TaskReader, MacfTask
@@ -9028,21 +9298,41 @@ def cmd_search_service_status(args: argparse.Namespace) -> int:
 
 def cmd_transcripts_search(args: argparse.Namespace) -> int:
     """Search transcripts by breadcrumb with context window."""
-    from .forensics.transcript_search import search_by_breadcrumb, search_all_transcripts
+    from .forensics.transcript_search import SearchStats, search_by_breadcrumb, search_all_transcripts
     import json as json_lib
+    import time
+
+    if args.text is not None:
+        return _transcripts_search_text(args)
+    if not args.breadcrumb:
+        print("❌ Give a breadcrumb, or --text QUERY for a full-text search")
+        return 2
 
     breadcrumb = args.breadcrumb
     before = args.before
     after = args.after
     output_format = args.format
 
+    stats = SearchStats()
+    started = time.perf_counter()
     if args.search_all:
-        window = search_all_transcripts(breadcrumb, before, after)
+        window = search_all_transcripts(breadcrumb, before, after, workers=args.workers, stats=stats)
     else:
         window = search_by_breadcrumb(breadcrumb, before, after)
+        stats.elapsed_ms = (time.perf_counter() - started) * 1000
+
+    timing = None
+    if args.timing:
+        timing = f"⏱️  {stats.elapsed_ms:.1f} ms"
+        if args.search_all:
+            timing += (f" — {stats.scanned}/{stats.files} transcripts scanned "
+                       f"({stats.bytes_scanned / 1e6:.1f} MB), {stats.candidates} candidate(s), "
+                       f"{stats.workers} worker(s)")
 
     if not window:
         print(f"❌ Breadcrumb not found: {breadcrumb}")
+        if timing:
+            print(timing)
         return 1
 
     if output_format == "json":
@@ -9055,6 +9345,15 @@ def cmd_transcripts_search(args: argparse.Namespace) -> int:
             "target": {"index": window.target_message.index, "role": window.target_message.role, "content": window.target_message.content},
             "after": [{"index": m.index, "role": m.role, "content": m.content} for m in window.after],
         }
+        if args.timing:
+            result["timing"] = {
+                "elapsed_ms": round(stats.elapsed_ms, 1),
+                "files": stats.files,
+                "scanned": stats.scanned,
+                "bytes_scanned": stats.bytes_scanned,
+                "candidates": stats.candidates,
+                "workers": stats.workers,
+            }
         print(json_lib.dumps(result, indent=2))
     elif output_format == "compact":
         print(f"📍 Found at index {window.target_index}/{window.total_messages} in {window.transcript_path}")
@@ -9083,9 +9382,146 @@ def cmd_transcripts_search(args: argparse.Namespace) -> int:
             print(msg.content)
             print()
 
+    if timing and output_format != "json":
+        print(timing)
     return 0
 
 
+def _transcripts_search_text(args: argparse.Namespace) -> int:
+    """Ranked full-text search over the transcript FTS index."""
+    from .forensics.transcript_fts import TranscriptFTS, fts_available
+    import json as json_lib
+    import sqlite3
+    import time
+
+    if not fts_available():
+        print("❌ This Python's SQLite lacks FTS5; full-text search unavailable")
+        return 1
+
+    fts = TranscriptFTS()
+    started = time.perf_counter()
+    try:
+        hits = fts.search(args.text, limit=args.limit, session=args.session, raw=args.raw)
+    except sqlite3.OperationalError as e:
+        print(f"❌ Invalid full-text query: {e}")
+        return 2
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.format == "json":
+        result = {"query": args.text, "hits": [vars(hit) for hit in hits]}
+        if args.timing:
+            result["timing"] = {"elapsed_ms": round(elapsed_ms, 1)}
+        print(json_lib.dumps(result, indent=2))
+        return 0 if hits else 1
+
+    if not hits:
+        print(f"❌ No matches for: {args.text}")
+        if not fts.db_path.exists():
+            print("   (index is empty — run: macf_tools transcripts index)")
+    for n, hit in enumerate(hits, 1):
+        role_emoji = "👤" if hit.role == "user" else "🤖"
+        if args.format == "compact":
+            print(f"{n:>3}. {hit.breadcrumb} {role_emoji} {hit.snippet.replace(chr(10), ' ')}")
+            continue
+        print(f"{n:>3}. {role_emoji} {hit.breadcrumb}  (score {hit.score})")
+        print(f"     {hit.timestamp}  {hit.path}:{hit.line + 1}")
+        print(f"     {hit.snippet.replace(chr(10), ' ')}")
+    if args.timing:
+        print(f"⏱️  {elapsed_ms:.1f} ms")
+    return 0 if hits else 1
+
+
+def cmd_transcripts_index(args: argparse.Namespace) -> int:
+    """Bring the transcript full-text index up to date."""
+    from .forensics.transcript_fts import TranscriptFTS, fts_available
+    import json as json_lib
+
+    if not fts_available():
+        print("❌ This Python's SQLite lacks FTS5; full-text index unavailable")
+        return 1
+
+    fts = TranscriptFTS()
+    summary = fts.ingest(args.paths or None)
+    summary["database"] = str(fts.db_path)
+
+    if args.json_output:
+        print(json_lib.dumps(summary, indent=2))
+    else:
+        print(f"🔎 Indexed {summary['messages']} new message(s) from "
+              f"{summary['updated']}/{summary['files']} transcript(s) "
+              f"in {summary['elapsed_ms']:.1f} ms")
+        print(f"   Database: {summary['database']}")
+        if summary["pruned"]:
+            print(f"   Dropped {summary['pruned']} transcript(s) no longer on disk")
+        if summary["errors"]:
+            print(f"   ⚠️ {summary['errors']} transcript(s) failed")
+    return 1 if summary["errors"] else 0
+
+
+def cmd_transcripts_archive(args: argparse.Namespace) -> int:
+    """Compress inactive session transcripts into seekable archives."""
+    from .utils import get_current_session_id
+    from .utils.transcript_archive import archive_transcript, find_inactive_transcripts
+    import json as json_lib
+    import os
+    import time
+
+    started = time.perf_counter()
+    if args.paths:
+        paths = args.paths
+    else:
+        paths = find_inactive_transcripts(args.older_than, exclude=(get_current_session_id(),))
+
+    results, errors = [], []
+    for path in paths:
+        if args.dry_run:
+            try:
+                results.append({"path": path, "raw_size": os.path.getsize(path)})
+            except OSError as e:
+                errors.append({"path": path, "error": str(e)})
+            continue
+        try:
+            results.append(archive_transcript(path, codec=args.codec))
+        except (OSError, ValueError) as e:
+            errors.append({"path": path, "error": str(e)})
+
+    raw = sum(r["raw_size"] for r in results)
+    archived = sum(r.get("archived_size", 0) for r in results)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.json_output:
+        print(json_lib.dumps({
+            "dry_run": args.dry_run, "codec": args.codec, "archived": results, "errors": errors,
+            "raw_bytes": raw, "archived_bytes": archived, "elapsed_ms": round(elapsed_ms, 1),
+        }, indent=2))
+    elif args.dry_run:
+        print(f"🗜️  Would archive {len(results)} transcript(s), {raw / 1e6:.1f} MB raw:")
+        for r in results:
+            print(f"   {r['path']}")
+    else:
+        saved = f" ({100 * (1 - archived / raw):.0f}% saved)" if raw else ""
+        print(f"🗜️  Archived {len(results)} transcript(s): {raw / 1e6:.1f} MB → "
+              f"{archived / 1e6:.1f} MB{saved} in {elapsed_ms / 1000:.1f}s")
+    if not args.json_output:
+        for error in errors:
+            print(f"   ⚠️ {error['path']}: {error['error']}")
+    return 1 if errors else 0
+
+
+def cmd_transcripts_unarchive(args: argparse.Namespace) -> int:
+    """Restore archived transcripts to raw JSONL."""
+    from .utils.transcript_archive import restore_transcript
+
+    failed = 0
+    for path in args.paths:
+        try:
+            print(f"📂 Restored {restore_transcript(path)}")
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
 def cmd_transcripts_list(args: argparse.Namespace) -> int:
     """List all transcript files."""
     from .forensics.transcript_search import list_all_transcripts
@@ -9110,6 +9546,7 @@ def _cmd_tm_start(args) -> int:
     return start_daemon(
         foreground=getattr(args, "foreground", False),
         poll_interval=getattr(args, "interval", 1.0),
+        watch=getattr(args, "watch", None),
     )
 
 def _cmd_tm_stop(args) -> int:
@@ -9511,6 +9948,8 @@ def _build_parser() -> argparse.ArgumentParser:
                                help="install to local project (default)")
     install_parser.add_argument("--global", dest="global_install", action="store_true",
                                help="install to global ~/.claude directory")
+    install_parser.add_argument("--server", action="store_true",
+                               help="route hooks through the warm hook server (thin client, in-process fallback)")
     install_parser.set_defaults(func=cmd_hook_install)
 
     hook_sub.add_parser("test", help="test compaction detection on current session").set_defaults(func=cmd_hook_test)
@@ -9521,6 +9960,53 @@ def _build_parser() -> argparse.ArgumentParser:
 
     hook_sub.add_parser("status", help="display current hook states").set_defaults(func=cmd_hook_status)
 
+    server_parser = hook_sub.add_parser("server", help="warm hook server (see hooks install --server)")
+    server_sub = server_parser.add_subparsers(dest="server_cmd")
+    server_start = server_sub.add_parser("start", help="start the server for this project")
+    server_start.add_argument("--foreground", action="store_true", help="serve in this process")
+    server_sub.add_parser("stop", help="stop the server for this project")
+    server_status = server_sub.add_parser("status", help="show server status (exit 1 if none)")
+    server_status.add_argument("--json", dest="json_output", action="store_true", help="output as JSON")
+    server_parser.set_defaults(func=cmd_hook_server)
+
+    bench_parser = hook_sub.add_parser("bench", help="benchmark hook latency against a fixture agent home")
+    bench_parser.add_argument("--hook", action="append",
+                              help="hook to run (handle_stop, stop or Stop); repeatable, default all")
+    bench_parser.add_argument("--iterations", type=int, default=20, help="timed runs per hook (default 20)")
+    bench_parser.add_argument("--warmup", type=int, default=1, help="untimed runs per hook first (default 1)")
+    bench_parser.add_argument("--events", type=int, default=50_000, help="fixture event log size (default 50000)")
+    bench_parser.add_argument("--transcript-messages", type=int, default=4_000,
+                              help="fixture transcript length (default 4000)")
+    bench_parser.add_argument("--tasks", type=int, default=300, help="fixture task count (default 300)")
+    bench_parser.add_argument("--fixture-dir", help="build the fixture here and keep it (default: temp dir)")
+    bench_parser.add_argument("--payloads", help="directory of <hook>.json/.jsonl payloads to replay")
+    bench_parser.add_argument("--record-from-log", metavar="EVENTS_LOG",
+                              help="replay hook_input payloads recorded in an agent events log")
+    bench_parser.add_argument("--no-syscalls", action="store_true", help="skip the syscall-count run")
+    bench_parser.add_argument("--fast-path", nargs="?", const="", metavar="TOOLS",
+                              help="also bench the tool-call hooks with TOOLS (comma-separated; "
+                                   "default Read,Glob,Grep,LS) on the fast path")
+    bench_parser.add_argument("--baseline", help="compare against a saved report; exit 1 on regression")
+    bench_parser.add_argument("--tolerance", type=float, default=0.25,
+                              help="relative increase counted as a regression (default 0.25)")
+    bench_parser.add_argument("--save-baseline", metavar="FILE", help="write this run's report to FILE")
+    bench_parser.add_argument("--json", dest="json_output", action="store_true", help="output as JSON")
+    bench_parser.set_defaults(func=cmd_hook_bench)
+
+    profile_parser = hook_sub.add_parser("profile", help="per-phase latency from recorded hook traces")
+    profile_parser.add_argument("--hook", action="append",
+                                help="hook to include (handle_stop, stop or Stop); repeatable, default all")
+    profile_parser.add_argument("--session", help="only this session id (default: all sessions)")
+    profile_parser.add_argument("--agent", help="only this agent id (default: all agents)")
+    profile_parser.add_argument("--since", type=float, metavar="HOURS", help="only runs from the last HOURS hours")
+    profile_parser.add_argument("--root", default="/tmp/macf", help="sidecar root holding the traces (default /tmp/macf)")
+    profile_parser.add_argument("--top", type=int, help="show only the N most expensive phases per hook")
+    profile_parser.add_argument("--no-flame", action="store_true", help="omit the flame-style tree")
+    profile_parser.add_argument("--folded", action="store_true",
+                                help="print collapsed stacks (hook;phase;subphase self_us) for flamegraph tools")
+    profile_parser.add_argument("--json", dest="json_output", action="store_true", help="output as JSON")
+    profile_parser.set_defaults(func=cmd_hook_profile)
+
     # Framework commands (unified installation of hooks, commands, skills)
     framework_parser = sub.add_parser("framework", help="framework artifact management")
     framework_sub = framework_parser.add_subparsers(dest="framework_cmd")
@@ -9864,6 +10350,7 @@ def _build_parser() -> argparse.ArgumentParser:
     query_parser.add_argument("--prompt", help="filter by prompt UUID")
     query_parser.add_argument("--after", help="events after timestamp")
     query_parser.add_argument("--before", help="events before timestamp")
+    query_parser.add_argument("--since", help="events in the last window (e.g. 30m, 1h, 7d)")
     query_parser.add_argument("--command", help="filter cli_command_invoked by command (e.g., 'policy read')")
     query_parser.add_argument("--verbose", "-v", action="store_true", help="show full event data")
     query_parser.set_defaults(func=cmd_events_query)
@@ -9888,6 +10375,26 @@ def _build_parser() -> argparse.ArgumentParser:
                             help="gap threshold in seconds (default: 3600)")
     gaps_parser.set_defaults(func=cmd_events_gaps)
 
+    # events segments / roll (rolled, compressed log segments)
+    segments_parser = events_sub.add_parser("segments", help="list rolled event log segments")
+    segments_parser.add_argument("--json", dest="json_output", action="store_true",
+                                 help="output as JSON")
+    segments_parser.set_defaults(func=cmd_events_segments)
+
+    roll_parser = events_sub.add_parser("roll", help="roll the hot event log into a compressed segment now")
+    roll_parser.add_argument("--compression", choices=["gzip", "xz", "none"],
+                             help="segment codec (default: events.segment_compression setting)")
+    roll_parser.set_defaults(func=cmd_events_roll)
+
+    compact_parser = events_sub.add_parser("compact", help="compress rolled segments still waiting for compression")
+    compact_parser.set_defaults(func=cmd_events_compact)
+
+    # events mirror (optional indexed SQLite mirror for queries)
+    mirror_parser = events_sub.add_parser("mirror", help="build or refresh the SQLite query mirror")
+    mirror_parser.add_argument("--rebuild", action="store_true",
+                               help="discard the mirror and rebuild it from the whole log")
+    mirror_parser.set_defaults(func=cmd_events_mirror)
+
     # events analyze (BUG #1069 — generic structured-event JSONL analyzer)
     analyze_parser = events_sub.add_parser(
         "analyze",
@@ -10532,7 +11039,16 @@ def _build_parser() -> argparse.ArgumentParser:
 
     # transcripts search
     transcripts_search_parser = transcripts_sub.add_parser("search", help="search transcripts by breadcrumb")
-    transcripts_search_parser.add_argument("breadcrumb", help="breadcrumb to search for (e.g., s_abc123/c_42/g_xyz/p_def456/t_123)")
+    transcripts_search_parser.add_argument("breadcrumb", nargs="?",
+                                           help="breadcrumb to search for (e.g., s_abc123/c_42/g_xyz/p_def456/t_123)")
+    transcripts_search_parser.add_argument("--text", metavar="QUERY", default=None,
+                                           help="ranked full-text search instead (needs 'transcripts index')")
+    transcripts_search_parser.add_argument("--limit", type=int, default=10,
+                                           help="maximum --text hits (default: 10)")
+    transcripts_search_parser.add_argument("--session", default=None,
+                                           help="only --text hits from sessions starting with this id")
+    transcripts_search_parser.add_argument("--raw", action="store_true",
+                                           help="pass --text to SQLite FTS5 unchanged (OR, NEAR, \"phrases\", prefix*)")
     transcripts_search_parser.add_argument("--before", "-B", type=int, default=3,
                                            help="number of messages before target (default: 3)")
     transcripts_search_parser.add_argument("--after", "-A", type=int, default=3,
@@ -10541,8 +11057,41 @@ def _build_parser() -> argparse.ArgumentParser:
                                            help="search all transcripts (not just session from breadcrumb)")
     transcripts_search_parser.add_argument("--format", choices=["full", "compact", "json"], default="full",
                                            help="output format (default: full)")
+    transcripts_search_parser.add_argument("--workers", type=int, default=None,
+                                           help="processes scanning transcripts with --all (default: CPUs, max 8)")
+    transcripts_search_parser.add_argument("--timing", action="store_true",
+                                           help="report elapsed time and how many transcripts were scanned")
     transcripts_search_parser.set_defaults(func=cmd_transcripts_search)
 
+    # transcripts index
+    transcripts_index_parser = transcripts_sub.add_parser("index", help="update the full-text transcript index")
+    transcripts_index_parser.add_argument("--path", dest="paths", action="append", default=None,
+                                          help="transcript to ingest (repeatable; default: all)")
+    transcripts_index_parser.add_argument("--json", dest="json_output", action="store_true",
+                                          help="output as JSON")
+    transcripts_index_parser.set_defaults(func=cmd_transcripts_index)
+
+    # transcripts archive / unarchive
+    transcripts_archive_parser = transcripts_sub.add_parser(
+        "archive", help="compress inactive transcripts into seekable archives")
+    transcripts_archive_parser.add_argument("--older-than", type=float, default=14, metavar="DAYS",
+                                            help="archive transcripts not written for DAYS days (default: 14)")
+    transcripts_archive_parser.add_argument("--path", dest="paths", action="append", default=None,
+                                            help="archive this transcript instead (repeatable)")
+    transcripts_archive_parser.add_argument("--codec", choices=["zlib", "lzma"], default="zlib",
+                                            help="frame compression (default: zlib; lzma is smaller and slower)")
+    transcripts_archive_parser.add_argument("--dry-run", action="store_true",
+                                            help="list what would be archived")
+    transcripts_archive_parser.add_argument("--json", dest="json_output", action="store_true",
+                                            help="output as JSON")
+    transcripts_archive_parser.set_defaults(func=cmd_transcripts_archive)
+
+    transcripts_unarchive_parser = transcripts_sub.add_parser(
+        "unarchive", help="restore archived transcripts to raw JSONL")
+    transcripts_unarchive_parser.add_argument("paths", nargs="+", metavar="ARCHIVE",
+                                              help="archived transcript (*.jsonl.fz)")
+    transcripts_unarchive_parser.set_defaults(func=cmd_transcripts_unarchive)
+
     # transcripts list
     transcripts_list_parser = transcripts_sub.add_parser("list", help="list all transcript files")
     transcripts_list_parser.add_argument("--json", dest="json_output", action="store_true",
@@ -10630,6 +11179,8 @@ def _build_parser() -> argparse.ArgumentParser:
     tm_start = tm_sub.add_parser("start", help="start transcript monitor daemon")
     tm_start.add_argument("-f", "--foreground", action="store_true", help="run in foreground (don't daemonize)")
     tm_start.add_argument("--interval", type=float, default=1.0, help="poll interval in seconds (default: 1.0)")
+    tm_start.add_argument("--watch", choices=["auto", "inotify", "poll"], default=None,
+                          help="wake on inotify events or poll (default: setting transcript_monitor.watch, else auto)")
     tm_start.set_defaults(func=lambda args: _cmd_tm_start(args))
 
     tm_sub.add_parser("stop", help="stop transcript monitor daemon").set_defaults(func=lambda args: _cmd_tm_stop(args))
@@ -409,6 +409,26 @@ def _dotted_lookup(config: Dict[str, Any], dotted_path: str) -> Any:
     return node
 
 
+def coerce_bool(value: Any) -> bool:
+    """Coerce an env/config flag (``1``/``true``/``yes``/``on``) to bool.
+
+    Anything else is False. Pass as ``coerce`` to ``resolve_setting`` for
+    boolean settings, whose env values always arrive as strings.
+    """
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def coerce_name_list(value: Any) -> List[str]:
+    """Coerce a comma-separated env value or a config list to a list of names."""
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(part).strip() for part in value if str(part).strip()]
+    raise TypeError(f"expected a list or comma-separated string, got {type(value).__name__}")
+
+
 def resolve_setting(
     env_var: str,
     config_path: str,
@@ -506,4 +526,76 @@ RESOLVED_SETTINGS: List[Dict[str, Any]] = [
         "coerce": None,
         "description": "Display name for the agent (cycle 518 Phase 1)",
     },
+    {
+        "name": "events.segment_max_mb",
+        "env_var": "MACF_EVENTS_SEGMENT_MAX_MB",
+        "config_path": "events.segment_max_mb",
+        "default": 64,
+        "coerce": int,
+        "description": "Hot event log size (MB) at which it rolls into a segment (0 = never)",
+    },
+    {
+        "name": "events.segment_per_cycle",
+        "env_var": "MACF_EVENTS_SEGMENT_PER_CYCLE",
+        "config_path": "events.segment_per_cycle",
+        "default": False,
+        "coerce": coerce_bool,
+        "description": "Also roll the event log at every compaction (one segment per cycle)",
+    },
+    {
+        "name": "events.segment_compression",
+        "env_var": "MACF_EVENTS_SEGMENT_COMPRESSION",
+        "config_path": "events.segment_compression",
+        "default": "gzip",
+        "coerce": None,
+        "description": "Codec for cold event log segments: gzip, xz or none",
+    },
+    {
+        "name": "events.shared_lock_appends",
+        "env_var": "MACF_EVENTS_SHARED_LOCK_APPENDS",
+        "config_path": "events.shared_lock_appends",
+        "default": "auto",
+        "coerce": None,
+        "description": "Append small events under a shared lock: auto (local filesystems only), true or false",
+    },
+    {
+        "name": "events.sqlite_mirror",
+        "env_var": "MACF_EVENTS_SQLITE_MIRROR",
+        "config_path": "events.sqlite_mirror",
+        "default": False,
+        "coerce": coerce_bool,
+        "description": "Answer event queries from an indexed SQLite mirror of the log",
+    },
+    {
+        "name": "events.snapshot_every",
+        "env_var": "MACF_EVENTS_SNAPSHOT_EVERY",
+        "config_path": "events.snapshot_every",
+        "default": 5000,
+        "coerce": int,
+        "description": "Emit a state_snapshot once this many events follow the latest one (0 = never)",
+    },
+    {
+        "name": "events.snapshot_on_pre_compact",
+        "env_var": "MACF_EVENTS_SNAPSHOT_ON_PRE_COMPACT",
+        "config_path": "events.snapshot_on_pre_compact",
+        "default": True,
+        "coerce": coerce_bool,
+        "description": "Emit a state_snapshot right before every compaction",
+    },
+    {
+        "name": "hooks.fast_path_tools",
+        "env_var": "MACF_HOOK_FAST_PATH_TOOLS",
+        "config_path": "hooks.fast_path_tools",
+        "default": [],
+        "coerce": coerce_name_list,
+        "description": "Tools whose Pre/PostToolUse hooks only record the event when no other work applies",
+    },
+    {
+        "name": "transcript_monitor.watch",
+        "env_var": "MACF_TM_WATCH",
+        "config_path": "transcript_monitor.watch",
+        "default": "auto",
+        "coerce": None,
+        "description": "Transcript monitor wake-up: inotify, poll, or auto (inotify where available)",
+    },
 ]
\ No newline at end of file
@@ -0,0 +1,409 @@
+"""
+Event Index - Per-event-type byte-offset sidecar for agent_events_log.jsonl.
+
+"Latest X" queries used to walk ``read_events(reverse=True)`` from EOF until
+they hit a matching type. For a common type that is a few lines; for a rare
+one (``state_snapshot``, ``task_grant_delete``, ``mode_change``) on a
+multi-hundred-MB log it means parsing every line back to the start of time.
+
+This module keeps a sidecar directory next to the log that records, for
+every event type and every session prefix, the byte offsets of the records
+carrying it::
+
+    agent_events_log.jsonl.idx/
+        meta.json               {"covered": N, "base": ..., "inode": ..., "head": ...}
+        event/<event_type>.off  packed uint64 offsets, file order
+        session/<prefix8>.off   packed uint64 offsets, file order
+        time.blk                sparse time checkpoints (see below)
+
+"Latest X" becomes one 8-byte read, one seek and one ``json.loads``.
+
+Time checkpoints cover the log in blocks of ``TIME_BLOCK_RECORDS`` records,
+each stored as ``(first_offset, min_timestamp, max_timestamp)``. Records are
+appended in *nearly* timestamp order - concurrent writers stamp before they
+append, so neighbours can be a little out of order - and bisecting raw
+timestamps would be wrong across such skew. ``time_window`` bisects the
+running maximum (every block before it is entirely <= since) and the
+trailing minimum (every block from it on is entirely >= until) instead,
+which are monotone whatever the skew, so the window it returns always
+holds every record in range.
+
+The index is a pure function of the log bytes. ``sync()`` catches it up from
+the last covered offset to EOF and rebuilds from scratch when the log no
+longer matches what was indexed (truncated, replaced, or rewritten in place),
+so a stale or missing index is never wrong — only temporarily slower.
+``append_event`` never touches the index (``sync`` takes an exclusive lock
+and rewrites ``meta.json``, which would serialise every writer); readers
+sync before every lookup, catching up whatever was appended since, by
+``append_event`` or anything else.
+
+Offsets are logical (see ``macf.event_segments``): they run continuously
+across rolled segments and the hot file, so the index survives a roll and
+keeps serving records that now live in compressed segments.
+
+Stdlib plus ``event_segments`` only: this sits on every hook's append path.
+"""
+
+import fcntl
+import json
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .event_segments import (
+    iter_raw_lines,
+    logical_size,
+    prefix_stamp,
+    read_line_at,
+    stamp_is_prefix,
+)
+
+#: Bumped whenever the on-disk layout changes; a mismatch forces a rebuild.
+INDEX_VERSION = 2
+
+#: Session keys use the same 8-char prefix convention as event_queries.
+SESSION_PREFIX_LEN = 8
+
+_INF = float("inf")
+
+#: Offsets read per backwards step when iterating an offsets file.
+_REVERSE_BATCH = 4096
+
+_OFFSET_SIZE = 8
+_SAFE_KEY = re.compile(r"^[A-Za-z0-9_.\-]{1,128}$")
+
+#: Records per time checkpoint block.
+TIME_BLOCK_RECORDS = 256
+
+#: One time block: first logical offset, min and max timestamp.
+_TIME_BLOCK = struct.Struct("<Qdd")
+
+
+def get_index_dir(log_path: Path) -> Path:
+    """Sidecar directory for ``log_path`` (``<log>.idx`` beside the log)."""
+    return log_path.parent / (log_path.name + ".idx")
+
+
+def is_indexable_key(key: str) -> bool:
+    """True if ``key`` can be stored as an index file name.
+
+    Event types are lowercase_underscore by convention and session ids are
+    UUIDs, so this only rejects pathological values; lookups for those fall
+    back to a scan.
+    """
+    return bool(key) and _SAFE_KEY.match(key) is not None and key not in (".", "..")
+
+
+def _record_keys(line: bytes) -> Optional[tuple]:
+    """(event_type, session_prefix, timestamp) for one raw JSONL line, or None if unparseable."""
+    try:
+        record = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(record, dict):
+        return None
+    event_type = record.get("event")
+    data = record.get("data")
+    session_id = data.get("session_id") if isinstance(data, dict) else None
+    prefix = session_id[:SESSION_PREFIX_LEN] if isinstance(session_id, str) else ""
+    timestamp = record.get("timestamp")
+    if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+        timestamp = None
+    return (event_type if isinstance(event_type, str) else "", prefix, timestamp)
+
+
+class EventIndex:
+    """Byte-offset index over one event log file.
+
+    Args:
+        log_path: The JSONL log being indexed. The sidecar directory is
+            derived from it (see ``get_index_dir``).
+    """
+
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        self.index_dir = get_index_dir(self.log_path)
+
+    # -- maintenance ---------------------------------------------------------
+
+    def _meta_path(self) -> Path:
+        return self.index_dir / "meta.json"
+
+    def _key_path(self, kind: str, key: str) -> Path:
+        return self.index_dir / kind / f"{key}.off"
+
+    def _time_path(self) -> Path:
+        return self.index_dir / "time.blk"
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._meta_path(), "r") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ MACF: event index meta unreadable, rebuilding: {e}", file=sys.stderr)
+            return None
+        return meta if isinstance(meta, dict) else None
+
+    def _write_meta(self, meta: dict) -> None:
+        tmp = self._meta_path().with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path())
+
+    def sync(self) -> bool:
+        """Bring the index up to date with the log.
+
+        Indexes every complete line between the last covered offset and EOF.
+        A trailing partial line (a writer mid-append) is left for the next
+        sync. Rebuilds from offset 0 when the log was truncated, replaced, or
+        rewritten since the index was built.
+
+        Returns:
+            True if the index now covers the log, False if it could not be
+            maintained (callers then fall back to scanning).
+        """
+        try:
+            self.log_path.stat()
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            print(f"⚠️ MACF: event index stat failed: {e}", file=sys.stderr)
+            return False
+
+        try:
+            self.index_dir.mkdir(mode=0o700, exist_ok=True)
+            with open(self.index_dir / "lock", "a") as lock:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                try:
+                    return self._sync_locked()
+                finally:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        except OSError as e:
+            print(f"⚠️ MACF: event index sync failed: {e}", file=sys.stderr)
+            return False
+
+    def _sync_locked(self) -> bool:
+        meta = self._read_meta()
+        if not (meta and meta.get("version") == INDEX_VERSION
+                and stamp_is_prefix(meta, self.log_path)):
+            import shutil
+
+            for kind in ("event", "session"):
+                shutil.rmtree(self.index_dir / kind, ignore_errors=True)
+            self._time_path().unlink(missing_ok=True)
+            meta = {"version": INDEX_VERSION, "records": 0, "covered": 0}
+
+        covered = meta["covered"]
+        if covered >= logical_size(self.log_path) and "inode" in meta:
+            return True
+
+        pending: Dict[tuple, array] = {}
+        position = covered
+        records = meta.get("records", 0)
+        # The open time block: [first_offset, records, min_ts, max_ts].
+        block = meta.get("time_open") or [covered, 0, _INF, 0.0]
+        closed = bytearray()
+        for offset, line in iter_raw_lines(self.log_path, covered):
+            position = offset + len(line)
+            if not line.strip():
+                continue
+            keys = _record_keys(line)
+            if keys is None:
+                continue
+            records += 1
+            event_type, prefix, timestamp = keys
+            if is_indexable_key(event_type):
+                pending.setdefault(("event", event_type), array("Q")).append(offset)
+            if is_indexable_key(prefix):
+                pending.setdefault(("session", prefix), array("Q")).append(offset)
+
+            if block[1] == TIME_BLOCK_RECORDS:
+                closed += _TIME_BLOCK.pack(block[0], block[2], block[3])
+                block = [offset, 0, _INF, 0.0]
+            # Same defaults as the time filters: a missing timestamp is 0
+            # for "since" and +inf for "until"; NaN passes both.
+            if timestamp is None:
+                low, high = _INF, 0.0
+            elif timestamp != timestamp:
+                low, high = -_INF, _INF
+            else:
+                low = high = timestamp
+            block[1] += 1
+            block[2] = min(block[2], low)
+            block[3] = max(block[3], high)
+
+        for (kind, key), offsets in pending.items():
+            path = self._key_path(kind, key)
+            path.parent.mkdir(mode=0o700, exist_ok=True)
+            with open(path, "ab") as out:
+                offsets.tofile(out)
+        if closed:
+            with open(self._time_path(), "ab") as out:
+                out.write(closed)
+
+        meta["records"] = records
+        meta["time_open"] = block
+        meta.update(prefix_stamp(self.log_path, position))
+        self._write_meta(meta)
+        return True
+
+    def rebuild(self) -> bool:
+        """Discard the index and rebuild it from the whole log."""
+        import shutil
+
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+        return self.sync()
+
+    # -- lookups -------------------------------------------------------------
+
+    def records(self) -> int:
+        """Number of records in the indexed log (as of the last sync)."""
+        meta = self._read_meta()
+        return meta.get("records", 0) if meta else 0
+
+    def count(self, kind: str, key: str) -> int:
+        """Number of indexed records for ``key`` (``kind`` is event/session)."""
+        try:
+            return self._key_path(kind, key).stat().st_size // _OFFSET_SIZE
+        except FileNotFoundError:
+            return 0
+
+    def iter_offsets_reverse(self, kind: str, key: str) -> Iterator[int]:
+        """Yield offsets for ``key`` newest-first, reading the file backwards."""
+        path = self._key_path(kind, key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            end = os.fstat(f.fileno()).st_size // _OFFSET_SIZE
+            while end > 0:
+                start = max(0, end - _REVERSE_BATCH)
+                f.seek(start * _OFFSET_SIZE)
+                batch = array("Q")
+                batch.frombytes(f.read((end - start) * _OFFSET_SIZE))
+                for offset in reversed(batch):
+                    yield offset
+                end = start
+
+    def nth_offset(self, kind: str, key: str, n: int = 0) -> Optional[int]:
+        """Offset of the ``n``-th most recent record for ``key`` (0 = latest)."""
+        path = self._key_path(kind, key)
+        try:
+            with open(path, "rb") as f:
+                total = os.fstat(f.fileno()).st_size // _OFFSET_SIZE
+                if n < 0 or n >= total:
+                    return None
+                f.seek((total - 1 - n) * _OFFSET_SIZE)
+                value = array("Q")
+                value.frombytes(f.read(_OFFSET_SIZE))
+                return value[0]
+        except FileNotFoundError:
+            return None
+
+    def time_blocks(self) -> List[Tuple[int, int, float, float]]:
+        """Time checkpoint blocks as ``(first_offset, end_offset, min_ts, max_ts)``.
+
+        Blocks tile the indexed log in file order; the last one is the
+        partially filled block and ends at the covered offset.
+        """
+        meta = self._read_meta()
+        if not meta or meta.get("version") != INDEX_VERSION:
+            return []
+        try:
+            with open(self._time_path(), "rb") as f:
+                packed = f.read()
+        except FileNotFoundError:
+            packed = b""
+        starts, lows, highs = [], [], []
+        for first, low, high in _TIME_BLOCK.iter_unpack(packed[:len(packed) - len(packed) % _TIME_BLOCK.size]):
+            starts.append(first)
+            lows.append(low)
+            highs.append(high)
+        block = meta.get("time_open")
+        if block and block[1]:
+            starts.append(block[0])
+            lows.append(block[2])
+            highs.append(block[3])
+        ends = starts[1:] + [meta["covered"]]
+        return list(zip(starts, ends, lows, highs))
+
+    def time_window(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Tuple[int, Optional[int]]:
+        """Logical ``[start, end)`` holding every record with since < ts < until.
+
+        Bisects the running maximum and trailing minimum of the time blocks,
+        so out-of-order timestamps never push a record outside the window.
+        ``end`` is None when nothing can be cut off the tail (lines appended
+        after the last sync are then still read).
+
+        Example:
+            >>> start, end = index.time_window(since=time.time() - 3600)
+        """
+        blocks = self.time_blocks()
+        if not blocks:
+            return 0, None
+        start, end = 0, None
+        if since is not None:
+            running_max = list(accumulate((b[3] for b in blocks), max))
+            k = bisect_right(running_max, since)
+            start = blocks[k][0] if k < len(blocks) else blocks[-1][1]
+        if until is not None:
+            trailing_min = list(accumulate((b[2] for b in reversed(blocks)), min))[::-1]
+            k = bisect_left(trailing_min, until)
+            if k < len(blocks):
+                end = max(start, blocks[k][0])
+        return start, end
+
+    def keys(self, kind: str) -> List[str]:
+        """All indexed keys of ``kind`` (event types or session prefixes)."""
+        try:
+            return sorted(p.stem for p in (self.index_dir / kind).glob("*.off"))
+        except OSError as e:
+            print(f"⚠️ MACF: event index listing failed: {e}", file=sys.stderr)
+            return []
+
+    def read_at(self, offset: int) -> Optional[dict]:
+        """Parse the record that starts at logical ``offset`` of the log."""
+        try:
+            line = read_line_at(self.log_path, offset)
+        except OSError as e:
+            print(f"⚠️ MACF: event index read failed: {e}", file=sys.stderr)
+            return None
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        return record if isinstance(record, dict) else None
+
+
+def get_event_index(log_path: Path) -> Optional[EventIndex]:
+    """Synced index for ``log_path``, or None when it cannot be maintained.
+
+    ``MACF_EVENT_INDEX=0`` disables the index entirely (callers then scan).
+    """
+    if os.environ.get("MACF_EVENT_INDEX", "1") == "0":
+        return None
+    index = EventIndex(log_path)
+    return index if index.sync() else None
+
+
+__all__ = [
+    "EventIndex",
+    "get_event_index",
+    "get_index_dir",
+    "is_indexable_key",
+    "INDEX_VERSION",
+    "TIME_BLOCK_RECORDS",
+]
@@ -0,0 +1,368 @@
+"""
+Event Mirror - Optional SQLite mirror of agent_events_log.jsonl.
+
+``query_events`` and ``query_set_operations`` answer forensic questions
+("everything from cycle 170 in git state 44545c6") by streaming the whole
+JSONL through Python predicates; set operations additionally round-trip
+every event through ``json.dumps(sort_keys=True)`` to build sets. On a log
+with millions of events each query costs a full decode.
+
+This module keeps a SQLite database beside the log::
+
+    agent_events_log.jsonl.sqlite
+        events(offset PK, timestamp, event, session_id,
+               bc_ok, bc_session, bc_cycle, bc_prompt, bc_git, bc_timestamp,
+               line)             -- line is the full record, queryable as JSON1
+        meta(key PK, value)      -- version + prefix stamp of the mirrored bytes
+
+with indexes on event type, session, cycle, prompt uuid, git hash and
+timestamp. ``_matches_filter`` specs compile to a WHERE clause
+(``compile_filter``) and set operations to OR / AND / AND NOT of those
+clauses, so a query is an index lookup rather than a scan.
+
+The JSONL log stays the source of truth. Like ``macf.event_index`` the
+mirror is a pure function of the log bytes: ``sync()`` catches it up from
+the last mirrored offset and rebuilds from scratch when the log no longer
+matches what was mirrored. Offsets are logical (see
+``macf.event_segments``), so rolled segments stay mirrored.
+
+The mirror is opt-in (``events.sqlite_mirror`` / ``MACF_EVENTS_SQLITE_MIRROR``)
+and synced lazily by readers, never on the append path.
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
+from .event_segments import iter_raw_lines, logical_size, prefix_stamp, stamp_is_prefix
+from .utils import parse_breadcrumb
+
+#: Bumped whenever the schema changes; a mismatch forces a rebuild.
+MIRROR_VERSION = 1
+
+#: Rows inserted per executemany batch while syncing.
+_BATCH = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    offset       INTEGER PRIMARY KEY,
+    timestamp    REAL,
+    event        TEXT,
+    session_id   TEXT,
+    bc_ok        INTEGER NOT NULL,
+    bc_session   TEXT,
+    bc_cycle     INTEGER,
+    bc_prompt    TEXT,
+    bc_git       TEXT,
+    bc_timestamp INTEGER,
+    line         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_event ON events(event, offset);
+CREATE INDEX IF NOT EXISTS events_session ON events(session_id);
+CREATE INDEX IF NOT EXISTS events_cycle ON events(bc_cycle);
+CREATE INDEX IF NOT EXISTS events_prompt ON events(bc_prompt);
+CREATE INDEX IF NOT EXISTS events_git ON events(bc_git);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events(timestamp);
+"""
+
+# Breadcrumb filter key -> mirrored column (see _matches_filter).
+_BREADCRUMB_COLUMNS = {"s": "bc_session", "c": "bc_cycle", "g": "bc_git", "p": "bc_prompt"}
+
+
+def get_mirror_path(log_path: Path) -> Path:
+    """SQLite file for ``log_path`` (``<log>.sqlite`` beside the log)."""
+    return log_path.parent / (log_path.name + ".sqlite")
+
+
+def _row(offset: int, line: bytes) -> Optional[tuple]:
+    """Mirror row for one raw JSONL line, or None if it is not an event."""
+    try:
+        text = line.decode("utf-8").strip()
+        record = json.loads(text)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(record, dict):
+        return None
+
+    timestamp = record.get("timestamp")
+    if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+        timestamp = None
+    event = record.get("event")
+    data = record.get("data")
+    session_id = data.get("session_id") if isinstance(data, dict) else None
+
+    breadcrumb = record.get("breadcrumb")
+    parsed = parse_breadcrumb(breadcrumb) if isinstance(breadcrumb, str) and breadcrumb else None
+    parsed = parsed or {}
+
+    return (
+        offset,
+        timestamp,
+        event if isinstance(event, str) else None,
+        session_id if isinstance(session_id, str) else None,
+        1 if parsed else 0,
+        parsed.get("session_id"),
+        parsed.get("cycle"),
+        parsed.get("prompt_uuid"),
+        parsed.get("git_hash"),
+        parsed.get("timestamp"),
+        text,
+    )
+
+
+def compile_filter(filters: dict) -> Tuple[str, List[Any]]:
+    """
+    Compile a ``_matches_filter`` spec into a SQL boolean expression.
+
+    Args:
+        filters: Filter spec (event_type, since, until, breadcrumb,
+            session_id, without_matching); unknown keys are ignored, as
+            ``_matches_filter`` ignores them
+
+    Returns:
+        (sql, params) — ``sql`` is "1" when the spec matches everything
+
+    Example:
+        >>> compile_filter({'event_type': 'mode_change', 'breadcrumb': {'c': 170}})
+        ('event = ? AND bc_ok = 1 AND bc_cycle = ?', ['mode_change', 170])
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    if 'event_type' in filters:
+        clauses.append("event = ?")
+        params.append(filters['event_type'])
+
+    # A missing timestamp counts as 0 for since and as +inf for until.
+    if 'since' in filters:
+        clauses.append("COALESCE(timestamp, 0) > ?")
+        params.append(filters['since'])
+    if 'until' in filters:
+        clauses.append("timestamp < ?")
+        params.append(filters['until'])
+
+    if 'breadcrumb' in filters:
+        clauses.append("bc_ok = 1")
+        breadcrumb_filters = filters['breadcrumb']
+        for key, column in _BREADCRUMB_COLUMNS.items():
+            if key in breadcrumb_filters:
+                clauses.append(f"{column} = ?")
+                params.append(breadcrumb_filters[key])
+        if 't_min' in breadcrumb_filters:
+            clauses.append("bc_timestamp >= ?")
+            params.append(breadcrumb_filters['t_min'])
+        if 't_max' in breadcrumb_filters:
+            clauses.append("bc_timestamp <= ?")
+            params.append(breadcrumb_filters['t_max'])
+
+    if 'session_id' in filters:
+        clauses.append("session_id = ?")
+        params.append(filters['session_id'])
+
+    if 'without_matching' in filters:
+        clauses.append("event IS NOT ?")
+        params.append(filters['without_matching'])
+
+    return (" AND ".join(clauses) or "1"), params
+
+
+class EventMirror:
+    """SQLite mirror of one event log.
+
+    Args:
+        log_path: The JSONL log being mirrored. The database path is derived
+            from it (see ``get_mirror_path``).
+    """
+
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        self.db_path = get_mirror_path(self.log_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self.db_path.chmod(0o600)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # -- maintenance ---------------------------------------------------------
+
+    def _read_meta(self, conn: sqlite3.Connection) -> Optional[dict]:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+        if row is None:
+            return None
+        try:
+            meta = json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        return meta if isinstance(meta, dict) else None
+
+    def sync(self) -> bool:
+        """Bring the mirror up to date with the log.
+
+        Mirrors every complete line between the last mirrored offset and
+        EOF inside one write transaction, so concurrent syncs serialise and
+        readers never see a half-applied batch. Rebuilds from offset 0 when
+        the log was truncated, replaced, or rewritten since it was mirrored.
+
+        Returns:
+            True if the mirror now covers the log, False if it could not be
+            maintained (callers then fall back to scanning).
+        """
+        if not self.log_path.exists():
+            return False
+        try:
+            conn = self.connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync_locked(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return True
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ MACF: event mirror sync failed: {e}", file=sys.stderr)
+            return False
+
+    def _sync_locked(self, conn: sqlite3.Connection) -> None:
+        meta = self._read_meta(conn)
+        if not (meta and meta.get("version") == MIRROR_VERSION
+                and stamp_is_prefix(meta, self.log_path)):
+            conn.execute("DELETE FROM events")
+            meta = {"version": MIRROR_VERSION, "covered": 0}
+
+        covered = meta["covered"]
+        if covered >= logical_size(self.log_path) and "inode" in meta:
+            return
+
+        position = covered
+        batch: List[tuple] = []
+        insert = "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        for offset, line in iter_raw_lines(self.log_path, covered):
+            position = offset + len(line)
+            row = _row(offset, line)
+            if row is not None:
+                batch.append(row)
+            if len(batch) >= _BATCH:
+                conn.executemany(insert, batch)
+                batch.clear()
+        if batch:
+            conn.executemany(insert, batch)
+
+        meta.update(prefix_stamp(self.log_path, position))
+        conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('stamp', ?)", (json.dumps(meta),),
+        )
+
+    def rebuild(self) -> bool:
+        """Discard the mirror and rebuild it from the whole log."""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(str(self.db_path) + suffix).unlink(missing_ok=True)
+        return self.sync()
+
+    # -- queries -------------------------------------------------------------
+
+    def select(
+        self,
+        where: str = "1",
+        params: Optional[List[Any]] = None,
+        order: str = "offset",
+    ) -> Iterator[dict]:
+        """Events matching a compiled WHERE clause (log order by default)."""
+        cursor = self.connect().execute(
+            f"SELECT line FROM events WHERE {where} ORDER BY {order}", params or [],
+        )
+        for (line,) in cursor:
+            yield json.loads(line)
+
+    def query(self, filters: dict) -> List[dict]:
+        """Events matching a ``_matches_filter`` spec, in log order."""
+        where, params = compile_filter(filters)
+        return list(self.select(where, params))
+
+    def set_operation(self, queries: List[dict], operation: str) -> List[dict]:
+        """``query_set_operations`` as one SQL statement, sorted by timestamp.
+
+        Events are identified by their offset in the log rather than by
+        their serialised content.
+        """
+        compiled = [compile_filter(q) for q in queries]
+        params: List[Any] = []
+        if operation == "union":
+            where = " OR ".join(f"({sql})" for sql, _ in compiled)
+        elif operation == "intersection":
+            where = " AND ".join(f"({sql})" for sql, _ in compiled)
+        elif operation == "subtraction":
+            where = f"({compiled[0][0]})" + "".join(
+                f" AND NOT COALESCE(({sql}), 0)" for sql, _ in compiled[1:]
+            )
+        else:
+            return []
+        for _, query_params in compiled:
+            params.extend(query_params)
+        return list(self.select(where, params, order="COALESCE(timestamp, 0), offset"))
+
+    def sessions(self) -> List[dict]:
+        """Per-session first/last timestamp and event count, first-seen order."""
+        cursor = self.connect().execute(
+            "SELECT session_id, MIN(timestamp), MAX(timestamp), COUNT(*), MIN(offset) AS first "
+            "FROM events WHERE session_id IS NOT NULL AND session_id != '' "
+            "GROUP BY session_id ORDER BY first"
+        )
+        return [
+            {"session_id": sid, "first_seen": lo or 0, "last_seen": hi or 0, "events": n}
+            for sid, lo, hi, n, _ in cursor
+        ]
+
+    def count(self) -> int:
+        return self.connect().execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+def mirror_enabled() -> bool:
+    """True when the SQLite mirror is switched on (``events.sqlite_mirror``)."""
+    from .config import coerce_bool, resolve_setting
+
+    enabled, _ = resolve_setting(
+        "MACF_EVENTS_SQLITE_MIRROR", "events.sqlite_mirror", False, coerce_bool,
+    )
+    return bool(enabled)
+
+
+def get_event_mirror(log_path: Path, force: bool = False) -> Optional[EventMirror]:
+    """Synced mirror for ``log_path``, or None when disabled or unavailable.
+
+    Args:
+        log_path: The JSONL event log
+        force: Build/sync the mirror even when ``events.sqlite_mirror`` is off
+    """
+    if not (force or mirror_enabled()):
+        return None
+    mirror = EventMirror(log_path)
+    if mirror.sync():
+        return mirror
+    mirror.close()
+    return None
+
+
+__all__ = [
+    "EventMirror",
+    "compile_filter",
+    "get_event_mirror",
+    "get_mirror_path",
+    "mirror_enabled",
+    "MIRROR_VERSION",
+]
@@ -10,7 +10,16 @@ event-sourced queries from agent_events_log.jsonl.
 """
 
 from typing import Tuple, Dict, List, Optional
-from .agent_events_log import read_events
+from .utils.context import hook_fact
+from .observability.tracing import span
+from .agent_events_log import (
+    ScanQuery,
+    fold_projection,
+    iter_events_of_type,
+    read_events,
+    register_projection,
+    scan_many,
+)
 
 
 def get_latest_state_snapshot() -> Optional[dict]:
@@ -28,10 +37,7 @@ def get_latest_state_snapshot() -> Optional[dict]:
         >>> if snapshot:
         ...     baseline = snapshot["data"]["event_tallies"].get("dev_drv_ended", 0)
     """
-    for event in read_events(reverse=True):
-        if event.get("event") == "state_snapshot":
-            return event
-    return None
+    return next(iter_events_of_type("state_snapshot"), None)
 
 
 def get_latest_event(event_type: str, limit: Optional[int] = None) -> Optional[dict]:
@@ -45,10 +51,8 @@ def get_latest_event(event_type: str, limit: Optional[int] = None) -> Optional[d
     Returns:
         Most recent event of the specified type, or None if not found
     """
-    for event in read_events(limit=limit, reverse=True):
-        if event.get("event") == event_type:
-            return event
-    return None
+    found = scan_many({"latest": ScanQuery(frozenset({event_type}), limit=limit)})
+    return next(iter(found["latest"]), None)
 
 
 def get_nth_event(event_type: str, n: int = 0, limit: Optional[int] = None) -> Optional[dict]:
@@ -63,13 +67,10 @@ def get_nth_event(event_type: str, n: int = 0, limit: Optional[int] = None) -> O
     Returns:
         The nth most recent event of the specified type, or None if not found
     """
-    count = 0
-    for event in read_events(limit=limit, reverse=True):
-        if event.get("event") == event_type:
-            if count == n:
-                return event
-            count += 1
-    return None
+    if n < 0:
+        return None
+    found = scan_many({"nth": ScanQuery(frozenset({event_type}), limit=limit, max_matches=n + 1)})
+    return found["nth"][n] if len(found["nth"]) > n else None
 
 
 def get_recent_events(event_type: str, max_count: int = 100, limit: Optional[int] = None) -> List[dict]:
@@ -84,13 +85,8 @@ def get_recent_events(event_type: str, max_count: int = 100, limit: Optional[int
     Returns:
         List of matching events, most recent first
     """
-    results = []
-    for event in read_events(limit=limit, reverse=True):
-        if event.get("event") == event_type:
-            results.append(event)
-            if len(results) >= max_count:
-                break
-    return results
+    found = scan_many({"recent": ScanQuery(frozenset({event_type}), limit=limit, max_matches=max_count)})
+    return found["recent"]
 
 
 def get_dev_drv_stats_from_events(session_id: str) -> dict:
@@ -136,20 +132,18 @@ def get_dev_drv_stats_from_events(session_id: str) -> dict:
         durations = snapshot_data.get("accumulated_durations", {})
         baseline_duration = durations.get("total_dev_drv_duration_seconds", 0.0)
 
-    # Collect incremental events AFTER snapshot (reverse scan, stop at snapshot)
+    # Collect incremental events AFTER snapshot (time window bisected on the
+    # index, so only the records since the snapshot are read)
     incremental_events = []
     session_prefix = session_id[:8] if session_id else ""
 
-    for event in read_events(limit=None, reverse=True):
-        event_timestamp = event.get("timestamp", 0)
-        # Stop when we reach snapshot timestamp (efficient for long logs)
-        if snapshot_timestamp > 0 and event_timestamp <= snapshot_timestamp:
-            break
-
+    for event in read_events(
+        limit=None,
+        reverse=True,
+        event_types=("dev_drv_started", "dev_drv_ended"),
+        since=snapshot_timestamp if snapshot_timestamp > 0 else None,
+    ):
         event_type = event.get("event")
-        if event_type not in ("dev_drv_started", "dev_drv_ended"):
-            continue
-
         data = event.get("data", {})
         event_session = data.get("session_id", "")
         if session_prefix and event_session and not event_session.startswith(session_prefix):
@@ -216,8 +210,11 @@ def get_deleg_drv_stats_from_events(session_id: str) -> dict:
     # Track started delegations to match with ended events
     started_delegations = {}  # key: subagent_type, value: timestamp
 
-    # Read events in chronological order
-    for event in read_events(limit=None, reverse=False):
+    # Read delegation events in chronological order. No snapshot baseline:
+    # snapshot tallies are log-wide, these stats are per session.
+    for event in read_events(
+        limit=None, reverse=False, event_types=("deleg_drv_started", "deleg_drv_ended"),
+    ):
         event_type = event.get("event")
         data = event.get("data", {})
         event_session = data.get("session_id", "")
@@ -260,6 +257,45 @@ def get_deleg_drv_stats_from_events(session_id: str) -> dict:
     }
 
 
+def _cycle_from_event(event: dict) -> Optional[int]:
+    """Cycle number an event asserts, or None if it asserts none."""
+    event_type = event.get("event")
+    data = event.get("data", {})
+
+    # cycle_correction (manual fix for test pollution) and compaction_detected
+    # (authoritative) both carry the cycle directly
+    if event_type in ("cycle_correction", "compaction_detected"):
+        cycle = data.get("cycle")
+        if cycle is not None and cycle > 0:
+            return cycle
+
+    # Fallback: state_snapshot baseline
+    if event_type == "state_snapshot":
+        # Check derived_values first (from state file captures)
+        derived = data.get("derived_values", {})
+        if "cycle_number" in derived:
+            return derived["cycle_number"]
+        # Fallback to event_tallies
+        tallies = data.get("event_tallies", {})
+        if "compaction_detected" in tallies:
+            return tallies["compaction_detected"] + 1
+
+    return None
+
+
+@register_projection(
+    "cycle_number",
+    initial=lambda: None,
+    event_types=["cycle_correction", "compaction_detected", "state_snapshot"],
+)
+def _reduce_cycle_number(state: Optional[int], event: dict) -> Optional[int]:
+    """Last-write-wins over the cycle-bearing events."""
+    cycle = _cycle_from_event(event)
+    return cycle if cycle is not None else state
+
+
+@hook_fact("cycle_number", events={"cycle_correction", "compaction_detected", "state_snapshot"})
+@span("cycle_number")
 def get_cycle_number_from_events() -> int:
     """
     Get cycle number from events.
@@ -270,49 +306,47 @@ def get_cycle_number_from_events() -> int:
     3. state_snapshot's derived_values.cycle_number (baseline)
     4. Default to 1 for first run
 
+    Served by the checkpointed ``cycle_number`` projection: each call folds
+    only events appended since the last one.
+
     Returns:
         Current cycle number (1 if no events found)
     """
-    # Reverse scan - find most recent cycle source
-    # Self-limiting: exits on first match
-    for event in read_events(limit=None, reverse=True):
-        event_type = event.get("event")
+    cycle = fold_projection("cycle_number")
+    # No events - return 1 (first run default)
+    return cycle if cycle is not None else 1
 
-        # Highest priority: cycle_correction (manual fix for test pollution)
-        if event_type == "cycle_correction":
-            data = event.get("data", {})
-            cycle = data.get("cycle")
-            if cycle is not None and cycle > 0:
-                return cycle
-
-        # Primary: compaction_detected has authoritative cycle number
-        if event_type == "compaction_detected":
-            data = event.get("data", {})
-            cycle = data.get("cycle")
-            if cycle is not None and cycle > 0:
-                return cycle
-
-        # Fallback: state_snapshot baseline
-        if event_type == "state_snapshot":
-            data = event.get("data", {})
-            # Check derived_values first (from state file captures)
-            derived = data.get("derived_values", {})
-            if "cycle_number" in derived:
-                return derived["cycle_number"]
-            # Fallback to event_tallies
-            tallies = data.get("event_tallies", {})
-            if "compaction_detected" in tallies:
-                return tallies["compaction_detected"] + 1
 
-    # No events - return 1 (first run default)
-    return 1
+def get_cycle_timeline_from_events(max_count: int = 10000) -> List[Tuple[float, int]]:
+    """
+    Get ``(timestamp, cycle)`` for each cycle-asserting event, most recent first.
+
+    The cycle in force at time ``t`` is the first entry with timestamp <= t
+    (1 when there is none). Used to date transcript messages into cycles.
+
+    Args:
+        max_count: Maximum number of cycle events to return
+
+    Returns:
+        List of (epoch timestamp, cycle) tuples, most recent first
+    """
+    found = scan_many({"cycles": ScanQuery(
+        frozenset({"cycle_correction", "compaction_detected", "state_snapshot"}),
+        max_matches=max_count,
+    )})
+    timeline = []
+    for event in found["cycles"]:
+        cycle = _cycle_from_event(event)
+        if cycle is not None and isinstance(event.get("timestamp"), (int, float)):
+            timeline.append((event["timestamp"], cycle))
+    return timeline
 
 
 def get_compaction_count_from_events(session_id: str) -> dict:
     """
     Count compaction_detected events with snapshot baseline.
 
-    Uses reverse scan, stopping at snapshot timestamp for efficiency.
+    Reads only the compaction events logged after the snapshot.
 
     Args:
         session_id: Session ID to filter events (uses first 8 chars for matching)
@@ -329,27 +363,30 @@ def get_compaction_count_from_events(session_id: str) -> dict:
     from_snapshot = False
 
     if snapshot:
-        tallies = snapshot.get("data", {}).get("event_tallies", {})
-        baseline_count = tallies.get("compaction_detected", 0)
+        snapshot_data = snapshot.get("data", {})
+        tallies = snapshot_data.get("event_tallies", {})
+        derived = snapshot_data.get("derived_values", {})
+        # State files may remember compactions that predate the log
+        baseline_count = max(tallies.get("compaction_detected", 0), derived.get("compaction_count", 0))
         from_snapshot = True
 
-    # Count incremental events after snapshot (reverse scan, stop at snapshot)
+    # Count incremental events after snapshot
     count = baseline_count
     session_prefix = session_id[:8] if session_id else ""
 
-    for event in read_events(limit=None, reverse=True):
-        event_timestamp = event.get("timestamp", 0)
-        if snapshot_timestamp > 0 and event_timestamp <= snapshot_timestamp:
-            break
-
-        if event.get("event") == "compaction_detected":
-            data = event.get("data", {})
-            event_session = data.get("session_id", "")
+    for event in read_events(
+        limit=None,
+        reverse=True,
+        event_types=("compaction_detected",),
+        since=snapshot_timestamp if snapshot_timestamp > 0 else None,
+    ):
+        data = event.get("data", {})
+        event_session = data.get("session_id", "")
 
-            if session_prefix and event_session and not event_session.startswith(session_prefix):
-                continue
+        if session_prefix and event_session and not event_session.startswith(session_prefix):
+            continue
 
-            count += 1
+        count += 1
 
     return {"count": count, "from_snapshot": from_snapshot}
 
@@ -432,9 +469,7 @@ def _latest_session_event(event_type: str, session_id: str) -> Optional[dict]:
     if not session_prefix:
         return None
 
-    for event in read_events(reverse=True):
-        if event.get("event") != event_type:
-            continue
+    for event in iter_events_of_type(event_type):
         event_session = event.get("data", {}).get("session_id", "")
         if not event_session or not event_session.startswith(session_prefix):
             continue
@@ -493,11 +528,10 @@ def get_latest_precompact_event(session_id: str) -> Optional[dict]:
 
 def get_active_dev_drv_start(session_id: str) -> tuple[float, str]:
     """Get start time and prompt_uuid of active (unended) dev_drv from events."""
-    from .agent_events_log import read_events
     session_prefix = session_id[:8] if session_id else ""
 
     # Read in reverse - find most recent started/ended first
-    for event in read_events(reverse=True):
+    for event in iter_events_of_type("dev_drv_started", "dev_drv_ended"):
         event_type = event.get("event")
         data = event.get("data", {})
         event_session = data.get("session_id", "")
@@ -518,13 +552,11 @@ def get_active_deleg_drv_start(session_id: str) -> tuple[float, str, str]:
         Tuple of (started_at, tool_use_id_short, subagent_type).
         ``(0.0, "", "")`` when no active drive exists.
     """
-    from .agent_events_log import read_events
     session_prefix = session_id[:8] if session_id else ""
 
-    # Reverse stream — first started/ended event for this session
-    # wins. Phase 1 streaming readers make this O(events-to-answer),
-    # not O(total-events), so no cap is needed.
-    for event in read_events(reverse=True):
+    # Reverse walk over the two drive types only (type index, merged in
+    # log order) — first started/ended event for this session wins.
+    for event in iter_events_of_type("deleg_drv_started", "deleg_drv_ended"):
         event_type = event.get("event")
         data = event.get("data", {})
         event_session = data.get("session_id", "")
@@ -661,13 +693,10 @@ def get_deleg_drv_bridge_by_agent_id(session_id: str, agent_id: str) -> Optional
     Returns:
         The event's ``data`` dict, or ``None``.
     """
-    from .agent_events_log import read_events
     session_prefix = session_id[:8] if session_id else ""
 
     # Reverse walk — most recent bridge for this agent_id wins
-    for event in read_events(reverse=True):
-        if event.get("event") != "deleg_drv_subagent_booted":
-            continue
+    for event in iter_events_of_type("deleg_drv_subagent_booted"):
         data = event.get("data", {})
         event_session = data.get("session_id", "")
         if session_prefix and event_session and not event_session.startswith(session_prefix):
@@ -723,12 +752,11 @@ def get_last_session_id_from_events() -> str:
         Previous session ID string, or empty string if no migration detected
     """
     # Read most recent events first
-    for event in read_events(reverse=True):
-        if event.get("event") == "migration_detected":
-            data = event.get("data", {})
-            previous_session = data.get("previous_session", "")
-            if previous_session:
-                return previous_session
+    for event in iter_events_of_type("migration_detected"):
+        data = event.get("data", {})
+        previous_session = data.get("previous_session", "")
+        if previous_session:
+            return previous_session
 
     # Fallback: check session_started events for session_id continuity
     # (older events might have previous session info)
@@ -746,16 +774,24 @@ def get_last_session_end_time_from_events() -> Optional[float]:
         Unix timestamp of last session end, or None if no session_ended events
     """
     # Read most recent events first
-    for event in read_events(reverse=True):
-        if event.get("event") == "session_ended":
-            data = event.get("data", {})
-            timestamp = data.get("timestamp")
-            if timestamp:
-                return float(timestamp)
+    for event in iter_events_of_type("session_ended"):
+        data = event.get("data", {})
+        timestamp = data.get("timestamp")
+        if timestamp:
+            return float(timestamp)
 
     return None
 
 
+@register_projection("auto_mode", initial=lambda: None, event_types=["mode_change"])
+def _reduce_auto_mode(state: Optional[bool], event: dict) -> bool:
+    """Auto mode as set by the most recent mode_change event."""
+    data = event.get("data", {})
+    mode = data.get("mode", "MANUAL_MODE")
+    enabled = data.get("enabled", False)
+    return (mode == "AUTO_MODE" and enabled)
+
+
 def get_auto_mode_from_events(session_id: str) -> Tuple[bool, str]:
     """
     Get auto_mode setting from most recent mode_change event.
@@ -784,28 +820,61 @@ def get_auto_mode_from_events(session_id: str) -> Tuple[bool, str]:
     # SessionStart handles the reset logic — this function just finds the
     # most recent mode_change regardless of which session wrote it.
 
-    # Read most recent events first — find the latest mode_change
-    # NOTE: limit=None because mode_change events are rare (1 per session)
-    # and can be buried under thousands of tool_call/cli_command events.
-    # With limit=200, a busy session would push mode_change out of range.
-    for event in read_events(limit=None, reverse=True):
-        if event.get("event") == "mode_change":
-            data = event.get("data", {})
+    # Checkpointed projection of the latest mode_change. mode_change events
+    # are rare (1 per session) and can be buried under thousands of
+    # tool_call/cli_command events, so no scan limit may be applied here.
+    projected = fold_projection("auto_mode")
+    if projected is not None:
+        return (projected, "event")
 
-            mode = data.get("mode", "MANUAL_MODE")
-            enabled = data.get("enabled", False)
-            auto_mode = (mode == "AUTO_MODE" and enabled)
+    return (False, "default")
 
-            return (auto_mode, "event")
 
-    return (False, "default")
+@register_projection(
+    "policy_injections",
+    initial=lambda: {"seq": 0, "policies": {}},
+    event_types=[
+        "policy_injections_cleared_all",
+        "compaction_detected",
+        "policy_injection_cleared",
+        "policy_injection_activated",
+    ],
+)
+def _reduce_policy_injections(state: dict, event: dict) -> dict:
+    """Latest lifecycle event per policy since the last clear-all/compaction.
+
+    ``seq`` orders policies by their most recent event so the query can
+    return them newest-first, the order a reverse scan would find them in.
+    """
+    event_type = event.get("event")
+    data = event.get("data", {})
+
+    if event_type in ("policy_injections_cleared_all", "compaction_detected"):
+        state["policies"] = {}
+        return state
+
+    policy_name = data.get("policy_name")
+    if not policy_name:
+        return state
+
+    state["seq"] += 1
+    if event_type == "policy_injection_cleared":
+        state["policies"][policy_name] = {"state": "cleared", "seq": state["seq"]}
+    elif event_type == "policy_injection_activated":
+        state["policies"][policy_name] = {
+            "state": "active",
+            "policy_path": data.get("policy_path", ""),
+            "source": data.get("source", ""),
+            "seq": state["seq"],
+        }
+    return state
 
 
 def get_active_policy_injections_from_events() -> List[Dict[str, str]]:
     """
     Get list of currently active policy injections from event log.
 
-    Scans in REVERSE (most recent first) for efficiency, stopping at:
+    Folds the injection lifecycle since the last reset boundary:
     - policy_injections_cleared_all event (explicit clear)
     - compaction_detected event (cycle boundary - injections reset)
 
@@ -816,10 +885,13 @@ def get_active_policy_injections_from_events() -> List[Dict[str, str]]:
     Event types:
     - policy_injection_activated: Activates injection for a policy
     - policy_injection_cleared: Deactivates specific policy (auto-clear or lifecycle)
-    - policy_injections_cleared_all: Deactivates ALL policies (early exit)
+    - policy_injections_cleared_all: Deactivates ALL policies
+
+    Served by the checkpointed ``policy_injections`` projection: each call
+    folds only events appended since the last one.
 
     Returns:
-        List of dicts with keys:
+        List of dicts (most recently touched first) with keys:
         - policy_name: Name of the policy (e.g., "task_management")
         - policy_path: Absolute path to the policy file
 
@@ -828,40 +900,10 @@ def get_active_policy_injections_from_events() -> List[Dict[str, str]]:
         >>> for inj in injections:
         ...     print(f"{inj['policy_name']}: {inj['policy_path']}")
     """
-    # Track active policies found during reverse scan
-    # Key: policy_name, Value: {"policy_path": "...", "state": "active"|"cleared"}
-    policy_final_states: Dict[str, Dict[str, str]] = {}
-
-    # Reverse scan - first event for each policy determines its state
-    for event in read_events(limit=None, reverse=True):
-        event_type = event.get("event")
-        data = event.get("data", {})
-
-        # Early exit conditions (compaction boundary or explicit clear-all)
-        if event_type in ("policy_injections_cleared_all", "compaction_detected"):
-            break
-
-        elif event_type == "policy_injection_cleared":
-            policy_name = data.get("policy_name")
-            if policy_name and policy_name not in policy_final_states:
-                # First time seeing this policy - it's cleared (don't re-inject)
-                policy_final_states[policy_name] = {"state": "cleared"}
-
-        elif event_type == "policy_injection_activated":
-            policy_name = data.get("policy_name")
-            policy_path = data.get("policy_path", "")
-            source = data.get("source", "")
-            if policy_name and policy_name not in policy_final_states:
-                # First time seeing this policy - it's active
-                policy_final_states[policy_name] = {
-                    "state": "active",
-                    "policy_path": policy_path,
-                    "source": source,
-                }
-
-    # Filter to only active policies and format output
+    policies = fold_projection("policy_injections")["policies"]
+    ordered = sorted(policies.items(), key=lambda item: item[1]["seq"], reverse=True)
     return [
         {"policy_name": name, "policy_path": state["policy_path"], "source": state.get("source", "")}
-        for name, state in policy_final_states.items()
+        for name, state in ordered
         if state.get("state") == "active"
     ]
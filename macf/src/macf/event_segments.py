@@ -0,0 +1,924 @@
+"""
+Event Segments - Rolled, compressed segments of agent_events_log.jsonl.
+
+The event log used to be one file that grew forever. It now rolls: the hot
+segment is always ``agent_events_log.jsonl`` (the only file ever appended
+to), and when it passes a size bound — or a cycle boundary, if configured —
+it is moved into a sidecar directory and compressed with the stdlib::
+
+    agent_events_log.jsonl.segments/
+        manifest.json          one entry per cold segment, oldest first
+        manifest.lock          serialises manifest rewrites
+        compact.lock           held by the one compaction running
+        000001.jsonl.gz        cold segment (gzip / xz / raw)
+        000001.jsonl.gz.frames seek table of a compressed segment
+        000002.jsonl.xz
+
+Every manifest entry records the segment's time range, event-type counts,
+record count and its **logical** byte range ``[first_offset, last_offset)``.
+Logical offsets run continuously across all segments and the hot file, so
+anything derived from the log (the type index, projection checkpoints) keeps
+addressing records the same way after a roll. The hot file starts at
+logical offset ``active_base()`` — the last segment's ``last_offset``.
+
+Rolling is split in two. ``roll_segment`` runs under the append lock and
+only publishes the hot file as a raw segment (a hard link, a summary pass and
+a manifest rewrite) before swapping in an empty hot file. Compressing it,
+seconds for gzip and far longer for xz at 64MB, happens afterwards with no
+append lock held: ``compact_segments`` (run in a detached child by
+``spawn_compaction``, or by ``macf_tools events compact``) compresses every
+segment the manifest marks ``pending_compression`` and publishes each with
+its own manifest rewrite. Readers that opened the raw file before it was
+replaced keep reading it; those that find it gone look it up again.
+
+A compressed segment is written as independent frames of whole lines, about
+``SEGMENT_FRAME_SIZE`` uncompressed bytes each (one gzip member or xz stream
+per frame, so the file is still an ordinary ``.gz``/``.xz``), with the frame
+offsets in a ``.frames`` seek table beside it - the layout of
+``utils.transcript_archive``. Reading the record at a logical offset, which
+the type index does once per record, then decompresses one frame instead of
+the segment up to that offset. Open readers of recent segments are kept per
+process with their last frame, so walking many offsets of one segment
+decompresses each frame once. Segments rolled before seek tables existed are
+still read, by decompressing from their start.
+
+Readers never see the split: ``iter_log_lines`` walks cold segments and the
+hot file in either direction, and skips any segment whose manifest entry
+proves it cannot contain a match (wrong event types, outside a time range).
+
+Only the stdlib and ``utils.streaming``: this sits on every hook's append
+path.
+"""
+
+import bisect
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .utils.streaming import iter_lines_forward, iter_lines_reverse, map_readonly
+
+#: Bumped whenever the manifest layout changes.
+MANIFEST_VERSION = 1
+
+#: Bytes of a segment head fingerprinted to detect in-place rewrites.
+HEAD_BYTES = 256
+
+#: Uncompressed bytes per independently compressed frame of a segment.
+SEGMENT_FRAME_SIZE = 256 * 1024
+
+#: Frame codec (see ``utils.transcript_archive``) behind each compression.
+FRAME_CODECS = {"gzip": "gzip", "xz": "lzma"}
+
+#: Appended to a compressed segment's name for its seek table.
+SEEK_TABLE_SUFFIX = ".frames"
+
+#: Open readers of framed segments kept per process.
+READER_CACHE_SIZE = 4
+
+
+def _gzip_open(path, mode="rb", **kwargs) -> BinaryIO:
+    import gzip
+    return gzip.open(path, mode, **kwargs)
+
+
+def _xz_open(path, mode="rb", **kwargs) -> BinaryIO:
+    import lzma
+    return lzma.open(path, mode, **kwargs)
+
+
+#: Supported codecs: file suffix and opener. "none" keeps segments raw.
+#: The codec modules load on first use; hooks that never touch a cold
+#: segment don't import them.
+COMPRESSIONS: Dict[str, Tuple[str, Callable[..., BinaryIO]]] = {
+    "gzip": (".gz", _gzip_open),
+    "xz": (".xz", _xz_open),
+    "none": ("", open),
+}
+
+# append_event writes {"timestamp": <float>, "event": "<type>", ...} - read the
+# two leading keys off the raw bytes when summarising a segment, and fall back
+# to a full decode for lines written any other way.
+_LEADING_KEYS = re.compile(rb'^\{"timestamp": ([0-9.eE+-]+), "event": "([^"\\]*)"')
+
+SegmentFilter = Callable[[dict], bool]
+
+
+def get_segments_dir(log_path: Path) -> Path:
+    """Sidecar directory holding cold segments of ``log_path``."""
+    return log_path.parent / (log_path.name + ".segments")
+
+
+#: manifest path -> ((inode, mtime_ns, size), segments)
+_manifests: Dict[str, Tuple[tuple, List[dict]]] = {}
+
+# (log path, segment file, first_offset, inode) -> reader, least recently used first
+_readers: "OrderedDict[tuple, object]" = OrderedDict()
+_readers_lock = threading.Lock()
+
+
+def load_manifest(log_path: Path) -> List[dict]:
+    """Cold segment entries for ``log_path``, oldest first ([] if none).
+
+    Parsed once per process and reused while the manifest file is unchanged
+    (it is only ever replaced whole). The list is shared: don't mutate it.
+    """
+    # Plain string join: this runs once per indexed record lookup.
+    path = os.path.join(f"{log_path}.segments", "manifest.json")
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        print(f"⚠️ MACF: event segment manifest unreadable: {e}", file=sys.stderr)
+        return []
+    stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _manifests.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ MACF: event segment manifest unreadable: {e}", file=sys.stderr)
+        return []
+    segments = manifest.get("segments", []) if isinstance(manifest, dict) else []
+    _manifests[path] = (stamp, segments)
+    return segments
+
+
+def _write_manifest(log_path: Path, segments: List[dict]) -> None:
+    path = get_segments_dir(log_path) / "manifest.json"
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "segments": segments}, f, indent=2)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _flocked(path: Path, blocking: bool = True) -> Iterator[bool]:
+    """Hold an exclusive flock on ``path``; yields False if busy and not ``blocking``."""
+    import fcntl
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def _update_manifest(log_path: Path, update: Callable[[List[dict]], List[dict]]) -> None:
+    """Rewrite the manifest as ``update(current entries)``, one writer at a time.
+
+    A roll (under the append lock) and a compaction (under none) both
+    rewrite it; each re-reads the current entries under ``manifest.lock``,
+    so neither loses the other's change.
+    """
+    with _flocked(get_segments_dir(log_path) / "manifest.lock"):
+        _write_manifest(log_path, update(list(load_manifest(log_path))))
+
+
+def _hot_is_rolled(st: os.stat_result, segments: List[dict]) -> bool:
+    """True if the hot file ``st`` describes is already the newest segment.
+
+    ``roll_segment`` publishes a segment before it swaps in the new, empty
+    hot file. In between, the old hot file sits at the new ``active_base``
+    holding only bytes the segment has, and readers must see it as empty.
+    """
+    if not segments:
+        return False
+    newest = segments[-1]
+    return (newest.get("inode") == st.st_ino
+            and newest["last_offset"] - newest["first_offset"] == st.st_size)
+
+
+def active_base(log_path: Path, segments: Optional[List[dict]] = None) -> int:
+    """Logical offset of the first byte of the hot file."""
+    if segments is None:
+        segments = load_manifest(log_path)
+    return segments[-1]["last_offset"] if segments else 0
+
+
+def logical_size(log_path: Path) -> int:
+    """Logical size of the whole log: cold segments plus the hot file."""
+    segments = load_manifest(log_path)
+    base = active_base(log_path, segments)
+    try:
+        st = log_path.stat()
+    except FileNotFoundError:
+        return base
+    return base if _hot_is_rolled(st, segments) else base + st.st_size
+
+
+def _open_framed(log_path: Path, entry: dict):
+    """``ArchiveReader`` over a compressed segment and its seek table."""
+    from .utils.transcript_archive import ArchiveReader
+
+    path = get_segments_dir(log_path) / entry["file"]
+    with open(path.with_name(path.name + SEEK_TABLE_SUFFIX), "r") as f:
+        footer = json.load(f)
+    return ArchiveReader(path, footer=footer)
+
+
+def _open_entry(log_path: Path, entry: dict) -> BinaryIO:
+    if entry.get("framed"):
+        return io.BufferedReader(_open_framed(log_path, entry), buffer_size=64 * 1024)
+    _, opener = COMPRESSIONS[entry.get("compression", "none")]
+    return opener(get_segments_dir(log_path) / entry["file"], "rb")
+
+
+def _open_live(log_path: Path, entry: dict) -> Tuple[dict, BinaryIO]:
+    """Open ``entry``'s segment, following a compaction that replaced its file.
+
+    Returns:
+        The entry actually opened (the manifest's current one if the raw
+        file was compacted away since ``entry`` was read) and the open file.
+    """
+    try:
+        return entry, _open_entry(log_path, entry)
+    except FileNotFoundError:
+        for current in load_manifest(log_path):
+            if current["seq"] == entry["seq"] and current["file"] != entry["file"]:
+                return current, _open_entry(log_path, current)
+        raise
+
+
+def open_segment(log_path: Path, entry: dict) -> BinaryIO:
+    """Open a cold segment for binary reading, decompressing transparently.
+
+    Segments with a seek table open seekable in O(1); older compressed ones
+    decompress from their start on every backwards or long seek.
+    """
+    return _open_live(log_path, entry)[1]
+
+
+def _cached_reader(log_path: Path, entry: dict):
+    """A kept-open reader of framed ``entry``; hold ``_readers_lock`` while using it."""
+    key = (str(log_path), entry["file"], entry["first_offset"], entry.get("inode"))
+    reader = _readers.get(key)
+    if reader is not None:
+        _readers.move_to_end(key)
+        return reader
+    reader = _readers[key] = _open_framed(log_path, entry)
+    while len(_readers) > READER_CACHE_SIZE:
+        _readers.popitem(last=False)[1].close()
+    return reader
+
+
+# -----------------------------------------------------------------------------
+# Prefix stamps - validating state derived from a prefix of the log
+# -----------------------------------------------------------------------------
+
+def _digest(f: BinaryIO, length: int) -> str:
+    return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def prefix_stamp(log_path: Path, covered: int) -> dict:
+    """Fingerprint of the log up to logical offset ``covered``.
+
+    Anything derived from a prefix of the log (the event index, projection
+    checkpoints) stores this alongside the offset it covers, and checks it
+    with ``stamp_is_prefix`` before trusting that offset again. The stamp
+    names the hot file it was taken against (inode, base offset, head
+    digest), which is what survives that file later being rolled into a
+    segment.
+    """
+    segments = load_manifest(log_path)
+    base = active_base(log_path, segments)
+    if covered <= base and segments:
+        # Covers no hot-file bytes: stamp the cold segment holding its end.
+        for entry in segments:
+            if entry["first_offset"] < covered <= entry["last_offset"] or covered == 0:
+                head_len = min(covered - entry["first_offset"], HEAD_BYTES)
+                with open_segment(log_path, entry) as f:
+                    head = _digest(f, head_len) if head_len else ""
+                return {
+                    "covered": covered,
+                    "base": entry["first_offset"],
+                    "inode": entry.get("inode"),
+                    "head_len": head_len,
+                    "head": head,
+                }
+
+    head_len = max(0, min(covered - base, HEAD_BYTES))
+    with open(log_path, "rb") as f:
+        inode = os.fstat(f.fileno()).st_ino
+        head = _digest(f, head_len) if head_len else ""
+    return {
+        "covered": covered,
+        "base": base,
+        "inode": inode,
+        "head_len": head_len,
+        "head": head,
+    }
+
+
+def stamp_is_prefix(stamp: Optional[dict], log_path: Path) -> bool:
+    """True if the bytes ``stamp`` describes are still a prefix of the log.
+
+    The stamped hot file is either still the hot file (same base and inode,
+    not shorter than the stamp, same head) or has since been rolled into the
+    cold segment that starts at the stamp's base. False when the log was
+    truncated, replaced or rewritten in place — derived state must then be
+    rebuilt from scratch.
+    """
+    if not stamp:
+        return False
+    covered = stamp.get("covered", 0)
+    base = stamp.get("base", 0)
+    head_len = stamp.get("head_len", 0)
+    segments = load_manifest(log_path)
+
+    try:
+        if base == active_base(log_path, segments):
+            with open(log_path, "rb") as f:
+                st = os.fstat(f.fileno())
+                if stamp.get("inode") != st.st_ino or covered - base > st.st_size:
+                    return False
+                return not head_len or _digest(f, head_len) == stamp.get("head")
+
+        for entry in segments:
+            if entry["first_offset"] != base:
+                continue
+            if entry.get("inode") != stamp.get("inode") or covered > entry["last_offset"]:
+                return False
+            if not head_len:
+                return True
+            with open_segment(log_path, entry) as f:
+                return _digest(f, head_len) == stamp.get("head")
+    except OSError as e:
+        print(f"⚠️ MACF: event log stamp check failed: {e}", file=sys.stderr)
+    return False
+
+
+# -----------------------------------------------------------------------------
+# Reading across segments
+# -----------------------------------------------------------------------------
+
+def iter_raw_lines(
+    log_path: Path,
+    start: int = 0,
+    end: Optional[int] = None,
+    segment_filter: Optional[SegmentFilter] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(logical_offset, line)`` for complete lines from ``start`` on.
+
+    Walks cold segments then the hot file, oldest first. Lines keep their
+    trailing newline; a partial trailing line in the hot file (a writer
+    mid-append) is not yielded. ``start`` must fall on a line boundary, and
+    so must ``end`` if given (lines at or past it are not yielded). Cold
+    segments rejected by ``segment_filter`` are skipped unread.
+    """
+    segments = load_manifest(log_path)
+    for entry in segments:
+        if entry["last_offset"] <= start:
+            continue
+        if end is not None and entry["first_offset"] >= end:
+            return
+        if segment_filter is not None and not segment_filter(entry):
+            continue
+        with open_segment(log_path, entry) as f:
+            position = max(start, entry["first_offset"])
+            f.seek(position - entry["first_offset"])
+            for line in f:
+                if not line.endswith(b"\n") or (end is not None and position >= end):
+                    break
+                yield position, line
+                position += len(line)
+
+    base = active_base(log_path, segments)
+    if end is not None and end <= base:
+        return
+    try:
+        f = open(log_path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        if load_manifest(log_path) != segments:
+            # Rolled while we were reading the cold segments: the file just
+            # opened is a new hot file. Resume from where the segments ended.
+            f.close()
+            yield from iter_raw_lines(log_path, max(start, base), end, segment_filter)
+            return
+        if _hot_is_rolled(os.fstat(f.fileno()), segments):
+            return
+        position = max(start, base)
+        f.seek(position - base)
+        for line in f:
+            if not line.endswith(b"\n") or (end is not None and position >= end):
+                break
+            yield position, line
+            position += len(line)
+
+
+def _iter_range_reverse(
+    f: BinaryIO,
+    base: int,
+    lo: int,
+    hi: int,
+    chunk_size: int = 65536,
+) -> Iterator[Tuple[int, bytes]]:
+    """Complete lines of ``f`` between ``lo`` and ``hi``, newest-first.
+
+    Yields ``(base + position, line)``. ``lo`` must fall on a line boundary;
+    bytes after the last newline before ``hi`` are a partial line and are
+    dropped. Memory is O(chunk_size + max_line_size).
+    """
+    mapping = map_readonly(f)
+    if mapping is not None:
+        with mapping:
+            hi = min(hi, len(mapping))
+            end = mapping.rfind(b"\n", lo, hi) + 1
+            while end > lo:
+                newline = mapping.rfind(b"\n", lo, end - 1)
+                start = newline + 1 if newline >= 0 else lo
+                yield base + start, mapping[start:end]
+                end = start
+        return
+
+    # ``pending`` is the head of the region already read: the tail of a line
+    # that starts further back, newline included.
+    pending = b""
+    complete = False
+    position = hi
+    while position > lo:
+        step = min(chunk_size, position - lo)
+        position -= step
+        f.seek(position)
+        block = f.read(step) + pending
+        if not complete:
+            cut = block.rfind(b"\n") + 1
+            if not cut:
+                pending = b""
+                continue
+            block, complete = block[:cut], True
+        parts = block.split(b"\n")
+        line_end = position + len(block)
+        for part in reversed(parts[1:-1]):
+            line_end -= len(part) + 1
+            yield base + line_end, part + b"\n"
+        pending = parts[0] + b"\n"
+    if complete and pending:
+        yield base + lo, pending
+
+
+def _iter_frames_reverse(reader, base: int, lo: int, hi: int) -> Iterator[Tuple[int, bytes]]:
+    """``_iter_range_reverse`` over a framed segment, one frame at a time.
+
+    Walks the seek table from the frame holding ``hi`` back to the one
+    holding ``lo``, decompressing each frame once. A line that starts in an
+    earlier frame is carried over and completed there.
+    """
+    if hi <= lo:
+        return
+    starts = reader._starts
+    n = bisect.bisect_right(starts, hi - 1) - 1
+    carry = b""
+    complete = False
+    while n >= 0:
+        frame_start = starts[n]
+        skip = max(lo - frame_start, 0)
+        block = reader.frame(n)[skip:hi - frame_start] + carry
+        if not complete:
+            # Bytes after the last newline before ``hi`` are a partial line.
+            cut = block.rfind(b"\n") + 1
+            block, complete = block[:cut], cut > 0
+        origin = frame_start + skip
+        if frame_start <= lo:
+            head = 0
+        else:
+            newline = block.find(b"\n")
+            head = len(block) if newline < 0 else newline + 1
+        end = len(block)
+        while end > head:
+            newline = block.rfind(b"\n", head, end - 1)
+            start = newline + 1 if newline >= 0 else head
+            yield base + origin + start, block[start:end]
+            end = start
+        if frame_start <= lo:
+            return
+        carry = block[:head]
+        n -= 1
+
+
+def iter_raw_lines_reverse(
+    log_path: Path,
+    start: int = 0,
+    end: Optional[int] = None,
+    segment_filter: Optional[SegmentFilter] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """Reverse peer of ``iter_raw_lines``: complete lines newest-first.
+
+    Covers logical offsets ``[start, end)`` (``end=None`` means EOF); both
+    bounds must fall on line boundaries. The hot file and raw segments are
+    read backwards in place, as are framed compressed segments (one frame
+    at a time); an older compressed segment has the needed range spilled to
+    a temporary file once, like ``iter_log_lines`` does.
+    """
+    segments = load_manifest(log_path)
+    base = active_base(log_path, segments)
+    if end is None or end > base:
+        try:
+            f = open(log_path, "rb")
+        except FileNotFoundError:
+            pass
+        else:
+            with f:
+                if load_manifest(log_path) != segments:
+                    # Rolled between the manifest read and the open.
+                    f.close()
+                    yield from iter_raw_lines_reverse(log_path, start, end, segment_filter)
+                    return
+                st = os.fstat(f.fileno())
+                size = 0 if _hot_is_rolled(st, segments) else st.st_size
+                hi = size if end is None else min(size, end - base)
+                yield from _iter_range_reverse(f, base, max(start, base) - base, hi)
+
+    for entry in reversed(segments):
+        first, last = entry["first_offset"], entry["last_offset"]
+        if (end is not None and first >= end) or last <= start:
+            continue
+        if segment_filter is not None and not segment_filter(entry):
+            continue
+        lo = max(start, first) - first
+        hi = (last if end is None else min(end, last)) - first
+        entry, f = _open_live(log_path, entry)
+        if entry.get("framed"):
+            with f:
+                yield from _iter_frames_reverse(f.raw, first, lo, hi)
+            continue
+        if entry.get("compression", "none") == "none":
+            with f:
+                yield from _iter_range_reverse(f, first, lo, hi)
+            continue
+        import tempfile
+        with tempfile.TemporaryFile(prefix="macf_segment_") as tmp:
+            with f:
+                f.seek(lo)
+                remaining = hi - lo
+                while remaining > 0:
+                    chunk = f.read(min(remaining, 1 << 20))
+                    if not chunk:
+                        break
+                    tmp.write(chunk)
+                    remaining -= len(chunk)
+            yield from _iter_range_reverse(tmp, first + lo, 0, tmp.tell())
+
+
+def read_line_at(log_path: Path, offset: int) -> bytes:
+    """Raw line starting at logical ``offset`` (b"" if out of range).
+
+    In a framed segment this decompresses at most one frame, none when it
+    is the frame the previous lookup in that segment read.
+    """
+    segments = load_manifest(log_path)
+    for entry in segments:
+        if entry["first_offset"] <= offset < entry["last_offset"]:
+            if entry.get("framed"):
+                with _readers_lock:
+                    return _cached_reader(log_path, entry).line_at(offset - entry["first_offset"])
+            with open_segment(log_path, entry) as f:
+                f.seek(offset - entry["first_offset"])
+                return f.readline()
+    base = active_base(log_path, segments)
+    if offset < base:
+        return b""
+    with open(log_path, "rb") as f:
+        if load_manifest(log_path) != segments:
+            return read_line_at(log_path, offset)  # rolled since the manifest read
+        if _hot_is_rolled(os.fstat(f.fileno()), segments):
+            return b""
+        f.seek(offset - base)
+        return f.readline()
+
+
+def _iter_segment_lines(
+    log_path: Path,
+    entry: dict,
+    reverse: bool,
+    encoding: str,
+) -> Iterator[str]:
+    entry, f = _open_live(log_path, entry)
+    if not reverse:
+        with f:
+            for raw in f:
+                yield raw.decode(encoding, errors="replace")
+        return
+
+    if entry.get("framed"):
+        with f:
+            for _, raw in _iter_frames_reverse(f.raw, 0, 0, f.raw.raw_size):
+                yield raw[:-1].decode(encoding, errors="replace")
+        return
+    if entry.get("compression", "none") == "none":
+        with f:
+            for _, raw in _iter_range_reverse(f, 0, 0, os.fstat(f.fileno()).st_size):
+                yield raw[:-1].decode(encoding, errors="replace")
+        return
+
+    # A compressed segment from before seek tables cannot be read backwards.
+    # Spill it to a temporary file so the reverse reader keeps its bounded
+    # memory.
+    import shutil
+    import tempfile
+
+    with tempfile.NamedTemporaryFile(prefix="macf_segment_", suffix=".jsonl") as tmp:
+        with f:
+            shutil.copyfileobj(f, tmp)
+        tmp.flush()
+        yield from iter_lines_reverse(tmp.name, encoding=encoding)
+
+
+def iter_log_lines(
+    log_path: Path,
+    reverse: bool = True,
+    segment_filter: Optional[SegmentFilter] = None,
+    encoding: str = "utf-8",
+) -> Iterator[str]:
+    """Yield decoded lines across every segment of the log.
+
+    Same line contract as ``utils.streaming``: reverse lines are stripped of
+    their newline, forward lines keep it. Cold segments for which
+    ``segment_filter(entry)`` is False are skipped unread — pass one built
+    from the query (see ``segment_may_match``) to prune by the manifest.
+    """
+    manifest = load_manifest(log_path)
+    segments = [entry for entry in manifest if segment_filter is None or segment_filter(entry)]
+    try:
+        hot = not _hot_is_rolled(log_path.stat(), manifest)
+    except FileNotFoundError:
+        hot = False
+
+    if reverse:
+        if hot:
+            yield from iter_lines_reverse(log_path, encoding=encoding)
+        for entry in reversed(segments):
+            yield from _iter_segment_lines(log_path, entry, True, encoding)
+        return
+
+    for entry in segments:
+        yield from _iter_segment_lines(log_path, entry, False, encoding)
+    if hot:
+        yield from iter_lines_forward(log_path, encoding=encoding)
+
+
+def segment_may_match(
+    entry: dict,
+    event_types: Optional[List[str]] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> bool:
+    """False only when the manifest proves ``entry`` holds no matching event.
+
+    Args:
+        entry: Manifest entry of a cold segment
+        event_types: Wanted event types (None = any)
+        since: Wanted events strictly after this timestamp
+        until: Wanted events strictly before this timestamp
+    """
+    if event_types is not None:
+        counts = entry.get("event_counts", {})
+        if not any(counts.get(t) for t in event_types):
+            return False
+    min_ts, max_ts = entry.get("min_timestamp"), entry.get("max_timestamp")
+    if since is not None and max_ts is not None and max_ts <= since:
+        return False
+    if until is not None and min_ts is not None and min_ts >= until:
+        return False
+    return True
+
+
+# -----------------------------------------------------------------------------
+# Rolling
+# -----------------------------------------------------------------------------
+
+def _summarise(path: Path) -> dict:
+    """Record count, event-type counts and time range of a raw segment."""
+    counts: Dict[str, int] = {}
+    records = 0
+    min_ts: Optional[float] = None
+    max_ts: Optional[float] = None
+    with open(path, "rb") as f:
+        for line in f:
+            match = _LEADING_KEYS.match(line)
+            if match:
+                timestamp, event_type = float(match.group(1)), match.group(2).decode()
+            else:
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                event_type = str(record.get("event", "unknown"))
+                timestamp = record.get("timestamp")
+                if not isinstance(timestamp, (int, float)):
+                    timestamp = None
+            records += 1
+            counts[event_type] = counts.get(event_type, 0) + 1
+            if timestamp is not None:
+                min_ts = timestamp if min_ts is None else min(min_ts, timestamp)
+                max_ts = timestamp if max_ts is None else max(max_ts, timestamp)
+    return {
+        "records": records,
+        "event_counts": counts,
+        "min_timestamp": min_ts,
+        "max_timestamp": max_ts,
+    }
+
+
+def roll_segment(log_path: Path, compression: str = "gzip") -> Optional[dict]:
+    """Move the hot file into a cold segment, compressed later.
+
+    The caller MUST hold the append lock on the hot file (``append_event``
+    does), so no writer can land a record in the file being moved. Writers
+    that opened the old file before the roll detect the inode change after
+    taking the lock and reopen (see ``append_event``).
+
+    Readers take no lock, so every step leaves the log readable: the hot
+    file is hard-linked into the segments directory and summarised, its
+    manifest entry is published (readers then skip the old hot file, see
+    ``_hot_is_rolled``), and only then is an empty hot file swapped in.
+
+    The segment is published raw. A ``compression`` other than "none" is
+    recorded as ``pending_compression`` for ``compact_segments`` to carry
+    out once the caller has released the lock.
+
+    Args:
+        log_path: Hot file of the event log
+        compression: "gzip", "xz" or "none"
+
+    Returns:
+        The new manifest entry, or None if the hot file was empty/missing.
+    """
+    if compression not in COMPRESSIONS:
+        print(f"⚠️ MACF: unknown segment compression {compression!r}, using gzip", file=sys.stderr)
+        compression = "gzip"
+
+    try:
+        st = log_path.stat()
+    except FileNotFoundError:
+        return None
+    if st.st_size == 0:
+        return None
+
+    segments_dir = get_segments_dir(log_path)
+    segments_dir.mkdir(mode=0o700, exist_ok=True)
+    # Only a roll appends entries, and rolls are serialised by the append
+    # lock, so the newest entry cannot change under us.
+    segments = load_manifest(log_path)
+    seq = segments[-1]["seq"] + 1 if segments else 1
+    base = active_base(log_path, segments)
+
+    raw_path = segments_dir / f"{seq:06d}.jsonl"
+    raw_path.unlink(missing_ok=True)  # left by a roll that died before publishing
+    try:
+        os.link(log_path, raw_path)
+    except OSError:
+        import shutil
+        shutil.copyfile(log_path, raw_path)
+        os.chmod(raw_path, 0o600)
+
+    with open(raw_path, "rb") as f:
+        head = f.read(HEAD_BYTES)
+    entry = {
+        "seq": seq,
+        "file": raw_path.name,
+        "compression": "none",
+        "first_offset": base,
+        "last_offset": base + st.st_size,
+        "inode": st.st_ino,
+        "head": hashlib.sha1(head).hexdigest(),
+    }
+    entry.update(_summarise(raw_path))
+    if compression != "none":
+        entry["pending_compression"] = compression
+    _update_manifest(log_path, lambda current: current + [entry])
+    _replace_hot_file(log_path)
+    return entry
+
+
+def _compress_segment(log_path: Path, entry: dict) -> Optional[dict]:
+    """Compress raw segment ``entry`` into frames and publish it; None on failure."""
+    from .utils.transcript_archive import write_frames
+
+    compression = entry["pending_compression"]
+    raw_path = get_segments_dir(log_path) / entry["file"]
+    suffix, _ = COMPRESSIONS[compression]
+    packed = raw_path.with_name(raw_path.name + suffix)
+    table = packed.with_name(packed.name + SEEK_TABLE_SUFFIX)
+    try:
+        with open(raw_path, "rb") as src, open(packed, "wb") as dst:
+            footer = write_frames(src, dst, FRAME_CODECS[compression], SEGMENT_FRAME_SIZE)
+        with open(table, "w") as f:
+            json.dump(footer, f)
+        os.chmod(packed, 0o600)
+        os.chmod(table, 0o600)
+    except OSError as e:
+        # The raw segment stays published and fully readable; the next
+        # compaction tries again.
+        print(f"⚠️ MACF: segment compression failed, kept raw: {e}", file=sys.stderr)
+        packed.unlink(missing_ok=True)
+        table.unlink(missing_ok=True)
+        return None
+
+    packed_entry = {k: v for k, v in entry.items() if k != "pending_compression"}
+    packed_entry.update(file=packed.name, compression=compression, framed=True)
+    _update_manifest(log_path, lambda current: [
+        packed_entry if e["seq"] == entry["seq"] else e for e in current
+    ])
+    raw_path.unlink()
+    return packed_entry
+
+
+def compact_segments(log_path: Path) -> List[dict]:
+    """Compress every segment still marked ``pending_compression``.
+
+    Holds no append lock: segments are immutable once published, and each
+    compressed one is swapped into the manifest with its own rewrite. Only
+    one compaction runs at a time; a second returns at once.
+
+    Returns:
+        The manifest entries of the segments compressed.
+    """
+    segments_dir = get_segments_dir(log_path)
+    if not segments_dir.is_dir():
+        return []
+    done = []
+    with _flocked(segments_dir / "compact.lock", blocking=False) as acquired:
+        if not acquired:
+            return []
+        for entry in load_manifest(log_path):
+            if entry.get("pending_compression") and entry.get("compression", "none") == "none":
+                packed = _compress_segment(log_path, entry)
+                if packed is not None:
+                    done.append(packed)
+    return done
+
+
+def spawn_compaction(log_path: Path) -> None:
+    """Run ``compact_segments`` in a detached child, off the caller's path."""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "macf.event_segments", "compact", str(log_path)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        print(f"⚠️ MACF: could not start segment compaction: {e}", file=sys.stderr)
+
+
+def _replace_hot_file(log_path: Path) -> None:
+    """Atomically swap an empty file in as the hot file.
+
+    The path never goes missing, so stamps and tails always have a file to
+    address.
+    """
+    tmp = log_path.with_name(f".{log_path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.close(fd)
+    os.replace(tmp, log_path)
+
+
+__all__ = [
+    "COMPRESSIONS",
+    "active_base",
+    "compact_segments",
+    "get_segments_dir",
+    "iter_log_lines",
+    "iter_raw_lines",
+    "iter_raw_lines_reverse",
+    "load_manifest",
+    "logical_size",
+    "open_segment",
+    "prefix_stamp",
+    "read_line_at",
+    "roll_segment",
+    "segment_may_match",
+    "spawn_compaction",
+    "stamp_is_prefix",
+]
+
+
+if __name__ == "__main__":
+    # python -m macf.event_segments compact <log path>  (see spawn_compaction)
+    if len(sys.argv) == 3 and sys.argv[1] == "compact":
+        compact_segments(Path(sys.argv[2]))
+    else:
+        sys.exit("usage: python -m macf.event_segments compact LOG_PATH")
@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from ..utils import get_session_transcript_path, parse_breadcrumb
+from ..utils.transcript_archive import open_transcript
 
 
 @dataclass
@@ -76,9 +77,9 @@ def extract_dev_drive(
         if not jsonl_path.exists():
             return None
 
-        # Load all JSONL entries
+        # Load all JSONL entries (archived transcripts read transparently)
         entries = []
-        with open(jsonl_path, 'r') as f:
+        with open_transcript(jsonl_path, 'r') as f:
             for line in f:
                 line = line.strip()
                 if not line:
@@ -0,0 +1,350 @@
+"""
+Transcript FTS - full-text index over every session transcript (SQLite FTS5).
+
+Breadcrumb search finds a message when you already know its coordinates.
+Finding "where did we decide X" meant grepping gigabytes of JSONL. This
+module keeps one SQLite database of the user and assistant text, and the
+names of the tools each assistant turn called, from every transcript::
+
+    {agent_home}/.maceff/transcript_index/fts.sqlite3
+        files      path, inode, covered offset, line count, head digest,
+                   session id, current prompt uuid
+        messages   FTS5 (text, tools) + role, session, uuid, prompt uuid,
+                   timestamp, path, line
+
+Ingest is incremental: each file resumes from the byte offset stored for it,
+and only complete appended lines are read. A transcript that was replaced,
+truncated or rewritten in place (inode, size or head digest disagree) has
+its rows dropped and is read again from the start. ``ingest_transcript`` is
+fed by ``macf_tools transcripts index`` and by the transcript monitor.
+
+Hits carry a breadcrumb (``s_/c_/p_/t_``) built from the message's session,
+the user prompt it answered, its time and the cycle in force then, so
+``macf_tools transcripts search <breadcrumb>`` opens the surrounding window.
+
+``MACF_TRANSCRIPT_FTS=0`` stops the transcript monitor feeding the index.
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..utils.transcript_archive import open_transcript, session_id_of, transcript_stat
+from .transcript_index import HEAD_BYTES, _head_digest, get_transcript_index_root
+
+#: Bumped whenever the schema changes; a mismatch drops and rebuilds the index.
+SCHEMA_VERSION = 1
+
+DB_NAME = "fts.sqlite3"
+
+#: Rows inserted per executemany batch during ingest.
+_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    inode INTEGER,
+    covered INTEGER NOT NULL DEFAULT 0,
+    lines INTEGER NOT NULL DEFAULT 0,
+    head_len INTEGER NOT NULL DEFAULT 0,
+    head TEXT,
+    session_id TEXT,
+    prompt_uuid TEXT,
+    indexed_at REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5(
+    text, tools,
+    role UNINDEXED, session_id UNINDEXED, uuid UNINDEXED, prompt_uuid UNINDEXED,
+    ts UNINDEXED, path UNINDEXED, line UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+@dataclass
+class TextHit:
+    """One ranked full-text match."""
+    path: str
+    line: int
+    role: str
+    session_id: str
+    uuid: Optional[str]
+    prompt_uuid: Optional[str]
+    timestamp: str
+    snippet: str
+    score: float
+    breadcrumb: str = ""
+
+
+def get_fts_db_path() -> Path:
+    """The FTS database (beside the per-transcript offset indexes)."""
+    return get_transcript_index_root() / DB_NAME
+
+
+def fts_available() -> bool:
+    """True if this Python's SQLite was built with FTS5."""
+    try:
+        with closing(sqlite3.connect(":memory:")) as conn:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def message_text(entry: dict) -> Tuple[str, str]:
+    """``(text, tool names)`` worth indexing for one transcript entry.
+
+    User and assistant text blocks (or plain string content) and the names
+    of ``tool_use`` blocks. Tool results and other entry types give nothing.
+    """
+    if entry.get("type") not in ("user", "assistant"):
+        return "", ""
+    message = entry.get("message")
+    content = message.get("content") if isinstance(message, dict) else None
+    if isinstance(content, str):
+        return content.strip(), ""
+    texts, tools = [], []
+    if isinstance(content, list):
+        for block in content:
+            if not isinstance(block, dict):
+                continue
+            if block.get("type") == "text" and block.get("text"):
+                texts.append(block["text"])
+            elif block.get("type") == "tool_use" and block.get("name"):
+                tools.append(block["name"])
+    return "\n".join(texts).strip(), " ".join(tools)
+
+
+def _is_prompt(entry: dict, text: str) -> bool:
+    """A user-typed prompt (what a breadcrumb's ``p_`` names)."""
+    return (entry.get("type") == "user" and bool(text)
+            and not entry.get("isMeta") and not entry.get("isCompactSummary")
+            and "toolUseResult" not in entry)
+
+
+def _epoch(timestamp: str) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+def to_match_query(text: str) -> str:
+    """FTS5 query matching every word of ``text`` (quoted, so no syntax errors)."""
+    words = [w.replace('"', '""') for w in text.split()]
+    return " ".join(f'"{w}"' for w in words if w)
+
+
+class TranscriptFTS:
+    """Full-text index over session transcripts.
+
+    Args:
+        db_path: SQLite database (default ``get_fts_db_path()``).
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else get_fts_db_path()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the database, creating or migrating the schema as needed."""
+        self.db_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.executescript("DROP TABLE IF EXISTS messages; DROP TABLE IF EXISTS files;")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    # -- ingest --------------------------------------------------------------
+
+    def ingest_transcript(self, path: Path, conn: Optional[sqlite3.Connection] = None) -> int:
+        """Index the lines appended to ``path`` since its last ingest.
+
+        Returns:
+            Number of messages added.
+        """
+        if conn is None:
+            with closing(self.connect()) as conn:
+                return self.ingest_transcript(path, conn)
+
+        path = Path(path)
+        key = str(path)
+        row = conn.execute(
+            "SELECT inode, covered, lines, head_len, head, prompt_uuid FROM files WHERE path = ?",
+            (key,),
+        ).fetchone()
+        added = 0
+        with open_transcript(path, "rb") as f, conn:
+            inode, size = transcript_stat(f)
+            if row and not (row[0] == inode and row[1] <= size
+                            and _head_digest(f, row[3]) == row[4]):
+                conn.execute("DELETE FROM messages WHERE path = ?", (key,))
+                row = None
+            position, lines, prompt_uuid = (row[1], row[2], row[5]) if row else (0, 0, None)
+            if row and position == size:
+                return 0
+
+            session_id = session_id_of(path)
+            batch = []
+            f.seek(position)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                line_no = lines
+                position += len(raw)
+                lines += 1
+                if b'"user"' not in raw and b'"assistant"' not in raw:
+                    continue
+                try:
+                    entry = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                text, tools = message_text(entry)
+                if not text and not tools:
+                    continue
+                uuid = entry.get("uuid") if isinstance(entry.get("uuid"), str) else None
+                if _is_prompt(entry, text):
+                    prompt_uuid = uuid
+                session_id = entry.get("sessionId") or session_id
+                batch.append((text, tools, entry.get("type"), session_id, uuid, prompt_uuid,
+                              str(entry.get("timestamp") or ""), key, line_no))
+                if len(batch) >= _BATCH:
+                    added += self._insert(conn, batch)
+            added += self._insert(conn, batch)
+
+            head_len = min(position, HEAD_BYTES)
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, inode, covered, lines, head_len, head,"
+                " session_id, prompt_uuid, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, inode, position, lines, head_len, _head_digest(f, head_len),
+                 session_id, prompt_uuid, time.time()),
+            )
+        return added
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, keep: set) -> int:
+        gone = [row[0] for row in conn.execute("SELECT path FROM files") if row[0] not in keep]
+        with conn:
+            for path in gone:
+                conn.execute("DELETE FROM messages WHERE path = ?", (path,))
+                conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        return len(gone)
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, batch: list) -> int:
+        count = len(batch)
+        if batch:
+            conn.executemany(
+                "INSERT INTO messages (text, tools, role, session_id, uuid, prompt_uuid, ts, path, line)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            batch.clear()
+        return count
+
+    def ingest(self, paths: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Ingest ``paths`` (default: every transcript); returns a summary.
+
+        A full ingest also drops the rows of transcripts that no longer exist
+        (deleted, or replaced by their archive).
+        """
+        from .transcript_search import list_all_transcripts
+
+        started = time.perf_counter()
+        summary = {"files": 0, "updated": 0, "messages": 0, "errors": 0, "pruned": 0}
+        with closing(self.connect()) as conn:
+            if paths is None:
+                paths = list_all_transcripts()
+                summary["pruned"] = self._prune(conn, set(paths))
+            for path in paths:
+                summary["files"] += 1
+                try:
+                    added = self.ingest_transcript(Path(path), conn)
+                except (OSError, ValueError, sqlite3.Error) as e:
+                    import sys
+                    print(f"⚠️ MACF: transcript FTS ingest failed for {path}: {e}", file=sys.stderr)
+                    summary["errors"] += 1
+                    continue
+                summary["updated"] += bool(added)
+                summary["messages"] += added
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return summary
+
+    # -- queries -------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        session: Optional[str] = None,
+        raw: bool = False,
+    ) -> List[TextHit]:
+        """Best ``limit`` hits for ``query``, most relevant first.
+
+        Args:
+            query: Words that must all appear (``raw=True``: FTS5 query syntax)
+            limit: Maximum hits
+            session: Only hits whose session id starts with this
+            raw: Pass ``query`` to FTS5 unchanged (phrases, OR, NEAR, prefix*)
+        """
+        match = query if raw else to_match_query(query)
+        if not match or not self.db_path.exists():
+            return []
+        sql = (
+            "SELECT path, line, role, session_id, uuid, prompt_uuid, ts,"
+            " snippet(messages, 0, '[', ']', '…', 12), bm25(messages)"
+            " FROM messages WHERE messages MATCH ?"
+        )
+        params: list = [match]
+        if session:
+            sql += " AND session_id LIKE ? ESCAPE '\\'"
+            params.append(session.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        sql += " ORDER BY bm25(messages) LIMIT ?"
+        params.append(limit)
+        with closing(self.connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        hits = [TextHit(*row[:7], snippet=row[7], score=round(-row[8], 3)) for row in rows]
+        _attach_breadcrumbs(hits)
+        return hits
+
+
+def _attach_breadcrumbs(hits: List[TextHit]) -> None:
+    """Fill in each hit's breadcrumb, dating it into a cycle via the event log."""
+    if not hits:
+        return
+    from ..event_queries import get_cycle_timeline_from_events
+    from ..utils.breadcrumbs import format_breadcrumb
+
+    try:
+        timeline = get_cycle_timeline_from_events()
+    except (OSError, ValueError):
+        timeline = []
+    for hit in hits:
+        epoch = _epoch(hit.timestamp)
+        cycle = next((c for ts, c in timeline if epoch is not None and ts <= epoch), 1)
+        hit.breadcrumb = format_breadcrumb(cycle, hit.session_id, hit.prompt_uuid, completion_time=epoch)
+
+
+def ingest_transcript(path: Path) -> int:
+    """Incrementally index one transcript into the default database."""
+    return TranscriptFTS().ingest_transcript(Path(path))
+
+
+__all__ = [
+    "TextHit",
+    "TranscriptFTS",
+    "fts_available",
+    "get_fts_db_path",
+    "ingest_transcript",
+    "message_text",
+    "to_match_query",
+    "SCHEMA_VERSION",
+]
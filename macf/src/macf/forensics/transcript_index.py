@@ -0,0 +1,270 @@
+"""
+Transcript Index - byte-offset sidecar for Claude Code session transcripts.
+
+Finding a breadcrumb's message used to parse a transcript line by line until
+the uuid turned up, and extracting the ±N messages around it parsed the
+whole file again, materializing every message. Transcripts run to hundreds
+of MB, so one lookup cost seconds.
+
+This module keeps, per transcript, a sidecar under the agent home::
+
+    {agent_home}/.maceff/transcript_index/<session_id>-<path hash>/
+        meta.json     {"version", "path", "covered", "inode", "head", "messages", ...}
+        offsets.bin   per message: packed uint64 (byte offset, line number)
+        uuids.txt     per message: its uuid (empty when it has none), one per line
+
+A message is any line holding a JSON object; its ordinal is its position
+among those. ``uuids.txt`` maps a uuid (or the truncated prefix a breadcrumb
+carries) to an ordinal with a single ``bytes.find``; ``offsets.bin`` maps an
+ordinal to its line with one 16-byte read. A lookup plus a window therefore
+reads O(window) transcript lines.
+
+Like the event index, the sidecar is a pure function of the transcript
+bytes. ``sync()`` indexes the complete lines appended since the last covered
+offset and rebuilds from scratch when the transcript no longer matches
+(replaced, truncated or rewritten in place), so a stale index is never
+wrong — only temporarily slower. The index lives outside
+``~/.claude/projects`` so Claude Code's own directory is never written to.
+Archived transcripts (``*.jsonl.fz``) are indexed by uncompressed offset and
+read through ``open_transcript``, so a lookup decompresses only the frames
+holding its window.
+
+``MACF_TRANSCRIPT_INDEX=0`` disables the index; callers then scan.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from ..utils.transcript_archive import open_transcript, transcript_stat
+
+#: Bumped whenever the on-disk layout changes; a mismatch forces a rebuild.
+INDEX_VERSION = 1
+
+#: Leading transcript bytes fingerprinted to detect an in-place rewrite.
+HEAD_BYTES = 4096
+
+#: One message: byte offset of its line, and the line's number.
+_ENTRY = struct.Struct("<QQ")
+
+
+def get_transcript_index_root() -> Path:
+    """Directory holding every transcript's sidecar (under the agent home)."""
+    from ..utils.paths import find_agent_home
+
+    return find_agent_home() / ".maceff" / "transcript_index"
+
+
+def _head_digest(f, length: int) -> str:
+    f.seek(0)
+    return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+def _message_uuid(line: bytes) -> Optional[bytes]:
+    """The uuid of one transcript line, b"" if it has none, None if not a message."""
+    try:
+        entry = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(entry, dict):
+        return None
+    uuid = entry.get("uuid")
+    if not isinstance(uuid, str):
+        return b""
+    return uuid.replace("\n", "").encode("utf-8", errors="replace")
+
+
+class TranscriptIndex:
+    """Byte-offset index over one session transcript.
+
+    Args:
+        transcript_path: The JSONL transcript being indexed.
+        root: Directory holding the sidecars (default
+            ``get_transcript_index_root()``).
+    """
+
+    def __init__(self, transcript_path: Path, root: Optional[Path] = None):
+        self.transcript_path = Path(transcript_path)
+        path_hash = hashlib.blake2b(
+            str(self.transcript_path.absolute()).encode(), digest_size=4
+        ).hexdigest()
+        self.index_dir = (root or get_transcript_index_root()) / f"{self.transcript_path.stem}-{path_hash}"
+
+    # -- maintenance ---------------------------------------------------------
+
+    def _meta_path(self) -> Path:
+        return self.index_dir / "meta.json"
+
+    def _offsets_path(self) -> Path:
+        return self.index_dir / "offsets.bin"
+
+    def _uuids_path(self) -> Path:
+        return self.index_dir / "uuids.txt"
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._meta_path(), "r") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ MACF: transcript index meta unreadable, rebuilding: {e}", file=sys.stderr)
+            return None
+        return meta if isinstance(meta, dict) else None
+
+    def _write_meta(self, meta: dict) -> None:
+        tmp = self._meta_path().with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path())
+
+    def sync(self) -> bool:
+        """Bring the index up to date with the transcript.
+
+        Indexes every complete line between the last covered offset and
+        EOF; a trailing partial line (Claude Code mid-append) waits for the
+        next sync. Rebuilds from offset 0 when the transcript was replaced,
+        truncated or rewritten since the index was built.
+
+        Returns:
+            True if the index now covers the transcript, False if it could
+            not be maintained (callers then fall back to scanning).
+        """
+        if not self.transcript_path.is_file():
+            return False
+        try:
+            self.index_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(self.index_dir / "lock", "a") as lock:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                try:
+                    return self._sync_locked()
+                finally:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ MACF: transcript index sync failed: {e}", file=sys.stderr)
+            return False
+
+    def _sync_locked(self) -> bool:
+        with open_transcript(self.transcript_path, "rb") as f:
+            inode, size = transcript_stat(f)
+            meta = self._read_meta()
+            if not (meta and meta.get("version") == INDEX_VERSION
+                    and meta.get("inode") == inode
+                    and meta.get("covered", 0) <= size
+                    and _head_digest(f, meta.get("head_len", 0)) == meta.get("head")):
+                meta = {"version": INDEX_VERSION, "path": str(self.transcript_path),
+                        "covered": 0, "lines": 0, "messages": 0, "uuid_bytes": 0}
+            if meta["covered"] == size and "inode" in meta:
+                return True
+
+            entries = bytearray()
+            uuids = bytearray()
+            position, lines, messages = meta["covered"], meta["lines"], meta["messages"]
+            f.seek(position)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                uuid = _message_uuid(line)
+                if uuid is not None:
+                    entries += _ENTRY.pack(position, lines)
+                    uuids += uuid + b"\n"
+                    messages += 1
+                position += len(line)
+                lines += 1
+
+            # Truncate to what meta vouches for first, so a sync killed
+            # between the appends and the meta write leaves no duplicates.
+            for path, length, data in (
+                (self._offsets_path(), meta["messages"] * _ENTRY.size, entries),
+                (self._uuids_path(), meta["uuid_bytes"], uuids),
+            ):
+                with open(path, "ab") as out:
+                    out.truncate(length)
+                    out.write(data)
+
+            head_len = min(position, HEAD_BYTES)
+            meta.update(
+                covered=position, lines=lines, messages=messages,
+                uuid_bytes=meta["uuid_bytes"] + len(uuids),
+                inode=inode, head_len=head_len, head=_head_digest(f, head_len),
+            )
+        self._write_meta(meta)
+        return True
+
+    def rebuild(self) -> bool:
+        """Discard the index and rebuild it from the whole transcript."""
+        import shutil
+
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+        return self.sync()
+
+    # -- lookups -------------------------------------------------------------
+
+    def messages(self) -> int:
+        """Number of indexed messages (as of the last sync)."""
+        meta = self._read_meta()
+        return meta.get("messages", 0) if meta else 0
+
+    def find_uuid(self, fragment: str) -> Optional[int]:
+        """Ordinal of the first message whose uuid contains ``fragment``."""
+        meta = self._read_meta()
+        if not fragment or not meta:
+            return None
+        try:
+            with open(self._uuids_path(), "rb") as f:
+                uuids = f.read(meta["uuid_bytes"])
+        except FileNotFoundError:
+            return None
+        found = uuids.find(fragment.encode())
+        if found < 0:
+            return None
+        return uuids.count(b"\n", 0, found)
+
+    def entries(self, start: int, stop: int) -> List[Tuple[int, int]]:
+        """``(byte offset, line number)`` of messages ``start`` to ``stop - 1``."""
+        start = max(start, 0)
+        stop = min(stop, self.messages())
+        if start >= stop:
+            return []
+        with open(self._offsets_path(), "rb") as f:
+            f.seek(start * _ENTRY.size)
+            return list(_ENTRY.iter_unpack(f.read((stop - start) * _ENTRY.size)))
+
+    def iter_range(self, start: int, stop: int) -> Iterator[Tuple[int, dict]]:
+        """Yield ``(line number, entry)`` for messages ``start`` to ``stop - 1``."""
+        positions = self.entries(start, stop)
+        if not positions:
+            return
+        with open_transcript(self.transcript_path, "rb") as f:
+            for offset, line_no in positions:
+                f.seek(offset)
+                try:
+                    entry = json.loads(f.readline())
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue  # rewritten since the sync; the next sync rebuilds
+                if isinstance(entry, dict):
+                    yield line_no, entry
+
+
+def get_transcript_index(transcript_path: Path) -> Optional[TranscriptIndex]:
+    """Synced index for ``transcript_path``, or None when it cannot be maintained.
+
+    ``MACF_TRANSCRIPT_INDEX=0`` disables the index entirely (callers then scan).
+    """
+    if os.environ.get("MACF_TRANSCRIPT_INDEX", "1") == "0":
+        return None
+    index = TranscriptIndex(transcript_path)
+    return index if index.sync() else None
+
+
+__all__ = [
+    "TranscriptIndex",
+    "get_transcript_index",
+    "get_transcript_index_root",
+    "INDEX_VERSION",
+]
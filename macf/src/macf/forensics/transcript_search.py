@@ -3,11 +3,25 @@ Transcript forensics for breadcrumb-targeted search with context windows.
 
 Enables post-compaction archaeology by locating exact messages in JSONL transcripts
 using breadcrumb coordinates and extracting surrounding context.
+
+Lookups go through the per-transcript byte-offset index
+(``macf.forensics.transcript_index``), so finding a message and its window
+reads only the window's lines. Without an index they scan the transcript.
+
+Searching every transcript (``search_all_transcripts``) first tests each
+file's raw bytes for the prompt uuid, newest file first, across a process
+pool; only files that contain the bytes are parsed, and outstanding scans
+are cancelled once the newest confirmed match is known.
 """
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import json
+import os
+import time
+
+#: Upper bound on default search workers (byte scans are I/O-heavy).
+MAX_SEARCH_WORKERS = 8
 
 
 @dataclass
@@ -77,7 +91,20 @@ def find_message_by_breadcrumb(
     if not path.exists():
         return None
 
-    with open(path, 'r') as f:
+    from .transcript_index import get_transcript_index
+
+    index = get_transcript_index(path)
+    if index is not None:
+        ordinal = index.find_uuid(prompt_uuid)
+        if ordinal is None:
+            return None
+        for idx, entry in index.iter_range(ordinal, ordinal + 1):
+            return (idx, _entry_to_message(idx, entry), str(path))
+        return None
+
+    from ..utils.transcript_archive import open_transcript
+
+    with open_transcript(path, 'r') as f:
         for idx, line in enumerate(f):
             try:
                 entry = json.loads(line.strip())
@@ -114,8 +141,35 @@ def extract_window(
     if not path.exists():
         return None
 
+    from .transcript_index import get_transcript_index
+
+    index = get_transcript_index(path)
+    if index is not None:
+        total = index.messages()
+        if target_index < 0 or target_index >= total:
+            return None
+        start = max(0, target_index - before)
+        window = [
+            _entry_to_message(idx, entry)
+            for idx, entry in index.iter_range(start, min(total, target_index + after + 1))
+        ]
+        position = target_index - start
+        if position >= len(window):
+            return None
+        return TranscriptWindow(
+            target_index=target_index,
+            target_message=window[position],
+            before=window[:position],
+            after=window[position + 1:],
+            transcript_path=transcript_path,
+            breadcrumb="",  # Caller should set
+            total_messages=total
+        )
+
+    from ..utils.transcript_archive import open_transcript
+
     messages = []
-    with open(path, 'r') as f:
+    with open_transcript(path, 'r') as f:
         for idx, line in enumerate(f):
             try:
                 entry = json.loads(line.strip())
@@ -180,59 +234,174 @@ def list_all_transcripts() -> List[str]:
     """
     List all transcript JSONL files in the Claude projects directory.
 
+    Archived transcripts (``*.jsonl.fz``) are included.
+
     Returns:
         List of absolute paths to JSONL files.
     """
+    from ..utils.transcript_archive import ARCHIVE_SUFFIX
+
     projects_dir = Path.home() / ".claude" / "projects"
     if not projects_dir.exists():
         return []
 
     transcripts = []
-    for jsonl_file in projects_dir.glob("**/*.jsonl"):
-        transcripts.append(str(jsonl_file))
+    for pattern in ("**/*.jsonl", f"**/*.jsonl{ARCHIVE_SUFFIX}"):
+        for jsonl_file in projects_dir.glob(pattern):
+            transcripts.append(str(jsonl_file))
 
     return sorted(transcripts)
 
 
+@dataclass
+class SearchStats:
+    """What one ``search_all_transcripts`` call did, for timing output."""
+    files: int = 0  # transcripts considered
+    scanned: int = 0  # byte scans completed before the search stopped
+    bytes_scanned: int = 0
+    candidates: int = 0  # scanned files whose bytes held the prompt uuid
+    workers: int = 1
+    elapsed_ms: float = 0.0
+
+
+def default_search_workers() -> int:
+    """Worker processes used when the caller does not choose."""
+    return max(1, min(MAX_SEARCH_WORKERS, os.cpu_count() or 1))
+
+
+def _scan_bytes(path: str, needle: bytes) -> Tuple[bool, int]:
+    """(``needle`` occurs in the file, bytes scanned). No JSON parsing.
+
+    Archives are searched frame by frame; frames hold whole lines, so a
+    needle inside one line never straddles two frames.
+    """
+    from ..utils.streaming import map_readonly
+    from ..utils.transcript_archive import is_archive, iter_archive_frames
+
+    try:
+        if is_archive(path):
+            scanned = 0
+            for data in iter_archive_frames(path):
+                scanned += len(data)
+                if needle in data:
+                    return True, scanned
+            return False, scanned
+        with open(path, "rb") as f:
+            mapping = map_readonly(f)
+            if mapping is None:
+                data = f.read()
+                return needle in data, len(data)
+            with mapping:
+                return mapping.find(needle) >= 0, len(mapping)
+    except (OSError, ValueError):
+        return False, 0
+
+
+def _newest_first(paths: List[str]) -> List[str]:
+    stamped = []
+    for path in paths:
+        try:
+            stamped.append((os.stat(path).st_mtime, path))
+        except OSError:
+            continue
+    return [path for _, path in sorted(stamped, reverse=True)]
+
+
+def _candidates(
+    paths: List[str],
+    needle: bytes,
+    workers: int,
+    stats: SearchStats,
+) -> Iterator[str]:
+    """Yield the ``paths`` whose bytes contain ``needle``, in ``paths`` order.
+
+    With more than one worker the scans run in a process pool; a candidate
+    is yielded once every path before it has been ruled out, so the caller
+    sees the same order as a serial scan. Closing the generator (the caller
+    found its match) cancels the scans not yet started.
+    """
+    def tally(hit: bool, size: int) -> bool:
+        stats.scanned += 1
+        stats.bytes_scanned += size
+        stats.candidates += hit
+        return hit
+
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            if tally(*_scan_bytes(path, needle)):
+                yield path
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(_scan_bytes, path, needle) for path in paths]
+        for path, future in zip(paths, futures):
+            if tally(*future.result()):
+                yield path
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def search_all_transcripts(
     breadcrumb: str,
     before: int = 3,
-    after: int = 3
+    after: int = 3,
+    workers: Optional[int] = None,
+    stats: Optional[SearchStats] = None,
 ) -> Optional[TranscriptWindow]:
     """
     Search all transcripts for breadcrumb.
 
+    Transcripts are tried newest first. Each is byte-scanned for the prompt
+    uuid (in parallel across ``workers`` processes) and only files that
+    contain it are parsed.
+
     Args:
         breadcrumb: Breadcrumb string
         before: Messages before target
         after: Messages after target
+        workers: Scan processes (default ``default_search_workers()``; 1 scans
+            in-process)
+        stats: Filled in with what the search did, when given
 
     Returns:
         TranscriptWindow or None if not found in any transcript.
     """
-    for transcript_path in list_all_transcripts():
-        result = find_message_by_breadcrumb(breadcrumb, transcript_path)
-        if result:
-            idx, msg, path = result
-            window = extract_window(path, idx, before, after)
-            if window:
-                window.breadcrumb = breadcrumb
-                return window
-    return None
+    from ..utils.breadcrumbs import parse_breadcrumb
+
+    started = time.perf_counter()
+    stats = stats if stats is not None else SearchStats()
+    parsed = parse_breadcrumb(breadcrumb) or {}
+    prompt_uuid = parsed.get('prompt_uuid')
+    if not prompt_uuid:
+        return None
+
+    paths = _newest_first(list_all_transcripts())
+    stats.files = len(paths)
+    stats.workers = workers if workers is not None else default_search_workers()
+    candidates = _candidates(paths, prompt_uuid.encode(), stats.workers, stats)
+    try:
+        for transcript_path in candidates:
+            result = find_message_by_breadcrumb(breadcrumb, transcript_path)
+            if result:
+                idx, msg, path = result
+                window = extract_window(path, idx, before, after)
+                if window:
+                    window.breadcrumb = breadcrumb
+                    return window
+        return None
+    finally:
+        candidates.close()
+        stats.elapsed_ms = (time.perf_counter() - started) * 1000
 
 
 def _find_transcript_by_prefix(session_id_prefix: str) -> Optional[str]:
     """Find transcript JSONL file by session ID prefix match."""
-    projects_dir = Path.home() / ".claude" / "projects"
-    if not projects_dir.exists():
-        return None
+    from ..utils.transcript_registry import get_transcript_registry
 
-    # Search for JSONL files starting with the prefix
-    for jsonl_file in projects_dir.glob("**/*.jsonl"):
-        if jsonl_file.stem.startswith(session_id_prefix):
-            return str(jsonl_file)
-
-    return None
+    return get_transcript_registry().find_prefix(session_id_prefix)
 
 
 def _entry_to_message(idx: int, entry: Dict[str, Any]) -> TranscriptMessage:
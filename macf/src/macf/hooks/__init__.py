@@ -1,12 +1,30 @@
-"""Hook ecosystem for cognitive superpower capabilities."""
+"""Hook ecosystem for cognitive superpower capabilities.
+
+The ``*_run`` re-exports resolve lazily: a hook script imports
+``macf.hooks.<something>`` on every run, and loading every handler module
+here would make each hook pay for all of them.
+"""
+import importlib
+
+# Re-exported run functions -> handle_* module that defines them
+_RUN_FUNCTIONS = {
+    'session_start_run': 'handle_session_start',
+    'user_prompt_submit_run': 'handle_user_prompt_submit',
+    'stop_run': 'handle_stop',
+    'subagent_stop_run': 'handle_subagent_stop',
+    'pre_tool_use_run': 'handle_pre_tool_use',
+    'post_tool_use_run': 'handle_post_tool_use',
+}
+
+
+def __getattr__(name):
+    module_name = _RUN_FUNCTIONS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = importlib.import_module(f"{__name__}.{module_name}").run
+    globals()[name] = value
+    return value
 
-# Import run functions from handle_* modules
-from .handle_session_start import run as session_start_run
-from .handle_user_prompt_submit import run as user_prompt_submit_run
-from .handle_stop import run as stop_run
-from .handle_subagent_stop import run as subagent_stop_run
-from .handle_pre_tool_use import run as pre_tool_use_run
-from .handle_post_tool_use import run as post_tool_use_run
 
 __all__ = [
     'session_start_run',
@@ -15,4 +33,4 @@ __all__ = [
     'subagent_stop_run',
     'pre_tool_use_run',
     'post_tool_use_run'
-]
\ No newline at end of file
+]
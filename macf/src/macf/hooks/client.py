@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+client - Thin hook launcher for the warm hook server.
+
+``macf_tools hooks install --server`` links every ``.claude/hooks/<name>.py``
+to this file instead of to its ``handle_<name>`` module. A cold hook run
+starts an interpreter and imports ``macf.utils``, ``macf.modes``, the models
+and the rest before any handler logic runs - hundreds of ms per tool call.
+This launcher imports only the stdlib: it connects to the hook server's Unix
+socket (see ``macf.hooks.server``), hands over its own stdin/stdout/stderr
+descriptors and environment, and exits with the handler's exit code. The
+server runs the handler in a forked child of an interpreter that already
+has everything loaded.
+
+If no server is listening, the handler runs in this process exactly as the
+direct symlink would have run it, so the hooks work either way.
+
+Stdlib only, and nothing heavier than ``socket``: this file's import cost is
+the per-call overhead.
+"""
+import json
+import os
+import socket
+import sys
+import zlib
+
+#: Seconds to wait for the server to accept before running in-process.
+CONNECT_TIMEOUT = 0.25
+
+#: Seconds to wait for the server to take the request on; past this the
+#: hook runs in-process. Only the handler's own run is waited on unbounded.
+ACK_TIMEOUT = 2.0
+
+#: Set in the environment of every hook launched through this client.
+CLIENT_ENV = "MACF_HOOK_CLIENT"
+
+#: Server reply meaning "not run here - run it in-process".
+FALLBACK = b"fallback"
+
+#: Server reply meaning "ready to run", answered by ``CONFIRM``. Nothing
+#: runs until the confirmation arrives, so a client that gave up waiting
+#: can run the hook in-process without it ever running twice.
+ACCEPTED = b"accepted\n"
+CONFIRM = b"go\n"
+
+
+def socket_path(project_dir=None):
+    """Per-user, per-project socket path of the hook server.
+
+    ``MACF_HOOK_SOCKET`` overrides it. Otherwise the socket lives in a
+    private per-user directory, named after the project
+    (``CLAUDE_PROJECT_DIR``, else the working directory) so a server only
+    ever serves the project it was started for.
+    """
+    override = os.environ.get("MACF_HOOK_SOCKET")
+    if override:
+        return override
+    if project_dir is None:
+        project_dir = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    base = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    key = zlib.crc32(os.path.realpath(project_dir).encode("utf-8", "surrogateescape"))
+    return os.path.join(base, f"macf-hooks-{os.getuid()}", f"{key:08x}.sock")
+
+
+def hook_module(script):
+    """Handler module for a hook script path (``pre_tool_use.py`` -> ``handle_pre_tool_use``)."""
+    name = os.path.basename(script)
+    if name.endswith(".py"):
+        name = name[:-3]
+    return name if name.startswith("handle_") else f"handle_{name}"
+
+
+def forward(module, path=None):
+    """Run ``module`` on the hook server; its exit code, or None to run it in-process.
+
+    Until the server accepts the request (``ACK_TIMEOUT``) nothing has run
+    and the hook falls back to in-process. Once the run is confirmed the
+    handler owns this process's stdio, so a lost reply is reported on
+    stderr rather than retried in-process (that could run the handler's
+    side effects twice).
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path or socket_path())
+        except OSError:
+            return None
+        sock.settimeout(ACK_TIMEOUT)
+        payload = json.dumps({
+            "op": "run",
+            "module": module,
+            "argv": sys.argv,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }).encode("utf-8", "surrogateescape")
+        try:
+            socket.send_fds(sock, [b"%d\n" % len(payload)], [0, 1, 2])
+            sock.sendall(payload)
+            ack = b""
+            while len(ack) < len(ACCEPTED):
+                chunk = sock.recv(len(ACCEPTED) - len(ack))
+                if not chunk:
+                    break
+                ack += chunk
+            if ack != ACCEPTED:
+                return None  # FALLBACK, or dropped before running anything
+            sock.sendall(CONFIRM)
+        except OSError:  # includes the ACK_TIMEOUT expiring
+            return None
+        sock.settimeout(None)
+        reply = b""
+        while True:
+            chunk = sock.recv(64)
+            if not chunk:
+                break
+            reply += chunk
+        if reply == FALLBACK:
+            return None
+        try:
+            return int(reply)
+        except ValueError:
+            print(json.dumps({"continue": True}))
+            print(f"Hook error: hook server dropped {module}", file=sys.stderr)
+            return 0
+    finally:
+        sock.close()
+
+
+def run_in_process(module):
+    """Run the handler file as ``__main__``, exactly as the direct symlink did."""
+    import runpy
+
+    here = os.path.dirname(os.path.realpath(__file__))
+    runpy.run_path(os.path.join(here, f"{module}.py"), run_name="__main__")
+
+
+def main():
+    os.environ[CLIENT_ENV] = "1"
+    module = hook_module(sys.argv[0])
+    code = forward(module)
+    if code is None:
+        run_in_process(module)
+        return 0
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,52 +6,83 @@ provides recovery guidance to restore consciousness awareness.
 """
 from pathlib import Path
 
+#: Transcript lines (newest first) searched for the marker. SessionStart runs
+#: right after compaction, so the marker is always recent.
+TAIL_LINES = 100
 
-def detect_compaction(transcript_path: Path) -> bool:
+#: Seconds to wait for a late marker write. Observed: the marker can land
+#: 10-34 ms after the hook starts.
+MARKER_WAIT = 0.1
+
+_MARKER = b"compact_boundary"
+
+
+def _tail_has_marker(transcript_path: Path) -> bool:
+    """True if one of the last ``TAIL_LINES`` lines is a compact_boundary message."""
+    import json
+
+    from macf.utils.streaming import iter_line_bytes_reverse
+
+    seen = 0
+    for line in iter_line_bytes_reverse(transcript_path):
+        if not line.strip():
+            continue
+        seen += 1
+        if seen > TAIL_LINES:
+            break
+        # Cheap byte test first: only a line naming the marker is parsed.
+        if _MARKER not in line:
+            continue
+        try:
+            msg = json.loads(line)
+        except ValueError:
+            continue
+        if (isinstance(msg, dict) and msg.get('type') == 'system' and
+                msg.get('subtype') == 'compact_boundary'):
+            return True
+    return False
+
+
+def detect_compaction(transcript_path: Path, wait: float = MARKER_WAIT) -> bool:
     """
     Detect compaction via CC 2.0 compact_boundary marker.
 
     CC 2.0 creates system messages with subtype "compact_boundary"
-    after compaction events. Uses retry logic to handle race condition
-    where marker may not be written to disk when hook first runs.
+    after compaction events. Only the transcript tail is read, backwards,
+    so the cost does not depend on transcript size. If the marker is not
+    there yet, waits up to ``wait`` seconds for the transcript to grow and
+    re-checks on each write (the marker may not be on disk when the hook
+    first runs).
 
     Args:
         transcript_path: Path to JSONL transcript file
+        wait: Seconds to wait for a late marker write
 
     Returns:
         bool: True if compaction detected, False otherwise
     """
-    if not transcript_path.exists():
-        return False
-
-    import json
+    import os
     import time
 
-    # Retry up to 3 times to handle write timing race condition
-    # Observed: marker can be written 10-34ms after hook starts
-    for attempt in range(3):
-        # Read all lines
-        with open(transcript_path) as f:
-            lines = f.readlines()
-
-        # Check last 100 messages for compact_boundary
-        # (SessionStart runs early, so marker should be recent)
-        start_idx = max(0, len(lines) - 100)
-
-        for line in lines[start_idx:]:
-            try:
-                msg = json.loads(line)
-                if (msg.get('type') == 'system' and
-                    msg.get('subtype') == 'compact_boundary'):
-                    return True
-            except (json.JSONDecodeError, KeyError):
-                continue
-
-        # If not found and not last attempt, wait and retry
-        if attempt < 2:
-            time.sleep(0.05)  # 50ms delay between attempts
+    from macf.utils.file_watch import wait_for_growth
 
-    return False
+    deadline = time.monotonic() + wait
+    try:
+        size = os.stat(transcript_path).st_size
+    except OSError:
+        return False
+    while True:
+        try:
+            if _tail_has_marker(transcript_path):
+                return True
+        except OSError:
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        size = wait_for_growth(transcript_path, size, remaining)
+        if size < 0:
+            return False
 
 
 def inject_recovery() -> str:
@@ -0,0 +1,69 @@
+"""
+Declarative fast path for the per-tool-call hooks.
+
+PreToolUse and PostToolUse run on every tool call. Most of what PreToolUse
+computes (token info, modes, breadcrumb, status line, Telegram notice) is
+awareness output that an operator may not want for trivial read-only calls,
+but some of its work must happen whatever the operator prefers: denying a
+native TaskCreate, guarding a bare ``cd``, starting DELEG_DRV tracking,
+delivering a pending policy injection.
+
+Each handler declares that required work as ``WorkRule``s, a tool set and an
+optional condition on the call. ``take_fast_path`` returns True only when
+the tool is opted in via the ``hooks.fast_path_tools`` setting
+(``MACF_HOOK_FAST_PATH_TOOLS``) and no rule applies. The handler then
+records a minimal event and returns without computing anything else.
+Rules are checked in order, so cheap tool-name rules go before conditions
+that read the event log.
+
+The setting defaults to no tools, so behaviour is unchanged until opted in.
+``SUGGESTED_FAST_PATH_TOOLS`` are the read-only tools that usually qualify.
+"""
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Iterable, List, Optional
+
+#: Read-only local tools whose per-call awareness output is rarely needed.
+SUGGESTED_FAST_PATH_TOOLS = ("Read", "Glob", "Grep", "LS")
+
+
+@dataclass(frozen=True)
+class WorkRule:
+    """Work a hook must do for some tool calls, fast path or not.
+
+    Attributes:
+        work: Short name of the work, for reporting.
+        tools: Tool names the rule covers; empty means every tool.
+        when: Optional condition on ``tool_input``; the rule applies only
+            when it returns True.
+    """
+
+    work: str
+    tools: FrozenSet[str] = frozenset()
+    when: Optional[Callable[[dict], bool]] = None
+
+    def applies(self, tool_name: str, tool_input: dict) -> bool:
+        if self.tools and tool_name not in self.tools:
+            return False
+        return self.when is None or bool(self.when(tool_input))
+
+
+def fast_path_tools() -> FrozenSet[str]:
+    """Tools opted into the fast path (``hooks.fast_path_tools``)."""
+    from macf.config import coerce_name_list, resolve_setting
+
+    tools, _ = resolve_setting(
+        "MACF_HOOK_FAST_PATH_TOOLS", "hooks.fast_path_tools", [], coerce=coerce_name_list,
+    )
+    return frozenset(tools)
+
+
+def required_work(rules: Iterable[WorkRule], tool_name: str, tool_input: dict) -> List[str]:
+    """Names of every rule in ``rules`` that applies to this call."""
+    return [rule.work for rule in rules if rule.applies(tool_name, tool_input)]
+
+
+def take_fast_path(rules: Iterable[WorkRule], tool_name: str, tool_input: dict) -> bool:
+    """True when ``tool_name`` is opted in and no rule requires work."""
+    if tool_name not in fast_path_tools():
+        return False
+    return not any(rule.applies(tool_name, tool_input) for rule in rules)
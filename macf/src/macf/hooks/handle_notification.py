@@ -17,8 +17,10 @@ from macf.utils import (
 )
 from macf.agent_events_log import append_event
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 
 
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run Notification hook logic.
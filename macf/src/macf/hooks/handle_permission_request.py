@@ -17,6 +17,7 @@ from macf.utils import (
 )
 from macf.agent_events_log import append_event
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 from macf.observability import Warning, emit_warning
 
 
@@ -80,6 +81,7 @@ def _send_permission_preview(tool_name, tool_input, send_notification, send_docu
         send_notification(msg, parse_mode="HTML")
 
 
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run PermissionRequest hook logic.
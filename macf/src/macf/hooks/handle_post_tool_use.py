@@ -13,9 +13,16 @@ from macf.utils import (
     get_current_session_id,
 )
 from macf.agent_events_log import append_event, elide_large_values
+from macf.hooks.fast_path import take_fast_path
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 
+#: PostToolUse only records the call, so nothing keeps an opted-in tool off
+#: the fast path (see macf.hooks.fast_path); it then drops the tool response.
+WORK_RULES = ()
 
+
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run PostToolUse hook logic.
@@ -45,6 +52,11 @@ def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
             "session_id": session_id,
             "success": True  # PostToolUse means tool completed (may have errors in output but call completed)
         }
+        recorded_input = data
+        if take_fast_path(WORK_RULES, tool_name, tool_input):
+            # Minimal record: the response of an opted-in tool is not kept.
+            event_data["fast_path"] = True
+            recorded_input = {k: v for k, v in data.items() if k != "tool_response"}
 
         # Replace oversized values with their size before the event is written.
         #
@@ -58,7 +70,7 @@ def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
         append_event(
             event="tool_call_completed",
             data=event_data,
-            hook_input=elide_large_values(data)
+            hook_input=elide_large_values(recorded_input)
         )
 
         # Silent: no message output (PreToolUse handles user/agent awareness)
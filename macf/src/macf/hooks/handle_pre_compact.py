@@ -17,12 +17,14 @@ from macf.utils import (
     get_token_info,
     get_breadcrumb
 )
-from macf.agent_events_log import append_event
+from macf.agent_events_log import append_event, maybe_emit_state_snapshot
 from macf.event_queries import get_cycle_number_from_events
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 from macf.observability import Warning, emit_warning
 
 
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run PreCompact hook logic.
@@ -54,6 +56,12 @@ def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
         # Get temporal context
         temporal_ctx = get_temporal_context()
 
+        # Fresh tally baseline right before the context is lost
+        try:
+            maybe_emit_state_snapshot(session_id, trigger="pre_compact")
+        except (OSError, ValueError) as e:
+            emit_warning(Warning(source="pre_compact", kind="state_snapshot_failed", detail=f"pre-compact state snapshot failed (non-blocking): {e}"))
+
         # Append pre_compact event for forensic reconstruction
         import time
         append_event(
@@ -23,7 +23,9 @@ from macf.utils import (
 from macf.modes import detect_active_modes, anticipate_mode_change, format_mode_indicators, get_active_task_type_marker
 from macf.agent_events_log import append_event, elide_large_values
 from macf.event_queries import get_active_policy_injections_from_events
+from macf.hooks.fast_path import WorkRule, take_fast_path
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 from macf.observability import Warning, emit_warning
 
 
@@ -104,6 +106,20 @@ def _touch_discipline_nag(session_id: str) -> str:
     return ""
 
 
+#: Work this hook does regardless of the fast path (see macf.hooks.fast_path).
+#: A fast-path tool call skips the status line, token context, Telegram notice
+#: and touch-discipline count only when none of these applies.
+WORK_RULES = (
+    WorkRule("task_redirect", frozenset({"TaskCreate", "TaskUpdate", "TaskList", "TaskGet"})),
+    WorkRule("deleg_drv", frozenset({"Task", "Agent"})),
+    WorkRule("bare_cd_guard", frozenset({"Bash"}),
+             when=lambda tool_input: _is_bare_cd_command(tool_input.get("command", ""))),
+    # Last: the only rule that reads the event log.
+    WorkRule("policy_injection", when=lambda _: bool(get_active_policy_injections_from_events())),
+)
+
+
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run PreToolUse hook logic.
@@ -149,6 +165,9 @@ def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
         # Add file_path if it's a file operation
         if "file_path" in tool_input:
             event_data["file_path"] = tool_input["file_path"]
+        fast_path = take_fast_path(WORK_RULES, tool_name, tool_input)
+        if fast_path:
+            event_data["fast_path"] = True
 
         # Same size-based elision as the completed path. This path had no guard
         # at all and wrote the payload verbatim. Note what the exemption list
@@ -160,6 +179,9 @@ def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
             data=event_data,
             hook_input=elide_large_values(data)
         )
+        if fast_path:
+            # Opted-in tool and no rule applies: the event is all this call needs.
+            return {"continue": True}
 
         # Get token info for smoke test
         token_info = get_token_info(session_id)
@@ -20,9 +20,11 @@ from macf.utils import (
 from macf.agent_events_log import append_event
 from macf.event_queries import get_cycle_number_from_events
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 from macf.observability import Warning, emit_warning
 
 
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run SessionEnd hook logic.
@@ -5,6 +5,7 @@ handle_session_start - SessionStart hook runner.
 Compaction detection and consciousness recovery with mode-aware branching.
 """
 import json
+import os
 import sys
 from pathlib import Path
 from typing import Dict, Any
@@ -32,6 +33,7 @@ from macf.hooks.recovery import (
     format_fresh_session_manual_recovery_message
 )
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 from macf.observability import Warning, emit_warning
 from macf.agent_events_log import append_event
 from macf.event_queries import (
@@ -112,6 +114,7 @@ def detect_session_migration(current_session_id: str) -> tuple[bool, str, str]:
     return True, "", previous_session_id
 
 
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run SessionStart hook logic.
@@ -170,6 +173,20 @@ def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
                 detail=f"could not ensure transcript monitor running: {e}",
             ))
 
+        # Hooks installed with `hooks install --server` launch through the
+        # thin client; keep its warm server up for the rest of the session.
+        # This run and any that race the startup fall back to in-process.
+        if os.environ.get("MACF_HOOK_CLIENT") == "1":
+            try:
+                from macf.hooks.server import ensure_server_running
+                ensure_server_running()
+            except (ImportError, OSError) as e:
+                emit_warning(Warning(
+                    source="session_start",
+                    kind="hook_server_autostart_failed",
+                    detail=f"could not start warm hook server: {e}",
+                ))
+
         # PHASE 1: Check source field FIRST (highest priority)
         # This distinguishes user-initiated /compact from crash-based session migration
         source = data.get('source')
@@ -24,8 +24,9 @@ from macf.utils import (
     detect_auto_mode,
     get_breadcrumb
 )
-from macf.agent_events_log import append_event
+from macf.agent_events_log import append_event, maybe_emit_state_snapshot
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 from macf.observability import Warning, emit_warning
 from macf.modes import (
     detect_active_modes, get_current_work_mode,
@@ -35,6 +36,7 @@ from macf.modes import (
 )
 
 
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run Stop hook logic.
@@ -94,6 +96,12 @@ def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
             hook_input=json.loads(stdin_json) if stdin_json else {}
         )
 
+        # Keep a recent state_snapshot baseline under the event queries
+        try:
+            maybe_emit_state_snapshot(session_id)
+        except (OSError, ValueError) as e:
+            emit_warning(Warning(source="stop", kind="state_snapshot_failed", detail=f"Periodic state snapshot failed: {e}"))
+
         # Get stats AFTER completing (now includes this drive)
         stats = get_dev_drv_stats(session_id)
         stats['prompt_uuid'] = prompt_uuid  # Restore UUID for display
@@ -465,7 +473,8 @@ Development Drive Stats:
             import time
             from macf.agent_events_log import read_events
             # Find the most recent scope_timer_set event
-            for event in read_events(limit=None, reverse=True):
+            for event in read_events(limit=None, reverse=True,
+                                     event_types=("scope_timer_set", "scope_cleared")):
                 if event.get("event") == "scope_timer_set":
                     timer_end = event.get("data", {}).get("timer_end_epoch", 0)
                     remaining_sec = timer_end - time.time()
@@ -32,6 +32,7 @@ from macf.utils import (
 )
 from macf.event_queries import get_deleg_drv_bridge_by_agent_id
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 from macf.observability import Warning, emit_warning
 
 
@@ -60,6 +61,7 @@ def _format_deleg_drv_tag(
     return f"[{''.join(parts)}]"
 
 
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """Process SubagentStart hook input and emit the bridge event.
 
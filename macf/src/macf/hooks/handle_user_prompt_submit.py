@@ -28,6 +28,7 @@ from macf.utils import (
     get_breadcrumb
 )
 from macf.hooks.hook_logging import log_hook_event
+from macf.utils.context import with_hook_context
 from macf.observability import Warning, emit_warning
 
 # EXPERIMENT: Memory injection script path (Cycle 337)
@@ -115,6 +116,7 @@ def record_user_activity_from_payload(prompt: str) -> bool:
         return False
 
 
+@with_hook_context
 def run(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
     """
     Run UserPromptSubmit hook logic.
@@ -4,11 +4,10 @@ Hook logging infrastructure with unified agent-scoped paths.
 All logging uses /tmp/macf/{agent_id}/{session_id}/hooks/
 """
 import json
-import logging
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 # Import from centralized utils
 from macf.utils import (
@@ -18,8 +17,13 @@ from macf.utils import (
 )
 from macf.config import ConsciousnessConfig
 from macf.observability import Warning, emit_warning
+from macf.observability.tracing import span
 
+if TYPE_CHECKING:
+    import logging
 
+
+@span("hook_log")
 def log_hook_event(
     event_data: dict,
     raw_input: Optional[dict] = None
@@ -90,7 +94,7 @@ def log_hook_event(
         print(f"Logging error: {e}", file=sys.stderr)
 
 
-def setup_hook_logger(hook_name: str, session_id: str) -> logging.Logger:
+def setup_hook_logger(hook_name: str, session_id: str) -> "logging.Logger":
     """
     Configure Python logger for hook with file and stderr handlers.
 
@@ -101,6 +105,8 @@ def setup_hook_logger(hook_name: str, session_id: str) -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    import logging
+
     logger = logging.getLogger(f"macf.hooks.{hook_name}")
     logger.setLevel(logging.INFO)
 
@@ -0,0 +1,205 @@
+"""
+Hook phase profile (``macf_tools hooks profile``).
+
+Reads the per-session span traces written by
+``macf.observability.tracing`` (``/tmp/macf/{agent}/{session}/hooks/
+hook_trace.jsonl``) and aggregates them across sessions:
+
+- a per-hook latency line (runs, p50/p95/mean wall time);
+- a per-phase table: how many runs hit the phase, calls, p50/p95 of the
+  per-run phase time, total and self time, and its share of the hook's time;
+- a flame-style tree of self time by span path, or collapsed stacks
+  (``hook;phase;subphase <µs>``) for flamegraph.pl / speedscope via
+  ``--folded``.
+
+Span paths nest with ``/`` (``event_append/breadcrumb/git_hash``). Self time
+is a span's duration minus its direct children's; the hook's own self time
+(``(self)``) is whatever no span covered.
+"""
+
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from macf.hooks.bench import percentile
+from macf.observability.tracing import TRACE_FILE, TRACE_FORMAT_VERSION
+
+DEFAULT_TRACE_ROOT = Path("/tmp/macf")
+
+#: Width of the flame-style bars.
+BAR_WIDTH = 30
+
+
+def find_trace_files(
+    root: Path = DEFAULT_TRACE_ROOT,
+    session: Optional[str] = None,
+    agent: Optional[str] = None,
+) -> List[Path]:
+    """Trace files under ``root`` (``{agent}/{session}/hooks/hook_trace.jsonl``)."""
+    pattern = f"{agent or '*'}/{session or '*'}/hooks/{TRACE_FILE}"
+    return sorted(root.glob(pattern))
+
+
+def load_traces(
+    paths: Iterable[Path],
+    hooks: Optional[Iterable[str]] = None,
+    since: Optional[float] = None,
+) -> List[dict]:
+    """Parse trace records, keeping those for ``hooks`` newer than ``since``.
+
+    Malformed lines (a run killed mid-write) and other format versions are
+    skipped.
+    """
+    wanted = set(hooks) if hooks else None
+    records = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not isinstance(record, dict) or record.get("v") != TRACE_FORMAT_VERSION:
+                        continue
+                    if wanted is not None and record.get("hook") not in wanted:
+                        continue
+                    if since is not None and record.get("ts", 0) < since:
+                        continue
+                    records.append(record)
+        except OSError:
+            continue
+    return records
+
+
+def _parent(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+def run_phase_times(record: dict) -> Dict[str, Dict[str, int]]:
+    """Per span path in one run: ``{"calls", "total_us", "self_us"}``.
+
+    The empty path is the run itself; its self time is what no span covered.
+    """
+    phases: Dict[str, Dict[str, int]] = defaultdict(lambda: {"calls": 0, "total_us": 0, "self_us": 0})
+    children_us: Dict[str, int] = defaultdict(int)
+    for path, _start, dur in record.get("spans", []):
+        phase = phases[path]
+        phase["calls"] += 1
+        phase["total_us"] += dur
+        children_us[_parent(path)] += dur
+    phases[""] = {"calls": 1, "total_us": record.get("us", 0), "self_us": 0}
+    for path, phase in phases.items():
+        phase["self_us"] = max(phase["total_us"] - children_us.get(path, 0), 0)
+    return dict(phases)
+
+
+def aggregate(records: List[dict]) -> Dict[str, dict]:
+    """Per-hook latency and per-phase statistics across ``records``."""
+    by_hook: Dict[str, List[dict]] = defaultdict(list)
+    for record in records:
+        by_hook[record.get("hook", "unknown")].append(record)
+
+    summary = {}
+    for hook in sorted(by_hook):
+        runs = by_hook[hook]
+        wall_ms = [r.get("us", 0) / 1000 for r in runs]
+        hook_total_ms = sum(wall_ms)
+        per_phase: Dict[str, dict] = defaultdict(lambda: {"runs_ms": [], "calls": 0, "self_ms": 0.0})
+        for record in runs:
+            for path, t in run_phase_times(record).items():
+                if not path:
+                    continue
+                entry = per_phase[path]
+                entry["runs_ms"].append(t["total_us"] / 1000)
+                entry["calls"] += t["calls"]
+                entry["self_ms"] += t["self_us"] / 1000
+        phases = {}
+        for path, entry in per_phase.items():
+            total_ms = sum(entry["runs_ms"])
+            phases[path] = {
+                "runs": len(entry["runs_ms"]),
+                "calls": entry["calls"],
+                "p50_ms": round(percentile(entry["runs_ms"], 50), 2),
+                "p95_ms": round(percentile(entry["runs_ms"], 95), 2),
+                "total_ms": round(total_ms, 2),
+                "self_ms": round(entry["self_ms"], 2),
+                "share": round(total_ms / hook_total_ms, 4) if hook_total_ms else 0.0,
+            }
+        summary[hook] = {
+            "runs": len(runs),
+            "failures": sum(1 for r in runs if not r.get("ok", True)),
+            "sessions": len({r.get("sid") for r in runs}),
+            "p50_ms": round(percentile(wall_ms, 50), 2),
+            "p95_ms": round(percentile(wall_ms, 95), 2),
+            "mean_ms": round(hook_total_ms / len(runs), 2),
+            "total_ms": round(hook_total_ms, 2),
+            "phases": dict(sorted(phases.items(), key=lambda kv: -kv[1]["total_ms"])),
+        }
+    return summary
+
+
+def folded_stacks(records: List[dict]) -> Dict[str, int]:
+    """Collapsed stacks (``hook;phase;subphase`` -> self µs) across ``records``."""
+    stacks: Dict[str, int] = defaultdict(int)
+    for record in records:
+        hook = record.get("hook", "unknown")
+        for path, t in run_phase_times(record).items():
+            stack = hook if not path else f"{hook};{path.replace('/', ';')}"
+            stacks[stack] += t["self_us"]
+    return dict(sorted(stacks.items()))
+
+
+def format_folded(stacks: Dict[str, int]) -> str:
+    return "\n".join(f"{stack} {us}" for stack, us in stacks.items() if us > 0)
+
+
+def _flame_lines(hook: str, entry: dict) -> List[str]:
+    total = entry["total_ms"] or 1.0
+    covered = sum(p["total_ms"] for path, p in entry["phases"].items() if "/" not in path)
+    rows = [("(self)", max(entry["total_ms"] - covered, 0.0), 0)]
+    rows += [(path, p["total_ms"], path.count("/")) for path, p in entry["phases"].items()]
+    # Depth-first by path so children sit under their parent.
+    rows.sort(key=lambda row: (row[0] != "(self)", row[0]))
+    lines = []
+    for path, ms, depth in rows:
+        share = ms / total
+        bar = "█" * max(int(round(share * BAR_WIDTH)), 1 if ms else 0)
+        label = "  " * depth + path.rsplit("/", 1)[-1]
+        lines.append(f"  {label:<34}{bar:<{BAR_WIDTH}} {share:6.1%}  {ms / entry['runs']:8.2f} ms/run")
+    return lines
+
+
+def format_profile(summary: Dict[str, dict], top: Optional[int] = None, flame: bool = True) -> str:
+    """Per-hook latency line, per-phase table and (optionally) flame tree."""
+    if not summary:
+        return "No hook traces found."
+    lines = []
+    for hook, entry in summary.items():
+        failed = f", {entry['failures']} failed" if entry["failures"] else ""
+        lines.append(
+            f"{hook}: {entry['runs']} runs in {entry['sessions']} session(s){failed} — "
+            f"p50 {entry['p50_ms']:.1f} ms, p95 {entry['p95_ms']:.1f} ms, mean {entry['mean_ms']:.1f} ms"
+        )
+        lines.append(
+            f"  {'phase':<38}{'runs':>6}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'total ms':>11}{'self ms':>10}{'share':>8}"
+        )
+        phases = list(entry["phases"].items())
+        for path, p in phases[:top] if top else phases:
+            lines.append(
+                f"  {path:<38}{p['runs']:>6}{p['calls']:>7}{p['p50_ms']:>9.2f}{p['p95_ms']:>9.2f}"
+                f"{p['total_ms']:>11.1f}{p['self_ms']:>10.1f}{p['share']:>8.1%}"
+            )
+        if flame:
+            lines.append("  flame (time per run, nested by span path):")
+            lines.extend(_flame_lines(hook, entry))
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+
+def since_hours(hours: Optional[float]) -> Optional[float]:
+    """Epoch cutoff for ``--since`` hours, or None."""
+    return time.time() - hours * 3600 if hours else None
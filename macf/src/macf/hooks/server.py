@@ -0,0 +1,395 @@
+"""
+server - Warm hook server behind the thin hook launcher (``hooks/client.py``).
+
+Keeps every ``handle_*`` module imported in one long-lived interpreter and
+serves hook runs over a per-project Unix socket (``client.socket_path``).
+Each run forks a child from the warm parent, so a hook pays for a fork
+instead of an interpreter start plus the whole ``macf`` import graph, and
+no handler state leaks from one run into the next:
+
+- the client passes its stdin/stdout/stderr descriptors (``SCM_RIGHTS``);
+  the child installs them as fds 0/1/2, so output goes straight to Claude
+  Code and exit-code semantics (``exit 2`` blocks a tool) are unchanged
+- the child adopts the client's environment, working directory and argv
+- the child runs nothing until the client confirms it is still waiting;
+  a client not taken on within ``client.ACK_TIMEOUT`` runs the hook
+  in-process, and one that stalls sending its request is dropped after
+  ``REQUEST_TIMEOUT``
+- the handler file runs as ``__main__`` from a code object compiled at
+  startup, exactly like ``python <hook>.py`` would run it
+- the child reports the handler's exit code and exits
+
+The server is opt-in: it only receives requests from hooks installed with
+``macf_tools hooks install --server``, and SessionStart starts it on demand
+for such installs. It exits after ``MACF_HOOK_SERVER_IDLE`` seconds without
+a request (default 1800), and as soon as a handler source file changes, so
+an upgraded package is never served from stale code (that request falls
+back to the client's in-process run).
+
+Usage:
+    python -m macf.hooks.server            # serve in the foreground
+    macf_tools hooks server start|stop|status
+"""
+import builtins
+import fcntl
+import json
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .client import ACCEPTED, CONFIRM, CONNECT_TIMEOUT, FALLBACK, socket_path
+
+#: Seconds without a request after which the server exits.
+DEFAULT_IDLE_SECONDS = 1800
+
+#: Upper bound on one request (the client's environment dominates it).
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+
+#: Seconds a client may take to send its request (or confirm a run). The
+#: accept loop is single-threaded, so a stalled client must not hold it.
+REQUEST_TIMEOUT = 2.0
+
+_HOOKS_DIR = Path(__file__).parent
+
+
+def _handler_files() -> Dict[str, Path]:
+    return {path.stem: path for path in sorted(_HOOKS_DIR.glob("handle_*.py"))}
+
+
+def _nested_imports(path: str, package: str):
+    """Absolute names of every import in ``path``, including function-level ones."""
+    import ast
+
+    try:
+        tree = ast.parse(Path(path).read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                name = f"{base}.{node.module}" if node.module else base
+            else:
+                name = node.module or ""
+            yield name
+            for alias in node.names:
+                yield f"{name}.{alias.name}"  # submodule imports; non-modules just fail
+
+
+def _warm_imports() -> None:
+    """Import what ``macf`` code imports lazily, so forked children don't.
+
+    Handlers and the ``macf`` modules they reach defer heavy imports
+    (pydantic models, yaml, ...) into function bodies to keep cold hook runs
+    cheap. In a warm server those deferred imports would run again in every
+    forked child, so they are resolved once here, transitively over ``macf``.
+    Best effort: anything that fails to import is left to the handler.
+    """
+    import importlib
+
+    seen = set()
+    while True:
+        pending = [
+            (name, module) for name, module in list(sys.modules.items())
+            if name.startswith("macf") and name not in seen and getattr(module, "__file__", None)
+        ]
+        if not pending:
+            return
+        for name, module in pending:
+            seen.add(name)
+            package = name if hasattr(module, "__path__") else name.rpartition(".")[0]
+            for target in _nested_imports(module.__file__, package):
+                if not target or target in sys.modules or target.startswith("macf.hooks.server"):
+                    continue
+                try:
+                    importlib.import_module(target)
+                except BaseException:  # includes SystemExit from script-ish modules
+                    pass
+
+
+def _preload() -> Tuple[Dict[str, object], Dict[str, float]]:
+    """Import every handler and compile its file; returns (code objects, mtimes)."""
+    import importlib
+
+    code, mtimes = {}, {}
+    for module, path in _handler_files().items():
+        importlib.import_module(f"macf.hooks.{module}")
+        code[module] = compile(path.read_bytes(), str(path), "exec")
+        mtimes[module] = path.stat().st_mtime
+    _warm_imports()
+    return code, mtimes
+
+
+def _stale(mtimes: Dict[str, float]) -> bool:
+    current = _handler_files()
+    if set(current) != set(mtimes):
+        return True
+    try:
+        return any(path.stat().st_mtime != mtimes[name] for name, path in current.items())
+    except OSError:
+        return True
+
+
+def _read_request(conn: socket.socket) -> Tuple[Optional[dict], list]:
+    """Length-prefixed JSON request plus any descriptors sent with it.
+
+    A client that stalls past the connection's timeout is a bad request.
+    """
+    fds: list = []
+    try:
+        data, fds, _flags, _addr = socket.recv_fds(conn, 65536, 3)
+        header, sep, body = data.partition(b"\n")
+        if not sep or not header.isdigit() or int(header) > MAX_REQUEST_BYTES:
+            return None, fds
+        length = int(header)
+        chunks = [body]
+        received = len(body)
+        while received < length:
+            chunk = conn.recv(min(65536, length - received))
+            if not chunk:
+                return None, fds
+            chunks.append(chunk)
+            received += len(chunk)
+    except OSError:  # includes the timeout
+        return None, fds
+    try:
+        return json.loads(b"".join(chunks).decode("utf-8", "surrogateescape")), fds
+    except (ValueError, UnicodeDecodeError):
+        return None, fds
+
+
+def _run_child(conn: socket.socket, request: dict, fds: list, code: object) -> None:
+    """In the forked child: become the hook process, run the handler, report, exit.
+
+    Runs nothing unless the client confirms it is still waiting; one that
+    timed out has already run the hook in-process.
+    """
+    exit_code = 0
+    try:
+        try:
+            conn.sendall(ACCEPTED)
+            confirmed = conn.recv(len(CONFIRM)) == CONFIRM
+        except OSError:
+            confirmed = False
+        if not confirmed:
+            return
+        conn.settimeout(None)
+        for target, fd in zip((0, 1, 2), fds):
+            os.dup2(fd, target)
+        for fd in fds:
+            if fd > 2:
+                os.close(fd)
+        sys.stdin = open(0, "r", encoding="utf-8", closefd=False)
+        sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+        sys.stderr = open(2, "w", encoding="utf-8", closefd=False, buffering=1)
+        os.environ.clear()
+        os.environ.update(request.get("env") or {})
+        os.chdir(request.get("cwd") or "/")
+        sys.argv = list(request.get("argv") or [request["module"]])
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        namespace = {
+            "__name__": "__main__",
+            "__file__": code.co_filename,
+            "__builtins__": builtins,
+        }
+        try:
+            exec(code, namespace)
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except BaseException as e:  # the cold interpreter would print it and exit 1
+            import traceback
+            traceback.print_exception(type(e), e, e.__traceback__)
+            exit_code = 1
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except OSError as e:
+                exit_code = exit_code or 1
+                os.write(2, f"Hook error: flush failed: {e}\n".encode())
+        conn.sendall(b"%d" % exit_code)
+    finally:
+        os._exit(exit_code)
+
+
+def serve(path: Optional[str] = None, idle_seconds: Optional[float] = None) -> int:
+    """Serve hook runs on ``path`` until idle, stale, or asked to stop."""
+    path = path or socket_path()
+    if idle_seconds is None:
+        idle_seconds = float(os.environ.get("MACF_HOOK_SERVER_IDLE", DEFAULT_IDLE_SECONDS))
+
+    code, mtimes = _preload()
+
+    sock_dir = os.path.dirname(path)
+    os.makedirs(sock_dir, mode=0o700, exist_ok=True)
+    st = os.stat(sock_dir)
+    if st.st_uid != os.getuid():
+        print(f"⚠️ MACF: hook server socket dir not owned by this user: {sock_dir}", file=sys.stderr)
+        return 1
+    # makedirs leaves an existing directory's mode alone, and anyone who can
+    # reach the socket runs hooks with this user's environment.
+    if st.st_mode & 0o077:
+        try:
+            os.chmod(sock_dir, 0o700)
+        except OSError as e:
+            print(f"⚠️ MACF: hook server socket dir is group/world accessible: {sock_dir}: {e}",
+                  file=sys.stderr)
+            return 1
+    # One server per socket: the lock is held for the server's lifetime.
+    lock = open(path + ".lock", "a")
+    try:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return 0
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    os.chmod(path, 0o600)
+    listener.listen(64)
+
+    started, served = time.time(), 0
+    last_request = started
+    stopping = False
+
+    def _stop(_signum, _frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        while not stopping:
+            # Reap finished children; their exit codes went to the clients.
+            try:
+                while os.waitpid(-1, os.WNOHANG)[0]:
+                    pass
+            except ChildProcessError:
+                pass
+
+            ready, _, _ = select.select([listener], [], [], 1.0)
+            if not ready:
+                if time.time() - last_request > idle_seconds:
+                    break
+                continue
+
+            conn, _ = listener.accept()
+            conn.settimeout(REQUEST_TIMEOUT)
+            last_request = time.time()
+            with conn:
+                request, fds = _read_request(conn)
+                try:
+                    op = request.get("op") if request else None
+                    if op == "status":
+                        conn.sendall(json.dumps({
+                            "pid": os.getpid(), "started": started, "served": served,
+                            "path": path, "handlers": sorted(code),
+                        }).encode())
+                    elif op == "stop":
+                        conn.sendall(b'{"stopping": true}')
+                        stopping = True
+                    elif op == "run":
+                        stale = _stale(mtimes)
+                        if stale or request.get("module") not in code or len(fds) != 3:
+                            # Nothing ran and the client still owns its stdio:
+                            # it runs the hook in-process instead. A changed
+                            # handler source also retires this server so the
+                            # next SessionStart launches a fresh one.
+                            conn.sendall(FALLBACK)
+                            stopping = stopping or stale
+                            continue
+                        served += 1
+                        if os.fork() == 0:
+                            listener.close()
+                            lock.close()
+                            _run_child(conn, request, fds, code[request["module"]])
+                finally:
+                    for fd in fds:
+                        os.close(fd)
+    finally:
+        listener.close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        lock.close()
+    return 0
+
+
+def _request(op: str, path: Optional[str] = None) -> Optional[dict]:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(path or socket_path())
+        sock.settimeout(5.0)
+        payload = json.dumps({"op": op}).encode()
+        sock.sendall(b"%d\n" % len(payload) + payload)
+        reply = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+        return json.loads(reply) if reply else None
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def status(path: Optional[str] = None) -> Optional[dict]:
+    """The running server's status, or None if none answers on ``path``."""
+    return _request("status", path)
+
+
+def stop(path: Optional[str] = None) -> bool:
+    """Ask the server on ``path`` to exit. True if one was running."""
+    return _request("stop", path) is not None
+
+
+def ensure_server_running(path: Optional[str] = None) -> bool:
+    """Start a detached server for this project unless one already answers.
+
+    Returns True if a server was started. Never blocks on the server's
+    startup: the hooks that race it simply run in-process.
+    """
+    if status(path) is not None:
+        return False
+    env = dict(os.environ)
+    if path:
+        env["MACF_HOOK_SOCKET"] = path
+    subprocess.Popen(
+        [sys.executable, "-m", "macf.hooks.server"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+        env=env,
+    )
+    return True
+
+
+def main() -> int:
+    return serve()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,7 +17,9 @@ import time
 from pathlib import Path
 from typing import Dict, Optional, Set, Tuple
 
-from ..agent_events_log import read_events
+from ..agent_events_log import ScanQuery, scan_many
+from ..utils.context import hook_fact
+from ..observability.tracing import span
 from ..utils.cycles import detect_auto_mode
 
 
@@ -97,6 +99,12 @@ DEFAULT_EPSILON = 0.05
 # Mode Detection
 # ============================================================================
 
+@hook_fact(
+    "active_modes",
+    events={"mode_change", "work_mode_change", "user_activity_detected"},
+    key=lambda session_id, token_info: (session_id, token_info.get("cl_level")),
+)
+@span("mode_detection")
 def detect_active_modes(session_id: str, token_info: dict) -> Set[str]:
     """
     Detect all currently active modes across both layers.
@@ -105,6 +113,9 @@ def detect_active_modes(session_id: str, token_info: dict) -> Set[str]:
     """
     modes = set()
 
+    # Every event-log question below is answered by one shared reverse pass.
+    scan = _scan_mode_events()
+
     # --- Operational modes ---
 
     # AUTO_MODE: existing detection from cycles.py
@@ -126,7 +137,7 @@ def detect_active_modes(session_id: str, token_info: dict) -> Set[str]:
             10,
             coerce=int,
         )
-        last_activity = _get_last_user_activity_timestamp(session_id)
+        last_activity = _get_last_user_activity_timestamp(session_id, scan=scan)
         if last_activity and (time.time() - last_activity) > idle_timeout * 60:
             modes.add("USER_IDLE")
     except (OSError, ValueError) as e:
@@ -134,14 +145,14 @@ def detect_active_modes(session_id: str, token_info: dict) -> Set[str]:
 
     # USER_REMOTE: explicitly set; auto-clears when the operator returns to the CLI.
     try:
-        if _detect_user_remote(session_id):
+        if _detect_user_remote(session_id, scan=scan):
             modes.add("USER_REMOTE")
     except (OSError, ValueError) as e:
         print(f"⚠️ MACF: USER_REMOTE detection failed: {e}", file=sys.stderr)
 
     # QUIET_MODE: explicit event OR auto with USER_IDLE
     try:
-        quiet_explicit = _detect_quiet_mode_event(session_id)
+        quiet_explicit = _detect_quiet_mode_event(session_id, scan=scan)
         quiet_on_idle = os.environ.get("MACF_QUIET_ON_IDLE", "false").lower() == "true"
         if quiet_explicit or (quiet_on_idle and "USER_IDLE" in modes):
             modes.add("QUIET_MODE")
@@ -167,7 +178,7 @@ def detect_active_modes(session_id: str, token_info: dict) -> Set[str]:
 
     # --- Work mode ---
     try:
-        work_mode = _get_current_work_mode()
+        work_mode = _get_current_work_mode(scan=scan)
         if work_mode and work_mode in WORK_MODES:
             modes.add(work_mode)
     except (OSError, ValueError) as e:
@@ -230,9 +241,9 @@ def get_active_task_type_marker() -> str:
     """
     try:
         from ..task.scope import get_scope_check
-        from ..task.reader import TaskReader
         scope = get_scope_check()
         for entry in scope.get("active", []):
+            from ..task.reader import TaskReader
             tid = entry.get("id")
             task = TaskReader().read_task(tid)
             if task and task.mtmd:
@@ -538,7 +549,72 @@ def format_recommendation(
 # Internal Helpers
 # ============================================================================
 
-def _get_last_user_activity_timestamp(session_id: str, sources: Optional[Set[str]] = None) -> Optional[float]:
+def _parse_epoch(ts) -> Optional[float]:
+    """Coerce an event timestamp (epoch number or ISO string) to epoch seconds."""
+    if ts is None:
+        return None
+    try:
+        if isinstance(ts, (int, float)):
+            return float(ts)
+        if isinstance(ts, str):
+            from datetime import datetime
+            return datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError):
+        return None
+    return None
+
+
+# CLI-typed activity origins: a normal prompt ("direct") and a mid-turn queued
+# message ("mid_turn_enqueue"). Both mean the operator is AT the CLI. A Telegram
+# message is "channel" and deliberately excluded — it does not prove presence at
+# the terminal, which is what USER_REMOTE is about.
+_CLI_ACTIVITY_SOURCES = {"direct", "mid_turn_enqueue"}
+
+
+def _user_activity_query(sources: Optional[Set[str]] = None) -> Tuple[str, ScanQuery]:
+    """(name, query) for the newest user_activity_detected from ``sources``."""
+    name = "user_activity" if sources is None else "user_activity:" + ",".join(sorted(sources))
+
+    def where(event: dict) -> bool:
+        if sources is not None and event.get("data", {}).get("source") not in sources:
+            return False
+        ts = event.get("timestamp")
+        return bool(ts) and _parse_epoch(ts) is not None
+
+    return name, ScanQuery(frozenset({"user_activity_detected"}), where=where, limit=200)
+
+
+# Event-log questions behind mode detection, answered together by
+# ``_scan_mode_events``. Windows match the per-helper scans they replace.
+_MODE_QUERIES: Dict[str, ScanQuery] = dict([
+    _user_activity_query(),
+    _user_activity_query(_CLI_ACTIVITY_SOURCES),
+    # The newest mode_change that decides QUIET_MODE: its own toggle, or an
+    # AUTO/MANUAL switch that supersedes it.
+    ("quiet_mode", ScanQuery(
+        frozenset({"mode_change"}),
+        where=lambda e: e.get("data", {}).get("mode") in ("QUIET_MODE", "AUTO_MODE", "MANUAL_MODE"),
+        limit=50,
+    )),
+    ("user_remote", ScanQuery(
+        frozenset({"mode_change"}),
+        where=lambda e: e.get("data", {}).get("mode") == "USER_REMOTE",
+        limit=100,
+    )),
+    ("work_mode", ScanQuery(frozenset({"work_mode_change"}), limit=50)),
+])
+
+
+def _scan_mode_events(*names: str) -> Dict[str, list]:
+    """Answer the named ``_MODE_QUERIES`` (default: all) in one reverse pass."""
+    return scan_many({name: _MODE_QUERIES[name] for name in (names or _MODE_QUERIES)})
+
+
+def _get_last_user_activity_timestamp(
+    session_id: str,
+    sources: Optional[Set[str]] = None,
+    scan: Optional[Dict[str, list]] = None,
+) -> Optional[float]:
     """Get epoch timestamp of last user activity from event log.
 
     ``sources`` optionally restricts which activity origins count — e.g.
@@ -558,69 +634,34 @@ def _get_last_user_activity_timestamp(session_id: str, sources: Optional[Set[str
     producer preserves that constraint by discriminating on the payload
     rather than on the invocation.
 
+    ``scan`` is a ``_scan_mode_events`` result to answer from; without one
+    (or without the needed entry) the log is scanned here.
+
     Returns None when neither producer has recorded anything for this agent
     (no false signals > wrong signals).
     """
-    for event in read_events(limit=200, reverse=True):
-        event_type = event.get("event", "")
-        if event_type != "user_activity_detected":
-            continue
-        if sources is not None and event.get("data", {}).get("source") not in sources:
-            continue
-        ts = event.get("timestamp")
-        if ts:
-            try:
-                from datetime import datetime, timezone
-                if isinstance(ts, str):
-                    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                    epoch = dt.timestamp()
-                elif isinstance(ts, (int, float)):
-                    epoch = float(ts)
-                else:
-                    continue
-                return epoch
-            except (ValueError, TypeError):
-                pass
+    name, query = _user_activity_query(sources)
+    if scan is None or name not in scan:
+        scan = scan_many({name: query})
+    for event in scan[name]:
+        return _parse_epoch(event.get("timestamp"))
     return None
 
 
-def _detect_quiet_mode_event(session_id: str) -> bool:
+def _detect_quiet_mode_event(session_id: str, scan: Optional[Dict[str, list]] = None) -> bool:
     """Check if QUIET_MODE was explicitly set via mode_change event."""
-    for event in read_events(limit=50, reverse=True):
-        if event.get("event") == "mode_change":
-            data = event.get("data", {})
-            mode = data.get("mode", "")
-            if mode == "QUIET_MODE":
-                return data.get("enabled", True)
-            # If we hit a non-QUIET mode_change, QUIET wasn't explicitly set
-            if mode in ("AUTO_MODE", "MANUAL_MODE"):
-                return False
+    if scan is None:
+        scan = _scan_mode_events("quiet_mode")
+    for event in scan["quiet_mode"]:
+        data = event.get("data", {})
+        if data.get("mode", "") == "QUIET_MODE":
+            return data.get("enabled", True)
+        # A newer AUTO/MANUAL mode_change means QUIET wasn't explicitly set
+        return False
     return False
 
 
-def _parse_epoch(ts) -> Optional[float]:
-    """Coerce an event timestamp (epoch number or ISO string) to epoch seconds."""
-    if ts is None:
-        return None
-    try:
-        if isinstance(ts, (int, float)):
-            return float(ts)
-        if isinstance(ts, str):
-            from datetime import datetime
-            return datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
-    except (ValueError, TypeError):
-        return None
-    return None
-
-
-# CLI-typed activity origins: a normal prompt ("direct") and a mid-turn queued
-# message ("mid_turn_enqueue"). Both mean the operator is AT the CLI. A Telegram
-# message is "channel" and deliberately excluded — it does not prove presence at
-# the terminal, which is what USER_REMOTE is about.
-_CLI_ACTIVITY_SOURCES = {"direct", "mid_turn_enqueue"}
-
-
-def _detect_user_remote(session_id: str) -> bool:
+def _detect_user_remote(session_id: str, scan: Optional[Dict[str, list]] = None) -> bool:
     """USER_REMOTE: explicitly set via mode_change, auto-cleared by CLI activity.
 
     Active when the most recent USER_REMOTE ``mode_change`` is enabled AND no
@@ -629,26 +670,22 @@ def _detect_user_remote(session_id: str) -> bool:
     MANUAL_MODE mode_changes are ignored: USER_REMOTE is an orthogonal presence
     axis, not part of the operational-mode toggle.
     """
+    if scan is None:
+        scan = _scan_mode_events("user_remote", _user_activity_query(_CLI_ACTIVITY_SOURCES)[0])
     set_ts = None
-    for event in read_events(limit=100, reverse=True):
-        if event.get("event") != "mode_change":
-            continue
-        data = event.get("data", {})
-        if data.get("mode") != "USER_REMOTE":
-            continue
-        if not data.get("enabled", True):
+    for event in scan["user_remote"]:
+        if not event.get("data", {}).get("enabled", True):
             return False  # most recent USER_REMOTE change disabled it
         set_ts = _parse_epoch(event.get("timestamp"))
-        break
     if set_ts is None:
         return False
-    cli_ts = _get_last_user_activity_timestamp(session_id, sources=_CLI_ACTIVITY_SOURCES)
+    cli_ts = _get_last_user_activity_timestamp(session_id, sources=_CLI_ACTIVITY_SOURCES, scan=scan)
     if cli_ts is not None and cli_ts > set_ts:
         return False  # operator has returned to the CLI since going remote
     return True
 
 
-def _get_current_work_mode() -> Optional[str]:
+def _get_current_work_mode(scan: Optional[Dict[str, list]] = None) -> Optional[str]:
     """Get the current work mode.
 
     Resolution order (BUG #1068 fix — Cycle 514):
@@ -670,10 +707,11 @@ def _get_current_work_mode() -> Optional[str]:
     # work_mode_change event from sprint creation aged out of the 50-event window.
     try:
         from ..task.scope import get_scope_check
-        from ..task.reader import TaskReader
         scope = get_scope_check()
         active_entries = scope.get("active", [])
         if active_entries:
+            # Task models (YAML, pydantic) load only when a task is in scope.
+            from ..task.reader import TaskReader
             reader = TaskReader()
             for entry in active_entries:
                 tid = entry.get("id")
@@ -705,7 +743,8 @@ def _get_current_work_mode() -> Optional[str]:
         print(f"⚠️ MACF: SPRINT/PLAY_TIME scope check in _get_current_work_mode failed (non-blocking): {e}", file=sys.stderr)
 
     # Fall back: most recent work_mode_change event (existing behavior)
-    for event in read_events(limit=50, reverse=True):
-        if event.get("event") == "work_mode_change":
-            return event.get("data", {}).get("mode")
+    if scan is None:
+        scan = _scan_mode_events("work_mode")
+    for event in scan["work_mode"]:
+        return event.get("data", {}).get("mode")
     return None
@@ -20,6 +20,9 @@ Current contents:
   one-line summary per tool invocation (tool name + key argument
   like skill name, file path, command prefix) for inclusion in
   PreToolUse hook output.
+- ``tracing`` — :class:`span` (context manager / decorator) and
+  :class:`trace_hook` for phase-level hook timing, written per session to
+  ``hooks/hook_trace.jsonl`` and aggregated by ``macf_tools hooks profile``.
 
 Producers expected: hook handlers in ``macf.hooks.*``, channel modules
 in ``macf.channels.*``, and CLI commands in ``macf.cli``.
@@ -28,6 +31,7 @@ from __future__ import annotations
 
 from .messages import HookMessage, emit_message
 from .tool_metadata import format_tool_metadata
+from .tracing import span, trace_hook
 from .warnings import Warning, emit_warning, reset_dedup_registry
 
 __all__ = [
@@ -37,4 +41,6 @@ __all__ = [
     "emit_warning",
     "format_tool_metadata",
     "reset_dedup_registry",
+    "span",
+    "trace_hook",
 ]
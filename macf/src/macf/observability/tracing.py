@@ -0,0 +1,170 @@
+"""Phase-level tracing for hook runs.
+
+``log_hook_event`` records that a hook ran; spans record where its time went.
+A hook run is traced by ``trace_hook`` (entered for every handler's ``run``
+by ``with_hook_context``), and code on its path marks phases with ``span``,
+as a context manager or a decorator::
+
+    with span("transcript_scan"):
+        ...
+
+    @span("breadcrumb")
+    def get_breadcrumb(): ...
+
+Spans nest: a span opened inside another is recorded under its parent's
+path (``breadcrumb/git_hash``). Outside a traced hook run ``span`` does
+nothing beyond one ContextVar lookup, so helpers can be decorated
+unconditionally.
+
+On exit ``trace_hook`` appends ONE compact JSON line per run to
+``/tmp/macf/{agent_id}/{session_id}/hooks/hook_trace.jsonl``::
+
+    {"v": 1, "hook": "handle_stop", "sid": "...", "ts": 1730000000.0,
+     "us": 48211, "ok": true,
+     "spans": [["token_scan", 1022, 4310], ["breadcrumb", 5400, 4012], ...]}
+
+``us`` is the run's wall time and each span is ``[path, start_us, dur_us]``
+relative to the run start. ``macf_tools hooks profile`` aggregates these
+files into per-phase latency tables and flame-style summaries.
+
+``MACF_HOOK_TRACE=0`` disables tracing.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional
+
+TRACE_FILE = "hook_trace.jsonl"
+
+TRACE_FORMAT_VERSION = 1
+
+
+class _Trace:
+    """Spans collected during one hook run."""
+
+    __slots__ = ("hook", "session_id", "started", "t0", "spans", "stack")
+
+    def __init__(self, hook: str, session_id: Optional[str]):
+        self.hook = hook
+        self.session_id = session_id
+        self.started = time.time()
+        self.t0 = time.perf_counter_ns()
+        self.spans: List[list] = []
+        self.stack: List[str] = []
+
+
+_current: ContextVar[Optional[_Trace]] = ContextVar("macf_hook_trace", default=None)
+
+
+class span:
+    """Time one phase of the traced hook run.
+
+    Usable as ``with span("name"):`` or as ``@span("name")``. A no-op when
+    no hook run is being traced.
+    """
+
+    __slots__ = ("name", "_trace", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._trace: Optional[_Trace] = None
+        self._start = 0
+
+    def __enter__(self) -> "span":
+        trace = _current.get()
+        if trace is not None:
+            self._trace = trace
+            trace.stack.append(self.name)
+            self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        trace = self._trace
+        if trace is None:
+            return
+        end = time.perf_counter_ns()
+        path = "/".join(trace.stack)
+        trace.stack.pop()
+        trace.spans.append([path, (self._start - trace.t0) // 1000, (end - self._start) // 1000])
+        self._trace = None
+
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+class trace_hook:
+    """Trace one hook run and append its record to the session trace file.
+
+    Args:
+        hook: Handler module name, e.g. ``"handle_stop"``.
+        session_id: Session the run belongs to; resolved at exit when None.
+    """
+
+    __slots__ = ("_trace", "_token")
+
+    def __init__(self, hook: str, session_id: Optional[str] = None):
+        enabled = os.environ.get("MACF_HOOK_TRACE", "1").lower() not in ("0", "false", "no")
+        self._trace = _Trace(hook, session_id) if enabled else None
+        self._token = None
+
+    def __enter__(self) -> "trace_hook":
+        if self._trace is not None:
+            self._token = _current.set(self._trace)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        trace = self._trace
+        if trace is None:
+            return
+        _current.reset(self._token)
+        elapsed = (time.perf_counter_ns() - trace.t0) // 1000
+        write_trace({
+            "v": TRACE_FORMAT_VERSION,
+            "hook": trace.hook,
+            "sid": trace.session_id,
+            "ts": round(trace.started, 3),
+            "us": elapsed,
+            "ok": exc_type is None,
+            "spans": trace.spans,
+        })
+
+
+def write_trace(record: dict) -> None:
+    """Append ``record`` to its session's trace file. Never raises."""
+    try:
+        from ..utils import get_current_session_id, get_hooks_dir
+
+        session_id = record.get("sid") or get_current_session_id()
+        record["sid"] = session_id
+        hooks_dir = get_hooks_dir(session_id, create=True)
+        if not hooks_dir:
+            return
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        fd = os.open(hooks_dir / TRACE_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except Exception as e:
+        # Tracing must never disrupt a hook.
+        print(f"⚠️ MACF: hook trace write failed: {e}", file=sys.stderr)
+
+
+def current_spans() -> Optional[List[Any]]:
+    """Spans recorded so far in the traced run, or None when not tracing."""
+    trace = _current.get()
+    return None if trace is None else list(trace.spans)
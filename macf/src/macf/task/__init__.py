@@ -5,31 +5,56 @@ Provides CLI access to Claude Code native Task* tools with MacfTaskMetaData (MTM
 support for hierarchy, version tracking, and lifecycle breadcrumbs.
 
 Task files are stored at: ~/.claude/tasks/{session_uuid}/*.json
+
+The names below are re-exported lazily, so importing one submodule (the
+hooks import ``macf.task.scope`` on every tool call) does not load the
+pydantic/YAML task models.
 """
+import importlib
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "MacfTask": "models",
+    "MacfTaskMetaData": "models",
+    "MacfTaskUpdate": "models",
+    "SprintCustom": "custom_models",
+    "PlayTimeCustom": "custom_models",
+    "TaskReader": "reader",
+    "get_current_session_tasks": "reader",
+    "get_all_session_tasks": "reader",
+    "update_task_file": "reader",
+    "add_task_note": "reader",
+    "archive_task": "archive",
+    "restore_task": "archive",
+    "list_archived_tasks": "archive",
+    "ArchiveResult": "archive",
+    "RestoreResult": "archive",
+    "get_archive_dir": "archive",
+    "ProtectionLevel": "protection",
+    "ProtectionResult": "protection",
+    "check_task_create": "protection",
+    "check_task_update_description": "protection",
+    "check_grant_in_events": "protection",
+    "clear_grant": "protection",
+    "create_grant": "protection",
+    "get_task_type": "protection",
+    "TYPES_REQUIRING_PLAN_CA": "protection",
+    "VALID_TASK_TYPES": "protection",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-from .models import MacfTask, MacfTaskMetaData, MacfTaskUpdate
-from .custom_models import SprintCustom, PlayTimeCustom
-from .reader import TaskReader, get_current_session_tasks, get_all_session_tasks, update_task_file, add_task_note
-from .archive import (
-    archive_task,
-    restore_task,
-    list_archived_tasks,
-    ArchiveResult,
-    RestoreResult,
-    get_archive_dir,
-)
-from .protection import (
-    ProtectionLevel,
-    ProtectionResult,
-    check_task_create,
-    check_task_update_description,
-    check_grant_in_events,
-    clear_grant,
-    create_grant,
-    get_task_type,
-    TYPES_REQUIRING_PLAN_CA,
-    VALID_TASK_TYPES,
-)
 
 __all__ = [
     "MacfTask",
@@ -7,7 +7,6 @@ MTMD is embedded in task descriptions within <macf_task_metadata> tags.
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any, Union
 import re
-import yaml
 
 
 @dataclass
@@ -125,6 +124,10 @@ class MacfTaskMetaData:
 
         yaml_content = match.group(1).strip()
 
+        # Deferred: hooks construct TaskReader on every tool call without
+        # ever parsing a task, and PyYAML is among their heaviest imports.
+        import yaml
+
         try:
             data = yaml.safe_load(yaml_content) or {}
         except yaml.YAMLError:
@@ -272,6 +275,8 @@ class MacfTaskMetaData:
         if self.custom:
             data["custom"] = self.custom
 
+        import yaml
+
         return yaml.dump(data, default_flow_style=False, sort_keys=False)
 
 
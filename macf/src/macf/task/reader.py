@@ -126,12 +126,10 @@ class TaskReader:
             from macf.utils.paths import encode_cc_project_path
             encoded_path = encode_cc_project_path(str(project_root))
 
-            projects_dir = Path.home() / ".claude" / "projects" / encoded_path
-            if not projects_dir.exists():
-                return set()
+            from macf.utils.transcript_registry import get_transcript_registry
 
             # Session UUIDs are JSONL filenames (without extension)
-            return {f.stem for f in projects_dir.glob("*.jsonl")}
+            return get_transcript_registry().sessions(encoded_path)
         except (OSError, IOError) as e:
             print(f"⚠️ MACF: session JSONL scan failed: {e}", file=sys.stderr)
             return set()
@@ -30,7 +30,12 @@ API follows the Full Disclosure Principle (cli_development.md §9):
 """
 
 from typing import Dict, List, Optional
-from ..agent_events_log import append_event, read_events
+from ..agent_events_log import (
+    append_event,
+    fold_projection,
+    read_events,
+    register_projection,
+)
 
 
 def _update_task_scope_status(task_id: str, scope_status: Optional[str]) -> bool:
@@ -169,10 +174,59 @@ def clear_scope(session_id: str = "") -> dict:
     return result
 
 
+_SCOPE_EVENT_TYPES = [
+    "scope_activated", "scope_task_completed", "scope_cleared",
+    "scope_paused", "scope_unpaused", "scope_added", "scope_removed",
+]
+
+
+@register_projection("scope_state", initial=dict, event_types=_SCOPE_EVENT_TYPES)
+def _reduce_scope_state(state: Dict[str, str], event: dict) -> Dict[str, str]:
+    """Fold one scope event into {task_id: status}. See get_scope_state."""
+    event_type = event.get("event", "")
+    data = event.get("data", {})
+
+    if event_type == "scope_cleared":
+        state.clear()
+    elif event_type == "scope_activated":
+        # Replace semantics: scope_activated also resets prior set
+        # (current behavior — set_scope is replace-style via scope set CLI)
+        # We do NOT clear here because scope set's clear is separate; the
+        # CLI orchestrates clear+activate. So scope_activated is purely additive.
+        for tid in data.get("task_ids", []):
+            state[str(tid)] = "active"
+    elif event_type == "scope_added":
+        for tid in data.get("task_ids", []):
+            # Only add if not already present (don't reset paused→active)
+            if str(tid) not in state:
+                state[str(tid)] = "active"
+    elif event_type == "scope_removed":
+        for tid in data.get("task_ids", []):
+            state.pop(str(tid), None)
+    elif event_type == "scope_task_completed":
+        tid = str(data.get("task_id", ""))
+        if tid in state:
+            state[tid] = "inactive"
+    elif event_type == "scope_paused":
+        for tid in data.get("task_ids", []):
+            stid = str(tid)
+            # Unknown tids are adopted as paused: pausing implies scope
+            # membership, and this lets orphan-healing pause events
+            # (BUG: stale MTMD with lost event history) replay correctly.
+            if stid not in state or state[stid] == "active":
+                state[stid] = "paused"
+    elif event_type == "scope_unpaused":
+        for tid in data.get("task_ids", []):
+            if str(tid) in state and state[str(tid)] == "paused":
+                state[str(tid)] = "active"
+
+    return state
+
+
 def get_scope_state() -> Dict[str, str]:
     """Reconstruct current scope state from event log.
 
-    Scans events in chronological order. 3-state model (BUG #1067):
+    Folds scope events in chronological order. 3-state model (BUG #1067):
 
     - scope_cleared resets everything
     - scope_activated / scope_added adds tasks as 'active'
@@ -181,57 +235,13 @@ def get_scope_state() -> Dict[str, str]:
     - scope_unpaused transitions paused task back to 'active'
     - scope_removed drops tasks entirely
 
+    Served by the checkpointed ``scope_state`` projection, so each call folds
+    only the events appended since the previous one.
+
     Returns:
         Dict of {task_id: 'active' | 'paused' | 'inactive'}
     """
-    scope_types = {
-        "scope_activated", "scope_task_completed", "scope_cleared",
-        "scope_paused", "scope_unpaused", "scope_added", "scope_removed",
-    }
-    events = [e for e in read_events(limit=None, reverse=False)
-              if e.get("event", "") in scope_types]
-
-    state: Dict[str, str] = {}
-
-    for event in events:
-        event_type = event.get("event", "")
-        data = event.get("data", {})
-
-        if event_type == "scope_cleared":
-            state.clear()
-        elif event_type == "scope_activated":
-            # Replace semantics: scope_activated also resets prior set
-            # (current behavior — set_scope is replace-style via scope set CLI)
-            # We do NOT clear here because scope set's clear is separate; the
-            # CLI orchestrates clear+activate. So scope_activated is purely additive.
-            for tid in data.get("task_ids", []):
-                state[str(tid)] = "active"
-        elif event_type == "scope_added":
-            for tid in data.get("task_ids", []):
-                # Only add if not already present (don't reset paused→active)
-                if str(tid) not in state:
-                    state[str(tid)] = "active"
-        elif event_type == "scope_removed":
-            for tid in data.get("task_ids", []):
-                state.pop(str(tid), None)
-        elif event_type == "scope_task_completed":
-            tid = str(data.get("task_id", ""))
-            if tid in state:
-                state[tid] = "inactive"
-        elif event_type == "scope_paused":
-            for tid in data.get("task_ids", []):
-                stid = str(tid)
-                # Unknown tids are adopted as paused: pausing implies scope
-                # membership, and this lets orphan-healing pause events
-                # (BUG: stale MTMD with lost event history) replay correctly.
-                if stid not in state or state[stid] == "active":
-                    state[stid] = "paused"
-        elif event_type == "scope_unpaused":
-            for tid in data.get("task_ids", []):
-                if str(tid) in state and state[str(tid)] == "paused":
-                    state[str(tid)] = "active"
-
-    return state
+    return fold_projection("scope_state")
 
 
 def find_orphaned_scope_tasks() -> Dict[str, str]:
@@ -485,7 +495,8 @@ def get_active_timer() -> dict:
         'timer_end_epoch' (float), or {'active': False} if no timer.
     """
     import time
-    for event in read_events(limit=None, reverse=True):
+    timer_events = ("scope_timer_set", "scope_cleared", "scope_timer_cleared")
+    for event in read_events(limit=None, reverse=True, event_types=timer_events):
         if event.get("event") == "scope_timer_set":
             timer_end = event.get("data", {}).get("timer_end_epoch", 0)
             remaining = timer_end - time.time()
@@ -5,7 +5,13 @@ Monitors the CC session JSONL transcript file in real-time using tail-f style
 chunk reads. Detectors classify entries and emit MACF events to the event log.
 
 Architecture:
-    JSONL file (CC appends) → daemon polls (1s) → detectors classify → event log
+    JSONL file (CC appends) → inotify wake (or 1s poll) → detectors classify → event log
+
+On Linux the daemon sleeps on inotify (``utils.file_watch.FileWatcher``) and
+wakes the moment CC appends, so detections land within milliseconds and an
+idle agent costs no wake-ups beyond ``IDLE_TIMEOUT``. Elsewhere, or with
+``--watch poll``, it polls every ``poll_interval`` seconds as before.
+``scripts/bench_transcript_monitor.py`` compares the two.
 
 Usage:
     macf_tools transcript-monitor start       # daemonize
@@ -25,13 +31,16 @@ from pathlib import Path
 from typing import Callable, Dict, List, Optional
 
 from ..agent_events_log import append_event
+from ..utils.file_watch import FileWatcher
 
 # ============================================================================
 # Configuration
 # ============================================================================
 
 DEFAULT_POLL_INTERVAL = 1.0  # 1 second — negligible CPU, responsive detection
+IDLE_TIMEOUT = 60.0  # inotify backend: longest sleep without an event (safety net)
 CHUNK_SIZE = 65536  # 64KB read chunks
+FTS_INGEST_INTERVAL = 10.0  # seconds between full-text index ingests while active
 PID_FILE_NAME = "macf_transcript_monitor.pid"
 LOG_FILE_NAME = "macf_transcript_monitor.log"
 
@@ -295,8 +304,10 @@ class TranscriptMonitor:
     Background daemon that watches a JSONL transcript file and emits MACF events.
 
     Uses tail-f style chunk reads: open file, seek to position, read chunks,
-    parse lines, run detectors, emit events. Poll interval default 1s —
-    negligible CPU on empty reads, responsive detection on new content.
+    parse lines, run detectors, emit events. Between reads it sleeps on the
+    ``watch`` backend: ``"inotify"`` wakes on appends and on the transcript
+    being replaced, ``"poll"`` re-checks every ``poll_interval`` seconds,
+    ``"auto"`` picks inotify where available.
     """
 
     def __init__(
@@ -304,10 +315,14 @@ class TranscriptMonitor:
         jsonl_path: Path,
         poll_interval: float = DEFAULT_POLL_INTERVAL,
         detectors: Optional[List[Detector]] = None,
+        watch: str = "auto",
     ):
         self.jsonl_path = jsonl_path
         self.poll_interval = poll_interval
         self.detectors = detectors or list(DEFAULT_DETECTORS)
+        self.watch = watch
+        self.backend: Optional[str] = None  # resolved by run()
+        self._watcher: Optional[FileWatcher] = None
         self.running = False
 
         # Stats
@@ -320,6 +335,11 @@ class TranscriptMonitor:
         self._fwd_checked_at = 0.0
         self._fwd_cached = False
 
+        # Full-text index feed: ingest whatever arrived, at most every
+        # FTS_INGEST_INTERVAL seconds, once the transcript goes idle.
+        self._fts_pending = False
+        self._fts_ingested_at = 0.0
+
     def add_detector(self, detector: Detector) -> "TranscriptMonitor":
         """Register an additional detector. Returns self for chaining."""
         self.detectors.append(detector)
@@ -375,6 +395,24 @@ class TranscriptMonitor:
             self._fwd_cached = False
         return self._fwd_cached
 
+    def _feed_fts(self) -> None:
+        """Ingest new transcript lines into the full-text index (best-effort)."""
+        if not self._fts_pending:
+            return
+        if os.environ.get("MACF_TRANSCRIPT_FTS", "1") == "0":
+            self._fts_pending = False
+            return
+        now = time.time()
+        if now - self._fts_ingested_at < FTS_INGEST_INTERVAL:
+            return
+        self._fts_ingested_at = now
+        self._fts_pending = False
+        try:
+            from ..forensics.transcript_fts import ingest_transcript
+            ingest_transcript(self.jsonl_path)
+        except Exception as e:
+            print(f"⚠️ TM: full-text ingest failed (non-blocking): {e}", file=sys.stderr)
+
     def _detect_rewind(self, current_size: int) -> None:
         """Check if JSONL was truncated (context rewind)."""
         if self.last_file_size > 0 and current_size < self.last_file_size:
@@ -387,6 +425,14 @@ class TranscriptMonitor:
             self.events_emitted += 1
         self.last_file_size = current_size
 
+    def _idle_timeout(self, watcher: FileWatcher) -> float:
+        """How long to sleep when no new data arrived."""
+        if watcher.backend == "poll":
+            return self.poll_interval
+        if self._fts_pending and os.environ.get("MACF_TRANSCRIPT_FTS", "1") != "0":
+            return max(0.0, self._fts_ingested_at + FTS_INGEST_INTERVAL - time.time())
+        return IDLE_TIMEOUT
+
     def run(self, start_from_end: bool = True) -> None:
         """
         Main daemon loop. Tail-f style chunk reads.
@@ -396,45 +442,35 @@ class TranscriptMonitor:
                            If False, process from beginning.
         """
         self.running = True
-        buffer = ""
+        watcher = self._watcher = FileWatcher(self.jsonl_path, backend=self.watch,
+                                              poll_interval=self.poll_interval)
+        self.backend = watcher.backend
 
         print(f"📡 Transcript Monitor started", file=sys.stderr)
         print(f"   Watching: {self.jsonl_path}", file=sys.stderr)
-        print(f"   Poll interval: {self.poll_interval}s", file=sys.stderr)
+        if self.backend == "poll":
+            print(f"   Poll interval: {self.poll_interval}s", file=sys.stderr)
+        else:
+            print(f"   Wake-up: inotify", file=sys.stderr)
         print(f"   Detectors: {len(self.detectors)}", file=sys.stderr)
 
         try:
-            with open(self.jsonl_path, 'r', errors='replace') as f:
-                if start_from_end:
-                    f.seek(0, 2)  # seek to end
-                    self.last_file_size = f.tell()
-
-                while self.running:
-                    data = f.read(CHUNK_SIZE)
-
-                    if data:
-                        buffer += data
-                        while '\n' in buffer:
-                            line, buffer = buffer.split('\n', 1)
-                            self._process_line(line)
-                    else:
-                        # No new data — check for rewind, then sleep
-                        try:
-                            current_size = self.jsonl_path.stat().st_size
-                            self._detect_rewind(current_size)
-
-                            # If file was truncated, reopen from start
-                            if current_size < f.tell():
-                                print("📡 TM: file truncated, reopening", file=sys.stderr)
-                                break  # exit inner loop, outer caller can restart
-                        except OSError:
-                            pass
-
-                        time.sleep(self.poll_interval)
+            replaced = self._follow(watcher, start_from_end)
+            while replaced and self.running:
+                # CC wrote a new file under the transcript's name: follow it
+                # from its end, like a fresh start.
+                print("📡 TM: transcript replaced, reopening", file=sys.stderr)
+                watcher.rewatch()
+                try:
+                    replaced = self._follow(watcher, start_from_end=True)
+                except FileNotFoundError:
+                    watcher.wait(self._idle_timeout(watcher))
 
         except KeyboardInterrupt:
             pass
         finally:
+            self._watcher = None
+            watcher.close()
             self.running = False
             print(
                 f"\n📡 Transcript Monitor stopped. "
@@ -443,9 +479,49 @@ class TranscriptMonitor:
                 file=sys.stderr,
             )
 
+    def _follow(self, watcher: FileWatcher, start_from_end: bool) -> bool:
+        """Tail the transcript until stopped or truncated (False) or replaced (True)."""
+        buffer = ""
+        with open(self.jsonl_path, 'r', errors='replace') as f:
+            inode = os.fstat(f.fileno()).st_ino
+            if start_from_end:
+                f.seek(0, 2)  # seek to end
+                self.last_file_size = f.tell()
+
+            while self.running:
+                data = f.read(CHUNK_SIZE)
+
+                if data:
+                    self._fts_pending = True
+                    buffer += data
+                    while '\n' in buffer:
+                        line, buffer = buffer.split('\n', 1)
+                        self._process_line(line)
+                    continue
+
+                # No new data — check for rewind or replacement, then sleep
+                try:
+                    st = self.jsonl_path.stat()
+                    if st.st_ino != inode:
+                        return True
+                    self._detect_rewind(st.st_size)
+
+                    # If file was truncated, reopen from start
+                    if st.st_size < f.tell():
+                        print("📡 TM: file truncated, reopening", file=sys.stderr)
+                        return False  # exit the loop, outer caller can restart
+                except OSError:
+                    pass
+
+                self._feed_fts()
+                watcher.wait(self._idle_timeout(watcher))
+        return False
+
     def stop(self) -> None:
-        """Signal the daemon to stop."""
+        """Signal the daemon to stop (safe from a signal handler)."""
         self.running = False
+        if self._watcher is not None:
+            self._watcher.wake()
 
     def get_stats(self) -> dict:
         """Return daemon statistics."""
@@ -456,6 +532,7 @@ class TranscriptMonitor:
             "running": self.running,
             "detectors": len(self.detectors),
             "poll_interval": self.poll_interval,
+            "backend": self.backend,
         }
 
 
@@ -482,16 +559,36 @@ def find_current_transcript() -> Optional[Path]:
     return None
 
 
-def start_daemon(foreground: bool = False, poll_interval: float = DEFAULT_POLL_INTERVAL) -> int:
+def resolve_watch_backend(watch: Optional[str] = None) -> str:
+    """The wake-up backend: ``watch`` if given, else setting ``transcript_monitor.watch``."""
+    if watch:
+        return watch
+    from ..config import resolve_setting
+
+    value, _ = resolve_setting("MACF_TM_WATCH", "transcript_monitor.watch", "auto")
+    if value not in ("auto", "inotify", "poll"):
+        print(f"⚠️ TM: unknown watch backend {value!r}, using auto", file=sys.stderr)
+        return "auto"
+    return value
+
+
+def start_daemon(
+    foreground: bool = False,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    watch: Optional[str] = None,
+) -> int:
     """Start the transcript monitor daemon.
 
     Args:
         foreground: Run in foreground (don't daemonize)
         poll_interval: Seconds between polls (default 1.0)
+        watch: ``auto``, ``inotify`` or ``poll`` (default: setting
+            ``transcript_monitor.watch``, else auto)
 
     Returns:
         0 on success, 1 on error
     """
+    watch = resolve_watch_backend(watch)
     if is_running():
         pid = read_pid_file()
         print(f"📡 Transcript Monitor already running (PID {pid})")
@@ -505,7 +602,7 @@ def start_daemon(foreground: bool = False, poll_interval: float = DEFAULT_POLL_I
     if foreground:
         # Run in foreground
         write_pid_file(os.getpid())
-        monitor = TranscriptMonitor(jsonl_path, poll_interval=poll_interval)
+        monitor = TranscriptMonitor(jsonl_path, poll_interval=poll_interval, watch=watch)
 
         def handle_signal(signum, frame):
             monitor.stop()
@@ -531,7 +628,7 @@ def start_daemon(foreground: bool = False, poll_interval: float = DEFAULT_POLL_I
         write_pid_file(pid)
         print(f"📡 Transcript Monitor started (PID {pid})")
         print(f"   Watching: {jsonl_path}")
-        print(f"   Poll interval: {poll_interval}s")
+        print(f"   Wake-up: {watch} (poll interval {poll_interval}s)")
         return 0
 
     # Child: become daemon
@@ -542,7 +639,7 @@ def start_daemon(foreground: bool = False, poll_interval: float = DEFAULT_POLL_I
     # daemon's inherited fd 2 (issue #54).
     _detach_standard_streams()
 
-    monitor = TranscriptMonitor(jsonl_path, poll_interval=poll_interval)
+    monitor = TranscriptMonitor(jsonl_path, poll_interval=poll_interval, watch=watch)
 
     def handle_signal(signum, frame):
         monitor.stop()
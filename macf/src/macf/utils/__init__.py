@@ -1,106 +1,118 @@
 """
 MACF Utilities - Modular package structure.
+
+The helpers listed in ``__all__`` are re-exported lazily: ``from macf.utils
+import get_token_info`` imports ``macf.utils.tokens`` and nothing else, so a
+hook entry point only pays for the submodules its code path touches.
+Submodules themselves are importable as attributes (``macf.utils.paths``).
 """
+import importlib
 
-from .paths import (
-    get_macf_package_path,
-    find_maceff_root,
-    find_project_root,
-    find_agent_home,
-    get_session_dir,
-    get_hooks_dir,
-    get_dev_scripts_dir,
-    get_logs_dir,
-    get_session_transcript_path,
-)
-from .session import (
-    get_current_session_id,
-    get_last_user_prompt_uuid,
-    detect_session_migration,
-)
-from .json_io import (
-    write_json_safely,
-    read_json,
-)
-from .artifacts import (
-    get_latest_consciousness_artifacts,
-    ConsciousnessArtifacts,
-)
-from .cycles import (
-    detect_auto_mode,
-)
-from .drives import (
-    start_dev_drv,
-    complete_dev_drv,
-    get_dev_drv_stats,
-    start_deleg_drv,
-    complete_deleg_drv,
-    bridge_deleg_drv_to_agent,
-    complete_deleg_drv_by_agent,
-    get_deleg_drv_stats,
-    record_delegation_start,
-    record_delegation_complete,
-    get_delegations_this_drive,
-    clear_delegations_this_drive,
-)
-from .temporal import (
-    get_formatted_timestamp,
-    get_temporal_context,
-    format_duration,
-    calculate_session_duration,
-    format_temporal_awareness_section,
-    get_minimal_timestamp,
-    format_minimal_temporal_message,
-)
-from .environment import (
-    detect_execution_environment,
-    get_rich_environment_string,
-    get_env_var_report,
-    KEY_ENV_VARS,
-)
-from .breadcrumbs import (
-    format_breadcrumb,
-    parse_breadcrumb,
-    extract_current_git_hash,
-    get_breadcrumb,
-)
-from .tokens import (
-    get_token_info,
-    format_token_context_minimal,
-    format_token_context_full,
-    get_boundary_guidance,
-    get_usable_context,
-    CC2_TOTAL_CONTEXT,
-    get_total_context,
-)
-from .claude_settings import (
-    get_autocompact_setting,
-)
-from .manifest import (
-    _deep_merge,
-    load_merged_manifest,
-    filter_active_policies,
-    format_manifest_awareness,
-    get_framework_policies_path,
-    find_policy_file,
-    list_policy_files,
-)
-from .formatting import (
-    format_macf_brand,
-    format_macf_footer,
-    format_proprioception_awareness,
-    get_claude_code_version,
-)
-from .identity import (
-    get_agent_identity,
-)
-from .terminal import (
-    set_terminal_title,
-)
-# NOTE: recommend module NOT imported here (heavy deps: sentence_transformers ~3s)
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    # .paths
+    "get_macf_package_path": "paths",
+    "find_maceff_root": "paths",
+    "find_project_root": "paths",
+    "find_agent_home": "paths",
+    "get_session_dir": "paths",
+    "get_hooks_dir": "paths",
+    "get_dev_scripts_dir": "paths",
+    "get_logs_dir": "paths",
+    "get_session_transcript_path": "paths",
+    # .session
+    "get_current_session_id": "session",
+    "get_last_user_prompt_uuid": "session",
+    "detect_session_migration": "session",
+    # .json_io
+    "write_json_safely": "json_io",
+    "read_json": "json_io",
+    # .artifacts
+    "get_latest_consciousness_artifacts": "artifacts",
+    "ConsciousnessArtifacts": "artifacts",
+    # .cycles
+    "detect_auto_mode": "cycles",
+    # .drives
+    "start_dev_drv": "drives",
+    "complete_dev_drv": "drives",
+    "get_dev_drv_stats": "drives",
+    "start_deleg_drv": "drives",
+    "complete_deleg_drv": "drives",
+    "bridge_deleg_drv_to_agent": "drives",
+    "complete_deleg_drv_by_agent": "drives",
+    "get_deleg_drv_stats": "drives",
+    "record_delegation_start": "drives",
+    "record_delegation_complete": "drives",
+    "get_delegations_this_drive": "drives",
+    "clear_delegations_this_drive": "drives",
+    # .temporal
+    "get_formatted_timestamp": "temporal",
+    "get_temporal_context": "temporal",
+    "format_duration": "temporal",
+    "calculate_session_duration": "temporal",
+    "format_temporal_awareness_section": "temporal",
+    "get_minimal_timestamp": "temporal",
+    "format_minimal_temporal_message": "temporal",
+    "DATEUTIL_AVAILABLE": "temporal",
+    # .environment
+    "detect_execution_environment": "environment",
+    "get_rich_environment_string": "environment",
+    "get_env_var_report": "environment",
+    "KEY_ENV_VARS": "environment",
+    # .breadcrumbs
+    "format_breadcrumb": "breadcrumbs",
+    "parse_breadcrumb": "breadcrumbs",
+    "extract_current_git_hash": "breadcrumbs",
+    "get_breadcrumb": "breadcrumbs",
+    # .tokens
+    "get_token_info": "tokens",
+    "format_token_context_minimal": "tokens",
+    "format_token_context_full": "tokens",
+    "get_boundary_guidance": "tokens",
+    "get_usable_context": "tokens",
+    "CC2_TOTAL_CONTEXT": "tokens",
+    "get_total_context": "tokens",
+    # .claude_settings
+    "get_autocompact_setting": "claude_settings",
+    # .manifest
+    "_deep_merge": "manifest",
+    "load_merged_manifest": "manifest",
+    "filter_active_policies": "manifest",
+    "format_manifest_awareness": "manifest",
+    "get_framework_policies_path": "manifest",
+    "find_policy_file": "manifest",
+    "list_policy_files": "manifest",
+    # .formatting
+    "format_macf_brand": "formatting",
+    "format_macf_footer": "formatting",
+    "format_proprioception_awareness": "formatting",
+    "get_claude_code_version": "formatting",
+    # .identity
+    "get_agent_identity": "identity",
+    # .terminal
+    "set_terminal_title": "terminal",
+}
+# NOTE: recommend module NOT re-exported here (heavy deps: sentence_transformers ~3s)
 # Import directly: from macf.utils.recommend import get_recommendations
 
-from .temporal import DATEUTIL_AVAILABLE
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        try:
+            return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __all__ = [
     "CC2_TOTAL_CONTEXT",
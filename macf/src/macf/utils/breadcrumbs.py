@@ -8,6 +8,9 @@ import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
+from .context import hook_fact
+from .fact_cache import persistent_fact
+from ..observability.tracing import span
 from .paths import find_project_root
 from .session import get_current_session_id
 from .json_io import read_json
@@ -28,25 +31,25 @@ def get_current_dev_drv_prompt_uuid() -> Optional[str]:
     """
     try:
         # Import here to avoid circular dependency
-        from ..agent_events_log import read_events
+        from ..agent_events_log import ScanQuery, scan_many
 
         # Get current session to filter events
         current_session = get_current_session_id()
 
-        # Get most recent dev_drv_started event FOR THIS SESSION
-        for event in read_events(limit=50, reverse=True):
-            if event.get("event") == "dev_drv_started":
-                data = event.get("data", {})
-
-                # Filter by current session - skip test data and other sessions
-                event_session = data.get("session_id", "")
-                if current_session and event_session and not event_session.startswith(current_session[:8]):
-                    continue  # Skip events from other sessions
+        def same_session(event: dict) -> bool:
+            # Filter by current session - skip test data and other sessions
+            event_session = event.get("data", {}).get("session_id", "")
+            return not (current_session and event_session
+                        and not event_session.startswith(current_session[:8]))
 
-                prompt_uuid = data.get("prompt_uuid")
-                if prompt_uuid and prompt_uuid != "unknown":
-                    return prompt_uuid
-                break  # Found event but no valid UUID
+        # Get most recent dev_drv_started event FOR THIS SESSION
+        found = scan_many({"dev_drv": ScanQuery(
+            frozenset({"dev_drv_started"}), where=same_session, limit=50,
+        )})
+        for event in found["dev_drv"]:
+            prompt_uuid = event.get("data", {}).get("prompt_uuid")
+            if prompt_uuid and prompt_uuid != "unknown":
+                return prompt_uuid
 
         return None
     except (OSError, IOError, ValueError) as e:
@@ -217,10 +220,48 @@ def _find_possible_agent_ids(session_id: str) -> list:
         print(f"⚠️ MACF: agent ID scan failed: {e}", file=sys.stderr)
         return []
 
+def _git_head_inputs(_git_hash: Optional[str]) -> Optional[list]:
+    """Files whose stamps pin the HEAD commit: HEAD, the branch ref, packed-refs.
+
+    Outside a repository, the ``.git`` candidates up the tree (all missing),
+    so a later ``git init`` invalidates the cached None.
+    """
+    root = find_project_root()
+    for directory in (root, *root.parents):
+        git_dir = directory / ".git"
+        if git_dir.exists():
+            break
+    else:
+        return [d / ".git" for d in (root, *root.parents)]
+
+    try:
+        if git_dir.is_file():  # worktree / submodule: "gitdir: <path>"
+            pointer = git_dir.read_text().strip()
+            if not pointer.startswith("gitdir:"):
+                return None
+            git_dir = (git_dir.parent / pointer[len("gitdir:"):].strip()).resolve()
+        head = (git_dir / "HEAD").read_text().strip()
+        common_dir = git_dir
+        if (git_dir / "commondir").exists():
+            common_dir = (git_dir / (git_dir / "commondir").read_text().strip()).resolve()
+    except OSError:
+        return None
+
+    inputs = [git_dir / "HEAD", common_dir / "packed-refs"]
+    if head.startswith("ref:"):
+        inputs.append(common_dir / head[len("ref:"):].strip())
+    return inputs
+
+
+@hook_fact("git_hash")
+@span("git_hash")
+@persistent_fact("git_hash", inputs=_git_head_inputs, env=("CLAUDE_PROJECT_DIR", "GIT_DIR"))
 def extract_current_git_hash() -> Optional[str]:
     """
     Extract current git commit hash (short form).
 
+    Cached across hook processes until HEAD or the branch ref changes.
+
     Returns:
         Short git hash (7 chars) like "c3ec870" or None if not in git repo
     """
@@ -239,6 +280,10 @@ def extract_current_git_hash() -> Optional[str]:
 
     return None
 
+@hook_fact("breadcrumb", events={
+    "dev_drv_started", "cycle_correction", "compaction_detected", "state_snapshot", "session_started",
+})
+@span("breadcrumb")
 def get_breadcrumb() -> str:
     """
     Get current breadcrumb with all 5 components auto-gathered.
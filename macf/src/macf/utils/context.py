@@ -0,0 +1,191 @@
+"""
+Per-invocation hook context.
+
+One hook run asks the same questions many times over: the session id, the
+token usage, the breadcrumb (which itself needs the cycle, the prompt UUID and
+a ``git rev-parse``), the AUTO_MODE setting, the active modes. Each helper
+answers from scratch, so a single PreToolUse used to read the event log and
+the transcript tail several times and fork git twice.
+
+A ``HookContext`` is entered once per invocation (``@with_hook_context`` on a
+handler's ``run``). While it is active, helpers decorated with ``@hook_fact``
+compute their answer once and serve it from the context afterwards. Outside a
+context they behave exactly as before, so CLI callers and tests that never
+enter one see no change.
+
+Facts derived from the event log name the event types that can change them;
+``append_events`` reports what it wrote and the matching facts are dropped,
+so a hook that records ``dev_drv_started`` sees the new prompt UUID in its
+next breadcrumb.
+"""
+
+import functools
+import json
+import os
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional
+
+_current: ContextVar[Optional["HookContext"]] = ContextVar("macf_hook_context", default=None)
+
+#: fact name -> event types whose arrival makes the cached answer stale
+_FACT_EVENTS: Dict[str, FrozenSet[str]] = {}
+
+
+class HookContext:
+    """Lazily computed, memoized facts for one hook invocation.
+
+    Usable as a context manager; while active it is what ``current_context()``
+    returns and what ``@hook_fact`` helpers cache into.
+
+    Example:
+        >>> with HookContext({"session_id": "abc"}) as ctx:
+        ...     ctx.session_id
+        'abc'
+    """
+
+    def __init__(self, hook_input: Optional[dict] = None):
+        self.hook_input = hook_input or {}
+        self._facts: Dict[Hashable, Any] = {}
+        self._token = None
+
+    def __enter__(self) -> "HookContext":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _current.reset(self._token)
+        self._token = None
+
+    def fact(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing it on first use."""
+        try:
+            return self._facts[key]
+        except KeyError:
+            value = self._facts[key] = compute()
+            return value
+
+    def invalidate(self, *names: str) -> None:
+        """Drop the named facts (all of them when no name is given)."""
+        if not names:
+            self._facts.clear()
+            return
+        for key in [k for k in self._facts if _fact_name(k) in names]:
+            del self._facts[key]
+
+    def events_appended(self, event_types: Iterable[str]) -> None:
+        """Drop the facts that the just-written ``event_types`` can change."""
+        written = set(event_types)
+        stale = [name for name, events in _FACT_EVENTS.items() if events & written]
+        if stale:
+            self.invalidate(*stale)
+
+    # Shared facts. Each goes through the same helper a handler would call,
+    # so the property and the helper share one cached answer.
+
+    @property
+    def session_id(self) -> str:
+        from .session import get_current_session_id
+        return get_current_session_id(self.hook_input)
+
+    @property
+    def token_info(self) -> Dict[str, Any]:
+        from .tokens import get_token_info
+        return get_token_info(self.session_id)
+
+    @property
+    def breadcrumb(self) -> str:
+        from .breadcrumbs import get_breadcrumb
+        return get_breadcrumb()
+
+    @property
+    def auto_mode(self) -> bool:
+        from .cycles import detect_auto_mode
+        return detect_auto_mode(self.session_id)[0]
+
+    @property
+    def agent_home(self):
+        from .paths import find_agent_home
+        return find_agent_home()
+
+    @property
+    def active_modes(self) -> set:
+        from ..modes.detection import detect_active_modes
+        return detect_active_modes(self.session_id, self.token_info)
+
+
+def current_context() -> Optional[HookContext]:
+    """The active ``HookContext``, or None outside a hook invocation."""
+    return _current.get()
+
+
+def _fact_name(key: Hashable) -> str:
+    return key[0] if isinstance(key, tuple) else key
+
+
+def _detach(value: Any) -> Any:
+    """Shallow-copy mutable results so one caller's edits don't leak to the next."""
+    if isinstance(value, (dict, set, list)):
+        return type(value)(value)
+    return value
+
+
+def hook_fact(
+    name: str,
+    events: Iterable[str] = (),
+    key: Optional[Callable[..., Hashable]] = None,
+) -> Callable:
+    """Memoize a helper in the active ``HookContext``.
+
+    Args:
+        name: Fact name, used for invalidation.
+        events: Event types that make a cached answer stale.
+        key: Maps the call's arguments to a hashable cache key. Defaults to
+            the positional and keyword arguments themselves.
+    """
+    _FACT_EVENTS[name] = frozenset(events)
+
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            ctx = _current.get()
+            if ctx is None:
+                return func(*args, **kwargs)
+            if key is not None:
+                args_key = key(*args, **kwargs)
+            else:
+                args_key = (args, tuple(sorted(kwargs.items())))
+            return _detach(ctx.fact((name, args_key), lambda: func(*args, **kwargs)))
+        return wrapper
+
+    return decorate
+
+
+def with_hook_context(run: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """Run a hook's ``run(stdin_json, **kwargs)`` inside a fresh ``HookContext``.
+
+    The run is also traced (``macf.observability.tracing.trace_hook``) under
+    the handler's module name.
+    """
+    hook_name = run.__module__.rsplit(".", 1)[-1]
+    if hook_name == "__main__":  # python -m macf.hooks.handle_*
+        hook_name = os.path.splitext(os.path.basename(run.__code__.co_filename))[0]
+
+    @functools.wraps(run)
+    def wrapper(stdin_json: str = "", **kwargs) -> Dict[str, Any]:
+        try:
+            hook_input = json.loads(stdin_json) if stdin_json else {}
+        except ValueError:
+            hook_input = {}  # run() reports the parse error itself
+        if not isinstance(hook_input, dict):
+            hook_input = {}
+        from ..observability.tracing import trace_hook
+        with HookContext(hook_input), trace_hook(hook_name, hook_input.get("session_id")):
+            return run(stdin_json, **kwargs)
+    return wrapper
+
+
+def notify_events_appended(event_types: Iterable[str]) -> None:
+    """Tell the active context (if any) which event types were just written."""
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.events_appended(event_types)
@@ -8,12 +8,16 @@ import sys
 import time
 from pathlib import Path
 from typing import Optional, Tuple
+from .context import hook_fact
+from ..observability.tracing import span
 from .paths import find_agent_home
 from .session import get_current_session_id
 from .json_io import read_json
 # NOTE: event_queries imported lazily inside functions to avoid circular import
 # (cycles.py -> event_queries -> agent_events_log -> utils -> cycles.py)
 
+@hook_fact("auto_mode", events={"mode_change"})
+@span("auto_mode")
 def detect_auto_mode(session_id: str) -> Tuple[bool, str]:
     """
     Hierarchical AUTO_MODE detection.
@@ -0,0 +1,206 @@
+"""
+Cross-process fact cache.
+
+Every hook is a fresh interpreter, so ``lru_cache`` only saves work within one
+hook run. Facts like the Claude Code version (up to 512 KB of the CC bundle
+read, or ``claude --version``), the git HEAD hash and the project/MacEff roots
+(``git rev-parse``) were recomputed on every tool call even though they change
+about once a session.
+
+``@persistent_fact`` memoizes such a zero-argument helper in
+``fact_cache.json`` under the session sidecar dir
+(``/tmp/macf/{agent_id}/{session_id}/``). Each entry records what the answer
+was computed from:
+
+- the environment variables and working directory it depends on, compared
+  for equality;
+- the stat stamps ``(path, mtime_ns, size, inode)`` of its input files, or a
+  missing-file marker. The helper names its inputs, and computations can add
+  files they end up reading via ``track_input()``.
+
+A hit costs one ``stat`` per input, with the JSON file loaded once per
+process. Any changed stamp, variable or cwd recomputes and rewrites the
+entry. Facts that cannot name their inputs return ``None`` from their
+``inputs`` callable and are not persisted.
+
+The store is only used when the session id is known without a lookup (the
+active ``HookContext``'s hook input, or ``MACF_SESSION_ID`` /
+``CLAUDE_CODE_SESSION_ID``), so resolving the cache never costs more than the
+facts it serves. ``MACF_FACT_CACHE_DIR`` relocates the per-session stores.
+"""
+
+import functools
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .context import current_context
+
+FACT_CACHE_FILE = "fact_cache.json"
+
+_FORMAT_VERSION = 1
+
+#: store path -> loaded {"version": ..., "facts": {...}}, one read per process
+_stores: Dict[str, Dict[str, Any]] = {}
+
+#: Files read by the computation in progress (see ``track_input``).
+_tracked: List[List[str]] = []
+
+_resolving_store = False
+
+
+def track_input(path) -> None:
+    """Record ``path`` as an input of the fact being computed, if any."""
+    if _tracked and path:
+        _tracked[-1].append(str(path))
+
+
+def _stamp(path: str) -> list:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [path, None]
+    return [path, st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _store_path() -> Optional[Path]:
+    """``fact_cache.json`` for this session, or None when it is not cheaply known."""
+    global _resolving_store
+    if _resolving_store:
+        return None
+
+    ctx = current_context()
+    session_id = ctx.hook_input.get("session_id") if ctx is not None else None
+    session_id = (
+        session_id
+        or os.environ.get("MACF_SESSION_ID")
+        or os.environ.get("CLAUDE_CODE_SESSION_ID")
+    )
+    if not session_id:
+        return None
+    override = os.environ.get("MACF_FACT_CACHE_DIR")
+    if override:
+        return Path(override) / str(session_id) / FACT_CACHE_FILE
+
+    _resolving_store = True
+    try:
+        from .paths import get_session_dir
+        session_dir = get_session_dir(str(session_id), create=True)
+    except (ImportError, OSError):
+        session_dir = None
+    finally:
+        _resolving_store = False
+    return session_dir / FACT_CACHE_FILE if session_dir else None
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    key = str(path)
+    store = _stores.get(key)
+    if store is None:
+        try:
+            with open(path) as f:
+                store = json.load(f)
+            if store.get("version") != _FORMAT_VERSION or not isinstance(store.get("facts"), dict):
+                store = None
+        except (OSError, ValueError, AttributeError):
+            store = None
+        store = _stores[key] = store or {"version": _FORMAT_VERSION, "facts": {}}
+    return store
+
+
+def _save(path: Path, name: str, entry: Dict[str, Any]) -> None:
+    """Merge ``entry`` into the on-disk store; last writer wins per file."""
+    store = _load(path)
+    store["facts"][name] = entry
+    try:
+        # Pick up entries other processes wrote since this one loaded.
+        with open(path) as f:
+            on_disk = json.load(f)
+        if on_disk.get("version") == _FORMAT_VERSION:
+            merged = dict(on_disk.get("facts") or {})
+            merged.update(store["facts"])
+            store["facts"] = merged
+    except (OSError, ValueError, AttributeError):
+        pass
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(store, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠️ MACF: fact cache write failed: {e}", file=sys.stderr)
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _is_fresh(entry: Any, env: Dict[str, Optional[str]], cwd: str) -> bool:
+    if not isinstance(entry, dict) or entry.get("env") != env or entry.get("cwd") != cwd:
+        return False
+    stamps = entry.get("stamps")
+    if not isinstance(stamps, list):
+        return False
+    return all(isinstance(s, list) and s and _stamp(s[0]) == s for s in stamps)
+
+
+def persistent_fact(
+    name: str,
+    inputs: Callable[[Any], Optional[Iterable]] = lambda value: (),
+    env: Iterable[str] = (),
+    encode: Callable[[Any], Any] = lambda value: value,
+    decode: Callable[[Any], Any] = lambda value: value,
+) -> Callable:
+    """Persist a zero-argument helper's result across hook processes.
+
+    Args:
+        name: Entry name in the store.
+        inputs: Given the computed value, the files it was derived from, or
+            None to skip persisting this answer. Files passed to
+            ``track_input()`` during the computation are added.
+        env: Environment variables the answer depends on.
+        encode: Value -> JSON-serialisable form.
+        decode: Inverse of ``encode``.
+    """
+    env_vars = tuple(env)
+
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper():
+            path = _store_path()
+            if path is None:
+                return func()
+
+            env_now = {var: os.environ.get(var) for var in env_vars}
+            try:
+                cwd = os.getcwd()
+            except OSError:
+                return func()
+            entry = _load(path)["facts"].get(name)
+            if _is_fresh(entry, env_now, cwd):
+                return decode(entry["value"])
+
+            _tracked.append([])
+            try:
+                value = func()
+            finally:
+                tracked = _tracked.pop()
+            paths = inputs(value)
+            if paths is None:
+                return value
+            stamps = [_stamp(str(p)) for p in dict.fromkeys([*map(str, paths), *tracked])]
+            _save(path, name, {"value": encode(value), "env": env_now, "cwd": cwd, "stamps": stamps})
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorate
+
+
+def clear_fact_cache() -> None:
+    """Forget the stores loaded by this process (the files stay on disk)."""
+    _stores.clear()
@@ -0,0 +1,226 @@
+"""Wait for a file to grow, woken by the kernel where it can tell us.
+
+Hooks sometimes run a few milliseconds before Claude Code finishes writing
+the transcript line they are looking for (SessionStart fires before the
+``compact_boundary`` marker lands). Sleeping a fixed interval and re-reading
+either wastes the whole interval or misses a late write.
+
+``wait_for_growth`` returns as soon as the file is larger than a known size,
+or at a deadline. On Linux it blocks on an inotify ``IN_MODIFY`` watch
+(through ctypes, no extra dependency); elsewhere, or when inotify is
+unavailable, it polls ``stat`` every ``POLL_INTERVAL`` seconds.
+
+``FileWatcher`` is the long-lived form for daemons tailing a file: one
+inotify fd watching the file for writes, moves and deletion, and its
+directory for a replacement appearing under the same name. Its ``wait``
+sleeps until one of those happens, or falls back to a fixed poll interval.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+#: Fallback polling interval, in seconds.
+POLL_INTERVAL = 0.005
+
+IN_MODIFY = 0x00000002
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC if hasattr(os, "O_CLOEXEC") else 0o2000000
+
+_libc = None
+
+
+def _inotify_libc():
+    """libc with the inotify calls, or None where they are unavailable."""
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith("linux"):
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                _libc = libc
+            except (OSError, AttributeError):
+                pass
+    return _libc or None
+
+
+def inotify_init() -> Optional[int]:
+    """A new non-blocking inotify fd, or None where inotify is unavailable."""
+    libc = _inotify_libc()
+    if libc is None:
+        return None
+    fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    return fd if fd >= 0 else None
+
+
+def add_watch(fd: int, path: Union[str, Path], mask: int) -> bool:
+    """Watch ``path`` for ``mask`` on inotify ``fd``; False if it cannot be watched."""
+    libc = _inotify_libc()
+    return libc is not None and libc.inotify_add_watch(fd, os.fsencode(str(path)), mask) >= 0
+
+
+def inotify_watch(path: Union[str, Path], mask: int) -> Optional[int]:
+    """Non-blocking inotify fd watching ``path`` for ``mask``, or None.
+
+    The caller owns the fd and must ``os.close`` it.
+    """
+    fd = inotify_init()
+    if fd is None:
+        return None
+    if not add_watch(fd, path, mask):
+        os.close(fd)
+        return None
+    return fd
+
+
+def drain(fd: int) -> None:
+    """Discard the queued events on non-blocking inotify ``fd``."""
+    try:
+        while os.read(fd, 4096):
+            pass
+    except (BlockingIOError, OSError):
+        pass
+
+
+def _size(path: Union[str, Path]) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return -1
+
+
+def wait_for_growth(path: Union[str, Path], size: int, timeout: float) -> int:
+    """Block until ``path`` is larger than ``size`` bytes or ``timeout`` passes.
+
+    Args:
+        path: File to watch.
+        size: Size already seen; only growth beyond it wakes the caller.
+        timeout: Seconds to wait at most.
+
+    Returns:
+        The file's size on return (``-1`` if it has disappeared). It is
+        larger than ``size`` unless the deadline passed first.
+    """
+    deadline = time.monotonic() + timeout
+    fd = inotify_watch(path, IN_MODIFY)
+    try:
+        while True:
+            # Checked after the watch is in place, so a write that lands
+            # between the caller's stat and the watch is not missed.
+            current = _size(path)
+            remaining = deadline - time.monotonic()
+            if current > size or current < 0 or remaining <= 0:
+                return current
+            if fd is None:
+                time.sleep(min(POLL_INTERVAL, remaining))
+                continue
+            if select.select([fd], [], [], remaining)[0]:
+                drain(fd)
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+class FileWatcher:
+    """Sleep until a file changes, is replaced, or a timeout passes.
+
+    Args:
+        path: File to watch. It may be missing; its directory must exist
+            for the inotify backend.
+        backend: ``"inotify"``, ``"poll"``, or ``"auto"`` (inotify where
+            available, else poll). Asking for ``"inotify"`` where it is
+            unavailable raises OSError.
+        poll_interval: Longest sleep of the poll backend, in seconds.
+    """
+
+    #: Events on the file itself: appends, truncation, rename, deletion.
+    FILE_EVENTS = IN_MODIFY | IN_MOVE_SELF | IN_DELETE_SELF
+    #: Events on its directory: something created or moved in (a replacement).
+    DIR_EVENTS = IN_CREATE | IN_MOVED_TO
+
+    def __init__(self, path: Union[str, Path], backend: str = "auto", poll_interval: float = 1.0):
+        if backend not in ("auto", "inotify", "poll"):
+            raise ValueError(f"unknown file watch backend: {backend}")
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.wakeups = 0  # returns from wait(), for benchmarks and stats
+        self.fd = self._open() if backend != "poll" else None
+        if self.fd is None and backend == "inotify":
+            raise OSError(f"inotify unavailable for {self.path}")
+        self.backend = "inotify" if self.fd is not None else "poll"
+        # Self-pipe: wake() (safe from a signal handler) ends a wait early.
+        self._wake_r, self._wake_w = os.pipe()
+        for end in (self._wake_r, self._wake_w):
+            os.set_blocking(end, False)
+
+    def _open(self) -> Optional[int]:
+        fd = inotify_init()
+        if fd is None:
+            return None
+        if not add_watch(fd, self.path.parent, self.DIR_EVENTS):
+            os.close(fd)
+            return None
+        add_watch(fd, self.path, self.FILE_EVENTS)  # missing file: the directory watch sees it appear
+        return fd
+
+    def rewatch(self) -> None:
+        """Follow the file now at ``path`` (after it was replaced or recreated)."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = self._open()
+            if self.fd is None:
+                self.backend = "poll"
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep until a watched event, ``wake()`` or ``timeout`` seconds.
+
+        The poll backend sleeps ``min(timeout, poll_interval)``.
+
+        Returns:
+            True if woken by an event or ``wake()`` (False on timeout).
+        """
+        self.wakeups += 1
+        timeout = max(0.0, timeout)
+        fds = [self._wake_r]
+        if self.fd is None:
+            timeout = min(timeout, self.poll_interval)
+        else:
+            fds.append(self.fd)
+        ready = select.select(fds, [], [], timeout)[0]
+        for fd in ready:
+            drain(fd)
+        return bool(ready)
+
+    def wake(self) -> None:
+        """End the current (or next) ``wait`` now."""
+        try:
+            os.write(self._wake_w, b"!")
+        except OSError:
+            pass  # pipe full: a wake-up is already pending, or closed
+
+    def close(self) -> None:
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        if self._wake_r is not None:
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r = self._wake_w = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -7,22 +7,78 @@ from functools import lru_cache
 
 import sys
 
-try:
-    from importlib.metadata import version
-    __version__ = version("macf")
-except Exception as e:
-    __version__ = "0.0.0-dev"  # Fallback for development
-    print(f"⚠️ MACF: macf package version unavailable, using {__version__}: {e}", file=sys.stderr)
-
 from .environment import get_rich_environment_string
+from .fact_cache import persistent_fact, track_input
+
+
+def _dist_info_version() -> str:
+    """Version from an installed ``macf-*.dist-info/METADATA`` on sys.path, or "".
+
+    Reads the ``Version:`` header directly: the footer runs in several hooks
+    per turn, and importing ``importlib.metadata`` (email, zipfile, ...)
+    costs more than the rest of those hooks' imports.
+    """
+    import os
+
+    for entry in sys.path:
+        try:
+            names = os.listdir(entry or ".")
+        except OSError:
+            continue
+        for name in names:
+            if name.startswith("macf-") and name.endswith(".dist-info"):
+                try:
+                    with open(os.path.join(entry, name, "METADATA"), encoding="utf-8") as f:
+                        for line in f:
+                            if line.startswith("Version:"):
+                                return line.split(":", 1)[1].strip()
+                            if not line.strip():
+                                break
+                except OSError:
+                    continue
+    return ""
+
+
+@lru_cache(maxsize=1)
+def _macf_version() -> str:
+    """macf package version, resolved on first use."""
+    found = _dist_info_version()
+    if found:
+        return found
+    try:
+        from importlib.metadata import version
+        return version("macf")
+    except Exception as e:
+        fallback = "0.0.0-dev"  # Fallback for development
+        print(f"⚠️ MACF: macf package version unavailable, using {fallback}: {e}", file=sys.stderr)
+        return fallback
+
+
+def __getattr__(name):
+    if name == "__version__":
+        return _macf_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _claude_binary_inputs(_version: str) -> list:
+    """The ``claude`` on PATH: an update swaps the file (or the symlink) it resolves to."""
+    import shutil
+    claude_path = shutil.which("claude")
+    return [claude_path] if claude_path else []
 
 
 @lru_cache(maxsize=1)
+@persistent_fact(
+    "claude_code_version",
+    inputs=_claude_binary_inputs,
+    env=("MACF_CC_VERSION", "PATH"),
+)
 def get_claude_code_version() -> str:
     """
     Get Claude Code version using multi-strategy detection.
 
-    Cached to avoid repeated subprocess calls (hooks may call this multiple times per session).
+    Cached to avoid repeated subprocess calls (hooks may call this multiple times per session),
+    per process and across hook processes until the ``claude`` binary changes.
 
     Strategies (in order):
     0. MACF_CC_VERSION env var (explicit override — required for Mac alias-launched CC)
@@ -52,6 +108,7 @@ def get_claude_code_version() -> str:
 
     def _extract_version_from_script(script_path: str) -> str:
         """Extract version from a self-contained CC node script by grepping its content."""
+        track_input(script_path)
         try:
             with open(script_path, 'r', errors='ignore') as f:
                 # Read first 500KB (version is near the top of the bundle)
@@ -149,9 +206,9 @@ def format_macf_footer() -> str:
     cc_version = get_claude_code_version()
 
     if cc_version:
-        version_line = f"🏗️ MACF Tools {__version__} | Claude Code {cc_version}"
+        version_line = f"🏗️ MACF Tools {_macf_version()} | Claude Code {cc_version}"
     else:
-        version_line = f"🏗️ MACF Tools {__version__} (Multi-Agent Coordination Framework)"
+        version_line = f"🏗️ MACF Tools {_macf_version()} (Multi-Agent Coordination Framework)"
 
     return f"""---
 {version_line}
@@ -11,7 +11,26 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+from .fact_cache import persistent_fact
+
+
+def _identity_inputs(_identity: str) -> list:
+    """Files the identity is resolved from (see ``get_agent_identity``)."""
+    from macf.utils.paths import find_agent_home
+    agent_home = find_agent_home()
+    return [
+        agent_home / '.maceff' / 'config.json',
+        agent_home / '.maceff_primary_agent.id',
+        Path.home() / '.maceff_primary_agent.id',
+        '/etc/passwd',
+    ]
+
 
+@persistent_fact(
+    "agent_identity",
+    inputs=_identity_inputs,
+    env=('USER', 'HOME', 'MACEFF_AGENT_NAME', 'MACEFF_AGENT_HOME_DIR'),
+)
 def get_agent_identity() -> str:
     """
     Get agent identity in format 'DisplayName@uuid_prefix'.
@@ -10,6 +10,8 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from .fact_cache import persistent_fact
+
 
 def detect_cc_binary() -> str:
     """Detect the Claude Code binary path.
@@ -76,6 +78,13 @@ def get_macf_package_path() -> Optional[Path]:
 
 
 @lru_cache(maxsize=1)
+@persistent_fact(
+    "maceff_root",
+    inputs=lambda root: [root / "framework"],
+    env=("MACEFF_ROOT_DIR",),
+    encode=str,
+    decode=Path,
+)
 def find_maceff_root() -> Path:
     """Find MacEff installation root.
 
@@ -88,7 +97,8 @@ def find_maceff_root() -> Path:
     This is where MacEff repo is checked out (host) or installed (container).
     The framework/ subdirectory contains policies and templates.
 
-    Result is cached - warnings only appear once per process.
+    Result is cached per process and, within a session, across hook processes
+    (revalidated against the framework/ marker, the env var and the cwd).
     """
     fallback_reasons = []
 
@@ -140,6 +150,13 @@ def find_maceff_root() -> Path:
 
 
 @lru_cache(maxsize=1)
+@persistent_fact(
+    "project_root",
+    inputs=lambda root: [root / ".claude", root / "CLAUDE.md", root / ".git"],
+    env=("CLAUDE_PROJECT_DIR",),
+    encode=str,
+    decode=Path,
+)
 def find_project_root() -> Path:
     """Find user's project/workspace root.
 
@@ -151,7 +168,8 @@ def find_project_root() -> Path:
     This is where `claude` was launched - the user's workspace.
     Contains project-specific CLAUDE.md and .claude/ configuration.
 
-    Result is cached - warnings only appear once per process.
+    Result is cached per process and, within a session, across hook processes
+    (revalidated against the root's markers, the env var and the cwd).
     """
     # 1. Check CLAUDE_PROJECT_DIR (set by Claude Code)
     claude_project_dir = os.environ.get("CLAUDE_PROJECT_DIR")
@@ -293,6 +311,9 @@ def get_logs_dir(session_id: Optional[str] = None, create: bool = True) -> Optio
 def get_session_transcript_path(session_id: str) -> Optional[str]:
     """Get path to session JSONL file given session ID.
 
+    Prefers a project directory named after the current project when the
+    session appears under several.
+
     Args:
         session_id: Session identifier
 
@@ -302,25 +323,6 @@ def get_session_transcript_path(session_id: str) -> Optional[str]:
     if session_id == "unknown":
         return None
 
-    projects_dir = Path.home() / ".claude" / "projects"
-
-    if not projects_dir.exists():
-        return None
-
-    # Find project directory using current working directory name
-    project_name = find_project_root().name
-
-    # Try exact match first
-    for project_dir in projects_dir.glob(f"*{project_name}*"):
-        potential_file = project_dir / f"{session_id}.jsonl"
-        if potential_file.exists():
-            return str(potential_file)
+    from .transcript_registry import get_transcript_registry
 
-    # Fallback: search all project directories
-    for project_dir in projects_dir.iterdir():
-        if project_dir.is_dir():
-            potential_file = project_dir / f"{session_id}.jsonl"
-            if potential_file.exists():
-                return str(potential_file)
-
-    return None
+    return get_transcript_registry().path(session_id, prefer=find_project_root().name)
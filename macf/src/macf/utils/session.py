@@ -7,6 +7,7 @@ import os
 import sys
 from pathlib import Path
 from typing import Optional
+from .context import current_context, hook_fact
 from .paths import find_project_root
 # Events are sole source of truth - state file reads removed
 
@@ -30,18 +31,32 @@ def get_current_session_id(hook_input: Optional[dict] = None) -> str:
     (cversek/MacEff#159's sibling, #158). The hook process already holds the
     right answer; prefer it over the shared log.
 
+    Inside a hook invocation the active ``HookContext`` supplies the hook
+    input when the caller passes none, and the tier 2-4 answer is computed
+    once per invocation.
+
     Args:
         hook_input: Parsed hook stdin payload, when the caller is a hook.
 
     Returns:
         Session ID string or "unknown" if not found
     """
+    if not hook_input:
+        ctx = current_context()
+        hook_input = ctx.hook_input if ctx is not None else None
+
     # TIER 1: the caller's own session, straight from CC.
     if hook_input:
         sid = hook_input.get("session_id")
         if sid:
             return str(sid)
 
+    return _get_session_id_without_hook_input()
+
+
+@hook_fact("session_id", events={"session_started", "migration_detected"})
+def _get_session_id_without_hook_input() -> str:
+    """Tiers 2-4 of ``get_current_session_id``."""
     # TIER 2: environment (session-scoped by construction).
     for var in ("MACF_SESSION_ID", "CLAUDE_CODE_SESSION_ID"):
         sid = os.environ.get(var)
@@ -72,34 +87,22 @@ def _get_session_id_from_mtime() -> str:
     Selection is order-independent: among the candidate JSONL files it picks
     the globally newest by mtime, with the filename as a tiebreaker, so the
     result does not depend on glob / iterdir ordering (which is
-    filesystem-dependent and was a source of flaky behaviour).
+    filesystem-dependent and was a source of flaky behaviour). The
+    transcript registry supplies the candidates without a directory walk.
 
     Returns:
         Session ID string or "unknown" if not found
     """
-    projects_dir = Path.home() / ".claude" / "projects"
-
-    if not projects_dir.exists():
-        return "unknown"
-
-    def _newest_stem(dirs) -> Optional[str]:
-        candidates = []
-        for project_dir in dirs:
-            if project_dir.is_dir():
-                candidates.extend(project_dir.glob("*.jsonl"))
-        if not candidates:
-            return None
-        # Global newest by mtime; filename tiebreaks equal mtimes so the
-        # result is deterministic regardless of iteration order.
-        newest = max(candidates, key=lambda p: (p.stat().st_mtime, p.name))
-        return newest.stem
+    from .transcript_registry import get_transcript_registry
+
+    registry = get_transcript_registry()
 
     # Prefer project directories matching the current project name; if none
     # of them contain a JSONL, fall back to all projects.
     project_name = find_project_root().name
     return (
-        _newest_stem(projects_dir.glob(f"*{project_name}*"))
-        or _newest_stem(projects_dir.iterdir())
+        registry.newest([p for p in registry.projects() if project_name in p])
+        or registry.newest()
         or "unknown"
     )
 
@@ -122,25 +125,18 @@ def get_last_user_prompt_uuid(session_id: Optional[str] = None) -> Optional[str]
         return None
 
     # Find JSONL file
-    jsonl_pattern = f"{session_id}.jsonl"
-    project_dirs = [Path.home() / ".claude" / "projects"]
-
-    jsonl_path = None
-    for project_dir in project_dirs:
-        if not project_dir.exists():
-            continue
-        for file_path in project_dir.rglob(jsonl_pattern):
-            jsonl_path = file_path
-            break
-        if jsonl_path:
-            break
+    from .transcript_registry import get_transcript_registry
 
+    found = get_transcript_registry().path(session_id)
+    jsonl_path = Path(found) if found else None
     if not jsonl_path or not jsonl_path.exists():
         return None
 
     # Read backwards to find last user message
     try:
-        with open(jsonl_path, 'r') as f:
+        from .transcript_archive import open_transcript
+
+        with open_transcript(jsonl_path, 'r') as f:
             lines = f.readlines()
 
         # Iterate backwards
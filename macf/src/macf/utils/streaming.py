@@ -6,15 +6,20 @@ implementation ``f.readlines()`` materializes the entire file into a list.
 For event logs that grow to hundreds of MB and transcripts that can be
 ~1 GB, this OOM-kills the hook at high context use.
 
-This module provides a generator that reads a file backwards in fixed-size
-chunks, yielding decoded lines newest-first. Memory bound: roughly
-``chunk_size + max_line_size`` bytes at any moment, independent of file
-size.
+This module provides a generator that reads a file backwards, yielding
+decoded lines newest-first. Regular files are memory-mapped and scanned with
+``rfind`` (one slice copy per line); anything that cannot be mapped is read
+in fixed-size chunks. Heap bound: roughly ``chunk_size + max_line_size``
+bytes at any moment, independent of file size.
+
+``scripts/bench_streaming.py`` compares the mapped and chunked readers.
 """
 from __future__ import annotations
 
+import mmap
+import os
 from pathlib import Path
-from typing import Generator, Union
+from typing import BinaryIO, Generator, Optional, Union
 
 
 def iter_lines_forward(
@@ -51,13 +56,15 @@ def iter_lines_reverse(
     path: Union[str, Path],
     chunk_size: int = 65536,
     encoding: str = "utf-8",
+    use_mmap: bool = True,
 ) -> Generator[str, None, None]:
     """Yield decoded lines from ``path`` in reverse order (newest first).
 
-    Reads the file backwards from EOF in ``chunk_size`` byte chunks. Within
-    each chunk, lines are split on ``b'\\n'``. The trailing fragment of a
-    line that started in an earlier (older) chunk is carried over as a
-    ``remainder`` so cross-chunk lines reassemble correctly.
+    Thin decoding layer over ``iter_line_bytes_reverse``: regular files are
+    memory-mapped and scanned backwards with ``rfind``, so each line is
+    copied once and decoded once, with no chunk concatenation or
+    re-splitting. Files that cannot be mapped fall back to reading
+    ``chunk_size`` byte chunks backwards from EOF.
 
     UTF-8 safety: decoding happens AFTER reassembly, with ``errors='replace'``
     as a defensive fallback when input contains malformed bytes (it should
@@ -66,16 +73,19 @@ def iter_lines_reverse(
 
     Args:
         path: File path to read.
-        chunk_size: Bytes per read. Default 64 KB. Larger = fewer syscalls,
-            higher transient memory; smaller = more syscalls, lower memory.
+        chunk_size: Bytes per read on the chunked fallback. Default 64 KB.
         encoding: Text encoding for decoded output (default ``utf-8``).
+        use_mmap: Map the file when possible (default). False forces the
+            chunked reader.
 
     Yields:
         Lines as str, NEWLINE STRIPPED, newest-first. Empty lines (from a
         trailing newline or blank lines in the source) are yielded as ``""``
         so callers can filter via ``if not line: continue``.
 
-    Memory: O(chunk_size + max_line_size) regardless of file size.
+    Memory: O(chunk_size + max_line_size) of heap regardless of file size.
+    Mapped pages are file-backed and clean, so the kernel reclaims them
+    freely; only the pages near the lines actually read are touched.
 
     Example:
         >>> for line in iter_lines_reverse("events.jsonl"):
@@ -85,37 +95,91 @@ def iter_lines_reverse(
         ...         print(line)
         ...         break
     """
-    p = Path(path)
-    with open(p, "rb") as f:
-        f.seek(0, 2)  # SEEK_END
-        position = f.tell()
-        if position == 0:
+    for line in iter_line_bytes_reverse(path, chunk_size=chunk_size, use_mmap=use_mmap):
+        yield line.decode(encoding, errors="replace")
+
+
+def iter_line_bytes_reverse(
+    path: Union[str, Path],
+    chunk_size: int = 65536,
+    use_mmap: bool = True,
+) -> Generator[bytes, None, None]:
+    """Undecoded peer of ``iter_lines_reverse``: same lines, as ``bytes``.
+
+    Callers that screen lines before parsing (a substring test on a type
+    name, a prefix match) can skip decoding the lines they reject.
+
+    The file is mapped read-only and newlines are found with ``rfind`` on
+    the mapping; each yielded line is a single slice copy. Empty files,
+    non-regular files and anything ``mmap`` refuses fall back to the
+    chunked reader. The mapping is sized when the scan starts, so bytes
+    appended while iterating are not seen — the same snapshot the chunked
+    reader gives.
+
+    Yields:
+        Lines as bytes, NEWLINE STRIPPED, newest-first, including the ``b""``
+        after a trailing newline.
+    """
+    with open(Path(path), "rb") as f:
+        mapping = map_readonly(f) if use_mmap else None
+        if mapping is None:
+            yield from _iter_line_bytes_reverse_chunked(f, chunk_size)
             return
+        with mapping:
+            end = len(mapping)
+            while True:
+                newline = mapping.rfind(b"\n", 0, end)
+                yield mapping[newline + 1:end]
+                if newline < 0:
+                    return
+                end = newline
 
-        # remainder holds the partial leading line from the current chunk,
-        # whose continuation lives in the next (older) chunk we'll read.
-        remainder = b""
-
-        while position > 0:
-            read_size = min(chunk_size, position)
-            position -= read_size
-            f.seek(position)
-            chunk = f.read(read_size)
-
-            # The remainder from the previous iteration represents the START
-            # of a line whose REST is at the END of THIS (older) chunk.
-            # Concatenate so the split below produces complete lines.
-            data = chunk + remainder
-            lines = data.split(b"\n")
-
-            if position > 0:
-                # First piece may be incomplete — its prefix lives in an
-                # even earlier chunk. Save it as the new remainder.
-                remainder = lines[0]
-                # Yield the rest newest-first (last index is most recent).
-                for line in reversed(lines[1:]):
-                    yield line.decode(encoding, errors="replace")
-            else:
-                # No more chunks; every piece is complete.
-                for line in reversed(lines):
-                    yield line.decode(encoding, errors="replace")
+
+def map_readonly(f: BinaryIO) -> Optional[mmap.mmap]:
+    """Read-only mapping of open file ``f``, or None when it cannot be mapped.
+
+    Empty files, pipes, in-memory buffers and anything else ``mmap`` refuses
+    return None so the caller can fall back to ordinary reads.
+    """
+    try:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def _iter_line_bytes_reverse_chunked(f: BinaryIO, chunk_size: int) -> Generator[bytes, None, None]:
+    """Chunked backwards reader behind ``iter_line_bytes_reverse``'s fallback."""
+    f.seek(0, 2)  # SEEK_END
+    position = f.tell()
+    if position == 0:
+        return
+
+    # remainder holds the partial leading line from the current chunk,
+    # whose continuation lives in the next (older) chunk we'll read.
+    remainder = b""
+
+    while position > 0:
+        read_size = min(chunk_size, position)
+        position -= read_size
+        f.seek(position)
+        chunk = f.read(read_size)
+
+        # The remainder from the previous iteration represents the START
+        # of a line whose REST is at the END of THIS (older) chunk.
+        # Concatenate so the split below produces complete lines.
+        data = chunk + remainder
+        lines = data.split(b"\n")
+
+        if position > 0:
+            # First piece may be incomplete — its prefix lives in an
+            # even earlier chunk. Save it as the new remainder.
+            remainder = lines[0]
+            # Yield the rest newest-first (last index is most recent).
+            for line in reversed(lines[1:]):
+                yield line
+        else:
+            # No more chunks; every piece is complete.
+            for line in reversed(lines):
+                yield line
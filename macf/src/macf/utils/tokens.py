@@ -5,9 +5,13 @@ Tokens utilities.
 import json
 import os
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
+from .context import hook_fact
+from .fact_cache import persistent_fact
+from ..observability.tracing import span
 from .paths import find_project_root, get_session_dir, get_session_transcript_path
 from .session import get_current_session_id
 from .json_io import read_json, write_json_safely
@@ -78,6 +82,16 @@ _MODEL_CONTEXT_MAP = {
 _1M_WARNING_SHOWN = False
 
 
+def _context_window_inputs(_window: int) -> list:
+    from .paths import find_agent_home
+    return [find_agent_home() / ".maceff" / "config.json"]
+
+
+@persistent_fact(
+    "total_context",
+    inputs=_context_window_inputs,
+    env=("MACF_CONTEXT_WINDOW", "MACEFF_AGENT_HOME_DIR"),
+)
 def get_total_context() -> int:
     """
     Get total context window size.
@@ -137,12 +151,137 @@ def get_usable_context() -> int:
     buffer = 45000 if autocompact_enabled else 0
     return total - buffer
 
+
+#: Transcript lines that mark a compaction; assistant usage before the last
+#: one is stale.
+_BOUNDARY_MARKERS = (b'"compact_boundary"', b'"type":"summary"')
+
+#: Bytes before the consumed offset kept in the tail state, to tell an
+#: appended-to transcript from one rewritten in place.
+_TAIL_SIG_BYTES = 32
+
+#: Larger backlogs are re-read with the bounded tail scan instead.
+_MAX_TAIL_INCREMENT = 4 * 1024 * 1024
+
+#: Tail progress is written back to ``token_cache.json`` once it has
+#: advanced this far, or once the saved state is this many seconds old (or
+#: when the max changed). Hooks and the statusline query on every call, so
+#: bursts of calls skip the rewrite, and at most a few KB plus a second's
+#: worth of appends is ever parsed twice.
+_PERSIST_TAIL_BYTES = 8 * 1024
+_PERSIST_TAIL_SECONDS = 1.0
+
+
+def _usage_tokens(data: dict) -> int:
+    """Total context tokens of one assistant message (TM! algorithm: all types)."""
+    usage = data.get("message", {}).get("usage", {})
+    return (
+        usage.get("cache_read_input_tokens", 0)
+        + usage.get("cache_creation_input_tokens", 0)
+        + usage.get("input_tokens", 0)
+        + usage.get("output_tokens", 0)
+    )
+
+
+def _tail_signature(f, offset: int) -> str:
+    start = max(0, offset - _TAIL_SIG_BYTES)
+    f.seek(start)
+    return f.read(offset - start).hex()
+
+
+def _resume_tail_state(f, cache_data: Optional[dict], ino: Optional[int],
+                       file_size: int, min_ts_iso: str) -> Optional[dict]:
+    """The saved tail state, if the transcript has only grown since it was saved.
+
+    The state (``token_cache.json`` ``"tail"``) records the byte offset of
+    the last consumed line, the latest qualifying assistant usage after the
+    last compaction boundary, and whether a boundary has been seen. It is
+    discarded — and the bounded tail scan runs instead — when the
+    transcript was replaced, shrank or rewound, when the bytes just before
+    the offset changed, when the compaction lower bound moved, or when too
+    much was appended to read at once.
+    """
+    state = (cache_data or {}).get("tail")
+    if not isinstance(state, dict) or ino is None:
+        return None
+    if not all(k in state for k in ("tokens", "timestamp", "boundary")):
+        return None
+    offset = state.get("offset")
+    if (state.get("ino") != ino or state.get("min_ts") != min_ts_iso
+            or not isinstance(offset, int) or not 0 <= offset <= file_size
+            or file_size - offset > _MAX_TAIL_INCREMENT):
+        return None
+    if _tail_signature(f, offset) != state.get("sig"):
+        return None
+    return state
+
+
+def _advance_tail_state(f, state: dict, file_size: int, min_ts_iso: str) -> bool:
+    """Fold the complete lines appended since ``state["offset"]`` into ``state``.
+
+    Same selection as the tail scan: a boundary resets the candidate, and
+    the assistant message with the latest timestamp (later in file on ties)
+    at or above ``min_ts_iso`` wins. Returns True if the offset moved.
+    """
+    offset = state["offset"]
+    f.seek(offset)
+    appended = f.read(file_size - offset)
+    end = appended.rfind(b"\n") + 1  # a partial last line waits for its newline
+    if not end:
+        return False
+    for line in appended[:end].split(b"\n"):
+        if not line.strip():
+            continue
+        if any(marker in line for marker in _BOUNDARY_MARKERS):
+            state.update(boundary=True, tokens=0, timestamp=None)
+            continue
+        # Cheap byte test first: most lines are tool results and user turns.
+        if b'"assistant"' not in line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(data, dict) or data.get("type") != "assistant":
+            continue
+        total_tokens = _usage_tokens(data)
+        if total_tokens > 0:
+            ts = data.get("timestamp", "unknown")
+            if ts >= min_ts_iso and (not state["tokens"] or ts >= state["timestamp"]):
+                state.update(tokens=total_tokens, timestamp=ts)
+    state["offset"] = offset + end
+    state["sig"] = _tail_signature(f, state["offset"])
+    return True
+
+
+def _post_compaction_estimate(max_tokens: int) -> Dict[str, Any]:
+    # Compaction detected but no post-boundary in-cycle message yet. Return
+    # a conservative estimate scaled to the ACTUAL context window: the fixed
+    # 60000 was 200K-calibrated, so its hardcoded 30%/CL70 were wrong on 1M
+    # (60000 is ~6% there). Derive the bands from max_tokens so the CL meter
+    # is sane on any window. (cversek/MacEff#118)
+    est_tokens = min(60000, max_tokens)
+    pct_used = round(est_tokens / max_tokens * 100, 1)
+    return {
+        "tokens_used": est_tokens,
+        "tokens_remaining": max_tokens - est_tokens,
+        "percentage_used": pct_used,
+        "percentage_remaining": round(100 - pct_used, 1),
+        "cl_level": round(100 - pct_used),
+        "last_updated": "post_compaction",
+        "source": "post_compaction_estimate",
+    }
+
+
+@hook_fact("token_info", events={"compaction_detected"})
+@span("token_scan")
 def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
     """Get current token usage information from session JSONL or hooks state.
 
     Uses a smart caching strategy for performance:
-    1. Check sidecar cache first (ultra-fast)
-    2. Quick scan last 200KB of JSONL
+    1. Resume the tail state saved in the sidecar cache and parse only the
+       bytes appended since the last call
+    2. Otherwise quick scan last 200KB of JSONL
     3. Full scan only if needed
 
     Args:
@@ -173,6 +312,8 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                 cache_data = read_json(cache_path)
                 if cache_data and cache_data.get("session_id") == session_id:
                     cached_max = cache_data.get("max_tokens_used", 0)
+                else:
+                    cache_data = None
             except (FileNotFoundError, OSError, json.JSONDecodeError):
                 pass  # Cache miss is non-critical, continue with cached_max = 0
 
@@ -192,17 +333,43 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                 # ALWAYS scan tail to get CURRENT token value, not historical maximum
                 current_tokens = 0
                 last_timestamp = None
+                try:
+                    ino = os.stat(jsonl_path).st_ino
+                except OSError:
+                    ino = None  # no tail state without a file identity
+                tail_state = None
+                persist_tail = False
 
                 with open(jsonl_path, "rb") as f:
                     file_size = f.seek(0, os.SEEK_END)
 
+                    tail_state = _resume_tail_state(f, cache_data, ino, file_size, min_ts_iso)
+                    if tail_state is not None:
+                        # Incremental: the saved state already covers
+                        # everything before its offset.
+                        saved_offset = tail_state["offset"]
+                        if _advance_tail_state(f, tail_state, file_size, min_ts_iso):
+                            persist_tail = (
+                                tail_state["offset"] - saved_offset >= _PERSIST_TAIL_BYTES
+                                or time.time() - tail_state.get("saved_at", 0) >= _PERSIST_TAIL_SECONDS
+                            )
+                        current_tokens = tail_state["tokens"]
+                        last_timestamp = tail_state["timestamp"]
+                        boundary_seen = tail_state["boundary"]
+                        consumed = tail_state["offset"]
+                    else:
+                        boundary_seen = False
+                        consumed = 0
+
                     # Quick scan: Read last 200KB for most recent token value
                     # We scan MORE data (200KB vs 100KB) to ensure we find the
                     # latest assistant message
-                    scan_size = min(200 * 1024, file_size)
+                    scan_size = min(200 * 1024, file_size) if tail_state is None else 0
                     if scan_size > 0:
                         f.seek(-scan_size, os.SEEK_END)
-                        content = f.read().decode("utf-8", errors="ignore")
+                        raw = f.read()
+                        consumed = file_size - scan_size + raw.rfind(b"\n") + 1
+                        content = raw.decode("utf-8", errors="ignore")
 
                         # Find compact_boundary marker (compaction detection)
                         # After compaction, pre-compaction messages have stale token counts
@@ -214,6 +381,7 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                             # Detect compact_boundary or summary markers
                             if '"compact_boundary"' in line or '"type":"summary"' in line:
                                 last_boundary_idx = i
+                        boundary_seen = last_boundary_idx >= 0
 
                         # Only scan lines AFTER the boundary (if found)
                         search_lines = lines[last_boundary_idx + 1:] if last_boundary_idx >= 0 else lines
@@ -231,18 +399,7 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                             try:
                                 data = json.loads(line)
                                 if data.get("type") == "assistant":
-                                    message = data.get("message", {})
-                                    usage = message.get("usage", {})
-                                    # Match TM! algorithm: sum ALL token types for total context
-                                    total_tokens = 0
-                                    total_tokens += usage.get(
-                                        "cache_read_input_tokens", 0
-                                    )
-                                    total_tokens += usage.get(
-                                        "cache_creation_input_tokens", 0
-                                    )
-                                    total_tokens += usage.get("input_tokens", 0)
-                                    total_tokens += usage.get("output_tokens", 0)
+                                    total_tokens = _usage_tokens(data)
                                     if total_tokens > 0:
                                         ts = data.get("timestamp", "unknown")
                                         # Drop pre-compaction messages when an
@@ -282,25 +439,6 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                                     latest_ts_so_far = ts
                             current_tokens = latest["tokens"]
                             last_timestamp = latest["timestamp"]
-                        elif last_boundary_idx >= 0:
-                            # Compaction detected but no post-boundary in-cycle
-                            # message yet. Return a conservative estimate scaled
-                            # to the ACTUAL context window: the fixed 60000 was
-                            # 200K-calibrated, so its hardcoded 30%/CL70 were
-                            # wrong on 1M (60000 is ~6% there). Derive the bands
-                            # from max_tokens so the CL meter is sane on any
-                            # window. (cversek/MacEff#118)
-                            est_tokens = min(60000, max_tokens)
-                            pct_used = round(est_tokens / max_tokens * 100, 1)
-                            return {
-                                "tokens_used": est_tokens,
-                                "tokens_remaining": max_tokens - est_tokens,
-                                "percentage_used": pct_used,
-                                "percentage_remaining": round(100 - pct_used, 1),
-                                "cl_level": round(100 - pct_used),
-                                "last_updated": "post_compaction",
-                                "source": "post_compaction_estimate",
-                            }
 
                     # If tail scan didn't find any data, do a full scan.
                     # Same timestamp-priority discipline as the tail scan (see
@@ -310,8 +448,9 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                     # running latest-timestamp winner rather than materializing
                     # every assistant message. Closes cversek/MacEff#110 in
                     # the fallback path too.
-                    if current_tokens == 0:
+                    if tail_state is None and current_tokens == 0 and not boundary_seen:
                         f.seek(0)
+                        consumed = 0
                         latest_tokens = 0
                         # Initialize the running-latest timestamp to the
                         # compaction lower bound (if any). The full-scan
@@ -319,25 +458,16 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                         # than the bound — same #111 + #110 filter as the
                         # tail-scan path.
                         latest_ts = min_ts_iso
-                        for line in f:
+                        for raw_line in f:
+                            if raw_line.endswith(b"\n"):
+                                consumed += len(raw_line)
                             try:
-                                line = line.decode("utf-8", errors="ignore").strip()
+                                line = raw_line.decode("utf-8", errors="ignore").strip()
                                 if not line:
                                     continue
                                 data = json.loads(line)
                                 if data.get("type") == "assistant":
-                                    message = data.get("message", {})
-                                    usage = message.get("usage", {})
-                                    # Match TM! algorithm: sum ALL token types for total context
-                                    total_tokens = 0
-                                    total_tokens += usage.get(
-                                        "cache_read_input_tokens", 0
-                                    )
-                                    total_tokens += usage.get(
-                                        "cache_creation_input_tokens", 0
-                                    )
-                                    total_tokens += usage.get("input_tokens", 0)
-                                    total_tokens += usage.get("output_tokens", 0)
+                                    total_tokens = _usage_tokens(data)
                                     if total_tokens > 0:
                                         ts = data.get("timestamp", "")
                                         # `>=` (not strict `>`) so later-in-file
@@ -356,6 +486,41 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                         if latest_ts:
                             last_timestamp = latest_ts
 
+                    if tail_state is None and ino is not None:
+                        # Seed the incremental state from the scan just done.
+                        tail_state = {
+                            "ino": ino,
+                            "offset": consumed,
+                            "sig": _tail_signature(f, consumed),
+                            "min_ts": min_ts_iso,
+                            "boundary": boundary_seen,
+                            "tokens": current_tokens,
+                            "timestamp": last_timestamp if current_tokens else None,
+                        }
+                        persist_tail = True
+
+                # Smart cache update: detect compaction events
+                # If current is significantly less than cached (>1k difference), update cache
+                # This automatically detects compaction resets
+                # FIXED: Lowered threshold from 10,000 to 1,000 for better cache accuracy
+                max_changed = current_tokens > 0 and (cached_max == 0 or abs(current_tokens - cached_max) > 1000)
+                if sidecar_dir and (max_changed or persist_tail):
+                    cache_path = sidecar_dir / "token_cache.json"
+                    cache = {
+                        "session_id": session_id,
+                        "max_tokens_used": cached_max,
+                        "last_updated": (cache_data or {}).get("last_updated"),
+                    }
+                    if max_changed:
+                        cache.update(max_tokens_used=current_tokens, last_updated=last_timestamp)
+                    if tail_state is not None:
+                        tail_state["saved_at"] = time.time()
+                        cache["tail"] = tail_state
+                    write_json_safely(cache_path, cache)
+
+                if current_tokens == 0 and boundary_seen:
+                    return _post_compaction_estimate(max_tokens)
+
                 if current_tokens > 0:
                     # Calculate raw CL from actual token usage
                     tokens_remaining = max_tokens - current_tokens
@@ -382,21 +547,6 @@ def get_token_info(session_id: Optional[str] = None) -> Dict[str, Any]:
                     except (ImportError, OSError, KeyError) as e:
                         print(f"⚠️ MACF: AUTO_MODE detection failed (using raw CL): {e}", file=sys.stderr)
 
-                    # Smart cache update: detect compaction events
-                    # If current is significantly less than cached (>1k difference), update cache
-                    # This automatically detects compaction resets
-                    # FIXED: Lowered threshold from 10,000 to 1,000 for better cache accuracy
-                    if sidecar_dir and (cached_max == 0 or abs(current_tokens - cached_max) > 1000):
-                        cache_path = sidecar_dir / "token_cache.json"
-                        write_json_safely(
-                            cache_path,
-                            {
-                                "session_id": session_id,
-                                "max_tokens_used": current_tokens,
-                                "last_updated": last_timestamp,
-                            },
-                        )
-
                     return {
                         "tokens_used": current_tokens,
                         "tokens_remaining": tokens_remaining,
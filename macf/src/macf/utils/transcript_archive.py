@@ -0,0 +1,433 @@
+"""
+Transcript archive - seekable compressed form of finished session transcripts.
+
+Transcripts of finished sessions reach about a GB each and stay raw under
+``~/.claude/projects`` forever. Archiving rewrites an inactive
+``{session}.jsonl`` as ``{session}.jsonl.fz``:
+
+    MAGIC                      b"MACFFZ1\\n"
+    frame 0 .. frame n-1       independent zlib (or lzma) streams of whole lines,
+                               about FRAME_SIZE uncompressed bytes each
+    footer                     JSON {"codec", "raw_size", "lines", "digest",
+                               "frames": [[raw offset, offset, length], ...]}
+    trailer                    uint64 footer offset, MAGIC
+
+Because every frame starts on a line boundary and decompresses on its own,
+reading at an uncompressed offset costs one frame. ``open_transcript()``
+opens raw and archived transcripts alike and returns an ordinary seekable
+file object, so the offset index, breadcrumb lookups and DEV_DRV extraction
+read archives transparently. An archived file refuses ``fileno()`` so nothing
+memory-maps the compressed bytes by mistake; ``transcript_stat()`` gives the
+inode and uncompressed size instead of ``os.fstat``.
+
+Claude Code cannot resume an archived session; ``restore_transcript()``
+(``macf_tools transcripts unarchive``) puts the raw JSONL back.
+"""
+
+import bisect
+import hashlib
+import io
+import json
+import os
+import struct
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+
+MAGIC = b"MACFFZ1\n"
+
+#: Appended to the transcript name: ``{session}.jsonl.fz``.
+ARCHIVE_SUFFIX = ".fz"
+
+#: Uncompressed bytes per frame (rounded up to the end of a line).
+FRAME_SIZE = 1 << 20
+
+DEFAULT_CODEC = "zlib"
+
+#: Transcripts untouched for this many days count as inactive.
+DEFAULT_INACTIVE_DAYS = 14
+
+_TRAILER = struct.Struct("<Q8s")
+
+PathLike = Union[str, Path]
+
+
+def _codec(name: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """``(compress, decompress)`` for a codec name; a corrupt frame raises ValueError."""
+    if name == "zlib":
+        import zlib
+
+        def compress(data: bytes) -> bytes:
+            return zlib.compress(data, 6)
+        raw_decompress, errors = zlib.decompress, (zlib.error,)
+    elif name == "gzip":
+        # One gzip member per frame: the frames concatenated are a valid
+        # multi-member .gz file (event log segments rely on that).
+        import gzip
+        import zlib
+
+        def compress(data: bytes) -> bytes:
+            return gzip.compress(data, 6, mtime=0)
+
+        def raw_decompress(data: bytes) -> bytes:
+            return zlib.decompress(data, 31)
+        errors = (zlib.error,)
+    elif name == "lzma":
+        import lzma
+
+        def compress(data: bytes) -> bytes:
+            return lzma.compress(data, preset=6)
+        raw_decompress, errors = lzma.decompress, (lzma.LZMAError,)
+    else:
+        raise ValueError(f"unknown transcript archive codec: {name}")
+
+    def decompress(data: bytes) -> bytes:
+        try:
+            return raw_decompress(data)
+        except errors + (EOFError,) as e:
+            raise ValueError(f"corrupt transcript archive frame: {e}") from e
+
+    return compress, decompress
+
+
+def is_archive(path: PathLike) -> bool:
+    """True if ``path`` names an archived transcript."""
+    return str(path).endswith(".jsonl" + ARCHIVE_SUFFIX)
+
+
+def archive_path_for(path: PathLike) -> Path:
+    """Where the archive of raw transcript ``path`` lives."""
+    return Path(str(path) + ARCHIVE_SUFFIX)
+
+
+def session_id_of(path: PathLike) -> str:
+    """Session id named by a raw or archived transcript path."""
+    name = Path(path).name
+    if name.endswith(ARCHIVE_SUFFIX):
+        name = name[:-len(ARCHIVE_SUFFIX)]
+    return name[:-len(".jsonl")] if name.endswith(".jsonl") else Path(name).stem
+
+
+class ArchiveReader(io.RawIOBase):
+    """Random-access reader over the uncompressed bytes of an archive.
+
+    Keeps the last decompressed frame, so sequential reads and nearby seeks
+    decompress each frame once.
+
+    Args:
+        path: Archive file
+        footer: Footer kept outside the file, for a file holding only the
+            frames (default: read the archive's own footer)
+    """
+
+    def __init__(self, path: PathLike, footer: Optional[dict] = None):
+        super().__init__()
+        self.path = Path(path)
+        self._f = open(self.path, "rb")
+        try:
+            if footer is None:
+                footer = self._read_footer()
+        except BaseException:
+            self._f.close()
+            raise
+        self.codec = footer["codec"]
+        self.raw_size = footer["raw_size"]
+        self.lines = footer.get("lines", 0)
+        self.digest = footer.get("digest")
+        self.frames = footer["frames"]
+        self.inode = os.fstat(self._f.fileno()).st_ino
+        self._starts = [frame[0] for frame in self.frames]
+        self._decompress = _codec(self.codec)[1]
+        self._cached: Tuple[int, bytes] = (-1, b"")
+        self._pos = 0
+
+    def _read_footer(self) -> dict:
+        f = self._f
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"not a transcript archive: {self.path}")
+        end = f.seek(0, 2) - _TRAILER.size
+        if end < len(MAGIC):
+            raise ValueError(f"truncated transcript archive: {self.path}")
+        f.seek(end)
+        footer_at, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+        if magic != MAGIC or not len(MAGIC) <= footer_at <= end:
+            raise ValueError(f"truncated transcript archive: {self.path}")
+        f.seek(footer_at)
+        return json.loads(f.read(end - footer_at))
+
+    def frame(self, n: int) -> bytes:
+        """Uncompressed bytes of frame ``n``."""
+        if self._cached[0] != n:
+            _, offset, length = self.frames[n]
+            self._f.seek(offset)
+            self._cached = (n, self._decompress(self._f.read(length)))
+        return self._cached[1]
+
+    def line_at(self, offset: int) -> bytes:
+        """The line starting at uncompressed ``offset`` (b"" past the end).
+
+        Frames end on line boundaries, so this decompresses one frame at
+        most, and none when it is the frame last read.
+        """
+        if not 0 <= offset < self.raw_size:
+            return b""
+        n = bisect.bisect_right(self._starts, offset) - 1
+        data = self.frame(n)
+        start = offset - self._starts[n]
+        end = data.find(b"\n", start)
+        return data[start:end + 1 if end >= 0 else len(data)]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.raw_size
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._pos = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        if self._pos >= self.raw_size:
+            return 0
+        n = bisect.bisect_right(self._starts, self._pos) - 1
+        data = memoryview(self.frame(n))
+        start = self._pos - self._starts[n]
+        chunk = data[start:start + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._f.close()
+        super().close()
+
+
+def open_transcript(path: PathLike, mode: str = "r", errors: Optional[str] = None):
+    """Open a raw or archived transcript for reading.
+
+    Args:
+        path: ``.jsonl`` or ``.jsonl.fz`` transcript
+        mode: ``"r"`` (text) or ``"rb"``
+        errors: Text decoding error handler, as for ``open``
+    """
+    if mode not in ("r", "rb"):
+        raise ValueError(f"transcripts open read-only, not {mode!r}")
+    if not is_archive(path):
+        return open(path, mode, errors=errors) if mode == "r" else open(path, "rb")
+    binary = io.BufferedReader(ArchiveReader(path), buffer_size=64 * 1024)
+    if mode == "rb":
+        return binary
+    return io.TextIOWrapper(binary, encoding="utf-8", errors=errors)
+
+
+def transcript_stat(f) -> Tuple[int, int]:
+    """``(inode, size)`` of a file from ``open_transcript``; archives report
+    their uncompressed size."""
+    raw = getattr(getattr(f, "buffer", f), "raw", None)
+    if isinstance(raw, ArchiveReader):
+        return raw.inode, raw.raw_size
+    st = os.fstat(f.fileno())
+    return st.st_ino, st.st_size
+
+
+def iter_archive_frames(path: PathLike) -> Iterator[bytes]:
+    """Yield an archive's frames uncompressed, in order."""
+    with ArchiveReader(path) as reader:
+        for n in range(len(reader.frames)):
+            yield reader.frame(n)
+
+
+def write_frames(src: BinaryIO, out: BinaryIO, codec: str = DEFAULT_CODEC,
+                 frame_size: int = FRAME_SIZE) -> dict:
+    """Compress the rest of ``src`` into frames written to ``out``.
+
+    Frames hold whole lines (about ``frame_size`` uncompressed bytes each)
+    and decompress independently.
+
+    Returns:
+        The footer describing them: ``{"codec", "raw_size", "lines",
+        "digest", "frames"}``, frame offsets relative to ``out``'s start.
+    """
+    compress = _codec(codec)[0]
+    digest = hashlib.blake2b(digest_size=16)
+    frames: List[List[int]] = []
+    raw_offset = lines = 0
+    while True:
+        chunk = src.read(frame_size)
+        if not chunk:
+            break
+        if not chunk.endswith(b"\n"):
+            chunk += src.readline()
+        digest.update(chunk)
+        lines += chunk.count(b"\n")
+        packed = compress(chunk)
+        frames.append([raw_offset, out.tell(), len(packed)])
+        out.write(packed)
+        raw_offset += len(chunk)
+    return {"codec": codec, "raw_size": raw_offset, "lines": lines,
+            "digest": digest.hexdigest(), "frames": frames}
+
+
+def write_archive(
+    source: PathLike,
+    dest: PathLike,
+    codec: str = DEFAULT_CODEC,
+    frame_size: int = FRAME_SIZE,
+) -> dict:
+    """Compress ``source`` into an archive at ``dest`` (atomically).
+
+    Returns:
+        The archive footer.
+    """
+    dest = Path(dest)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        with open(source, "rb") as src, open(tmp, "wb") as out:
+            out.write(MAGIC)
+            footer = write_frames(src, out, codec, frame_size)
+            footer_at = out.tell()
+            out.write(json.dumps(footer).encode())
+            out.write(_TRAILER.pack(footer_at, MAGIC))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return footer
+
+
+def verify_archive(path: PathLike) -> bool:
+    """True if every frame decompresses and the content digest matches."""
+    digest = hashlib.blake2b(digest_size=16)
+    size = 0
+    try:
+        with ArchiveReader(path) as reader:
+            for n, (raw_offset, _, _) in enumerate(reader.frames):
+                if raw_offset != size:
+                    return False
+                data = reader.frame(n)
+                digest.update(data)
+                size += len(data)
+            return size == reader.raw_size and digest.hexdigest() == reader.digest
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def archive_transcript(path: PathLike, codec: str = DEFAULT_CODEC) -> dict:
+    """Replace raw transcript ``path`` with its verified archive.
+
+    The archive keeps the transcript's mtime. Nothing is removed unless the
+    archive verifies and the transcript did not change while compressing.
+
+    Returns:
+        ``{"path", "archive", "raw_size", "archived_size"}``
+
+    Raises:
+        OSError: Reading or writing failed
+        ValueError: The archive did not verify or the transcript changed
+    """
+    path = Path(path)
+    before = os.stat(path)
+    dest = archive_path_for(path)
+    write_archive(path, dest, codec)
+    after = os.stat(path)
+    problem = None
+    if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+        problem = f"{path} changed while archiving"
+    elif not verify_archive(dest):
+        problem = f"archive of {path} failed verification"
+    if problem:
+        dest.unlink()
+        raise ValueError(problem)
+    os.utime(dest, ns=(before.st_atime_ns, before.st_mtime_ns))
+    path.unlink()
+    return {"path": str(path), "archive": str(dest),
+            "raw_size": before.st_size, "archived_size": dest.stat().st_size}
+
+
+def restore_transcript(archive: PathLike) -> Path:
+    """Put an archived transcript back as raw JSONL; returns its path."""
+    archive = Path(archive)
+    if not verify_archive(archive):
+        raise ValueError(f"archive {archive} failed verification")
+    st = os.stat(archive)
+    dest = archive.with_name(archive.name[:-len(ARCHIVE_SUFFIX)])
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as out:
+            for data in iter_archive_frames(archive):
+                out.write(data)
+            out.flush()
+            os.fsync(out.fileno())
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    archive.unlink()
+    return dest
+
+
+def find_inactive_transcripts(
+    older_than_days: float = DEFAULT_INACTIVE_DAYS,
+    exclude: Tuple[str, ...] = (),
+) -> List[str]:
+    """Raw session transcripts not written for ``older_than_days`` days.
+
+    Args:
+        older_than_days: Minimum age of the last write
+        exclude: Session ids never to report (e.g. the current session)
+    """
+    from .transcript_registry import get_transcript_registry
+
+    registry = get_transcript_registry()
+    cutoff = time.time() - older_than_days * 86400
+    inactive = []
+    for path in registry.raw_transcripts():
+        if session_id_of(path) in exclude:
+            continue
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                inactive.append(path)
+        except OSError:
+            continue
+    return inactive
+
+
+__all__ = [
+    "ArchiveReader",
+    "archive_path_for",
+    "archive_transcript",
+    "find_inactive_transcripts",
+    "is_archive",
+    "iter_archive_frames",
+    "open_transcript",
+    "restore_transcript",
+    "session_id_of",
+    "transcript_stat",
+    "verify_archive",
+    "write_archive",
+    "write_frames",
+    "ARCHIVE_SUFFIX",
+    "DEFAULT_CODEC",
+    "DEFAULT_INACTIVE_DAYS",
+    "FRAME_SIZE",
+]
@@ -0,0 +1,263 @@
+"""
+Transcript registry - session id -> transcript path, without walking directories.
+
+Claude Code keeps one transcript per session at
+``~/.claude/projects/{encoded project path}/{session_id}.jsonl``. Resolving a
+session id, a breadcrumb's session prefix, the sessions of a project or the
+newest session used to glob ``~/.claude/projects/*`` (often twice: the
+current project first, then every project) on each call.
+
+The registry remembers which sessions every project directory holds, in
+``{agent_home}/.maceff/transcript_registry.json``. A refresh lists the
+projects directory and stats each project directory; only a project whose
+directory mtime moved (a transcript was created, removed or renamed) is
+listed again. Lookups are then dict hits. Archived transcripts
+(``{session_id}.jsonl.fz``, see ``transcript_archive``) are registered too;
+a session with both forms resolves to the raw one.
+
+A directory modified within ``RACY_NS`` of its last listing is listed again
+on the next refresh, so a transcript created in the same timestamp tick as a
+listing is not missed. Appending to a transcript does not touch its
+directory, so ``newest()`` stats the transcripts of the projects it compares
+(still no directory reads).
+"""
+
+import bisect
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .transcript_archive import is_archive, session_id_of
+
+_FORMAT_VERSION = 2
+
+REGISTRY_FILE = "transcript_registry.json"
+
+#: Listings closer than this to a directory's mtime are not trusted.
+RACY_NS = 2_000_000_000
+
+#: (projects dir, registry file) -> registry, one load per process
+_registries: Dict[tuple, "TranscriptRegistry"] = {}
+
+
+def get_projects_dir() -> Path:
+    """Claude Code's per-project transcript directory."""
+    return Path.home() / ".claude" / "projects"
+
+
+def _default_registry_path() -> Optional[Path]:
+    try:
+        from .paths import find_agent_home
+        return find_agent_home() / ".maceff" / REGISTRY_FILE
+    except (ImportError, OSError):
+        return None
+
+
+class TranscriptRegistry:
+    """Which session transcripts each Claude Code project directory holds.
+
+    Args:
+        projects_dir: Directory of project directories (default
+            ``~/.claude/projects``).
+        registry_path: Where the registry persists between processes (None:
+            memory only).
+    """
+
+    def __init__(self, projects_dir: Optional[Path] = None, registry_path: Optional[Path] = None):
+        self.projects_dir = Path(projects_dir) if projects_dir else get_projects_dir()
+        self.registry_path = registry_path
+        # project dir name -> {"mtime_ns", "listed_ns", "files": [sorted transcript names]}
+        self._projects: Dict[str, dict] = self._load()
+        # session id -> [(project, file name)], raw transcripts first
+        self._by_id: Optional[Dict[str, List[tuple]]] = None
+        self._ids: Optional[List[str]] = None
+
+    # -- maintenance ---------------------------------------------------------
+
+    def _load(self) -> Dict[str, dict]:
+        if self.registry_path is None:
+            return {}
+        try:
+            with open(self.registry_path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ MACF: transcript registry unreadable, rebuilding: {e}", file=sys.stderr)
+            return {}
+        if (not isinstance(data, dict) or data.get("version") != _FORMAT_VERSION
+                or data.get("projects_dir") != str(self.projects_dir)
+                or not isinstance(data.get("projects"), dict)):
+            return {}
+        return data["projects"]
+
+    def _save(self) -> None:
+        if self.registry_path is None:
+            return
+        data = {"version": _FORMAT_VERSION, "projects_dir": str(self.projects_dir),
+                "projects": self._projects}
+        tmp = self.registry_path.with_name(f".{self.registry_path.name}.{os.getpid()}.tmp")
+        try:
+            self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.registry_path)
+        except OSError as e:
+            print(f"⚠️ MACF: transcript registry write failed: {e}", file=sys.stderr)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _list_transcripts(project_dir: str) -> List[str]:
+        try:
+            with os.scandir(project_dir) as it:
+                return sorted(
+                    e.name for e in it
+                    if (e.name.endswith(".jsonl") or is_archive(e.name)) and not e.is_dir()
+                )
+        except OSError:
+            return []
+
+    def refresh(self) -> bool:
+        """Relist the project directories that changed since they were listed.
+
+        Returns:
+            True if anything changed.
+        """
+        try:
+            with os.scandir(self.projects_dir) as it:
+                dirs = [e for e in it if e.is_dir()]
+        except OSError:
+            dirs = []
+
+        changed = False
+        seen = set()
+        for entry in dirs:
+            try:
+                mtime_ns = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+            seen.add(entry.name)
+            known = self._projects.get(entry.name)
+            if (known and known.get("mtime_ns") == mtime_ns
+                    and mtime_ns < known.get("listed_ns", 0) - RACY_NS):
+                continue
+            listed = {"mtime_ns": mtime_ns, "listed_ns": time.time_ns(),
+                      "files": self._list_transcripts(entry.path)}
+            self._projects[entry.name] = listed
+            # A relisting that found nothing new is only worth persisting
+            # once it makes the entry trustworthy.
+            changed = changed or not known or known.get("files") != listed["files"] \
+                or known.get("mtime_ns") != mtime_ns or mtime_ns < listed["listed_ns"] - RACY_NS
+        for name in set(self._projects) - seen:
+            del self._projects[name]
+            changed = True
+
+        if changed:
+            self._by_id = self._ids = None
+            self._save()
+        return changed
+
+    def _index(self) -> Dict[str, List[tuple]]:
+        if self._by_id is None:
+            by_id: Dict[str, List[tuple]] = {}
+            for project in sorted(self._projects):
+                for name in self._projects[project].get("files", ()):
+                    by_id.setdefault(session_id_of(name), []).append((project, name))
+            for found in by_id.values():
+                found.sort(key=lambda hit: is_archive(hit[1]))
+            self._by_id = by_id
+            self._ids = sorted(by_id)
+        return self._by_id
+
+    def _path(self, project: str, name: str) -> str:
+        return str(self.projects_dir / project / name)
+
+    # -- lookups -------------------------------------------------------------
+
+    def projects(self) -> List[str]:
+        """Names of the project directories."""
+        return sorted(self._projects)
+
+    def sessions(self, project: str) -> Set[str]:
+        """Session ids with a transcript in project directory ``project``."""
+        return {session_id_of(name) for name in self._projects.get(project, {}).get("files", ())}
+
+    def raw_transcripts(self) -> List[str]:
+        """Paths of every transcript not yet archived."""
+        return [
+            self._path(project, name)
+            for project in self.projects()
+            for name in self._projects[project].get("files", ())
+            if not is_archive(name)
+        ]
+
+    def path(self, session_id: str, prefer: Optional[str] = None) -> Optional[str]:
+        """Transcript of ``session_id``.
+
+        Args:
+            session_id: Full session id
+            prefer: When several projects hold it, the first whose directory
+                name contains this wins
+        """
+        found = self._index().get(session_id)
+        if not found:
+            return None
+        if prefer:
+            found = [hit for hit in found if prefer in hit[0]] or found
+        return self._path(*found[0])
+
+    def find_prefix(self, prefix: str) -> Optional[str]:
+        """Transcript of the (alphabetically first) session id starting with ``prefix``."""
+        by_id = self._index()
+        at = bisect.bisect_left(self._ids, prefix)
+        if at < len(self._ids) and self._ids[at].startswith(prefix):
+            return self._path(*by_id[self._ids[at]][0])
+        return None
+
+    def newest(self, projects: Optional[Iterable[str]] = None) -> Optional[str]:
+        """Session id of the most recently written transcript.
+
+        Args:
+            projects: Project directory names to consider (default: all)
+
+        Ties on mtime go to the larger file name, so the answer does not
+        depend on listing order.
+        """
+        best = None
+        for project in (self.projects() if projects is None else projects):
+            for name in self._projects.get(project, {}).get("files", ()):
+                if is_archive(name):
+                    continue  # archived sessions are inactive by definition
+                try:
+                    mtime = os.stat(self._path(project, name)).st_mtime_ns
+                except OSError:
+                    continue
+                if best is None or (mtime, name) > best:
+                    best = (mtime, name)
+        return session_id_of(best[1]) if best else None
+
+
+def get_transcript_registry() -> TranscriptRegistry:
+    """The refreshed registry for ``~/.claude/projects``."""
+    projects_dir = get_projects_dir()
+    registry_path = _default_registry_path()
+    key = (str(projects_dir), str(registry_path))
+    registry = _registries.get(key)
+    if registry is None:
+        registry = _registries[key] = TranscriptRegistry(projects_dir, registry_path)
+    registry.refresh()
+    return registry
+
+
+__all__ = [
+    "TranscriptRegistry",
+    "get_projects_dir",
+    "get_transcript_registry",
+    "REGISTRY_FILE",
+]
@@ -980,4 +980,39 @@ def tmux_sandbox_env():
         # because the env above selects a private server. Target it explicitly
         # so a future edit that reintroduces $TMUX cannot turn this line into
         # kill-server against the host.
-        subprocess.run(["tmux", "kill-server"], env=env, capture_output=True)
\ No newline at end of file
+        subprocess.run(["tmux", "kill-server"], env=env, capture_output=True)
+
+@pytest.fixture(autouse=True)
+def isolated_fact_cache(tmp_path, monkeypatch):
+    """Keep the cross-process fact cache (macf.utils.fact_cache) per test.
+
+    Without this, any test that runs with a session id stores facts under the
+    shared ``/tmp/macf/{agent}/{session}/`` sidecar, and a value computed under
+    one test's mocks is served to the next test that uses the same session id.
+    ``MACF_FACT_CACHE_DIR`` relocates the stores (subprocess hooks inherit it);
+    the in-process copies are dropped on both sides of the test.
+
+    Yields:
+        Path to the per-test fact cache directory
+    """
+    from macf.utils.fact_cache import clear_fact_cache
+
+    cache_dir = tmp_path / "_macf_fact_cache"
+    monkeypatch.setenv("MACF_FACT_CACHE_DIR", str(cache_dir))
+    clear_fact_cache()
+
+    yield cache_dir
+
+    clear_fact_cache()
+
+
+@pytest.fixture(autouse=True)
+def no_hook_traces(monkeypatch):
+    """Keep hook runs under test out of the real per-session trace files.
+
+    Traces land in ``/tmp/macf/{agent}/{session}/hooks/hook_trace.jsonl``,
+    which ``macf_tools hooks profile`` aggregates across sessions; test runs
+    would show up there as real hook latency. Tests of the tracer re-enable
+    it and capture records in-process.
+    """
+    monkeypatch.setenv("MACF_HOOK_TRACE", "0")
@@ -6,6 +6,7 @@ previous conversation" message and providing recovery guidance.
 """
 
 import tempfile
+import threading
 import time
 from pathlib import Path
 import pytest
@@ -47,6 +48,35 @@ class TestCompactionDetection:
         nonexistent_path = Path("/tmp/definitely_does_not_exist_12345.jsonl")
         assert detect_compaction(nonexistent_path) is False
 
+    def test_marker_older_than_tail_window_ignored(self, tmp_path):
+        """Only the last TAIL_LINES lines are searched."""
+        transcript_path = tmp_path / "t.jsonl"
+        transcript_path.write_text(
+            '{"type": "system", "subtype": "compact_boundary"}\n'
+            + '{"type": "user", "content": "x"}\n' * 100
+        )
+        assert detect_compaction(transcript_path, wait=0) is False
+
+    def test_late_marker_write_detected(self, tmp_path):
+        """A marker written after detection starts is seen before the deadline."""
+        transcript_path = tmp_path / "t.jsonl"
+        transcript_path.write_text('{"type": "user", "content": "Hello"}\n')
+
+        def write_marker():
+            time.sleep(0.03)
+            with open(transcript_path, "a") as f:
+                f.write('{"type": "system", "subtype": "compact_boundary"}\n')
+
+        writer = threading.Thread(target=write_marker)
+        writer.start()
+        try:
+            start_time = time.perf_counter()
+            assert detect_compaction(transcript_path, wait=1.0) is True
+            # Woken by the write, not by the deadline.
+            assert time.perf_counter() - start_time < 0.5
+        finally:
+            writer.join()
+
     def test_recovery_contains_required_markers(self):
         """Recovery contains markers: Has 'FAKE', 'TRAUMA' text."""
         recovery_text = inject_recovery()
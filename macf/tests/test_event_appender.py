@@ -0,0 +1,116 @@
+"""Tests for the per-process O_APPEND appender behind append_event/append_events.
+
+Whatever the write path, the log must end up with every record intact, in
+order per writer, and never two records spliced into one line.
+"""
+import json
+import multiprocessing
+import stat
+
+import pytest
+
+from macf import agent_events_log
+from macf.agent_events_log import (
+    ATOMIC_APPEND_BYTES,
+    append_event,
+    append_events,
+    get_append_stats,
+    read_events,
+    set_log_path,
+)
+
+
+def _delta(before):
+    after = get_append_stats()
+    return {key: after[key] - before[key] for key in before}
+
+
+def test_group_commit_is_one_write(isolated_events_log):
+    before = get_append_stats()
+
+    assert append_events([
+        ("scope_added", {"task_ids": [1]}),
+        ("scope_added", {"task_ids": [2]}, {"raw": True}),
+        ("scope_timer_set", {"timer_end_epoch": 1.0}),
+    ])
+
+    delta = _delta(before)
+    events = list(read_events(reverse=False))
+
+    assert [e["event"] for e in events] == ["scope_added", "scope_added", "scope_timer_set"]
+    assert events[1]["hook_input"] == {"raw": True}
+    assert delta["writes"] == 1 and delta["records"] == 3
+    assert delta["bytes_written"] == isolated_events_log.stat().st_size
+
+
+def test_small_records_skip_the_exclusive_lock(isolated_events_log, monkeypatch):
+    monkeypatch.setenv("MACF_EVENTS_SHARED_LOCK_APPENDS", "true")
+    before = get_append_stats()
+
+    append_event("tool_call_started", {"i": 0})
+    append_event("tool_call_started", {"blob": "x" * (ATOMIC_APPEND_BYTES * 2)})
+
+    assert _delta(before)["exclusive_writes"] == 1
+
+
+@pytest.mark.parametrize("setting, fstype, exclusive", [
+    ("false", "ext4", 1),
+    ("auto", "ext4", 0),
+    ("auto", "nfs4", 1),
+    ("auto", None, 1),
+])
+def test_shared_lock_only_where_appends_do_not_interleave(
+    isolated_events_log, monkeypatch, setting, fstype, exclusive,
+):
+    monkeypatch.setenv("MACF_EVENTS_SHARED_LOCK_APPENDS", setting)
+    monkeypatch.setattr(agent_events_log, "_filesystem_type", lambda fd: fstype)
+    agent_events_log._close_append_fd()
+    before = get_append_stats()
+
+    append_event("tool_call_started", {"i": 0})
+
+    assert _delta(before)["exclusive_writes"] == exclusive
+
+
+def test_log_created_private(isolated_events_log):
+    append_event("session_started", {})
+
+    assert stat.S_IMODE(isolated_events_log.stat().st_mode) == 0o600
+
+
+def test_deleted_log_is_recreated(isolated_events_log):
+    append_event("tool_call_started", {"i": 0})
+    isolated_events_log.unlink()
+
+    append_event("tool_call_started", {"i": 1})
+
+    assert [e["data"]["i"] for e in read_events()] == [1]
+
+
+def _writer(log_path, worker, count):
+    set_log_path(log_path)
+    for i in range(count):
+        # Every fifth record is too big for a single atomic write.
+        pad = "y" * (ATOMIC_APPEND_BYTES if i % 5 == 0 else 10)
+        append_event("tool_call_started", {"worker": worker, "i": i, "pad": pad})
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_writers_never_splice_records(isolated_events_log):
+    # The parent's descriptor is inherited across fork; children must reopen.
+    append_event("session_started", {})
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_writer, args=(isolated_events_log, w, 100)) for w in range(4)]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(30)
+        assert proc.exitcode == 0
+
+    with open(isolated_events_log) as f:
+        records = [json.loads(line) for line in f]
+
+    assert len(records) == 401
+    for worker in range(4):
+        seen = [r["data"]["i"] for r in records if r["data"].get("worker") == worker]
+        assert seen == list(range(100))
@@ -0,0 +1,124 @@
+"""Tests for the per-event-type byte-offset index (macf.event_index).
+
+The index is an accelerator, never a source of truth: every test here checks
+that an index-served answer equals what a full reverse scan would return,
+including after the log is changed behind the index's back.
+"""
+import json
+
+import pytest
+
+from macf.agent_events_log import append_event, iter_events_of_type, read_events
+from macf.event_index import EventIndex, get_event_index, get_index_dir
+from macf.event_queries import (
+    get_cycle_number_from_events,
+    get_latest_event,
+    get_latest_state_snapshot,
+    get_nth_event,
+)
+
+
+def _scan_latest(event_type):
+    for event in read_events(reverse=True):
+        if event.get("event") == event_type:
+            return event
+    return None
+
+
+def test_readers_catch_up_index_after_appends(isolated_events_log):
+    append_event("state_snapshot", {"session_id": "aaaaaaaa-1111", "n": 1})
+    for i in range(50):
+        append_event("tool_call_started", {"session_id": "aaaaaaaa-1111", "i": i})
+    # Appends stay off the index lock; the first reader syncs it.
+    assert not (get_index_dir(isolated_events_log) / "meta.json").exists()
+
+    index = get_event_index(isolated_events_log)
+    meta = json.loads((get_index_dir(isolated_events_log) / "meta.json").read_text())
+
+    assert meta["covered"] == isolated_events_log.stat().st_size
+    assert index.count("event", "state_snapshot") == 1
+    assert index.count("event", "tool_call_started") == 50
+    assert index.count("session", "aaaaaaaa") == 51
+
+
+def test_latest_rare_type_matches_scan(isolated_events_log):
+    append_event("state_snapshot", {"n": 1})
+    for i in range(20):
+        append_event("tool_call_started", {"i": i})
+    append_event("state_snapshot", {"n": 2})
+    for i in range(20):
+        append_event("tool_call_started", {"i": i})
+
+    assert get_latest_state_snapshot() == _scan_latest("state_snapshot")
+    assert get_latest_state_snapshot()["data"]["n"] == 2
+    assert get_nth_event("state_snapshot", n=1)["data"]["n"] == 1
+    assert get_nth_event("state_snapshot", n=2) is None
+
+
+def test_lines_written_outside_append_event_are_picked_up(isolated_events_log):
+    append_event("tool_call_started", {"i": 0})
+    with open(isolated_events_log, "a") as f:
+        f.write(json.dumps({"timestamp": 1.0, "event": "mode_change", "data": {"x": 1}}) + "\n")
+
+    latest = get_latest_event("mode_change")
+
+    assert latest is not None and latest["data"]["x"] == 1
+
+
+def test_partial_trailing_line_is_not_indexed(isolated_events_log):
+    append_event("tool_call_started", {"i": 0})
+    record = json.dumps({"timestamp": 2.0, "event": "mode_change", "data": {}})
+    with open(isolated_events_log, "a") as f:
+        f.write(record[:10])  # writer mid-append
+
+    index = EventIndex(isolated_events_log)
+    assert index.sync()
+    assert index.count("event", "mode_change") == 0
+
+    with open(isolated_events_log, "a") as f:
+        f.write(record[10:] + "\n")
+    assert index.sync()
+    assert index.count("event", "mode_change") == 1
+
+
+@pytest.mark.parametrize("shrink", [True, False])
+def test_rewritten_log_forces_rebuild(isolated_events_log, shrink):
+    for i in range(10):
+        append_event("state_snapshot", {"n": i})
+    assert get_latest_state_snapshot()["data"]["n"] == 9
+
+    # Replace the log content in place (same inode). A shorter rewrite trips
+    # the size check, a longer one the head fingerprint.
+    count = 1 if shrink else 30
+    lines = [
+        json.dumps({"timestamp": float(i), "event": "state_snapshot", "data": {"n": 100 + i}})
+        for i in range(count)
+    ]
+    with open(isolated_events_log, "r+") as f:
+        f.truncate(0)
+        f.write("\n".join(lines) + "\n")
+
+    assert get_latest_state_snapshot()["data"]["n"] == 100 + count - 1
+    assert EventIndex(isolated_events_log).count("event", "state_snapshot") == count
+
+
+def test_multi_type_walk_is_in_log_order(isolated_events_log):
+    append_event("compaction_detected", {"cycle": 5})
+    append_event("tool_call_started", {})
+    append_event("cycle_correction", {"cycle": 7})
+    append_event("tool_call_started", {})
+    append_event("compaction_detected", {"cycle": 8})
+
+    walked = [e["event"] for e in iter_events_of_type("compaction_detected", "cycle_correction")]
+
+    assert walked == ["compaction_detected", "cycle_correction", "compaction_detected"]
+    assert get_cycle_number_from_events() == 8
+
+
+def test_disabled_index_falls_back_to_scan(isolated_events_log, monkeypatch):
+    monkeypatch.setenv("MACF_EVENT_INDEX", "0")
+    append_event("state_snapshot", {"n": 1})
+    append_event("tool_call_started", {})
+
+    assert not get_index_dir(isolated_events_log).exists()
+    assert get_latest_state_snapshot()["data"]["n"] == 1
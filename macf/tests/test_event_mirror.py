@@ -0,0 +1,141 @@
+"""Tests for the optional SQLite mirror of the event log (macf.event_mirror).
+
+The mirror is an accelerator over the JSONL log: every compiled query must
+return what the Python predicates return over the same log.
+"""
+import json
+import subprocess
+
+import pytest
+
+from macf.agent_events_log import (
+    _matches_filter,
+    append_event,
+    query_events,
+    query_set_operations,
+    read_events,
+)
+from macf.event_mirror import EventMirror, compile_filter, get_event_mirror, get_mirror_path
+from macf.event_segments import roll_segment
+
+
+def _write(log_path, records):
+    with open(log_path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def _record(ts, event, cycle, session="aaaaaaaa-1111", git="abc1234", prompt="p0000001", **data):
+    return {
+        "timestamp": ts,
+        "event": event,
+        "breadcrumb": f"s_{session[:8]}/c_{cycle}/g_{git}/p_{prompt}/t_{int(ts)}",
+        "data": {"session_id": session, **data},
+        "hook_input": {},
+    }
+
+
+@pytest.fixture
+def seeded(isolated_events_log):
+    _write(isolated_events_log, [
+        _record(100.0, "session_started", 170),
+        _record(200.0, "tool_call_started", 170, git="def5678"),
+        _record(300.0, "mode_change", 171, session="bbbbbbbb-2222", prompt="p0000002"),
+        _record(400.0, "tool_call_started", 171, session="bbbbbbbb-2222"),
+        {"timestamp": 450.0, "event": "no_breadcrumb", "data": {}},
+        _record(500.0, "migration_detected", 172),
+    ])
+    return isolated_events_log
+
+
+FILTERS = [
+    {},
+    {"event_type": "tool_call_started"},
+    {"since": 200.0},
+    {"until": 400.0},
+    {"since": 100.0, "until": 500.0},
+    {"breadcrumb": {"c": 171}},
+    {"breadcrumb": {"g": "def5678"}},
+    {"breadcrumb": {"s": "bbbbbbbb", "p": "p0000002"}},
+    {"breadcrumb": {"t_min": 200, "t_max": 400}},
+    {"session_id": "aaaaaaaa-1111"},
+    {"without_matching": "tool_call_started"},
+    {"event_type": "tool_call_started", "breadcrumb": {"c": 170}},
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_compiled_filter_matches_python_predicate(seeded, filters):
+    expected = [e for e in read_events(reverse=False) if _matches_filter(e, filters)]
+    mirror = get_event_mirror(seeded, force=True)
+
+    assert mirror.query(filters) == expected
+
+
+@pytest.mark.parametrize("operation", ["union", "intersection", "subtraction"])
+def test_set_operations_match(seeded, monkeypatch, operation):
+    queries = [{"breadcrumb": {"c": 171}}, {"event_type": "tool_call_started"}]
+    expected = query_set_operations(queries, operation)
+
+    monkeypatch.setenv("MACF_EVENTS_SQLITE_MIRROR", "1")
+
+    assert query_set_operations(queries, operation) == expected
+
+
+def test_query_events_uses_mirror_when_enabled(seeded, monkeypatch):
+    monkeypatch.setenv("MACF_EVENTS_SQLITE_MIRROR", "1")
+
+    results = query_events({"breadcrumb": {"c": 170}})
+
+    assert [e["timestamp"] for e in results] == [100.0, 200.0]
+    assert get_mirror_path(seeded).exists()
+
+
+def test_mirror_is_off_by_default(seeded):
+    query_events({"event_type": "mode_change"})
+
+    assert get_event_mirror(seeded) is None
+    assert not get_mirror_path(seeded).exists()
+
+
+def test_incremental_sync_and_rebuild_on_rewrite(seeded):
+    mirror = get_event_mirror(seeded, force=True)
+    assert mirror.count() == 6
+
+    append_event("tool_call_started", {"session_id": "cccccccc"})
+    roll_segment(seeded)
+    append_event("tool_call_started", {"session_id": "cccccccc"})
+    assert mirror.sync() and mirror.count() == 8
+
+    # Rewrite the hot file in place: its rows are re-mirrored, the rolled
+    # segment's rows are not touched.
+    seeded.write_text(json.dumps(_record(1.0, "session_started", 1)) + "\n")
+    assert mirror.sync() and mirror.count() == 8
+    assert len(mirror.query({"event_type": "tool_call_started"})) == 3
+    assert len(mirror.query({"event_type": "session_started"})) == 2
+
+
+def test_compile_filter_shape():
+    sql, params = compile_filter({"event_type": "mode_change", "breadcrumb": {"c": 170}})
+
+    assert sql == "event = ? AND bc_ok = 1 AND bc_cycle = ?"
+    assert params == ["mode_change", 170]
+    assert compile_filter({}) == ("1", [])
+
+
+def test_sessions_summary(seeded):
+    mirror = EventMirror(seeded)
+    mirror.sync()
+
+    sessions = mirror.sessions()
+
+    assert [s["session_id"] for s in sessions] == ["aaaaaaaa-1111", "bbbbbbbb-2222"]
+    assert sessions[0]["events"] == 3 and sessions[0]["last_seen"] == 500.0
+
+
+def test_mirror_cli(seeded):
+    result = subprocess.run(['macf_tools', 'events', 'mirror'], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert "Mirrored" in result.stdout
+    assert get_mirror_path(seeded).exists()
@@ -0,0 +1,110 @@
+"""Tests for checkpointed projections in macf.agent_events_log.
+
+A projection must always equal a full fold of the log; the checkpoint only
+decides how much of the log has to be read to get there.
+"""
+import json
+
+import pytest
+
+from macf.agent_events_log import (
+    _PROJECTIONS,
+    append_event,
+    fold_projection,
+    get_current_state,
+    get_projection_dir,
+    reconstruct_state_at,
+    register_projection,
+)
+from macf.task.scope import get_scope_state
+
+
+@pytest.fixture
+def counting_projection():
+    """A projection that records every event it was handed."""
+    seen = []
+
+    @register_projection("test_counter", initial=lambda: 0, event_types=["tick"])
+    def _reduce(state, event):
+        seen.append(event["data"]["n"])
+        return state + 1
+
+    yield seen
+    _PROJECTIONS.pop("test_counter", None)
+
+
+def test_fold_reads_only_new_events(isolated_events_log, counting_projection):
+    for n in range(5):
+        append_event("tick", {"n": n})
+    append_event("tock", {"n": -1})
+
+    assert fold_projection("test_counter") == 5
+    assert counting_projection == [0, 1, 2, 3, 4]
+
+    append_event("tick", {"n": 5})
+    assert fold_projection("test_counter") == 6
+    # Only the appended event was reduced on the second call.
+    assert counting_projection == [0, 1, 2, 3, 4, 5]
+
+    assert fold_projection("test_counter") == 6
+    assert len(counting_projection) == 6
+
+
+def test_checkpoint_records_covered_offset(isolated_events_log, counting_projection):
+    append_event("tick", {"n": 0})
+    fold_projection("test_counter")
+
+    checkpoint = json.loads((get_projection_dir(isolated_events_log) / "test_counter.json").read_text())
+
+    assert checkpoint["state"] == 1
+    assert checkpoint["stamp"]["covered"] == isolated_events_log.stat().st_size
+
+
+def test_rewritten_log_refolds_from_start(isolated_events_log, counting_projection):
+    for n in range(3):
+        append_event("tick", {"n": n})
+    assert fold_projection("test_counter") == 3
+
+    isolated_events_log.write_text(json.dumps({"event": "tick", "data": {"n": 9}}) + "\n")
+
+    assert fold_projection("test_counter") == 1
+
+
+def test_version_bump_discards_checkpoint(isolated_events_log, counting_projection):
+    append_event("tick", {"n": 0})
+    assert fold_projection("test_counter") == 1
+
+    @register_projection("test_counter", initial=lambda: 100, event_types=["tick"], version=2)
+    def _reduce_v2(state, event):
+        return state + 1
+
+    assert fold_projection("test_counter") == 101
+
+
+def test_scope_projection_tracks_lifecycle(isolated_events_log):
+    append_event("scope_activated", {"task_ids": [1, 2, 3]})
+    assert get_scope_state() == {"1": "active", "2": "active", "3": "active"}
+
+    append_event("scope_task_completed", {"task_id": 1})
+    append_event("scope_paused", {"task_ids": [2]})
+    assert get_scope_state() == {"1": "inactive", "2": "paused", "3": "active"}
+
+    append_event("scope_cleared", {})
+    append_event("scope_added", {"task_ids": [7]})
+    assert get_scope_state() == {"7": "active"}
+
+
+def test_returned_state_is_a_private_copy(isolated_events_log):
+    append_event("scope_activated", {"task_ids": [1]})
+    get_scope_state()["1"] = "tampered"
+
+    assert get_scope_state() == {"1": "active"}
+
+
+def test_slow_fields_projection_serves_current_state(isolated_events_log):
+    append_event("session_started", {"session_id": "s-1", "cycle": 4})
+    append_event("tool_call_started", {"session_id": "s-2"})
+
+    assert get_current_state() == {"session_id": "s-2", "cycle": 4}
+    # A timestamp before the newest event still falls back to the scan.
+    assert reconstruct_state_at(0.0) == {"session_id": None, "cycle": None}
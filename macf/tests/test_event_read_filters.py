@@ -0,0 +1,124 @@
+"""Tests for filter pushdown and raw records in macf.agent_events_log.read_events.
+
+A pushed-down filter must yield exactly what filtering the decoded events
+would; the only difference allowed is how many lines get decoded.
+"""
+import json
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from macf import agent_events_log
+from macf.agent_events_log import (
+    RawEvent,
+    append_event,
+    query_events,
+    read_events,
+    tally_all_events,
+)
+
+
+def _seed(log_path):
+    lines = [
+        {"timestamp": 100.0, "event": "session_started", "data": {"session_id": "aaaaaaaa-1"}},
+        {"timestamp": 200.0, "event": "tool_call_started", "data": {"session_id": "aaaaaaaa-1"}},
+        {"timestamp": 300.0, "event": "scope_activated", "data": {"session_id": "bbbbbbbb-2"}},
+        {"timestamp": 400.0, "event": "dev_drv_ended", "data": {"session_id": "bbbbbbbb-2", "duration_seconds": 5}},
+        {"timestamp": 500.0, "event": "tool_call_started", "data": {"session_id": "aaaaaaaa-1"}},
+    ]
+    with open(log_path, "a") as f:
+        for record in lines:
+            f.write(json.dumps(record) + "\n")
+    return lines
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({"event_types": ["tool_call_started"]}, [200.0, 500.0]),
+    ({"event_types": ["scope_activated", "session_started"]}, [100.0, 300.0]),
+    ({"session_prefix": "bbbbbbbb"}, [300.0, 400.0]),
+    ({"since": 200.0, "until": 500.0}, [300.0, 400.0]),
+    ({"event_types": ["tool_call_started"], "session_prefix": "aaaaaaaa", "since": 200.0}, [500.0]),
+])
+def test_pushdown_matches_post_filtering(isolated_events_log, kwargs, expected):
+    _seed(isolated_events_log)
+
+    forward = [e["timestamp"] for e in read_events(reverse=False, **kwargs)]
+    backward = [e["timestamp"] for e in read_events(reverse=True, **kwargs)]
+
+    assert forward == expected
+    assert backward == list(reversed(expected))
+
+
+def test_screened_lines_are_never_decoded(isolated_events_log, monkeypatch):
+    _seed(isolated_events_log)
+    decoded = []
+
+    def counting_loads(line):
+        decoded.append(line)
+        return json.loads(line)
+
+    monkeypatch.setattr(agent_events_log, "json", SimpleNamespace(
+        loads=counting_loads, JSONDecodeError=json.JSONDecodeError,
+    ))
+
+    events = list(read_events(event_types=["scope_activated"]))
+
+    assert [e["event"] for e in events] == ["scope_activated"]
+    assert len(decoded) == 1
+
+
+def test_raw_records_decode_lazily(isolated_events_log):
+    _seed(isolated_events_log)
+
+    records = list(read_events(reverse=False, raw=True))
+
+    assert all(isinstance(r, RawEvent) for r in records)
+    assert [r.event for r in records][:2] == ["session_started", "tool_call_started"]
+    assert all(r._record is None for r in records)
+    assert records[3].data["duration_seconds"] == 5
+    assert records[3].get("data") == records[3].record["data"]
+
+
+def test_raw_mode_handles_lines_written_in_other_key_orders(isolated_events_log):
+    with open(isolated_events_log, "a") as f:
+        f.write(json.dumps({"event": "mode_change", "data": {"x": 1}, "timestamp": 7.0}) + "\n")
+
+    (record,) = read_events(raw=True, event_types=["mode_change"])
+
+    assert record.event == "mode_change" and record.timestamp == 7.0
+    assert record["data"] == {"x": 1}
+
+
+def test_query_events_pushes_filters_down(isolated_events_log):
+    _seed(isolated_events_log)
+
+    results = query_events({"session_id": "aaaaaaaa-1", "event_type": "tool_call_started"})
+
+    assert [e["timestamp"] for e in results] == [200.0, 500.0]
+
+
+def test_tally_on_raw_records(isolated_events_log):
+    _seed(isolated_events_log)
+    append_event("dev_drv_ended", {"duration_seconds": 2.5})
+
+    tallies = tally_all_events()
+
+    assert tallies["event_tallies"]["tool_call_started"] == 2
+    assert tallies["accumulated_durations"]["total_dev_drv_duration_seconds"] == 7.5
+    assert tallies["metadata"]["events_scanned"] == 6
+    assert tallies["metadata"]["earliest_timestamp"] == 100.0
+
+
+def test_gaps_cli_streams_raw_records(isolated_events_log):
+    _seed(isolated_events_log)
+
+    result = subprocess.run(
+        ['macf_tools', 'events', 'gaps', '--threshold', '50'],
+        capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0
+    # Four 100s gaps between seeded events (plus one up to the CLI's own event).
+    assert "Gap #4: 100s" in result.stdout
+    assert "(scope_activated)" in result.stdout
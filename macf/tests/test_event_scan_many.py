@@ -0,0 +1,107 @@
+"""Tests for the single-pass multi-query scan (macf.agent_events_log.scan_many).
+
+Every answer must equal what the query's own reverse scan would have found;
+the shared pass only changes how many times the log tail is read and parsed.
+"""
+import json
+from types import SimpleNamespace
+
+from macf import agent_events_log
+from macf.agent_events_log import ScanQuery, append_event, read_events, scan_many
+from macf.modes.detection import _get_current_work_mode, detect_active_modes
+from macf.utils.breadcrumbs import get_current_dev_drv_prompt_uuid
+
+
+def _types(*names):
+    return frozenset(names)
+
+
+def _seed():
+    append_event("mode_change", {"mode": "QUIET_MODE", "enabled": True})
+    for i in range(10):
+        append_event("tool_call_started", {"i": i})
+    append_event("work_mode_change", {"mode": "BUILD"})
+    for i in range(10, 20):
+        append_event("tool_call_started", {"i": i})
+
+
+def test_answers_match_individual_scans():
+    _seed()
+
+    found = scan_many({
+        "tools": ScanQuery(_types("tool_call_started"), max_matches=3),
+        "work": ScanQuery(_types("work_mode_change"), limit=50),
+        "quiet": ScanQuery(_types("mode_change"), limit=50),
+        "odd": ScanQuery(where=lambda e: e.get("data", {}).get("i", 0) % 2 == 1, max_matches=2),
+    })
+
+    assert [e["data"]["i"] for e in found["tools"]] == [19, 18, 17]
+    assert found["work"][0]["data"]["mode"] == "BUILD"
+    assert found["quiet"][0]["data"]["mode"] == "QUIET_MODE"
+    assert [e["data"]["i"] for e in found["odd"]] == [19, 17]
+
+
+def test_limit_is_a_window_over_all_events():
+    _seed()
+
+    found = scan_many({
+        "near": ScanQuery(_types("work_mode_change"), limit=10),
+        "far": ScanQuery(_types("work_mode_change"), limit=11),
+        "quiet": ScanQuery(_types("mode_change"), limit=21),
+    })
+
+    assert found["near"] == []
+    assert len(found["far"]) == 1
+    assert found["quiet"] == []
+
+
+def test_each_line_parsed_at_most_once(monkeypatch):
+    _seed()
+    total = len(list(read_events()))
+    calls = []
+
+    def counting_loads(line):
+        calls.append(line)
+        return json.loads(line)
+
+    monkeypatch.setattr(agent_events_log, "json", SimpleNamespace(
+        loads=counting_loads, JSONDecodeError=json.JSONDecodeError,
+    ))
+
+    scan_many({
+        "a": ScanQuery(_types("work_mode_change"), limit=100),
+        "b": ScanQuery(_types("mode_change"), limit=100),
+        "c": ScanQuery(_types("user_activity_detected"), limit=100),
+    })
+
+    # Only lines naming a wanted type are parsed, and each only once.
+    assert len(calls) == len(set(calls)) == 2 < total
+
+
+def test_unbounded_typed_queries_reach_old_events():
+    append_event("task_grant_delete", {"task_ids": ["1"]})
+    for i in range(300):
+        append_event("tool_call_started", {"i": i})
+
+    found = scan_many({"grant": ScanQuery(_types("task_grant_delete"))})
+
+    assert found["grant"][0]["data"]["task_ids"] == ["1"]
+
+
+def test_mode_detection_shares_one_scan():
+    _seed()
+    append_event("user_activity_detected", {"source": "direct"})
+
+    modes = detect_active_modes("s", {"cl_level": 100})
+
+    assert {"QUIET_MODE", "BUILD"} <= modes
+    assert "USER_REMOTE" not in modes
+    assert _get_current_work_mode() == "BUILD"
+
+
+def test_prompt_uuid_lookup(monkeypatch):
+    monkeypatch.setattr("macf.utils.breadcrumbs.get_current_session_id", lambda: "aaaaaaaa-1111")
+    append_event("dev_drv_started", {"session_id": "aaaaaaaa-1111", "prompt_uuid": "p-mine"})
+    append_event("dev_drv_started", {"session_id": "bbbbbbbb-2222", "prompt_uuid": "p-other"})
+
+    assert get_current_dev_drv_prompt_uuid() == "p-mine"
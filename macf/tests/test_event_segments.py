@@ -0,0 +1,373 @@
+"""Tests for rolled, compressed event log segments (macf.event_segments).
+
+Rolling must be invisible to every reader: the same events come back in the
+same order, the type index and projection checkpoints carry on from where
+they were, and the manifest lets queries skip segments that cannot match.
+"""
+import subprocess
+import threading
+
+import pytest
+
+from macf import agent_events_log, event_segments
+from macf.agent_events_log import (
+    _PROJECTIONS,
+    append_event,
+    fold_projection,
+    get_log_path,
+    query_events,
+    read_events,
+    register_projection,
+)
+from macf.event_queries import get_latest_state_snapshot
+from macf.utils import transcript_archive
+from macf.utils.transcript_archive import ArchiveReader
+from macf.event_segments import (
+    compact_segments,
+    get_segments_dir,
+    load_manifest,
+    logical_size,
+    roll_segment,
+    segment_may_match,
+)
+
+
+def _emit(n, event="tool_call_started", start=0):
+    for i in range(start, start + n):
+        append_event(event, {"i": i})
+
+
+def _roll(log_path, compression="gzip"):
+    """Roll and compress in one go, as ``macf_tools events roll`` does."""
+    entry = roll_segment(log_path, compression=compression)
+    packed = {e["seq"]: e for e in compact_segments(log_path)}
+    return packed.get(entry["seq"], entry)
+
+
+@pytest.mark.parametrize("compression", ["gzip", "xz", "none"])
+def test_reads_span_segments_in_order(isolated_events_log, compression):
+    _emit(5)
+    _roll(isolated_events_log, compression=compression)
+    _emit(5, start=5)
+    _roll(isolated_events_log, compression=compression)
+    _emit(5, start=10)
+
+    forward = [e["data"]["i"] for e in read_events(reverse=False)]
+    backward = [e["data"]["i"] for e in read_events(reverse=True)]
+
+    assert forward == list(range(15))
+    assert backward == list(reversed(range(15)))
+    assert len(load_manifest(isolated_events_log)) == 2
+
+
+def test_manifest_describes_segment(isolated_events_log):
+    _emit(3)
+    append_event("state_snapshot", {})
+    size = isolated_events_log.stat().st_size
+
+    entry = roll_segment(isolated_events_log)
+
+    # Published raw under the lock; compression comes afterwards.
+    assert entry["compression"] == "none"
+    assert entry["pending_compression"] == "gzip"
+    entry = compact_segments(isolated_events_log)[0]
+    assert entry["compression"] == "gzip" and "pending_compression" not in entry
+    assert load_manifest(isolated_events_log) == [entry]
+    assert (get_segments_dir(isolated_events_log) / entry["file"]).exists()
+    assert entry["first_offset"] == 0 and entry["last_offset"] == size
+    assert entry["records"] == 4
+    assert entry["event_counts"] == {"tool_call_started": 3, "state_snapshot": 1}
+    assert entry["min_timestamp"] <= entry["max_timestamp"]
+    # The hot file starts over, empty, at the segment's end offset.
+    assert isolated_events_log.stat().st_size == 0
+    assert logical_size(isolated_events_log) == size
+
+
+def test_index_survives_roll(isolated_events_log):
+    append_event("state_snapshot", {"n": 1})
+    _emit(3)
+    roll_segment(isolated_events_log)
+    _emit(3, start=3)
+
+    snapshot = get_latest_state_snapshot()
+
+    assert snapshot is not None and snapshot["data"]["n"] == 1
+
+
+def test_projection_continues_across_roll(isolated_events_log):
+    seen = []
+
+    @register_projection("test_roll_counter", initial=lambda: 0, event_types=["tick"])
+    def _reduce(state, event):
+        seen.append(event["data"]["i"])
+        return state + 1
+
+    try:
+        _emit(3, event="tick")
+        assert fold_projection("test_roll_counter") == 3
+        roll_segment(isolated_events_log)
+        _emit(2, event="tick", start=3)
+
+        assert fold_projection("test_roll_counter") == 5
+        # Nothing before the roll was refolded.
+        assert seen == [0, 1, 2, 3, 4]
+    finally:
+        _PROJECTIONS.pop("test_roll_counter", None)
+
+
+def test_per_cycle_rolling(isolated_events_log, monkeypatch):
+    monkeypatch.setenv("MACF_EVENTS_SEGMENT_PER_CYCLE", "1")
+    monkeypatch.setattr(agent_events_log, "spawn_compaction", compact_segments)
+    _emit(2)
+    append_event("compaction_detected", {"cycle": 2})
+    _emit(2, start=2)
+
+    segments = load_manifest(isolated_events_log)
+
+    assert len(segments) == 1
+    assert segments[0]["event_counts"]["compaction_detected"] == 1
+    assert segments[0]["framed"]
+    assert len(list(read_events())) == 5
+
+
+def test_compression_does_not_block_appenders(isolated_events_log, monkeypatch):
+    monkeypatch.setenv("MACF_EVENTS_SEGMENT_PER_CYCLE", "1")
+    started, release = threading.Event(), threading.Event()
+    real_write_frames = transcript_archive.write_frames
+
+    def slow_write_frames(*args):
+        started.set()
+        assert release.wait(10)
+        return real_write_frames(*args)
+
+    monkeypatch.setattr(transcript_archive, "write_frames", slow_write_frames)
+    compactor = []
+
+    def spawn(log_path):
+        compactor.append(threading.Thread(target=compact_segments, args=(log_path,)))
+        compactor[0].start()
+
+    monkeypatch.setattr(agent_events_log, "spawn_compaction", spawn)
+
+    _emit(2)
+    append_event("compaction_detected", {"cycle": 2})
+    assert started.wait(10)
+    # Compression is stuck; appending still goes through.
+    done = threading.Thread(target=_emit, args=(2, "tool_call_started", 2))
+    done.start()
+    done.join(5)
+    assert not done.is_alive()
+    assert load_manifest(isolated_events_log)[0]["compression"] == "none"
+
+    release.set()
+    compactor[0].join(10)
+    assert load_manifest(isolated_events_log)[0]["framed"]
+    assert [e["data"].get("i") for e in read_events(reverse=False)] == [0, 1, None, 2, 3]
+
+
+def test_size_bound_rolling_disabled_by_zero(isolated_events_log, monkeypatch):
+    monkeypatch.setenv("MACF_EVENTS_SEGMENT_MAX_MB", "0")
+    _emit(3)
+    assert load_manifest(isolated_events_log) == []
+
+
+def test_query_skips_segments_that_cannot_match(isolated_events_log, monkeypatch):
+    append_event("state_snapshot", {"n": 1})
+    _roll(isolated_events_log)
+    _emit(3)
+    _roll(isolated_events_log)
+    _emit(1, start=3)
+
+    opened = []
+    real_iter = event_segments._iter_segment_lines
+
+    def spy(log_path, entry, reverse, encoding):
+        opened.append(entry["seq"])
+        return real_iter(log_path, entry, reverse, encoding)
+
+    monkeypatch.setattr(event_segments, "_iter_segment_lines", spy)
+
+    results = query_events({"event_type": "state_snapshot"})
+
+    assert [e["data"]["n"] for e in results] == [1]
+    assert opened == [1]
+
+
+def test_segment_may_match_time_range():
+    entry = {"event_counts": {"a": 1}, "min_timestamp": 100.0, "max_timestamp": 200.0}
+
+    assert segment_may_match(entry, event_types=["a"])
+    assert not segment_may_match(entry, event_types=["b"])
+    assert not segment_may_match(entry, since=200.0)
+    assert not segment_may_match(entry, until=100.0)
+    assert segment_may_match(entry, since=150.0, until=160.0)
+
+
+def test_roll_cli(isolated_events_log):
+    _emit(2)
+    result = subprocess.run(
+        ['macf_tools', 'events', 'roll', '--compression', 'xz'],
+        capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert load_manifest(get_log_path())[0]["file"].endswith(".xz")
+
+    listing = subprocess.run(['macf_tools', 'events', 'segments'], capture_output=True, text=True)
+    assert listing.returncode == 0
+    assert "1 cold" in listing.stdout
+
+
+@pytest.mark.parametrize("compression", ["gzip", "xz"])
+def test_compressed_segment_is_framed_and_seekable(isolated_events_log, monkeypatch, compression):
+    monkeypatch.setattr(event_segments, "SEGMENT_FRAME_SIZE", 1024)
+    _emit(200)
+    raw = isolated_events_log.read_bytes()
+    entry = _roll(isolated_events_log, compression=compression)
+
+    assert entry["framed"]
+    path = get_segments_dir(isolated_events_log) / entry["file"]
+    # Still an ordinary .gz/.xz file: its members concatenate to the log.
+    with event_segments.COMPRESSIONS[compression][1](path, "rb") as f:
+        assert f.read() == raw
+
+    decompressed = []
+    real_frame = ArchiveReader.frame
+
+    def counting_frame(self, n):
+        if self._cached[0] != n:
+            decompressed.append(n)
+        return real_frame(self, n)
+
+    monkeypatch.setattr(ArchiveReader, "frame", counting_frame)
+
+    offsets = [0]
+    for line in raw.splitlines(keepends=True)[:-1]:
+        offsets.append(offsets[-1] + len(line))
+    middle = offsets[100]
+    assert event_segments.read_line_at(isolated_events_log, middle) == raw[middle:raw.index(b"\n", middle) + 1]
+    assert len(decompressed) == 1
+
+    # A walk over every record decompresses each frame once.
+    decompressed.clear()
+    walked = [event_segments.read_line_at(isolated_events_log, o) for o in reversed(offsets)]
+    assert b"".join(reversed(walked)) == raw
+    assert sorted(decompressed) == sorted(set(decompressed))
+
+
+def test_unframed_compressed_segment_still_reads(isolated_events_log):
+    import gzip
+    import json
+
+    _emit(5)
+    raw = isolated_events_log.read_bytes()
+    entry = roll_segment(isolated_events_log, compression="none")
+    # A segment rolled before seek tables existed: one gzip stream.
+    segments_dir = get_segments_dir(isolated_events_log)
+    (segments_dir / entry["file"]).unlink()
+    (segments_dir / (entry["file"] + ".gz")).write_bytes(gzip.compress(raw))
+    manifest = json.loads((segments_dir / "manifest.json").read_text())
+    manifest["segments"][0].update(file=entry["file"] + ".gz", compression="gzip")
+    (segments_dir / "manifest.json").write_text(json.dumps(manifest))
+
+    assert [e["data"]["i"] for e in read_events(reverse=True)] == [4, 3, 2, 1, 0]
+    second = raw.index(b"\n") + 1
+    assert event_segments.read_line_at(isolated_events_log, second) == raw[second:raw.index(b"\n", second) + 1]
+
+
+def test_readers_see_every_record_mid_roll(isolated_events_log, monkeypatch):
+    append_event("state_snapshot", {"n": 1})
+    _emit(3)
+    size = logical_size(isolated_events_log)
+    seen = {}
+    real_replace = event_segments._replace_hot_file
+
+    def replace_after_reading(log_path):
+        # The segment is published; the old hot file is still in place.
+        seen["size"] = logical_size(log_path)
+        seen["forward"] = [e["event"] for e in read_events(reverse=False)]
+        seen["backward"] = [e["event"] for e in read_events(reverse=True)]
+        seen["snapshot"] = get_latest_state_snapshot()
+        real_replace(log_path)
+
+    monkeypatch.setattr(event_segments, "_replace_hot_file", replace_after_reading)
+    roll_segment(isolated_events_log)
+
+    events = ["state_snapshot"] + ["tool_call_started"] * 3
+    assert seen["size"] == size
+    assert seen["forward"] == events
+    assert seen["backward"] == list(reversed(events))
+    assert seen["snapshot"]["data"]["n"] == 1
+    assert [e["event"] for e in read_events(reverse=False)] == events
+
+
+def test_reader_follows_segment_compressed_under_it(isolated_events_log):
+    _emit(3)
+    stale = roll_segment(isolated_events_log)
+    compact_segments(isolated_events_log)
+
+    # A reader that loaded the manifest before compaction finds the raw file
+    # gone and picks up the compressed one.
+    lines = list(event_segments._iter_segment_lines(isolated_events_log, stale, True, "utf-8"))
+
+    assert len([line for line in lines if line]) == 3
+
+
+def test_spawned_compaction_runs_detached(isolated_events_log):
+    _emit(3)
+    roll_segment(isolated_events_log)
+    result = subprocess.run(
+        [event_segments.sys.executable, "-m", "macf.event_segments", "compact", str(isolated_events_log)],
+        capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert load_manifest(isolated_events_log)[0]["framed"]
+
+
+@pytest.mark.parametrize("compression", ["gzip", "xz"])
+def test_framed_segment_reverses_frame_by_frame(isolated_events_log, monkeypatch, compression):
+    import tempfile
+
+    monkeypatch.setattr(event_segments, "SEGMENT_FRAME_SIZE", 1024)
+    _emit(200)
+    _roll(isolated_events_log, compression=compression)
+
+    def no_spill(*args, **kwargs):
+        raise AssertionError("framed segment spilled to a temporary file")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_spill)
+    monkeypatch.setattr(tempfile, "TemporaryFile", no_spill)
+    decompressed = []
+    real_frame = ArchiveReader.frame
+
+    def counting_frame(self, n):
+        decompressed.append(n)
+        return real_frame(self, n)
+
+    monkeypatch.setattr(ArchiveReader, "frame", counting_frame)
+
+    backward = [e["data"]["i"] for e in read_events(reverse=True)]
+
+    assert backward == list(reversed(range(200)))
+    assert decompressed == sorted(set(decompressed), reverse=True)
+    assert len(decompressed) > 1
+
+
+def test_frame_walk_carries_lines_across_frames():
+    import io
+
+    data = b"".join(b"line %d %s\n" % (i, b"x" * (i % 7)) for i in range(40))
+
+    class Frames:
+        # Frames cut mid-line, unlike write_frames, to exercise the carry.
+        _starts = list(range(0, len(data), 13))
+
+        def frame(self, n):
+            return data[self._starts[n]:self._starts[n] + 13]
+
+    bounds = [0] + [i + 1 for i, b in enumerate(data) if b == ord("\n")]
+    for lo in bounds[:5] + bounds[-5:]:
+        for hi in (lo, lo + 1, len(data) // 2, len(data)):
+            expected = list(event_segments._iter_range_reverse(io.BytesIO(data), 100, lo, hi))
+            assert list(event_segments._iter_frames_reverse(Frames(), 100, lo, hi)) == expected
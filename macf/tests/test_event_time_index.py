@@ -0,0 +1,122 @@
+"""Tests for the sparse time checkpoints in macf.event_index.
+
+Timestamps in the log are only nearly ordered (concurrent writers stamp
+before they append), so every windowed read must equal a full scan with the
+same bounds, whatever the skew.
+"""
+import json
+import random
+import subprocess
+import time
+
+import pytest
+
+from macf.agent_events_log import read_events, reconstruct_state_at
+from macf.event_index import TIME_BLOCK_RECORDS, EventIndex, get_event_index
+from macf.event_segments import roll_segment
+
+
+def _seed(log_path, count=TIME_BLOCK_RECORDS * 6, skew=30.0, seed=7):
+    rng = random.Random(seed)
+    with open(log_path, "a") as f:
+        for i in range(count):
+            data = {"i": i}
+            if i % 97 == 0:
+                data["session_id"] = f"session-{i}"
+            if i % 211 == 0:
+                data["cycle"] = i
+            f.write(json.dumps({
+                "timestamp": 1000.0 + i * 10 + rng.uniform(-skew, skew),
+                "event": "tool_call_started",
+                "data": data,
+            }) + "\n")
+
+
+def _scan_state_at(log_path, timestamp):
+    """reconstruct_state_at's contract, as a plain forward scan."""
+    state = {"session_id": None, "cycle": None}
+    with open(log_path) as f:
+        for line in f:
+            event = json.loads(line)
+            if event["timestamp"] > timestamp:
+                break
+            for field in state:
+                if field in event["data"]:
+                    state[field] = event["data"][field]
+    return state
+
+
+@pytest.mark.parametrize("since, until", [
+    (5000.0, None),
+    (None, 9000.0),
+    (4000.0, 4100.0),
+    (1000.0 + TIME_BLOCK_RECORDS * 10, 1000.0 + TIME_BLOCK_RECORDS * 30),
+    (99999.0, None),
+    (None, 0.0),
+])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_window_matches_full_scan(isolated_events_log, monkeypatch, since, until, reverse):
+    _seed(isolated_events_log)
+
+    windowed = [e["data"]["i"] for e in read_events(reverse=reverse, since=since, until=until)]
+    monkeypatch.setenv("MACF_EVENT_INDEX", "0")
+    scanned = [e["data"]["i"] for e in read_events(reverse=reverse, since=since, until=until)]
+
+    assert windowed == scanned
+
+
+def test_window_skips_old_blocks(isolated_events_log):
+    _seed(isolated_events_log)
+    index = get_event_index(isolated_events_log)
+
+    start, end = index.time_window(since=1000.0 + TIME_BLOCK_RECORDS * 45)
+
+    assert start > isolated_events_log.stat().st_size // 2
+    assert end is None
+    assert index.time_window() == (0, None)
+
+
+def test_blocks_tile_the_log_across_syncs(isolated_events_log):
+    _seed(isolated_events_log, count=TIME_BLOCK_RECORDS + 10)
+    index = EventIndex(isolated_events_log)
+    assert index.sync()
+    _seed(isolated_events_log, count=TIME_BLOCK_RECORDS, seed=8)
+    assert index.sync()
+
+    blocks = index.time_blocks()
+
+    assert [b[0] for b in blocks[1:]] == [b[1] for b in blocks[:-1]]
+    assert blocks[0][0] == 0 and blocks[-1][1] == isolated_events_log.stat().st_size
+    assert len(blocks) == 3
+
+
+@pytest.mark.parametrize("timestamp", [0.0, 1005.0, 2500.0, 7777.0, 12000.0, 16300.0])
+def test_reconstruct_state_matches_forward_scan(isolated_events_log, timestamp):
+    _seed(isolated_events_log)
+    expected = _scan_state_at(isolated_events_log, timestamp)
+
+    assert reconstruct_state_at(timestamp) == expected
+
+
+def test_reconstruct_state_across_segments(isolated_events_log):
+    _seed(isolated_events_log)
+    expected = _scan_state_at(isolated_events_log, 9000.0)
+    roll_segment(isolated_events_log)
+    _seed(isolated_events_log, count=10, seed=9)
+
+    assert reconstruct_state_at(9000.0) == expected
+
+
+def test_query_cli_since_window(isolated_events_log):
+    now = time.time()
+    with open(isolated_events_log, "a") as f:
+        for age in (7200, 1800, 60):
+            f.write(json.dumps({"timestamp": now - age, "event": "mode_change", "data": {}}) + "\n")
+
+    result = subprocess.run(
+        ['macf_tools', 'events', 'query', '--event', 'mode_change', '--since', '1h'],
+        capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "Query Results: 2 events" in result.stdout
@@ -0,0 +1,129 @@
+"""
+Tests for the cross-process fact cache (macf.utils.fact_cache).
+
+clear_fact_cache() between calls stands in for a new hook process: the
+in-process copy is dropped and the entry must come back from disk.
+"""
+
+import json
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from macf.utils.fact_cache import clear_fact_cache, persistent_fact, track_input
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setenv("MACF_SESSION_ID", "fact-cache-session")
+    return "fact-cache-session"
+
+
+def _counting_fact(name, inputs, env=()):
+    calls = []
+
+    @persistent_fact(name, inputs=inputs, env=env)
+    def fact():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    return fact, calls
+
+
+def test_hit_across_processes_until_input_changes(session, tmp_path, isolated_fact_cache):
+    source = tmp_path / "source.txt"
+    source.write_text("one")
+    fact, calls = _counting_fact("t_file", inputs=lambda value: [source])
+
+    assert fact() == {"n": 1}
+    clear_fact_cache()
+    assert fact() == {"n": 1}
+    assert len(calls) == 1
+
+    store = json.loads((isolated_fact_cache / session / "fact_cache.json").read_text())
+    assert store["facts"]["t_file"]["stamps"][0][0] == str(source)
+
+    source.write_text("changed")
+    clear_fact_cache()
+    assert fact() == {"n": 2}
+
+
+def test_env_and_missing_inputs_are_part_of_the_stamp(session, tmp_path, monkeypatch):
+    marker = tmp_path / "marker"
+    fact, calls = _counting_fact("t_env", inputs=lambda value: [marker], env=("T_FACT_VAR",))
+
+    fact()
+    fact()
+    assert len(calls) == 1
+
+    monkeypatch.setenv("T_FACT_VAR", "x")
+    fact()
+    assert len(calls) == 2
+
+    marker.write_text("now exists")
+    fact()
+    assert len(calls) == 3
+
+
+def test_tracked_inputs_are_stamped(session, tmp_path):
+    read = tmp_path / "read-during-compute"
+    read.write_text("v1")
+
+    @persistent_fact("t_tracked")
+    def fact():
+        track_input(read)
+        return read.read_text()
+
+    assert fact() == "v1"
+    read.write_text("v2!")
+    assert fact() == "v2!"
+
+
+def test_not_persisted_without_session_or_inputs(monkeypatch, isolated_fact_cache):
+    monkeypatch.delenv("MACF_SESSION_ID", raising=False)
+    monkeypatch.delenv("CLAUDE_CODE_SESSION_ID", raising=False)
+    fact, calls = _counting_fact("t_nosession", inputs=lambda value: [])
+    fact()
+    fact()
+    assert len(calls) == 2
+
+    monkeypatch.setenv("MACF_SESSION_ID", "s")
+    fact, calls = _counting_fact("t_noinputs", inputs=lambda value: None)
+    fact()
+    fact()
+    assert len(calls) == 2
+    assert not (isolated_fact_cache / "s" / "fact_cache.json").exists()
+
+
+def test_git_hash_follows_new_commits(session, tmp_path, monkeypatch):
+    from macf.utils.breadcrumbs import extract_current_git_hash
+    from macf.utils.paths import find_project_root
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=repo, check=True, capture_output=True,
+        )
+
+    git("init", "-q")
+    git("commit", "-q", "--allow-empty", "-m", "one")
+    monkeypatch.setenv("CLAUDE_PROJECT_DIR", str(repo))
+    find_project_root.cache_clear()
+    try:
+        first = extract_current_git_hash()
+        assert first
+
+        clear_fact_cache()
+        with patch("macf.utils.breadcrumbs.subprocess.run", side_effect=AssertionError("git ran")):
+            assert extract_current_git_hash() == first
+
+        git("commit", "-q", "--allow-empty", "-m", "two")
+        clear_fact_cache()
+        second = extract_current_git_hash()
+        assert second and second != first
+    finally:
+        find_project_root.cache_clear()
@@ -0,0 +1,105 @@
+"""Tests for macf.utils.file_watch: wait_for_growth and FileWatcher."""
+import os
+import threading
+import time
+
+import pytest
+
+from macf.utils import file_watch
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def backend(request, monkeypatch):
+    if request.param == "poll":
+        monkeypatch.setattr(file_watch, "_libc", False)
+    return request.param
+
+
+def test_returns_on_growth(tmp_path, backend):
+    path = tmp_path / "f.jsonl"
+    path.write_text("a\n")
+
+    def append():
+        time.sleep(0.02)
+        with open(path, "a") as f:
+            f.write("b\n")
+
+    writer = threading.Thread(target=append)
+    writer.start()
+    started = time.monotonic()
+    try:
+        assert file_watch.wait_for_growth(path, 2, timeout=2.0) == 4
+        assert time.monotonic() - started < 1.0
+    finally:
+        writer.join()
+
+
+def test_returns_at_deadline_without_growth(tmp_path, backend):
+    path = tmp_path / "f.jsonl"
+    path.write_text("a\n")
+    started = time.monotonic()
+    assert file_watch.wait_for_growth(path, 2, timeout=0.05) == 2
+    assert time.monotonic() - started >= 0.05
+
+
+def test_missing_file(tmp_path, backend):
+    assert file_watch.wait_for_growth(tmp_path / "gone", 0, timeout=1.0) == -1
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def watcher(request, tmp_path):
+    path = tmp_path / "f.jsonl"
+    path.write_text("a\n")
+    with file_watch.FileWatcher(path, backend=request.param, poll_interval=0.05) as w:
+        yield w
+
+
+def _later(action, delay=0.02):
+    thread = threading.Timer(delay, action)
+    thread.start()
+    return thread
+
+
+def test_watcher_wakes_on_append(watcher):
+    writer = _later(lambda: watcher.path.open("a").write("b\n"))
+    started = time.monotonic()
+    try:
+        woke = watcher.wait(2.0)
+        assert time.monotonic() - started < 1.0
+        assert woke or watcher.backend == "poll"  # poll only times out sooner
+    finally:
+        writer.join()
+
+
+def test_watcher_wake_ends_wait(watcher):
+    waker = _later(watcher.wake)
+    started = time.monotonic()
+    try:
+        assert watcher.wait(5.0)
+        assert time.monotonic() - started < 1.0
+    finally:
+        waker.join()
+
+
+def test_inotify_watcher_sees_replacement(tmp_path):
+    path = tmp_path / "f.jsonl"
+    path.write_text("a\n")
+    with file_watch.FileWatcher(path, backend="inotify") as w:
+        assert not w.wait(0.01)
+        new = tmp_path.parent / f"{tmp_path.name}.new"  # written outside the watched directory
+        new.write_text("b\n")
+        os.replace(new, path)
+        assert w.wait(1.0)
+        w.rewatch()
+        assert not w.wait(0.01)
+        with open(path, "a") as f:
+            f.write("c\n")
+        assert w.wait(1.0)
+
+
+def test_explicit_inotify_unavailable(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_watch, "_libc", False)
+    with pytest.raises(OSError):
+        file_watch.FileWatcher(tmp_path / "f.jsonl", backend="inotify")
+    with file_watch.FileWatcher(tmp_path / "f.jsonl") as w:
+        assert w.backend == "poll"
@@ -0,0 +1,157 @@
+"""Tests for get_token_info's incremental transcript tail state.
+
+After the first call, ``token_cache.json`` carries a ``"tail"`` state (byte
+offset, latest qualifying usage, boundary flag) and later calls parse only
+the bytes appended since. Any sign that the transcript was rewritten falls
+back to the bounded tail scan.
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from macf.utils import get_token_info, tokens
+
+
+def _assistant(timestamp: str, tokens: int) -> str:
+    return json.dumps({
+        "type": "assistant",
+        "timestamp": timestamp,
+        "message": {"usage": {"input_tokens": tokens}},
+    }) + "\n"
+
+
+@pytest.fixture
+def transcript(tmp_path):
+    jsonl_path = tmp_path / "session.jsonl"
+    sidecar = tmp_path / "sidecar"
+    sidecar.mkdir()
+    with patch("macf.utils.tokens.get_session_transcript_path", return_value=str(jsonl_path)), \
+         patch("macf.utils.tokens.get_session_dir", return_value=sidecar), \
+         patch("macf.utils.tokens._compaction_lower_bound_iso", return_value=""):
+        yield jsonl_path, sidecar / "token_cache.json"
+
+
+def _tail(cache_path):
+    return json.loads(cache_path.read_text())["tail"]
+
+
+def test_appended_lines_update_tokens(transcript):
+    jsonl_path, cache_path = transcript
+    jsonl_path.write_text(_assistant("2026-01-01T00:00:01.000Z", 10_000))
+    assert get_token_info("s1")["tokens_used"] == 10_000
+
+    with open(jsonl_path, "a") as f:
+        f.write('{"type": "user", "content": "go on"}\n')
+        f.write(_assistant("2026-01-01T00:00:02.000Z", 12_000))
+    with patch("macf.utils.tokens._usage_tokens", wraps=tokens._usage_tokens) as usage:
+        assert get_token_info("s1")["tokens_used"] == 12_000
+    assert usage.call_count == 1  # only the new assistant line was parsed
+    assert _tail(cache_path)["offset"] == jsonl_path.stat().st_size
+
+
+def test_appended_boundary_resets_to_estimate(transcript):
+    jsonl_path, _ = transcript
+    jsonl_path.write_text(_assistant("2026-01-01T00:00:01.000Z", 150_000))
+    get_token_info("s1")
+    with open(jsonl_path, "a") as f:
+        f.write('{"type": "system", "subtype": "compact_boundary"}\n')
+    assert get_token_info("s1")["source"] == "post_compaction_estimate"
+
+    with open(jsonl_path, "a") as f:
+        f.write(_assistant("2026-01-01T00:00:03.000Z", 30_000))
+    assert get_token_info("s1")["tokens_used"] == 30_000
+
+
+def test_partial_line_waits_for_newline(transcript):
+    jsonl_path, cache_path = transcript
+    jsonl_path.write_text(_assistant("2026-01-01T00:00:01.000Z", 10_000))
+    get_token_info("s1")
+    line = _assistant("2026-01-01T00:00:02.000Z", 20_000)
+    with open(jsonl_path, "a") as f:
+        f.write(line[:20])
+    assert get_token_info("s1")["tokens_used"] == 10_000
+    with open(jsonl_path, "a") as f:
+        f.write(line[20:])
+    assert get_token_info("s1")["tokens_used"] == 20_000
+
+
+def test_rewritten_transcript_falls_back_to_scan(transcript):
+    jsonl_path, cache_path = transcript
+    jsonl_path.write_text(
+        _assistant("2026-01-01T00:00:01.000Z", 10_000) + _assistant("2026-01-01T00:00:02.000Z", 90_000)
+    )
+    assert get_token_info("s1")["tokens_used"] == 90_000
+
+    # Same inode, shorter content: the saved offset is past EOF.
+    with open(jsonl_path, "w") as f:
+        f.write(_assistant("2026-01-01T00:00:05.000Z", 5_000))
+    assert get_token_info("s1")["tokens_used"] == 5_000
+
+    # Same length, different bytes before the offset.
+    with open(jsonl_path, "r+") as f:
+        f.write(_assistant("2026-01-01T00:00:06.000Z", 7_000))
+    assert get_token_info("s1")["tokens_used"] == 7_000
+    assert _tail(cache_path)["tokens"] == 7_000
+
+
+def test_small_progress_is_not_written_back(transcript, monkeypatch):
+    jsonl_path, cache_path = transcript
+    monkeypatch.setattr(tokens, "_PERSIST_TAIL_SECONDS", 3600)
+    jsonl_path.write_text(_assistant("2026-01-01T00:00:01.000Z", 10_000))
+    get_token_info("s1")
+    saved = cache_path.read_text()
+
+    # Grew, but not far, not long after the save and not enough to move the
+    # max: no cache write.
+    with open(jsonl_path, "a") as f:
+        f.write(_assistant("2026-01-01T00:00:02.000Z", 10_500))
+    assert get_token_info("s1")["tokens_used"] == 10_500
+    assert cache_path.read_text() == saved
+
+    # Unsaved progress is re-read from the saved offset next time.
+    with open(jsonl_path, "a") as f:
+        f.write(_assistant("2026-01-01T00:00:03.000Z", 10_700))
+    assert get_token_info("s1")["tokens_used"] == 10_700
+
+    monkeypatch.setattr(tokens, "_PERSIST_TAIL_BYTES", 1)
+    with open(jsonl_path, "a") as f:
+        f.write('{"type": "user", "content": "go on"}\n')
+    get_token_info("s1")
+    assert _tail(cache_path)["offset"] == jsonl_path.stat().st_size
+
+
+def test_later_calls_parse_only_new_bytes(transcript, monkeypatch):
+    jsonl_path, cache_path = transcript
+    monkeypatch.setattr(tokens, "_PERSIST_TAIL_SECONDS", 0)
+    parsed = []
+    real_advance = tokens._advance_tail_state
+
+    def spy(f, state, file_size, min_ts_iso):
+        parsed.append(file_size - state["offset"])
+        return real_advance(f, state, file_size, min_ts_iso)
+
+    monkeypatch.setattr(tokens, "_advance_tail_state", spy)
+    jsonl_path.write_text(_assistant("2026-01-01T00:00:01.000Z", 10_000))
+    get_token_info("s1")
+
+    for n, ts in enumerate(("02", "03", "04")):
+        line = _assistant(f"2026-01-01T00:00:{ts}.000Z", 10_100 + n)
+        with open(jsonl_path, "a") as f:
+            f.write(line)
+        assert get_token_info("s1")["tokens_used"] == 10_100 + n
+        assert parsed[-1] == len(line)
+
+
+def test_unsaved_span_is_capped(transcript, monkeypatch):
+    jsonl_path, cache_path = transcript
+    monkeypatch.setattr(tokens, "_PERSIST_TAIL_SECONDS", 3600)
+    jsonl_path.write_text(_assistant("2026-01-01T00:00:01.000Z", 10_000))
+    get_token_info("s1")
+
+    for n in range(400):
+        with open(jsonl_path, "a") as f:
+            f.write('{"type": "user", "content": "%04d"}\n' % n)
+        get_token_info("s1")
+        unsaved = jsonl_path.stat().st_size - _tail(cache_path)["offset"]
+        assert unsaved < tokens._PERSIST_TAIL_BYTES
@@ -0,0 +1,108 @@
+"""Tests for the hook latency benchmark (macf.hooks.bench / `hooks bench`)."""
+import json
+
+import pytest
+
+from macf.hooks import bench
+
+
+@pytest.fixture
+def small_fixture(tmp_path):
+    return bench.build_fixture(tmp_path / "fx", events=2000, transcript_messages=200, tasks=20)
+
+
+def test_percentile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0]
+
+    assert bench.percentile(values, 50) == 25.0
+    assert bench.percentile(values, 100) == 40.0
+    assert bench.percentile([5.0], 99) == 5.0
+    assert bench.percentile([], 50) == 0.0
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"hooks": {
+        "handle_stop": {"p50_ms": 100.0, "p95_ms": 120.0, "peak_rss_kb": 20000,
+                        "syscalls": 400, "syscall_source": "proc_io"},
+        "handle_post_tool_use": {"p50_ms": 4.0, "p95_ms": 5.0, "peak_rss_kb": 18000},
+    }}
+    report = {"hooks": {
+        # p50 +50%: regression. p95 +10%: within tolerance. syscalls from
+        # a different counter: not comparable.
+        "handle_stop": {"p50_ms": 150.0, "p95_ms": 132.0, "peak_rss_kb": 20000,
+                        "syscalls": 4000, "syscall_source": "strace"},
+        # +50% but only 2 ms: below the noise floor.
+        "handle_post_tool_use": {"p50_ms": 6.0, "p95_ms": 5.0, "peak_rss_kb": 18000},
+    }}
+
+    regressions = bench.compare(report, baseline, tolerance=0.25)
+
+    assert [(r["hook"], r["metric"]) for r in regressions] == [("handle_stop", "p50_ms")]
+    assert regressions[0]["change"] == pytest.approx(0.5)
+
+
+def test_load_payloads_accepts_handler_and_event_names(tmp_path):
+    (tmp_path / "handle_stop.json").write_text(json.dumps({"hook_event_name": "Stop"}))
+    (tmp_path / "PreToolUse.jsonl").write_text(
+        json.dumps({"tool_name": "Read"}) + "\n" + json.dumps({"tool_name": "Bash"}) + "\n"
+    )
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    payloads = bench.load_payloads(tmp_path)
+
+    assert payloads["handle_stop"] == [{"hook_event_name": "Stop"}]
+    assert [p["tool_name"] for p in payloads["handle_pre_tool_use"]] == ["Read", "Bash"]
+    assert set(payloads) == {"handle_stop", "handle_pre_tool_use"}
+
+
+def test_record_payloads_from_events_log(tmp_path):
+    log = tmp_path / "agent_events_log.jsonl"
+    with open(log, "w") as f:
+        for i, name in enumerate(["PreToolUse", "PostToolUse", "PreToolUse"]):
+            f.write(json.dumps({
+                "timestamp": i, "event": "tool_call_started", "data": {},
+                "hook_input": {"hook_event_name": name, "n": i},
+            }) + "\n")
+        f.write(json.dumps({"timestamp": 9, "event": "x", "data": {}, "hook_input": {}}) + "\n")
+
+    payloads = bench.record_payloads(log, per_hook=5)
+
+    assert [p["n"] for p in payloads["handle_pre_tool_use"]] == [2, 0]  # newest first
+    assert [p["n"] for p in payloads["handle_post_tool_use"]] == [1]
+
+
+def test_fixture_is_isolated_and_populated(small_fixture):
+    env = small_fixture.env
+
+    assert small_fixture.events_log.stat().st_size > 0
+    assert small_fixture.transcript_path.exists()
+    assert len(list((small_fixture.root / "tasks" / small_fixture.session_id).glob("*.json"))) == 20
+    for var in ("HOME", "CLAUDE_PROJECT_DIR", "MACEFF_AGENT_HOME_DIR", "MACF_TASKS_DIR", "XDG_RUNTIME_DIR"):
+        assert env[var].startswith(str(small_fixture.root))
+    payloads = bench.synthetic_payloads(small_fixture)
+    assert set(payloads) == set(bench.HOOK_EVENTS)
+
+
+def test_bench_reports_latency_and_resources(small_fixture):
+    report = bench.bench(
+        small_fixture, bench.synthetic_payloads(small_fixture),
+        hooks=["handle_post_tool_use"], iterations=2,
+    )
+
+    entry = report["hooks"]["handle_post_tool_use"]
+    assert entry["runs"] == 2
+    assert entry["failures"] == 0
+    assert 0 < entry["p50_ms"] <= entry["p95_ms"] <= entry["p99_ms"]
+    assert entry["peak_rss_kb"] > 0
+    assert "handle_post_tool_use" in bench.format_report(report)
+
+
+def test_every_hook_runs_clean_performance(small_fixture):
+    """All 11 hooks complete against the fixture (no crash, no stray exit code)."""
+    report = bench.bench(
+        small_fixture, bench.synthetic_payloads(small_fixture),
+        iterations=1, warmup=0, syscalls=False,
+    )
+
+    assert set(report["hooks"]) == set(bench.HOOK_EVENTS)
+    assert {hook: m["failures"] for hook, m in report["hooks"].items() if m["failures"]} == {}
@@ -0,0 +1,98 @@
+"""
+Tests for the per-invocation HookContext (macf.utils.context).
+
+Inside one hook run the shared facts are computed once; outside a context the
+helpers behave exactly as before.
+"""
+
+import json
+from unittest.mock import patch, MagicMock
+
+from macf.agent_events_log import append_event
+from macf.utils import get_breadcrumb, get_current_session_id, get_token_info
+from macf.utils.context import HookContext, current_context, hook_fact, with_hook_context
+
+
+def _git_result():
+    return MagicMock(returncode=0, stdout="abc1234\n")
+
+
+def _hash_lookups(run):
+    return sum(1 for c in run.call_args_list if c.args[0][-1] == "HEAD")
+
+
+def test_git_hash_computed_once_per_context(monkeypatch):
+    # No session outside the context, so nothing persists across calls there.
+    monkeypatch.delenv("MACF_SESSION_ID", raising=False)
+    monkeypatch.delenv("CLAUDE_CODE_SESSION_ID", raising=False)
+    with patch("macf.utils.breadcrumbs.subprocess.run", return_value=_git_result()) as run:
+        with HookContext({"session_id": "sess-1"}):
+            first = get_breadcrumb()
+            second = get_breadcrumb()
+            append_event("tool_call_started", {"tool": "Read"})  # irrelevant to the breadcrumb
+
+        assert first == second
+        assert "g_abc1234" in first
+        assert _hash_lookups(run) == 1
+
+        # Outside a context every call asks git again.
+        get_breadcrumb()
+        get_breadcrumb()
+        assert _hash_lookups(run) == 3
+
+
+def test_relevant_event_invalidates_breadcrumb():
+    with patch("macf.utils.breadcrumbs.subprocess.run", return_value=_git_result()):
+        with HookContext({"session_id": "sess-1"}):
+            before = get_breadcrumb()
+            append_event("dev_drv_started", {"session_id": "sess-1", "prompt_uuid": "feedc0de1234"})
+            after = get_breadcrumb()
+
+    assert "p_feedc0d" not in before
+    assert "p_feedc0d" in after
+
+
+def test_context_supplies_hook_input_session(monkeypatch):
+    monkeypatch.delenv("MACF_SESSION_ID", raising=False)
+    monkeypatch.delenv("CLAUDE_CODE_SESSION_ID", raising=False)
+
+    with HookContext({"session_id": "from-hook"}) as ctx:
+        assert get_current_session_id() == "from-hook"
+        assert ctx.session_id == "from-hook"
+
+
+def test_mutable_facts_are_not_shared_between_callers():
+    with HookContext({"session_id": "sess-1"}):
+        info = get_token_info("sess-1")
+        info["cl_level"] = -1
+        assert get_token_info("sess-1")["cl_level"] != -1
+
+
+def test_hook_fact_keys_on_arguments():
+    calls = []
+
+    @hook_fact("test_square")
+    def square(n):
+        calls.append(n)
+        return n * n
+
+    with HookContext() as ctx:
+        assert [square(2), square(2), square(3)] == [4, 4, 9]
+        ctx.invalidate("test_square")
+        square(2)
+
+    assert calls == [2, 3, 2]
+
+
+def test_with_hook_context_scopes_one_run():
+    seen = []
+
+    @with_hook_context
+    def run(stdin_json="", **kwargs):
+        seen.append(current_context().hook_input)
+        return {"continue": True}
+
+    assert run(json.dumps({"session_id": "s"})) == {"continue": True}
+    assert run("not json") == {"continue": True}
+    assert seen == [{"session_id": "s"}, {}]
+    assert current_context() is None
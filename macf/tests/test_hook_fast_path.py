@@ -0,0 +1,78 @@
+"""Tests for the declarative Pre/PostToolUse fast path (macf.hooks.fast_path)."""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from macf.hooks.fast_path import WorkRule, fast_path_tools, required_work, take_fast_path
+
+
+def _read(path="/tmp/x.py"):
+    return json.dumps({"session_id": "s1", "tool_name": "Read", "tool_input": {"file_path": path}})
+
+
+def test_setting_defaults_to_no_tools(monkeypatch):
+    monkeypatch.delenv("MACF_HOOK_FAST_PATH_TOOLS", raising=False)
+    assert fast_path_tools() == frozenset()
+    monkeypatch.setenv("MACF_HOOK_FAST_PATH_TOOLS", "Read, Grep,")
+    assert fast_path_tools() == {"Read", "Grep"}
+
+
+def test_rules_keep_matching_calls_off_the_fast_path(monkeypatch):
+    monkeypatch.setenv("MACF_HOOK_FAST_PATH_TOOLS", "Read,Bash")
+    rules = (
+        WorkRule("guard", frozenset({"Bash"}), when=lambda ti: ti.get("command", "").startswith("cd ")),
+    )
+    assert required_work(rules, "Bash", {"command": "cd /tmp"}) == ["guard"]
+    assert not take_fast_path(rules, "Bash", {"command": "cd /tmp"})
+    assert take_fast_path(rules, "Bash", {"command": "ls"})
+    assert take_fast_path(rules, "Read", {})
+    assert not take_fast_path(rules, "Grep", {})  # not opted in
+
+
+@pytest.fixture
+def pre_hook_mocks():
+    with patch("macf.hooks.handle_pre_tool_use.get_current_session_id", return_value="s1"), \
+         patch("macf.hooks.handle_pre_tool_use.get_active_policy_injections_from_events", return_value=[]), \
+         patch("macf.hooks.handle_pre_tool_use.append_event") as append, \
+         patch("macf.hooks.handle_pre_tool_use.get_token_info") as tokens:
+        yield append, tokens
+
+
+def test_pre_tool_use_fast_path_records_and_returns(monkeypatch, pre_hook_mocks):
+    from macf.hooks.handle_pre_tool_use import run
+
+    append, tokens = pre_hook_mocks
+    monkeypatch.setenv("MACF_HOOK_FAST_PATH_TOOLS", "Read")
+    assert run(_read()) == {"continue": True}
+    assert append.call_args.kwargs["data"]["fast_path"] is True
+    tokens.assert_not_called()
+
+
+def test_pre_tool_use_required_work_bypasses_fast_path(monkeypatch, pre_hook_mocks):
+    from macf.hooks.handle_pre_tool_use import run
+
+    monkeypatch.setenv("MACF_HOOK_FAST_PATH_TOOLS", "Read,TaskCreate")
+    create = json.dumps({"session_id": "s1", "tool_name": "TaskCreate", "tool_input": {"subject": "x"}})
+    assert run(create)["hookSpecificOutput"]["permissionDecision"] == "deny"
+
+    with patch("macf.hooks.handle_pre_tool_use.get_active_policy_injections_from_events",
+               return_value=[{"policy_name": "p", "policy_path": ""}]):
+        assert "hookSpecificOutput" in run(_read())
+
+
+def test_post_tool_use_fast_path_drops_response(monkeypatch):
+    from macf.hooks.handle_post_tool_use import run
+
+    monkeypatch.setenv("MACF_HOOK_FAST_PATH_TOOLS", "Read")
+    payload = {"session_id": "s1", "tool_name": "Read", "tool_input": {}, "tool_response": {"content": "x"}}
+    with patch("macf.hooks.handle_post_tool_use.get_current_session_id", return_value="s1"), \
+         patch("macf.hooks.handle_post_tool_use.append_event") as append:
+        run(json.dumps(payload))
+        assert append.call_args.kwargs["data"]["fast_path"] is True
+        assert "tool_response" not in append.call_args.kwargs["hook_input"]
+
+        monkeypatch.delenv("MACF_HOOK_FAST_PATH_TOOLS")
+        run(json.dumps(payload))
+        assert "fast_path" not in append.call_args.kwargs["data"]
+        assert "tool_response" in append.call_args.kwargs["hook_input"]
@@ -0,0 +1,119 @@
+"""Import-time budget for the hook entry points.
+
+Every tool call starts a fresh interpreter for PreToolUse/PostToolUse, so
+whatever ``macf.hooks.handle_*`` imports at module level is paid on every
+call. These tests run ``python -X importtime`` per hook and fail when a hook
+imports more modules or spends longer importing than its budget, or when a
+heavyweight dependency that no hook needs up front sneaks back into the
+import graph (typically through an eager package ``__init__`` re-export).
+
+The module counts and the heavy-module list are deterministic and always
+checked. Wall-clock import time depends on how loaded the machine is, so
+its budget is opt-in: set ``MACF_HOOK_IMPORT_TIMING=1`` on a quiet machine.
+``MACF_HOOK_IMPORT_BUDGET_SCALE`` multiplies the time budget for unusually
+slow ones.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+#: hook module -> max modules imported (interpreter startup included)
+MODULE_BUDGETS = {
+    "handle_notification": 165,
+    "handle_permission_request": 165,
+    "handle_post_tool_use": 160,
+    "handle_pre_compact": 165,
+    "handle_pre_tool_use": 175,
+    "handle_session_end": 165,
+    "handle_session_start": 165,
+    "handle_stop": 175,
+    "handle_subagent_start": 165,
+    "handle_subagent_stop": 165,
+    "handle_user_prompt_submit": 160,
+}
+
+#: Cumulative import time budget per hook, in ms.
+TIME_BUDGET_MS = 250
+
+#: Never imported just by loading a hook entry point.
+HEAVY_MODULES = {
+    "yaml",               # task models / manifests parse it on demand
+    "pydantic",           # task custom models, agent/project specs
+    "importlib.metadata", # package version, resolved lazily
+    "urllib.request",     # Telegram channel, only when sending
+    "ssl",
+    "lzma",               # compressed event segments, only when read
+    "macf.task.models",
+    "macf.utils.manifest",
+    "macf.utils.recommend",
+}
+
+
+needs_timing = pytest.mark.skipif(
+    os.environ.get("MACF_HOOK_IMPORT_TIMING") != "1",
+    reason="wall-clock budget is opt-in (MACF_HOOK_IMPORT_TIMING=1)",
+)
+
+
+def _import_profile(module, runs=1):
+    """(modules imported, total import µs) for ``import macf.hooks.<module>``,
+    from the fastest of ``runs`` imports."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # stale .pyc would count compile time
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import macf.hooks.{module}"]
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(cmd, capture_output=True, text=True, env=env, timeout=60)
+        assert result.returncode == 0, result.stderr
+        names, total = [], 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, _cumulative, name = line[len("import time:"):].split("|")
+            names.append(name.strip())
+            total += int(self_us)
+        if best is None or total < best[1]:
+            best = (names, total)
+    return best
+
+
+@pytest.mark.parametrize("module", sorted(MODULE_BUDGETS))
+def test_hook_import_budget(module):
+    names, _total_us = _import_profile(module)
+
+    heavy = sorted(HEAVY_MODULES.intersection(names))
+    assert not heavy, f"{module} imports {heavy} at load time"
+    assert len(names) <= MODULE_BUDGETS[module], (
+        f"{module} imports {len(names)} modules (budget {MODULE_BUDGETS[module]})"
+    )
+
+
+@needs_timing
+@pytest.mark.parametrize("module", sorted(MODULE_BUDGETS))
+def test_hook_import_time_budget(module):
+    _names, total_us = _import_profile(module, runs=3)
+    scale = float(os.environ.get("MACF_HOOK_IMPORT_BUDGET_SCALE", "1"))
+
+    assert total_us / 1000 <= TIME_BUDGET_MS * scale, (
+        f"{module} imports take {total_us / 1000:.0f}ms (budget {TIME_BUDGET_MS * scale:.0f}ms)"
+    )
+
+
+def test_lazy_reexports_still_resolve():
+    """Package-level re-exports keep working after the lazy restructuring."""
+    import macf
+    import macf.hooks
+    import macf.task
+    import macf.utils
+    from macf.utils.tokens import get_token_info
+    from macf.task.reader import TaskReader
+
+    assert macf.utils.get_token_info is get_token_info
+    assert macf.task.TaskReader is TaskReader
+    assert macf.hooks.post_tool_use_run.__module__ == "macf.hooks.handle_post_tool_use"
+    assert macf.utils.paths.__name__ == "macf.utils.paths"
+    assert isinstance(macf.__version__, str)
+    with pytest.raises(AttributeError):
+        macf.utils.no_such_helper
@@ -0,0 +1,103 @@
+"""Tests for hook phase tracing (macf.observability.tracing) and `hooks profile`."""
+import argparse
+import json
+
+import pytest
+
+from macf.hooks import profile
+from macf.observability import tracing
+from macf.observability.tracing import span, trace_hook
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    monkeypatch.setenv("MACF_HOOK_TRACE", "1")
+    records = []
+    monkeypatch.setattr(tracing, "write_trace", records.append)
+    return records
+
+
+def test_spans_nest_and_record_once_per_run(captured):
+    @span("outer")
+    def outer():
+        with span("inner"):
+            pass
+        with span("inner"):
+            pass
+
+    with trace_hook("handle_stop", "sess"):
+        outer()
+    outer()  # untraced: no-op
+
+    assert len(captured) == 1
+    record = captured[0]
+    assert (record["hook"], record["sid"], record["ok"]) == ("handle_stop", "sess", True)
+    assert [s[0] for s in record["spans"]] == ["outer/inner", "outer/inner", "outer"]
+    for _path, start, dur in record["spans"]:
+        assert 0 <= start and 0 <= dur <= record["us"]
+
+
+def test_trace_marks_failed_runs(captured):
+    with pytest.raises(RuntimeError):
+        with trace_hook("handle_stop", "sess"):
+            raise RuntimeError("boom")
+    assert captured[0]["ok"] is False
+
+
+def test_disabled_tracing_writes_nothing(monkeypatch):
+    monkeypatch.setenv("MACF_HOOK_TRACE", "0")
+    records = []
+    monkeypatch.setattr(tracing, "write_trace", records.append)
+    with trace_hook("handle_stop", "sess"):
+        with span("phase"):
+            pass
+    assert records == []
+
+
+def _record(hook, us, spans, sid="s1", ts=1000.0):
+    return {"v": 1, "hook": hook, "sid": sid, "ts": ts, "us": us, "ok": True, "spans": spans}
+
+
+def test_aggregate_self_time_and_folded_stacks():
+    records = [
+        _record("handle_stop", 10_000, [["breadcrumb/git_hash", 100, 3_000],
+                                        ["breadcrumb", 50, 4_000],
+                                        ["token_scan", 5_000, 2_000]]),
+        _record("handle_stop", 20_000, [["token_scan", 0, 6_000]], sid="s2"),
+    ]
+
+    summary = profile.aggregate(records)["handle_stop"]
+
+    assert (summary["runs"], summary["sessions"], summary["total_ms"]) == (2, 2, 30.0)
+    token = summary["phases"]["token_scan"]
+    assert (token["runs"], token["calls"], token["total_ms"]) == (2, 2, 8.0)
+    assert summary["phases"]["breadcrumb"]["self_ms"] == 1.0
+    assert list(summary["phases"])[0] == "token_scan"  # most expensive first
+
+    stacks = profile.folded_stacks(records)
+    assert stacks["handle_stop;breadcrumb;git_hash"] == 3_000
+    assert stacks["handle_stop;breadcrumb"] == 1_000
+    assert stacks["handle_stop"] == (10_000 - 6_000) + (20_000 - 6_000)
+    assert "flame" in profile.format_profile(profile.aggregate(records))
+
+
+def test_profile_command_reads_traces_across_sessions(tmp_path, capsys):
+    from macf.cli import cmd_hook_profile
+
+    for sid, hook in (("s1", "handle_stop"), ("s2", "handle_stop"), ("s2", "handle_pre_tool_use")):
+        trace = tmp_path / "agent" / sid / "hooks" / tracing.TRACE_FILE
+        trace.parent.mkdir(parents=True, exist_ok=True)
+        with open(trace, "a") as f:
+            f.write(json.dumps(_record(hook, 5_000, [["event_append", 0, 1_000]], sid=sid)) + "\n")
+            f.write("{truncated\n")
+
+    args = argparse.Namespace(
+        root=str(tmp_path), session=None, agent=None, since=None, hook=["stop"],
+        top=None, no_flame=False, folded=False, json_output=True,
+    )
+    assert cmd_hook_profile(args) == 0
+    out = json.loads(capsys.readouterr().out)
+
+    assert out["trace_files"] == 2
+    assert list(out["hooks"]) == ["handle_stop"]
+    assert out["hooks"]["handle_stop"]["sessions"] == 2
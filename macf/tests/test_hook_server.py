@@ -0,0 +1,199 @@
+"""Tests for the warm hook server (macf.hooks.server) and its thin client.
+
+A hook launched through the client must behave like the directly linked
+handler: same stdout, same exit code, and it must still run when no
+server is listening.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import macf.hooks as hooks_package
+from macf.hooks import server
+from macf.hooks import client
+from macf.hooks.client import hook_module
+
+CLIENT = Path(hooks_package.__file__).parent / "client.py"
+PRE_TOOL_USE_INPUT = json.dumps({
+    "session_id": "test-session",
+    "hook_event_name": "PreToolUse",
+    "tool_name": "Read",
+    "tool_input": {"file_path": "/tmp/x"},
+})
+
+
+@pytest.fixture
+def hook_env(tmp_path, monkeypatch):
+    sock = str(tmp_path / "hooks.sock")
+    monkeypatch.setenv("MACF_HOOK_SOCKET", sock)
+    script = tmp_path / "pre_tool_use.py"
+    script.symlink_to(CLIENT)
+    return sock, script
+
+
+def _run_hook(script, stdin=PRE_TOOL_USE_INPUT):
+    return subprocess.run(
+        [sys.executable, str(script)], input=stdin,
+        capture_output=True, text=True, timeout=60,
+    )
+
+
+@pytest.fixture
+def running_server(hook_env):
+    sock, _script = hook_env
+    proc = subprocess.Popen([sys.executable, "-m", "macf.hooks.server"])
+    deadline = time.time() + 60
+    while server.status(sock) is None:
+        assert proc.poll() is None, "hook server exited during startup"
+        assert time.time() < deadline, "hook server did not come up"
+        time.sleep(0.1)
+    yield sock
+    server.stop(sock)
+    proc.wait(timeout=10)
+
+
+def test_hook_module_names():
+    assert hook_module("/x/.claude/hooks/pre_tool_use.py") == "handle_pre_tool_use"
+    assert hook_module("handle_stop.py") == "handle_stop"
+
+
+def test_client_runs_in_process_without_server(hook_env):
+    _sock, script = hook_env
+
+    result = _run_hook(script)
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1])["continue"] is True
+
+
+def test_served_run_matches_direct_run(hook_env, running_server, isolated_events_log):
+    _sock, script = hook_env
+
+    served = _run_hook(script)
+    info = server.status(running_server)
+
+    assert served.returncode == 0, served.stderr
+    output = json.loads(served.stdout.strip().splitlines()[-1])
+    assert output["continue"] is True
+    assert output["hookSpecificOutput"]["hookEventName"] == "PreToolUse"
+    assert info["served"] == 1
+    assert "handle_pre_tool_use" in info["handlers"]
+
+
+def test_stop_removes_socket(hook_env, running_server):
+    assert server.stop(running_server)
+    deadline = time.time() + 10
+    while os.path.exists(running_server) and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert not os.path.exists(running_server)
+    assert server.status(running_server) is None
+
+
+def test_server_locks_down_existing_socket_dir(tmp_path, monkeypatch):
+    sock_dir = tmp_path / "shared"
+    sock_dir.mkdir(mode=0o777)
+    os.chmod(sock_dir, 0o777)
+    sock = str(sock_dir / "hooks.sock")
+    monkeypatch.setenv("MACF_HOOK_SOCKET", sock)
+    proc = subprocess.Popen([sys.executable, "-m", "macf.hooks.server"])
+    try:
+        deadline = time.time() + 60
+        while server.status(sock) is None:
+            assert proc.poll() is None, "hook server exited during startup"
+            assert time.time() < deadline, "hook server did not come up"
+            time.sleep(0.1)
+
+        assert sock_dir.stat().st_mode & 0o777 == 0o700
+    finally:
+        server.stop(sock)
+        proc.wait(timeout=10)
+
+
+def test_child_reports_exit_code_and_writes_client_stdio(tmp_path):
+    """The forked child runs on the client's fds and returns the handler's exit code."""
+    code = compile("import sys\nprint(sys.stdin.read().upper())\nsys.exit(2)\n", "hook", "exec")
+    stdin_path = tmp_path / "stdin"
+    stdin_path.write_text("blocked")
+    stdout_path = tmp_path / "stdout"
+    fds = [
+        os.open(stdin_path, os.O_RDONLY),
+        os.open(stdout_path, os.O_WRONLY | os.O_CREAT),
+        os.open(os.devnull, os.O_WRONLY),
+    ]
+    parent, child = socket.socketpair()
+    request = {"module": "handle_x", "env": {"X": "1"}, "cwd": str(tmp_path), "argv": ["x.py"]}
+
+    pid = os.fork()
+    if pid == 0:
+        parent.close()
+        server._run_child(child, request, fds, code)
+    child.close()
+    for fd in fds:
+        os.close(fd)
+    assert parent.recv(64) == client.ACCEPTED
+    parent.sendall(client.CONFIRM)
+    reply = parent.recv(64)
+    _, status = os.waitpid(pid, 0)
+
+    assert reply == b"2"
+    assert os.waitstatus_to_exitcode(status) == 2
+    assert stdout_path.read_text() == "BLOCKED\n"
+
+
+def test_child_runs_nothing_without_confirmation(tmp_path):
+    """A client that gave up before confirming has run the hook itself."""
+    marker = tmp_path / "ran"
+    code = compile(f"open({str(marker)!r}, 'w').close()\n", "hook", "exec")
+    fds = [os.open(os.devnull, os.O_RDWR) for _ in range(3)]
+    parent, child = socket.socketpair()
+
+    pid = os.fork()
+    if pid == 0:
+        parent.close()
+        server._run_child(child, {"module": "handle_x"}, fds, code)
+    child.close()
+    for fd in fds:
+        os.close(fd)
+    assert parent.recv(64) == client.ACCEPTED
+    parent.close()
+    os.waitpid(pid, 0)
+
+    assert not marker.exists()
+
+
+def test_silent_client_does_not_stall_server(hook_env, running_server):
+    silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    silent.connect(running_server)
+    try:
+        started = time.time()
+        info = server.status(running_server)
+
+        assert info is not None
+        assert time.time() - started < server.REQUEST_TIMEOUT + 3
+        # The server gave up on the silent client and closed it.
+        silent.settimeout(5)
+        assert silent.recv(64) == b""
+    finally:
+        silent.close()
+
+
+def test_client_falls_back_when_server_never_accepts(tmp_path, monkeypatch):
+    """A server that takes the connection but never answers costs ACK_TIMEOUT, not forever."""
+    path = str(tmp_path / "stuck.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    monkeypatch.setattr(client, "ACK_TIMEOUT", 0.2)
+    try:
+        started = time.time()
+        assert client.forward("handle_pre_tool_use", path) is None
+        assert time.time() - started < 5
+    finally:
+        listener.close()
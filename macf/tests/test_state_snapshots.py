@@ -0,0 +1,134 @@
+"""Tests for incremental state_snapshot tallies and the snapshot cadence policy.
+
+A snapshot built from the previous one plus the records since its offset
+must carry the same tallies a full scan of the log would.
+"""
+import json
+
+import pytest
+
+from macf.agent_events_log import (
+    append_event,
+    emit_state_snapshot,
+    iter_events_of_type,
+    maybe_emit_state_snapshot,
+    tally_all_events,
+)
+from macf.event_queries import get_compaction_count_from_events, get_dev_drv_stats_from_events
+from macf.event_segments import roll_segment
+
+
+def _latest_snapshot():
+    return next(iter_events_of_type("state_snapshot"), None)
+
+
+def _seed(count, start=0):
+    for i in range(start, start + count):
+        append_event("tool_call_started", {"i": i})
+        if i % 10 == 0:
+            append_event("dev_drv_ended", {"duration_seconds": 1.5})
+
+
+def test_incremental_snapshot_matches_full_tally(isolated_events_log):
+    _seed(50)
+    assert emit_state_snapshot("s", "manual", "command_line")
+    _seed(30, start=50)
+    roll_segment(isolated_events_log)
+    _seed(20, start=80)
+
+    incremental = tally_all_events(baseline=_latest_snapshot())
+    full = tally_all_events()
+
+    assert incremental["metadata"]["incremental"] is True
+    assert incremental["event_tallies"] == full["event_tallies"]
+    assert incremental["accumulated_durations"] == full["accumulated_durations"]
+    for key in ("events_scanned", "earliest_timestamp", "latest_timestamp", "covered_offset"):
+        assert incremental["metadata"][key] == full["metadata"][key]
+
+
+def test_snapshot_reads_only_the_delta(isolated_events_log, monkeypatch):
+    _seed(50)
+    emit_state_snapshot("s", "manual", "command_line")
+    append_event("dev_drv_ended", {"duration_seconds": 2.0})
+    # Garble everything before the snapshot: an incremental tally never reads it.
+    snapshot_offset = _latest_snapshot()["data"]["snapshot_metadata"]["covered_offset"]
+    raw = isolated_events_log.read_bytes()
+    isolated_events_log.write_bytes(b"x" * (snapshot_offset - 1) + b"\n" + raw[snapshot_offset:])
+
+    tallies = tally_all_events(baseline=json.loads(raw[snapshot_offset:].split(b"\n")[0]))
+
+    assert tallies["event_tallies"]["dev_drv_ended"] == 6
+    assert tallies["event_tallies"]["state_snapshot"] == 1
+    assert tallies["accumulated_durations"]["total_dev_drv_duration_seconds"] == 9.5
+
+
+def test_legacy_snapshot_falls_back_to_full_scan(isolated_events_log):
+    _seed(5)
+    legacy = {"data": {"event_tallies": {"tool_call_started": 999},
+                       "accumulated_durations": {}, "snapshot_metadata": {}}}
+
+    tallies = tally_all_events(baseline=legacy)
+
+    assert tallies["metadata"]["incremental"] is False
+    assert tallies["event_tallies"]["tool_call_started"] == 5
+
+
+def test_periodic_policy(isolated_events_log, monkeypatch):
+    monkeypatch.setenv("MACF_EVENTS_SNAPSHOT_EVERY", "40")
+    _seed(30)
+    assert not maybe_emit_state_snapshot("s")
+
+    _seed(10, start=30)
+    assert maybe_emit_state_snapshot("s")
+    assert _latest_snapshot()["data"]["snapshot_type"] == "periodic"
+    assert not maybe_emit_state_snapshot("s")
+
+    monkeypatch.setenv("MACF_EVENTS_SNAPSHOT_EVERY", "0")
+    _seed(100, start=40)
+    assert not maybe_emit_state_snapshot("s")
+
+
+def test_pre_compact_policy(isolated_events_log, monkeypatch):
+    assert maybe_emit_state_snapshot("s", trigger="pre_compact")
+    assert _latest_snapshot()["data"]["snapshot_type"] == "pre_compact"
+
+    monkeypatch.setenv("MACF_EVENTS_SNAPSHOT_ON_PRE_COMPACT", "false")
+    assert not maybe_emit_state_snapshot("s", trigger="pre_compact")
+
+    with pytest.raises(ValueError):
+        maybe_emit_state_snapshot("s", trigger="hourly")
+
+
+def test_queries_count_past_a_periodic_snapshot(isolated_events_log):
+    session = "aaaaaaaa-1111"
+    append_event("compaction_detected", {"session_id": session})
+    append_event("dev_drv_started", {"session_id": session, "prompt_uuid": "p1"})
+    append_event("dev_drv_ended", {"session_id": session, "prompt_uuid": "p1", "duration": 3.0})
+    emit_state_snapshot(session, "periodic", "events")
+    append_event("compaction_detected", {"session_id": session})
+    append_event("dev_drv_started", {"session_id": session, "prompt_uuid": "p2"})
+    append_event("dev_drv_ended", {"session_id": session, "prompt_uuid": "p2", "duration": 4.0})
+
+    assert get_compaction_count_from_events(session) == {"count": 2, "from_snapshot": True}
+    stats = get_dev_drv_stats_from_events(session)
+    assert stats["count"] == 2 and stats["current_prompt_uuid"] == "p2"
+
+
+def test_state_file_compaction_count_does_not_compound(isolated_events_log):
+    session = "aaaaaaaa-1111"
+    append_event("compaction_detected", {"session_id": session})
+    emit_state_snapshot(session, "initialization", "state_files", {"compaction_count": 10})
+
+    first = _latest_snapshot()["data"]
+    assert first["event_tallies"]["compaction_detected"] == 1
+    assert first["derived_values"]["compaction_count"] == 10
+    assert get_compaction_count_from_events(session)["count"] == 10
+
+    append_event("compaction_detected", {"session_id": session})
+    emit_state_snapshot(session, "periodic", "events")
+
+    second = _latest_snapshot()["data"]
+    # Raw tallies extend from the raw baseline, not from the override.
+    assert second["event_tallies"]["compaction_detected"] == 2
+    assert second["derived_values"]["compaction_count"] == 10
+    assert get_compaction_count_from_events(session)["count"] == 10
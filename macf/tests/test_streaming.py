@@ -8,13 +8,14 @@ fixed in cversek/MacEff#94).
 from __future__ import annotations
 
 import os
+import random
 import resource
 import sys
 from pathlib import Path
 
 import pytest
 
-from macf.utils.streaming import iter_lines_forward, iter_lines_reverse
+from macf.utils.streaming import iter_line_bytes_reverse, iter_lines_forward, iter_lines_reverse
 
 
 # --- iter_lines_reverse: happy paths and edge cases ----------------------
@@ -91,6 +92,47 @@ def test_reverse_utf8_multibyte_across_chunk_boundary(tmp_path: Path):
     assert non_empty == ["world", "é" * 50, "hello"]
 
 
+# --- mmap and chunked readers agree ---------------------------------------
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mapped_and_chunked_readers_agree(tmp_path: Path, seed: int):
+    """Both backends yield the same lines, blank lines and partial tail included."""
+    rng = random.Random(seed)
+    p = tmp_path / "f.jsonl"
+    parts = ["x" * rng.randint(0, 40) + "é" * rng.randint(0, 3) for _ in range(200)]
+    p.write_text("\n".join(parts) + rng.choice(["", "\n", "\n\n"]), encoding="utf-8")
+
+    mapped = list(iter_lines_reverse(p))
+    chunked = list(iter_lines_reverse(p, chunk_size=rng.randint(1, 64), use_mmap=False))
+
+    assert mapped == chunked
+    assert mapped == list(reversed(p.read_text(encoding="utf-8").split("\n")))
+
+
+def test_bytes_reader_skips_decoding(tmp_path: Path):
+    """iter_line_bytes_reverse yields the same lines undecoded."""
+    p = tmp_path / "f.txt"
+    p.write_bytes("alpha\nbéta\n".encode("utf-8"))
+
+    assert list(iter_line_bytes_reverse(p)) == [b"", "béta".encode("utf-8"), b"alpha"]
+    assert list(iter_line_bytes_reverse(tmp_path / "f.txt", use_mmap=False)) == [
+        b"", "béta".encode("utf-8"), b"alpha",
+    ]
+
+
+def test_mapped_reader_ignores_bytes_appended_mid_scan(tmp_path: Path):
+    """The scan covers the file as it was when iteration started."""
+    p = tmp_path / "f.txt"
+    p.write_text("one\ntwo\n", encoding="utf-8")
+
+    lines = iter_lines_reverse(p)
+    first = next(lines)
+    with open(p, "a", encoding="utf-8") as f:
+        f.write("three\n")
+
+    assert [first, *lines] == ["", "two", "one"]
+
+
 # --- iter_lines_forward ---------------------------------------------------
 
 def test_forward_yields_in_order_with_newlines_included(tmp_path: Path):
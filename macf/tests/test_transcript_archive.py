@@ -0,0 +1,113 @@
+"""Tests for seekable compressed transcript archives and reading through them."""
+import json
+import os
+
+import pytest
+
+from macf.forensics.transcript_index import TranscriptIndex
+from macf.forensics.transcript_search import _scan_bytes, search_by_breadcrumb
+from macf.utils.transcript_archive import (
+    archive_transcript,
+    find_inactive_transcripts,
+    open_transcript,
+    restore_transcript,
+    transcript_stat,
+    verify_archive,
+    write_archive,
+)
+from macf.utils.transcript_registry import TranscriptRegistry
+
+
+def _line(n: int) -> str:
+    return json.dumps({
+        "type": "user" if n % 2 else "assistant",
+        "uuid": f"{n:08x}-aaaa-bbbb-cccc-dddddddddddd",
+        "message": {"content": f"message {n} " + "x" * (n % 97)},
+    }) + "\n"
+
+
+@pytest.fixture
+def transcript(tmp_path):
+    root = tmp_path / ".claude" / "projects" / "-proj"
+    root.mkdir(parents=True)
+    path = root / "0123abcd-session.jsonl"
+    path.write_text("".join(_line(n) for n in range(400)))
+    os.utime(path, (1_000_000, 1_000_000))
+    return path
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_random_access_matches_raw(transcript, tmp_path, codec):
+    raw = transcript.read_bytes()
+    dest = tmp_path / "t.jsonl.fz"
+    footer = write_archive(transcript, dest, codec=codec, frame_size=4096)
+
+    assert len(footer["frames"]) > 5
+    assert footer["raw_size"] == len(raw) and footer["lines"] == 400
+    assert verify_archive(dest)
+    with open_transcript(dest, "rb") as f:
+        assert transcript_stat(f)[1] == len(raw)
+        for offset in (0, 4095, 4096, 10_000, len(raw) - 7):
+            f.seek(offset)
+            assert f.read(50) == raw[offset:offset + 50]
+        f.seek(raw.index(b"message 200"))
+        assert f.readline() == raw[raw.index(b"message 200"):raw.index(b"\n", raw.index(b"message 200")) + 1]
+        with pytest.raises(OSError):
+            f.fileno()
+    with open_transcript(dest) as f:
+        assert f.readlines() == transcript.read_text().splitlines(keepends=True)
+
+
+def test_corrupt_archive_fails_verification(transcript, tmp_path):
+    dest = tmp_path / "t.jsonl.fz"
+    write_archive(transcript, dest, frame_size=4096)
+    data = bytearray(dest.read_bytes())
+    data[100] ^= 0xFF
+    dest.write_bytes(bytes(data))
+    assert not verify_archive(dest)
+    assert _scan_bytes(str(dest), b"never") == (False, 0)
+
+
+def test_archived_transcript_keeps_breadcrumb_lookup(transcript, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    crumb = "s_0123abcd/c_1/g_abc/p_000000c8/t_1"
+    before = search_by_breadcrumb(crumb, before=2, after=2)
+
+    result = archive_transcript(transcript)
+    assert not transcript.exists()
+    assert result["archived_size"] < result["raw_size"]
+    archive = result["archive"]
+    assert os.stat(archive).st_mtime == 1_000_000
+
+    after = search_by_breadcrumb(crumb, before=2, after=2)
+    assert after.transcript_path == archive
+    assert after.target_message == before.target_message
+    assert [m.content for m in after.all_messages()] == [m.content for m in before.all_messages()]
+    assert _scan_bytes(archive, b"000000c8")[0]
+
+    index = TranscriptIndex(archive)
+    assert index.sync() and index.messages() == 400
+
+    monkeypatch.setenv("MACF_TRANSCRIPT_INDEX", "0")
+    assert search_by_breadcrumb(crumb).target_index == 200
+
+
+def test_registry_and_restore(transcript, tmp_path, monkeypatch):
+    projects = transcript.parent.parent
+    monkeypatch.setattr("macf.utils.transcript_registry.get_projects_dir", lambda: projects)
+    assert find_inactive_transcripts(14) == [str(transcript)]
+    assert find_inactive_transcripts(14, exclude=("0123abcd-session",)) == []
+
+    archive = archive_transcript(transcript)["archive"]
+    registry = TranscriptRegistry(projects)
+    registry.refresh()
+    assert registry.path("0123abcd-session") == archive
+    assert registry.find_prefix("0123") == archive
+    assert registry.newest() is None  # archived sessions are never the live one
+    assert find_inactive_transcripts(14) == []
+
+    restored = restore_transcript(archive)
+    assert restored == transcript
+    assert transcript.read_text() == "".join(_line(n) for n in range(400))
+    assert os.stat(transcript).st_mtime == 1_000_000
+    assert not os.path.exists(archive)
@@ -0,0 +1,97 @@
+"""Tests for the incremental SQLite FTS5 transcript index."""
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from macf.forensics.transcript_fts import TranscriptFTS, fts_available, message_text
+
+pytestmark = pytest.mark.skipif(not fts_available(), reason="SQLite built without FTS5")
+
+PROMPT = "2a0e25c0-1111-2222-3333-444444444444"
+
+
+def _ts(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _lines(*entries) -> str:
+    return "".join(json.dumps(e) + "\n" for e in entries)
+
+
+def _session(epoch: float = 1_760_000_000):
+    return [
+        {"type": "user", "uuid": PROMPT, "sessionId": "d4abc33b-sess", "timestamp": _ts(epoch),
+         "message": {"content": "Why does the event index rebuild on every start?"}},
+        {"type": "assistant", "uuid": "a1", "sessionId": "d4abc33b-sess", "timestamp": _ts(epoch + 5),
+         "message": {"content": [
+             {"type": "text", "text": "The head digest covers the rotating prefix."},
+             {"type": "tool_use", "name": "Grep", "input": {"pattern": "head"}},
+         ]}},
+        {"type": "user", "uuid": "r1", "sessionId": "d4abc33b-sess", "timestamp": _ts(epoch + 6),
+         "toolUseResult": {}, "message": {"content": [{"type": "tool_result", "content": "index"}]}},
+        {"type": "system", "uuid": "s1", "content": "event index"},
+    ]
+
+
+@pytest.fixture
+def fts(tmp_path):
+    return TranscriptFTS(tmp_path / "fts.sqlite3")
+
+
+def test_message_text_extracts_text_and_tools():
+    assert message_text(_session()[1]) == ("The head digest covers the rotating prefix.", "Grep")
+    assert message_text(_session()[2]) == ("", "")
+    assert message_text(_session()[3]) == ("", "")
+
+
+def test_ingest_resumes_from_offset(fts, tmp_path):
+    path = tmp_path / "d4abc33b-sess.jsonl"
+    first, second = _lines(*_session()[:2]), _lines(*_session()[2:])
+    path.write_text(first + second[:20])
+    assert fts.ingest_transcript(path) == 2
+
+    with open(path, "a") as f:
+        f.write(second[20:])
+    assert fts.ingest_transcript(path) == 0  # tool result and system entry add nothing
+    assert fts.ingest_transcript(path) == 0
+
+    with open(path, "a") as f:
+        f.write(_lines({"type": "user", "uuid": "u2", "timestamp": _ts(1_760_000_100),
+                        "message": {"content": "rebuild the event index again"}}))
+    assert fts.ingest_transcript(path) == 1
+    assert sorted(h.line for h in fts.search("event index rebuild")) == [0, 4]
+
+
+def test_rewritten_transcript_reingests(fts, tmp_path):
+    path = tmp_path / "d4abc33b-sess.jsonl"
+    path.write_text(_lines(*_session()))
+    assert fts.ingest_transcript(path) == 2
+
+    path.write_text(_lines({"type": "user", "uuid": "n1", "message": {"content": "brand new topic"}}))
+    assert fts.ingest_transcript(path) == 1
+    assert fts.search("digest") == []
+    assert [h.uuid for h in fts.search("topic")] == ["n1"]
+
+
+def test_search_ranks_and_builds_breadcrumbs(fts, tmp_path, monkeypatch):
+    import macf.event_queries as event_queries
+
+    epoch = 1_760_000_000
+    monkeypatch.setattr(event_queries, "get_cycle_timeline_from_events",
+                        lambda max_count=10000: [(epoch + 3, 43), (epoch - 100, 42)])
+    path = tmp_path / "d4abc33b-sess.jsonl"
+    path.write_text(_lines(*_session(epoch)))
+    fts.ingest([str(path)])
+
+    hits = fts.search("head digest")
+    assert [h.uuid for h in hits] == ["a1"]
+    assert "[head]" in hits[0].snippet and "[digest]" in hits[0].snippet
+    assert hits[0].breadcrumb == f"s_d4abc33b/c_43/p_2a0e25c0/t_{epoch + 5}"
+
+    tools = fts.search("Grep")
+    assert [h.role for h in tools] == ["assistant"]
+
+    prompt = fts.search('event "index')  # quoted, so FTS5 syntax cannot break it
+    assert prompt[0].breadcrumb.startswith("s_d4abc33b/c_42/p_2a0e25c0/")
+    assert fts.search("event", session="ffff") == []
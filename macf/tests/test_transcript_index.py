@@ -0,0 +1,76 @@
+"""Tests for the transcript byte-offset index and the lookups built on it."""
+import json
+
+import pytest
+
+from macf.forensics.transcript_index import TranscriptIndex, get_transcript_index
+from macf.forensics.transcript_search import extract_window, find_message_by_breadcrumb
+
+
+def _line(n: int) -> str:
+    return json.dumps({
+        "type": "user" if n % 2 else "assistant",
+        "uuid": f"{n:08x}-aaaa-bbbb-cccc-dddddddddddd",
+        "message": {"content": f"message {n}"},
+    }) + "\n"
+
+
+@pytest.fixture
+def transcript(tmp_path):
+    path = tmp_path / "0123abcd-session.jsonl"
+    path.write_text("".join(_line(n) for n in range(50)))
+    return path
+
+
+def _crumb(n: int) -> str:
+    return f"s_0123abcd/c_1/g_abc/p_{n:08x}/t_1"
+
+
+def test_lookups_match_scan(transcript, monkeypatch):
+    indexed = find_message_by_breadcrumb(_crumb(20), str(transcript))
+    window = extract_window(str(transcript), indexed[0], before=3, after=3)
+
+    monkeypatch.setenv("MACF_TRANSCRIPT_INDEX", "0")
+    scanned = find_message_by_breadcrumb(_crumb(20), str(transcript))
+    scanned_window = extract_window(str(transcript), scanned[0], before=3, after=3)
+
+    assert indexed[0] == scanned[0] == 20
+    assert indexed[1] == scanned[1]
+    assert window == scanned_window
+    assert [m.index for m in window.all_messages()] == list(range(17, 24))
+    assert window.total_messages == 50
+
+
+def test_window_clipped_at_edges(transcript):
+    window = extract_window(str(transcript), 1, before=3, after=3)
+    assert [m.index for m in window.before] == [0]
+    assert extract_window(str(transcript), 50) is None
+
+
+def test_sync_indexes_only_appended_complete_lines(transcript):
+    index = get_transcript_index(transcript)
+    assert index.messages() == 50
+
+    partial = _line(50)
+    with open(transcript, "a") as f:
+        f.write("not json\n" + partial[:10])
+    assert index.sync() and index.messages() == 50
+    assert index.find_uuid("00000032") is None
+
+    with open(transcript, "a") as f:
+        f.write(partial[10:])
+    assert index.sync() and index.messages() == 51
+    ordinal = index.find_uuid("00000032")
+    assert ordinal == 50
+    # The non-JSON line still counts as a line, not as a message.
+    assert list(index.iter_range(ordinal, ordinal + 1))[0][0] == 51
+
+
+def test_rewritten_transcript_rebuilds(transcript):
+    index = TranscriptIndex(transcript)
+    assert index.sync() and index.messages() == 50
+
+    transcript.write_text("".join(_line(n) for n in range(100, 105)))
+    assert index.sync() and index.messages() == 5
+    assert index.find_uuid("00000014") is None
+    assert index.find_uuid("00000066") == 2
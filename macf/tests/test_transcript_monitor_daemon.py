@@ -102,3 +102,61 @@ def test_daemon_module_source_redirects_stderr(tmp_path):
     assert "Keep stderr for logging" not in source, (
         "stale comment suggests the inherited-stderr bug has regressed"
     )
+
+
+def _start_monitor(path, watch, seen):
+    import threading
+    import time
+    from macf.transcript_monitor.daemon import TranscriptMonitor
+
+    def detector(entry):
+        seen.append(entry["n"])
+
+    monitor = TranscriptMonitor(path, poll_interval=0.05, detectors=[detector], watch=watch)
+    monitor._fwd_checked_at = float("inf")
+    thread = threading.Thread(target=monitor.run, daemon=True)
+    thread.start()
+    while monitor._watcher is None and thread.is_alive():
+        time.sleep(0.01)
+    time.sleep(0.1)
+    return monitor, thread
+
+
+def _wait_for(predicate, timeout=2.0):
+    import time
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_monitor_follows_appends_and_replacement(tmp_path, monkeypatch):
+    """Both wake-up backends see appended lines and a transcript replaced
+    under the same name, and stop() returns without waiting out a sleep."""
+    import os
+    import time
+    monkeypatch.setenv("MACF_TRANSCRIPT_FTS", "0")
+    for watch in ("inotify", "poll"):
+        path = tmp_path / f"{watch}.jsonl"
+        path.write_text('{"n": 0}\n')
+        seen = []
+        monitor, thread = _start_monitor(path, watch, seen)
+        assert monitor.backend == watch
+
+        with open(path, "a") as f:
+            f.write('{"n": 1}\n')
+        assert _wait_for(lambda: seen == [1])
+
+        new = tmp_path / "replacement"
+        new.write_text('{"n": 2}\n')
+        os.replace(new, path)
+        time.sleep(0.2)  # reopened from the end, like a fresh start
+        with open(path, "a") as f:
+            f.write('{"n": 3}\n')
+        assert _wait_for(lambda: seen == [1, 3])
+
+        started = time.monotonic()
+        monitor.stop()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert time.monotonic() - started < 1.0
@@ -0,0 +1,88 @@
+"""Tests for the session id -> transcript path registry."""
+import os
+
+import pytest
+
+import macf.utils.transcript_registry as registry_module
+from macf.utils.transcript_registry import TranscriptRegistry, get_transcript_registry
+
+
+def _touch(path, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("{}\n")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def projects(tmp_path):
+    root = tmp_path / "projects"
+    _touch(root / "-home-me-alpha" / "aaaa1111-s1.jsonl", 1_000)
+    _touch(root / "-home-me-alpha" / "aaaa2222-s2.jsonl", 3_000)
+    _touch(root / "-home-me-beta" / "bbbb1111-s3.jsonl", 2_000)
+    (root / "-home-me-beta" / "bbbb1111-s3").mkdir()  # subagent dir, not a transcript
+    return root
+
+
+def test_lookups(projects):
+    registry = TranscriptRegistry(projects)
+    assert registry.refresh()
+
+    assert registry.path("bbbb1111-s3") == str(projects / "-home-me-beta" / "bbbb1111-s3.jsonl")
+    assert registry.path("missing") is None
+    assert registry.find_prefix("aaaa") == str(projects / "-home-me-alpha" / "aaaa1111-s1.jsonl")
+    assert registry.find_prefix("aaaa2") == str(projects / "-home-me-alpha" / "aaaa2222-s2.jsonl")
+    assert registry.find_prefix("c") is None
+    assert registry.sessions("-home-me-alpha") == {"aaaa1111-s1", "aaaa2222-s2"}
+    assert registry.newest() == "aaaa2222-s2"
+    assert registry.newest(["-home-me-beta"]) == "bbbb1111-s3"
+
+    # Appends do not move the directory mtime; newest() still sees them.
+    os.utime(projects / "-home-me-beta" / "bbbb1111-s3.jsonl", (5_000, 5_000))
+    assert registry.newest() == "bbbb1111-s3"
+
+
+def test_refresh_relists_only_changed_projects(projects, monkeypatch):
+    for project in projects.iterdir():
+        os.utime(project, (1_000, 1_000))  # well outside the racy window
+    registry = TranscriptRegistry(projects)
+    registry.refresh()
+
+    listed = []
+    original = TranscriptRegistry._list_transcripts
+    monkeypatch.setattr(TranscriptRegistry, "_list_transcripts",
+                        staticmethod(lambda d: listed.append(os.path.basename(d)) or original(d)))
+    assert not registry.refresh()
+    assert listed == []
+
+    _touch(projects / "-home-me-beta" / "bbbb2222-s4.jsonl")
+    assert registry.refresh()
+    assert listed == ["-home-me-beta"]
+    assert registry.path("bbbb2222-s4")
+
+    (projects / "-home-me-alpha" / "aaaa1111-s1.jsonl").unlink()
+    registry.refresh()
+    assert registry.path("aaaa1111-s1") is None
+
+
+def test_registry_persists_across_processes(projects, tmp_path):
+    for project in projects.iterdir():
+        os.utime(project, (1_000, 1_000))
+    path = tmp_path / "registry.json"
+    TranscriptRegistry(projects, path).refresh()
+
+    reloaded = TranscriptRegistry(projects, path)
+    assert reloaded.path("aaaa1111-s1")  # answered before any refresh
+    assert not reloaded.refresh()
+
+    assert TranscriptRegistry(tmp_path / "elsewhere", path).path("aaaa1111-s1") is None
+
+
+def test_default_registry_follows_home(projects, monkeypatch):
+    monkeypatch.setattr(registry_module, "get_projects_dir", lambda: projects)
+    from macf.utils.paths import get_session_transcript_path
+    from macf.utils.session import _get_session_id_from_mtime
+
+    assert get_session_transcript_path("bbbb1111-s3").endswith("bbbb1111-s3.jsonl")
+    assert _get_session_id_from_mtime() == "aaaa2222-s2"
+    assert get_transcript_registry().registry_path.name == "transcript_registry.json"
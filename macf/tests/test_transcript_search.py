@@ -0,0 +1,59 @@
+"""Tests for the prefiltered, parallel cross-transcript breadcrumb search."""
+import json
+import os
+
+import pytest
+
+from macf.forensics.transcript_search import SearchStats, search_all_transcripts
+
+UUID = "2a0e25c0-1111-2222-3333-444444444444"
+CRUMB = "s_d4abc33b/c_1/g_abc/p_2a0e25c0/t_1"
+
+
+def _write(path, entries, mtime):
+    path.write_text("".join(json.dumps(e) + "\n" for e in entries))
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def projects(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    root = tmp_path / ".claude" / "projects" / "-proj"
+    root.mkdir(parents=True)
+    target = {"type": "user", "uuid": UUID, "message": {"content": "the decision"}}
+    # Oldest: holds the message.
+    _write(root / "old.jsonl", [{"type": "user", "uuid": "x1"}, target], 1_000)
+    # Newer: a resumed session replaying it after one extra line.
+    _write(root / "resumed.jsonl", [{"type": "user", "uuid": "x2"}, {"type": "user", "uuid": "x3"}, target], 2_000)
+    # Newest: only mentions the uuid as a parent, so the byte test passes
+    # but the parse does not.
+    _write(root / "newest.jsonl", [{"type": "assistant", "uuid": "x4", "parentUuid": UUID}], 3_000)
+    for n in range(5):
+        _write(root / f"unrelated{n}.jsonl", [{"type": "user", "uuid": f"u{n}"}], 500 + n)
+    return root
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_newest_confirmed_match_wins(projects, workers):
+    stats = SearchStats()
+    window = search_all_transcripts(CRUMB, before=1, after=1, workers=workers, stats=stats)
+
+    assert window.transcript_path.endswith("resumed.jsonl")
+    assert window.target_message.content == "the decision"
+    assert window.breadcrumb == CRUMB
+    assert stats.files == 8
+    assert stats.candidates == 2  # newest (parent mention) and resumed
+    assert stats.workers == workers
+
+
+def test_miss_scans_bytes_only(projects, monkeypatch):
+    parsed = []
+    import macf.forensics.transcript_search as search
+
+    monkeypatch.setattr(search, "find_message_by_breadcrumb",
+                        lambda *a, **k: parsed.append(a) or None)
+    stats = SearchStats()
+    assert search_all_transcripts("s_x/c_1/g_a/p_deadbeef/t_1", workers=1, stats=stats) is None
+    assert parsed == []
+    assert stats.scanned == stats.files == 8
+    assert stats.bytes_scanned > 0
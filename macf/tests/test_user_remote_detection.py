@@ -5,8 +5,9 @@ to the CLI — where "CLI activity" means source in {direct, mid_turn_enqueue},
 NOT a Telegram ("channel") message (the operator is still remote then).
 """
 
-from unittest.mock import patch
+import json
 
+from macf.agent_events_log import get_log_path
 from macf.modes import detection
 
 
@@ -15,10 +16,13 @@ def _ev(event, ts, **data):
 
 
 def _detect(events):
-    # read_events returns most-recent-first; both callers inside _detect_user_remote
-    # (the mode_change scan and _get_last_user_activity_timestamp) hit this mock.
-    with patch.object(detection, "read_events", return_value=events):
-        return detection._detect_user_remote("s")
+    # ``events`` is most-recent-first; the log is written oldest-first. Both
+    # questions inside _detect_user_remote (the mode_change lookup and the CLI
+    # activity lookup) are answered from this log in one scan.
+    with open(get_log_path(), "a") as f:
+        for event in reversed(events):
+            f.write(json.dumps(event) + "\n")
+    return detection._detect_user_remote("s")
 
 
 def test_no_mode_change_is_not_remote():